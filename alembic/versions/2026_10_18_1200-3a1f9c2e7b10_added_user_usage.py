@@ -0,0 +1,71 @@
+"""Added user usage
+
+Revision ID: 3a1f9c2e7b10
+Revises: ffeecde84b84
+Create Date: 2026-10-18 12:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '3a1f9c2e7b10'
+down_revision: str | None = 'ffeecde84b84'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.create_table(
+        'user_usage',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('content_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('preview_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('thumbnail_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('total_items', sa.Integer(), nullable=False),
+        sa.Column('total_collections', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index(op.f('ix_user_usage_user_id'), 'user_usage', ['user_id'], unique=True)
+
+    op.execute("""
+    INSERT INTO user_usage (
+        user_id,
+        content_bytes,
+        preview_bytes,
+        thumbnail_bytes,
+        total_items,
+        total_collections,
+        updated_at
+    )
+    SELECT u.id,
+           coalesce(sum(m.content_size), 0),
+           coalesce(sum(m.preview_size), 0),
+           coalesce(sum(m.thumbnail_size), 0),
+           count(i.id),
+           count(i.id) FILTER (WHERE i.is_collection),
+           now()
+    FROM users u
+    LEFT JOIN items i ON i.owner_id = u.id AND i.status <> 3
+    LEFT JOIN item_metainfo m ON m.item_id = i.id
+    GROUP BY u.id;
+    """)
+
+    op.execute('GRANT ALL ON user_usage TO omoide_app;')
+    op.execute('GRANT ALL ON user_usage TO omoide_worker;')
+    op.execute('GRANT SELECT ON user_usage TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.execute('REVOKE ALL PRIVILEGES ON user_usage FROM omoide_app;')
+    op.execute('REVOKE ALL PRIVILEGES ON user_usage FROM omoide_worker;')
+    op.execute('REVOKE ALL PRIVILEGES ON user_usage FROM omoide_monitoring;')
+
+    op.drop_index(op.f('ix_user_usage_user_id'), table_name='user_usage')
+    op.drop_table('user_usage')
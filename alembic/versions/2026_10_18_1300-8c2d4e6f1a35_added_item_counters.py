@@ -0,0 +1,70 @@
+"""Added item counters
+
+Revision ID: 8c2d4e6f1a35
+Revises: 3a1f9c2e7b10
+Create Date: 2026-10-18 13:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '8c2d4e6f1a35'
+down_revision: str | None = '3a1f9c2e7b10'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column(
+        'items',
+        sa.Column('children_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'items',
+        sa.Column('descendants_count', sa.Integer(), server_default='0', nullable=False),
+    )
+
+    op.execute("""
+    UPDATE items
+    SET children_count = c.total
+    FROM (
+        SELECT parent_id, count(*) AS total
+        FROM items
+        WHERE parent_id IS NOT NULL
+          AND status <> 3
+        GROUP BY parent_id
+    ) c
+    WHERE items.id = c.parent_id;
+    """)
+
+    op.execute("""
+    WITH RECURSIVE tree(ancestor_id, id) AS (
+        SELECT parent_id, id
+        FROM items
+        WHERE parent_id IS NOT NULL
+          AND status <> 3
+        UNION ALL
+        SELECT i.parent_id, tree.id
+        FROM items i
+        INNER JOIN tree ON i.id = tree.ancestor_id
+        WHERE i.parent_id IS NOT NULL
+    )
+    UPDATE items
+    SET descendants_count = d.total
+    FROM (
+        SELECT ancestor_id, count(*) AS total
+        FROM tree
+        GROUP BY ancestor_id
+    ) d
+    WHERE items.id = d.ancestor_id;
+    """)
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('items', 'descendants_count')
+    op.drop_column('items', 'children_count')
@@ -0,0 +1,61 @@
+"""Added perceptual signatures
+
+Revision ID: 5e7a9b1c3d42
+Revises: 8c2d4e6f1a35
+Create Date: 2026-10-18 14:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '5e7a9b1c3d42'
+down_revision: str | None = '8c2d4e6f1a35'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.create_table(
+        'signatures_perceptual',
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('signature', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id'),
+    )
+    op.create_index(
+        op.f('ix_signatures_perceptual_item_id'),
+        'signatures_perceptual',
+        ['item_id'],
+        unique=True,
+    )
+    op.create_index(
+        op.f('ix_signatures_perceptual_signature'),
+        'signatures_perceptual',
+        ['signature'],
+        unique=False,
+    )
+
+    op.execute('GRANT ALL ON signatures_perceptual TO omoide_app;')
+    op.execute('GRANT ALL ON signatures_perceptual TO omoide_worker;')
+    op.execute('GRANT SELECT ON signatures_perceptual TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.execute('REVOKE ALL PRIVILEGES ON signatures_perceptual FROM omoide_app;')
+    op.execute('REVOKE ALL PRIVILEGES ON signatures_perceptual FROM omoide_worker;')
+    op.execute('REVOKE ALL PRIVILEGES ON signatures_perceptual FROM omoide_monitoring;')
+
+    op.drop_index(
+        op.f('ix_signatures_perceptual_signature'),
+        table_name='signatures_perceptual',
+    )
+    op.drop_index(
+        op.f('ix_signatures_perceptual_item_id'),
+        table_name='signatures_perceptual',
+    )
+    op.drop_table('signatures_perceptual')
@@ -0,0 +1,35 @@
+"""Added search generation
+
+Revision ID: b7d1e3f5a920
+Revises: 5e7a9b1c3d42
+Create Date: 2026-10-19 10:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = 'b7d1e3f5a920'
+down_revision: str | None = '5e7a9b1c3d42'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('search_generation')))
+
+    op.execute('GRANT ALL ON SEQUENCE search_generation TO omoide_app;')
+    op.execute('GRANT ALL ON SEQUENCE search_generation TO omoide_worker;')
+    op.execute('GRANT SELECT ON SEQUENCE search_generation TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.execute('REVOKE ALL PRIVILEGES ON SEQUENCE search_generation FROM omoide_app;')
+    op.execute('REVOKE ALL PRIVILEGES ON SEQUENCE search_generation FROM omoide_worker;')
+    op.execute('REVOKE ALL PRIVILEGES ON SEQUENCE search_generation FROM omoide_monitoring;')
+
+    op.execute(sa.schema.DropSequence(sa.Sequence('search_generation')))
@@ -0,0 +1,71 @@
+"""Added item text search
+
+Revision ID: c3e5a7f9b142
+Revises: b7d1e3f5a920
+Create Date: 2026-10-19 11:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as pg
+
+from alembic import op
+
+revision: str = 'c3e5a7f9b142'
+down_revision: str | None = 'b7d1e3f5a920'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.create_table(
+        'item_text_search',
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('document', pg.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id'),
+    )
+    op.create_index(
+        op.f('ix_item_text_search_item_id'),
+        'item_text_search',
+        ['item_id'],
+        unique=True,
+    )
+
+    op.execute("""
+    INSERT INTO item_text_search (item_id, document)
+    SELECT items.id,
+           setweight(to_tsvector('simple', items.name), 'A')
+           || setweight(to_tsvector('simple', coalesce(notes.value, '')), 'B')
+    FROM items
+    LEFT JOIN (
+        SELECT item_id, string_agg(value, ' ') AS value
+        FROM item_notes
+        GROUP BY item_id
+    ) AS notes ON notes.item_id = items.id;
+    """)
+
+    op.create_index(
+        'ix_item_text_search',
+        'item_text_search',
+        ['document'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+    op.execute('GRANT ALL ON item_text_search TO omoide_app;')
+    op.execute('GRANT ALL ON item_text_search TO omoide_worker;')
+    op.execute('GRANT SELECT ON item_text_search TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.execute('REVOKE ALL PRIVILEGES ON item_text_search FROM omoide_app;')
+    op.execute('REVOKE ALL PRIVILEGES ON item_text_search FROM omoide_worker;')
+    op.execute('REVOKE ALL PRIVILEGES ON item_text_search FROM omoide_monitoring;')
+
+    op.drop_index('ix_item_text_search', table_name='item_text_search')
+    op.drop_index(op.f('ix_item_text_search_item_id'), table_name='item_text_search')
+    op.drop_table('item_text_search')
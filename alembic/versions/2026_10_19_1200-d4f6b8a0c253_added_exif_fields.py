@@ -0,0 +1,95 @@
+"""Added exif fields
+
+Revision ID: d4f6b8a0c253
+Revises: c3e5a7f9b142
+Create Date: 2026-10-19 12:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = 'd4f6b8a0c253'
+down_revision: str | None = 'c3e5a7f9b142'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('exif', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('exif', sa.Column('taken_at', sa.DateTime(timezone=False), nullable=True))
+    op.add_column('exif', sa.Column('camera_make', sa.String(length=64), nullable=True))
+    op.add_column('exif', sa.Column('camera_model', sa.String(length=64), nullable=True))
+    op.add_column('exif', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('exif', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('exif', sa.Column('orientation', sa.SmallInteger(), nullable=True))
+    op.add_column('exif', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('exif', sa.Column('longitude', sa.Float(), nullable=True))
+
+    # NOTE: only the simplest fields are restored here, everything else
+    # gets filled next time EXIF of the item is saved
+    op.execute("""
+    WITH raw AS (
+        SELECT exif.item_id,
+               items.owner_id,
+               coalesce(
+                   exif.exif ->> 'DateTimeOriginal',
+                   exif.exif -> 'Exif' ->> 'DateTimeOriginal',
+                   exif.exif ->> 'DateTime'
+               ) AS taken_at,
+               btrim(replace(exif.exif ->> 'Make', chr(0), '')) AS camera_make,
+               btrim(replace(exif.exif ->> 'Model', chr(0), '')) AS camera_model,
+               exif.exif ->> 'Orientation' AS orientation
+        FROM exif
+        JOIN items ON items.id = exif.item_id
+    )
+    UPDATE exif
+    SET owner_id = raw.owner_id,
+        taken_at = CASE
+            WHEN raw.taken_at ~ '^(1[89]|2[0-9])[0-9]{2}:(0[1-9]|1[0-2]):(0[1-9]|[12][0-9]|3[01]) ([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]$'
+            THEN to_timestamp(raw.taken_at, 'YYYY:MM:DD HH24:MI:SS')::timestamp
+        END,
+        camera_make = nullif(left(raw.camera_make, 64), ''),
+        camera_model = nullif(left(raw.camera_model, 64), ''),
+        orientation = CASE
+            WHEN raw.orientation ~ '^[1-8]$' THEN raw.orientation::smallint
+        END
+    FROM raw
+    WHERE raw.item_id = exif.item_id;
+    """)  # noqa: E501
+
+    op.alter_column('exif', 'owner_id', nullable=False)
+    op.create_foreign_key(
+        'exif_owner_id_fkey',
+        'exif',
+        'users',
+        ['owner_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+    op.create_index('ix_exif_taken_at', 'exif', ['taken_at', 'item_id'], unique=False)
+    op.create_index(
+        'ix_exif_owner_taken_at',
+        'exif',
+        ['owner_id', 'taken_at', 'item_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_index('ix_exif_owner_taken_at', table_name='exif')
+    op.drop_index('ix_exif_taken_at', table_name='exif')
+    op.drop_constraint('exif_owner_id_fkey', 'exif', type_='foreignkey')
+    op.drop_column('exif', 'longitude')
+    op.drop_column('exif', 'latitude')
+    op.drop_column('exif', 'orientation')
+    op.drop_column('exif', 'height')
+    op.drop_column('exif', 'width')
+    op.drop_column('exif', 'camera_model')
+    op.drop_column('exif', 'camera_make')
+    op.drop_column('exif', 'taken_at')
+    op.drop_column('exif', 'owner_id')
@@ -0,0 +1,29 @@
+"""Added exif location index
+
+Revision ID: e5a7c9b1d364
+Revises: d4f6b8a0c253
+Create Date: 2026-10-19 13:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = 'e5a7c9b1d364'
+down_revision: str | None = 'd4f6b8a0c253'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.execute("""
+    CREATE INDEX ix_exif_location ON exif
+    USING gist (point(longitude, latitude))
+    WHERE latitude IS NOT NULL;
+    """)
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_index('ix_exif_location', table_name='exif')
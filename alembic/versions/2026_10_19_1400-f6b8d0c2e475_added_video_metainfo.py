@@ -0,0 +1,31 @@
+"""Added video metainfo
+
+Revision ID: f6b8d0c2e475
+Revises: e5a7c9b1d364
+Create Date: 2026-10-19 14:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = 'f6b8d0c2e475'
+down_revision: str | None = 'e5a7c9b1d364'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('item_metainfo', sa.Column('duration', sa.Float(), nullable=True))
+    op.add_column('item_metainfo', sa.Column('video_codec', sa.String(length=64), nullable=True))
+    op.add_column('item_metainfo', sa.Column('fps', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('item_metainfo', 'fps')
+    op.drop_column('item_metainfo', 'video_codec')
+    op.drop_column('item_metainfo', 'duration')
@@ -0,0 +1,33 @@
+"""Added rendition sizes
+
+Revision ID: 07d9f1a3c586
+Revises: f6b8d0c2e475
+Create Date: 2026-10-19 15:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '07d9f1a3c586'
+down_revision: str | None = 'f6b8d0c2e475'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('item_metainfo', sa.Column('preview_webp_size', sa.Integer(), nullable=True))
+    op.add_column('item_metainfo', sa.Column('preview_avif_size', sa.Integer(), nullable=True))
+    op.add_column('item_metainfo', sa.Column('thumbnail_webp_size', sa.Integer(), nullable=True))
+    op.add_column('item_metainfo', sa.Column('thumbnail_avif_size', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('item_metainfo', 'thumbnail_avif_size')
+    op.drop_column('item_metainfo', 'thumbnail_webp_size')
+    op.drop_column('item_metainfo', 'preview_avif_size')
+    op.drop_column('item_metainfo', 'preview_webp_size')
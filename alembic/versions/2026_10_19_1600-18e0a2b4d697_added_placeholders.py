@@ -0,0 +1,29 @@
+"""Added placeholders
+
+Revision ID: 18e0a2b4d697
+Revises: 07d9f1a3c586
+Create Date: 2026-10-19 16:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '18e0a2b4d697'
+down_revision: str | None = '07d9f1a3c586'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('item_metainfo', sa.Column('placeholder', sa.String(length=1024), nullable=True))
+    op.add_column('item_metainfo', sa.Column('dominant_color', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('item_metainfo', 'dominant_color')
+    op.drop_column('item_metainfo', 'placeholder')
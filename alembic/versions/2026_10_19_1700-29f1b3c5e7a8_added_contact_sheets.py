@@ -0,0 +1,46 @@
+"""Added contact sheets
+
+Revision ID: 29f1b3c5e7a8
+Revises: 18e0a2b4d697
+Create Date: 2026-10-19 17:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = '29f1b3c5e7a8'
+down_revision: str | None = '18e0a2b4d697'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.create_table(
+        'contact_sheets',
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('source_key', sa.CHAR(length=32), nullable=False),
+        sa.Column('ext', sa.String(length=64), nullable=False),
+        sa.Column('width', sa.Integer(), nullable=False),
+        sa.Column('height', sa.Integer(), nullable=False),
+        sa.Column('tiles', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('item_id'),
+    )
+    op.create_index(op.f('ix_contact_sheets_item_id'), 'contact_sheets', ['item_id'], unique=True)
+
+    op.execute('GRANT ALL ON contact_sheets TO omoide_app;')
+    op.execute('GRANT ALL ON contact_sheets TO omoide_worker;')
+    op.execute('GRANT SELECT ON contact_sheets TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_index(op.f('ix_contact_sheets_item_id'), table_name='contact_sheets')
+    op.drop_table('contact_sheets')
@@ -0,0 +1,64 @@
+"""Added upload sessions
+
+Revision ID: 3a2c4e6f8b10
+Revises: 29f1b3c5e7a8
+Create Date: 2026-10-19 18:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = '3a2c4e6f8b10'
+down_revision: str | None = '29f1b3c5e7a8'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.create_table(
+        'upload_sessions',
+        sa.Column('uuid', postgresql.UUID(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('item_id', sa.Integer(), nullable=False),
+        sa.Column('oid', sa.BigInteger(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=256), nullable=False),
+        sa.Column('filename', sa.String(length=256), nullable=False),
+        sa.Column('ext', sa.String(length=64), nullable=False),
+        sa.Column('features', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('uuid'),
+    )
+    op.create_index(
+        op.f('ix_upload_sessions_expires_at'), 'upload_sessions', ['expires_at'], unique=False
+    )
+    op.create_index(
+        op.f('ix_upload_sessions_item_id'), 'upload_sessions', ['item_id'], unique=False
+    )
+    op.create_index(
+        op.f('ix_upload_sessions_owner_id'), 'upload_sessions', ['owner_id'], unique=False
+    )
+    op.create_index(op.f('ix_upload_sessions_uuid'), 'upload_sessions', ['uuid'], unique=True)
+
+    op.execute('GRANT ALL ON upload_sessions TO omoide_app;')
+    op.execute('GRANT ALL ON upload_sessions TO omoide_worker;')
+    op.execute('GRANT SELECT ON upload_sessions TO omoide_monitoring;')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_index(op.f('ix_upload_sessions_uuid'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_owner_id'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_item_id'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_expires_at'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,51 @@
+"""Count only available items in usage
+
+Revision ID: 4b3d5f7a9c21
+Revises: 3a2c4e6f8b10
+Create Date: 2026-10-19 19:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = '4b3d5f7a9c21'
+down_revision: str | None = '3a2c4e6f8b10'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _recalculate(condition: str) -> None:
+    """Overwrite usage of every user."""
+    op.execute(f"""
+    UPDATE user_usage
+    SET content_bytes     = actual.content_bytes,
+        preview_bytes     = actual.preview_bytes,
+        thumbnail_bytes   = actual.thumbnail_bytes,
+        total_items       = actual.total_items,
+        total_collections = actual.total_collections,
+        updated_at        = now()
+    FROM (
+        SELECT u.id AS user_id,
+               coalesce(sum(m.content_size), 0) AS content_bytes,
+               coalesce(sum(m.preview_size), 0) AS preview_bytes,
+               coalesce(sum(m.thumbnail_size), 0) AS thumbnail_bytes,
+               count(i.id) AS total_items,
+               count(i.id) FILTER (WHERE i.is_collection) AS total_collections
+        FROM users u
+        LEFT JOIN items i ON i.owner_id = u.id AND {condition}
+        LEFT JOIN item_metainfo m ON m.item_id = i.id
+        GROUP BY u.id
+    ) AS actual
+    WHERE user_usage.user_id = actual.user_id;
+    """)  # noqa: S608
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    _recalculate('i.status = 0')
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    _recalculate('i.status <> 3')
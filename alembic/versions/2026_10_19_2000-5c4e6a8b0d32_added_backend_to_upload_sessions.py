@@ -0,0 +1,30 @@
+"""Added backend to upload sessions
+
+Revision ID: 5c4e6a8b0d32
+Revises: 4b3d5f7a9c21
+Create Date: 2026-10-19 20:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '5c4e6a8b0d32'
+down_revision: str | None = '4b3d5f7a9c21'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column(
+        'upload_sessions',
+        sa.Column('backend', sa.String(length=64), server_default='database', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('upload_sessions', 'backend')
@@ -0,0 +1,33 @@
+"""Added writer to upload sessions
+
+Revision ID: 6d5f7b9c1e43
+Revises: 5c4e6a8b0d32
+Create Date: 2026-10-19 21:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = '6d5f7b9c1e43'
+down_revision: str | None = '5c4e6a8b0d32'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('upload_sessions', sa.Column('writer', postgresql.UUID(), nullable=True))
+    op.add_column(
+        'upload_sessions',
+        sa.Column('writing_until', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('upload_sessions', 'writing_until')
+    op.drop_column('upload_sessions', 'writer')
@@ -0,0 +1,27 @@
+"""Added animated preview size
+
+Revision ID: 7e6a8c0d2f54
+Revises: 6d5f7b9c1e43
+Create Date: 2026-10-19 22:00:00.000000+03:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = '7e6a8c0d2f54'
+down_revision: str | None = '6d5f7b9c1e43'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Adding stuff."""
+    op.add_column('item_metainfo', sa.Column('animated_preview_size', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Removing stuff."""
+    op.drop_column('item_metainfo', 'animated_preview_size')
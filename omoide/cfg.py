@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated
+from typing import Literal
 
 import nano_settings as ns
 import ujson
@@ -29,6 +30,18 @@ class Config(ns.BaseConfig):
     host: str = '0.0.0.0'
     port: int = 8080
     prefix_size: int = 2
+    # nginx (mod_zip) or app (pure python)
+    download_backend: Annotated[Literal['app', 'nginx'], ns.Choices('app', 'nginx')] = 'nginx'
+    media_backend: str = 'app'  # app (sendfile) or nginx (X-Accel-Redirect)
+    media_internal_location: str = '/protected'
+    # previews and thumbnails are looked up in pack files first,
+    # packed ones are always sent by the application
+    media_packs: Annotated[bool, ns.Boolean()] = False
+    resize_cache_size: int = 1024 * 1024 * 1024  # bytes, on-demand resized images of all workers
+    search_backend: str = 'database'  # database (SQL) or memory (bitmaps in API process)
+    upload_backend: str = 'database'  # database (large objects) or filesystem (staging folder)
+    # must be shared with workers, empty means `staging` in data folder
+    staging_folder: str = ''
 
     penalty_wrong_password: float = 2.5  # seconds
     allowed_origins: Annotated[tuple[str, ...], tuple, ujson.loads] = (
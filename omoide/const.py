@@ -30,6 +30,7 @@ class LockNamespace(enum.IntEnum):
 
     ITEMS = 1
     LARGE_OBJECTS = 2
+    CONTACT_SHEETS = 3
 
 
 class LockableResource(NamedTuple):
@@ -64,6 +65,59 @@ PAGES_IN_ALBUM_AT_ONCE = 10
 # /home/storage/<owner uuid>/00/109a6c44-c75f-4c71-aada-b22f15aa9a02.jpg
 STORAGE_PREFIX_SIZE = 2
 
+# access info of items is cached when serving media files
+MEDIA_ACCESS_CACHE_SIZE = 10_000
+MEDIA_ACCESS_CACHE_TTL = 60  # seconds
+# media URLs are not versioned, browsers must revalidate them
+MEDIA_CACHE_MAX_AGE = MEDIA_ACCESS_CACHE_TTL  # seconds
+MEDIA_VERSIONED_MAX_AGE = 365 * 24 * 60 * 60  # seconds
+
+# widths that could be requested from on-demand resizing, they are created
+# from stored previews and thumbnails and kept in a separate folder
+RESPONSIVE_WIDTHS = (160, 240, 320, 480, 640, 768, 1024)
+RESIZED_FOLDER = 'resized'
+
+# single sprite with thumbnails of the first children of a collection,
+# rebuilt in background when children change
+CONTACT_SHEET_FOLDER = 'contact_sheet'
+CONTACT_SHEET_SIZE = 100  # children in one sheet
+CONTACT_SHEET_TILE = 160  # side of the square tile
+CONTACT_SHEET_COLUMNS = 10
+CONTACT_SHEET_EXT = 'webp'
+
+# failed build is not repeated right away, delay doubles after every failure
+CONTACT_SHEET_RETRY_DELAY = 60  # seconds
+CONTACT_SHEET_MAX_RETRY_DELAY = 24 * 60 * 60  # seconds
+
+# previews and thumbnails could be moved into append-only pack files,
+# layout inside this folder mirrors layout of regular files
+PACKS_FOLDER = 'packs'
+
+# copied files are hard links to content-addressed blobs in this folder
+BLOBS_FOLDER = 'blobs'
+STAGING_FOLDER = 'staging'
+
+# totals and facets of search queries are cached per generation of computed tags
+SEARCH_CACHE_SIZE = 10_000
+SEARCH_CACHE_TTL = 600  # seconds
+# with approximate totals allowed planner estimate is returned as is
+# when it is at least this big
+SEARCH_APPROXIMATE_THRESHOLD = 10_000
+# co-occurring tags are counted on random sample of that size for huge results
+SEARCH_FACETS_SAMPLE_SIZE = 5_000
+
+# groups of similar images are kept while user pages through them
+SIMILAR_CACHE_SIZE = 100
+SIMILAR_CACHE_TTL = 300  # seconds
+
+# full-text search over names and notes of items, language agnostic
+TEXT_SEARCH_CONFIG = 'simple'
+
+# database NOTIFY channel with ids of items that in-memory search index must reload
+SEARCH_INDEX_CHANNEL = 'omoide_search_index'
+SEARCH_INDEX_BATCH_DELAY = 0.5  # seconds, gather notifications before reloading
+SEARCH_INDEX_LOAD_BATCH = 10_000  # items added to the index at once on start
+
 # Environment variables
 ENV_FOLDER = 'OMOIDE__FOLDER'
 ENV_DB_URL_ADMIN = 'OMOIDE__DB_URL_ADMIN'
@@ -80,6 +134,14 @@ PREVIEW_SIZE = 1024
 THUMBNAIL_SIZE = 384
 IMAGE_QUALITY = 80
 
+# extra formats of previews and thumbnails, stored next to jpeg
+RENDITION_FORMATS = ('webp', 'avif')
+RENDITION_CONTENT_TYPES: Final = {
+    'jpg': 'image/jpeg',
+    'webp': 'image/webp',
+    'avif': 'image/avif',
+}
+
 CONTENT_TYPE_PNG: Final = 'image/png'
 CONTENT_TYPE_JPEG: Final = 'image/jpeg'
 CONTENT_TYPE_WEBP: Final = 'image/webp'
@@ -95,6 +157,22 @@ VIDEO_EXTENSION = frozenset(
     )
 )
 
+# hard limits for external ffmpeg calls, seconds
+VIDEO_PROBE_TIMEOUT = 30.0
+VIDEO_FRAME_TIMEOUT = 30.0
+VIDEO_ANIMATION_TIMEOUT = 120.0
+
+# animated preview of the video, must not clash with static renditions
+ANIMATED_PREVIEW_EXT = 'anim.webp'
+ANIMATED_PREVIEW_SECONDS = 3.0
+ANIMATED_PREVIEW_FPS = 10
+
 
 MEGABYTE: Final = 1024 * 1024
 UPLOAD_CHUNK_SIZE: Final = MEGABYTE
+
+# resumable upload is forgotten when nothing was sent for that long
+UPLOAD_SESSION_TTL: Final = 24 * 60 * 60  # seconds
+# part of the upload is written by one request at a time, claim
+# of a request that died without releasing it runs out after that
+UPLOAD_PART_LEASE: Final = 60 * 60  # seconds
@@ -94,6 +94,11 @@ class User(Base):
         return f'<DB User id={self.id} {self.uuid} {self.name}>'
 
 
+# incremented after every change of computed tags or permissions,
+# cached search results of older generations must not be used
+search_generation = sa.Sequence('search_generation', metadata=Base.metadata)
+
+
 class ComputedTags(Base):
     """Combined tags of whole hierarchy of items.
 
@@ -191,6 +196,35 @@ class KnownTagsAnon(Base):
     )
 
 
+class UserUsage(Base):
+    """Aggregated resource usage of the user.
+
+    Maintained incrementally, only available items are counted.
+    """
+
+    __tablename__ = 'user_usage'
+
+    # primary and foreign keys ------------------------------------------------
+
+    user_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+        unique=True,
+        primary_key=True,
+    )
+
+    # fields ------------------------------------------------------------------
+
+    content_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    preview_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    thumbnail_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, default=0)
+    total_items: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    total_collections: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+
+
 class Status(Base):
     """Item status model."""
 
@@ -270,6 +304,15 @@ class Item(Base):
     preview_ext: Mapped[str | None] = mapped_column(sa.String(SMALL), nullable=True)
     thumbnail_ext: Mapped[str | None] = mapped_column(sa.String(SMALL), nullable=True)
 
+    # counters ----------------------------------------------------------------
+
+    children_count: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, default=0, server_default='0'
+    )
+    descendants_count: Mapped[int] = mapped_column(
+        sa.Integer, nullable=False, default=0, server_default='0'
+    )
+
     # array fields ------------------------------------------------------------
 
     tags: Mapped[set[str]] = mapped_column(pg.ARRAY(sa.Text), nullable=False)
@@ -345,6 +388,19 @@ class Metainfo(Base):
     thumbnail_width: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
     thumbnail_height: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
 
+    duration: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
+    video_codec: Mapped[str | None] = mapped_column(sa.String(length=SMALL), nullable=True)
+    fps: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
+    animated_preview_size: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+
+    preview_webp_size: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    preview_avif_size: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    thumbnail_webp_size: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    thumbnail_avif_size: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+
+    placeholder: Mapped[str | None] = mapped_column(sa.String(length=HUGE), nullable=True)
+    dominant_color: Mapped[str | None] = mapped_column(sa.String(length=SMALL), nullable=True)
+
     # methods -----------------------------------------------------------------
 
     def __repr__(self) -> str:
@@ -376,6 +432,16 @@ class Metainfo(Base):
             preview_height=row.preview_height,
             thumbnail_width=row.thumbnail_width,
             thumbnail_height=row.thumbnail_height,
+            duration=row.duration,
+            video_codec=row.video_codec,
+            fps=row.fps,
+            animated_preview_size=row.animated_preview_size,
+            preview_webp_size=row.preview_webp_size,
+            preview_avif_size=row.preview_avif_size,
+            thumbnail_webp_size=row.thumbnail_webp_size,
+            thumbnail_avif_size=row.thumbnail_avif_size,
+            placeholder=row.placeholder,
+            dominant_color=row.dominant_color,
         )
 
 
@@ -412,6 +478,31 @@ class ItemNote(Base):
     __table_args__ = (sa.UniqueConstraint('item_id', 'key', name='item_notes_uc'),)
 
 
+class ItemTextSearch(Base):
+    """Full-text search document of the item, made of its name and notes."""
+
+    __tablename__ = 'item_text_search'
+
+    # primary and foreign keys ------------------------------------------------
+
+    item_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('items.id', ondelete='CASCADE'),
+        primary_key=True,
+        nullable=False,
+        index=True,
+        unique=True,
+    )
+
+    # fields ------------------------------------------------------------------
+
+    document: Mapped[str] = mapped_column(pg.TSVECTOR, nullable=False)
+
+    # other -------------------------------------------------------------------
+
+    __table_args__ = (sa.Index('ix_item_text_search', document, postgresql_using='gin'),)
+
+
 class EXIF(Base):
     """EXIF information for items."""
 
@@ -428,16 +519,44 @@ class EXIF(Base):
         primary_key=True,
     )
 
+    owner_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+
     # fields ------------------------------------------------------------------
 
     exif: Mapped[dict[str, Any]] = mapped_column(pg.JSONB, nullable=False)
 
+    # typed copies of the most useful values, extracted from exif
+    taken_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=False), nullable=True)
+    camera_make: Mapped[str | None] = mapped_column(sa.String(SMALL), nullable=True)
+    camera_model: Mapped[str | None] = mapped_column(sa.String(SMALL), nullable=True)
+    width: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    height: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    orientation: Mapped[int | None] = mapped_column(sa.SmallInteger, nullable=True)
+    latitude: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(sa.Float, nullable=True)
+
     # relations ---------------------------------------------------------------
 
     item: Mapped[Item] = relationship(
         'Item', passive_deletes=True, back_populates='exif', uselist=False
     )
 
+    __table_args__ = (
+        sa.Index('ix_exif_taken_at', taken_at, item_id),
+        sa.Index('ix_exif_owner_taken_at', owner_id, taken_at, item_id),
+        # plain geometric point, no PostGIS required
+        sa.Index(
+            'ix_exif_location',
+            sa.func.point(longitude, latitude),
+            postgresql_using='gist',
+            postgresql_where=latitude.is_not(None),
+        ),
+    )
+
 
 class SignatureMD5(Base):
     """MD5 hash for item content."""
@@ -481,6 +600,151 @@ class SignatureCRC32(Base):
     signature: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, index=True)
 
 
+class SignaturePerceptual(Base):
+    """Perceptual hash for item content (64-bit difference hash)."""
+
+    __tablename__ = 'signatures_perceptual'
+
+    # primary and foreign keys ------------------------------------------------
+
+    item_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('items.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+        unique=True,
+        primary_key=True,
+    )
+
+    # fields ------------------------------------------------------------------
+
+    signature: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, index=True)
+
+
+class ContactSheet(Base):
+    """Sprite with thumbnails of the first children of a collection."""
+
+    __tablename__ = 'contact_sheets'
+
+    # primary and foreign keys ------------------------------------------------
+
+    item_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('items.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+        unique=True,
+        primary_key=True,
+    )
+
+    # fields ------------------------------------------------------------------
+
+    version: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    # digest of children that were used, sheet is outdated when it changes
+    source_key: Mapped[str] = mapped_column(sa.CHAR(32), nullable=False)
+    ext: Mapped[str] = mapped_column(sa.String(length=SMALL), nullable=False)
+    width: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    height: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    tiles: Mapped[list[dict[str, Any]]] = mapped_column(pg.JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+
+    @staticmethod
+    def cast(row: sa.Row) -> models.ContactSheet:
+        """Convert to domain-level object."""
+        return models.ContactSheet(
+            item_id=row.item_id,
+            version=row.version,
+            source_key=row.source_key,
+            ext=row.ext,
+            width=row.width,
+            height=row.height,
+            tiles=[
+                models.ContactSheetTile(
+                    item_uuid=UUID(tile['item_uuid']),
+                    x=tile['x'],
+                    y=tile['y'],
+                    width=tile['width'],
+                    height=tile['height'],
+                )
+                for tile in row.tiles
+            ],
+            updated_at=row.updated_at,
+        )
+
+
+class UploadSession(Base):
+    """Resumable upload, content is collected in the object storage."""
+
+    __tablename__ = 'upload_sessions'
+
+    # primary and foreign keys ------------------------------------------------
+
+    uuid: Mapped[UUID] = mapped_column(
+        pg.UUID(),
+        nullable=False,
+        index=True,
+        unique=True,
+        primary_key=True,
+    )
+    owner_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+    item_id: Mapped[int] = mapped_column(
+        sa.Integer,
+        sa.ForeignKey('items.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+
+    # fields ------------------------------------------------------------------
+
+    backend: Mapped[str] = mapped_column(
+        sa.String(length=SMALL), nullable=False, server_default='database'
+    )
+    oid: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    size: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    offset: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(sa.String(length=MEDIUM), nullable=False)
+    filename: Mapped[str] = mapped_column(sa.String(length=MEDIUM), nullable=False)
+    ext: Mapped[str] = mapped_column(sa.String(length=SMALL), nullable=False)
+    features: Mapped[dict[str, Any]] = mapped_column(pg.JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, index=True
+    )
+    # request that is currently writing a part and until when it may do so
+    writer: Mapped[UUID | None] = mapped_column(pg.UUID(), nullable=True)
+    writing_until: Mapped[datetime | None] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True
+    )
+
+    @staticmethod
+    def cast(row: sa.Row) -> models.UploadSession:
+        """Convert to domain-level object."""
+        return models.UploadSession(
+            uuid=row.uuid,
+            owner_id=row.owner_id,
+            item_id=row.item_id,
+            backend=row.backend,
+            oid=row.oid,
+            size=row.size,
+            offset=row.offset,
+            content_type=row.content_type,
+            filename=row.filename,
+            ext=row.ext,
+            features=row.features,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            expires_at=row.expires_at,
+            writer=row.writer,
+            writing_until=row.writing_until,
+        )
+
+
 class RegisteredWorkers(Base):
     """All allowed workers."""
 
@@ -1,16 +1,29 @@
 from omoide.database.implementations.impl_sqlalchemy.browse_repo import BrowseRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.commands_repo import CommandsRepo  # noqa: F401
+from omoide.database.implementations.impl_sqlalchemy.contact_sheets_repo import (
+    ContactSheetsRepo,  # noqa: F401
+)
 from omoide.database.implementations.impl_sqlalchemy.database import (
     SqlalchemyDatabase,  # noqa: F401
 )
+from omoide.database.implementations.impl_sqlalchemy.duplicates_repo import (
+    DuplicatesRepo,  # noqa: F401
+)
 from omoide.database.implementations.impl_sqlalchemy.exif_repo import EXIFRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.items_repo import ItemsRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.meta_repo import MetaRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.misc_repo import MiscRepo  # noqa: F401
+from omoide.database.implementations.impl_sqlalchemy.search_repo import (
+    BitmapSearchRepo,  # noqa: F401
+)
 from omoide.database.implementations.impl_sqlalchemy.search_repo import SearchRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.signatures_repo import (
     SignaturesRepo,  # noqa: F401
 )
 from omoide.database.implementations.impl_sqlalchemy.tags_repo import TagsRepo  # noqa: F401
+from omoide.database.implementations.impl_sqlalchemy.upload_sessions_repo import (
+    UploadSessionsRepo,  # noqa: F401
+)
+from omoide.database.implementations.impl_sqlalchemy.usage_repo import UsageRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.users_repo import UsersRepo  # noqa: F401
 from omoide.database.implementations.impl_sqlalchemy.worker_repo import WorkersRepo  # noqa: F401
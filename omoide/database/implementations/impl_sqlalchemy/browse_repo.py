@@ -34,11 +34,7 @@ class _BrowseRepoBase(AbsBrowseRepo[AsyncConnection], abc.ABC):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -101,7 +97,9 @@ class BrowseRepo(_BrowseRepoBase):
                    items.preview_ext   AS preview_ext,
                    items.thumbnail_ext AS thumbnail_ext,
                    items.tags          AS tags,
-                   items.permissions   AS permissions
+                   items.permissions   AS permissions,
+                   items.children_count    AS children_count,
+                   items.descendants_count AS descendants_count
             FROM items
             WHERE items.parent_id = :item_id
             UNION
@@ -119,7 +117,9 @@ class BrowseRepo(_BrowseRepoBase):
                    items.preview_ext   AS preview_ext,
                    items.thumbnail_ext AS thumbnail_ext,
                    items.tags          AS tags,
-                   items.permissions   AS permissions
+                   items.permissions   AS permissions,
+                   items.children_count    AS children_count,
+                   items.descendants_count AS descendants_count
             FROM items
                      INNER JOIN nested_items
                                 ON items.parent_id = nested_items.id)
@@ -138,12 +138,16 @@ class BrowseRepo(_BrowseRepoBase):
            nested_items.thumbnail_ext,
            nested_items.tags,
            nested_items.permissions,
+           nested_items.children_count,
+           nested_items.descendants_count,
            i2.name as parent_name,
            coalesce(m.thumbnail_width, :default_size) AS thumbnail_width,
-           coalesce(m.thumbnail_height, :default_size) AS thumbnail_height
+           coalesce(m.thumbnail_height, :default_size) AS thumbnail_height,
+           m.placeholder AS placeholder,
+           m.dominant_color AS dominant_color
     FROM nested_items
     LEFT JOIN items i2 ON nested_items.parent_id = i2.id
-    LEFT JOIN item_metainfo m ON m.item_id = i2.id
+    LEFT JOIN item_metainfo m ON m.item_id = nested_items.id
     WHERE nested_items.owner_id IN (SELECT id FROM users WHERE is_public)
       AND nested_items.status = :status
         """
@@ -175,11 +179,7 @@ class BrowseRepo(_BrowseRepoBase):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -208,7 +208,9 @@ class BrowseRepo(_BrowseRepoBase):
                    items.preview_ext   AS preview_ext,
                    items.thumbnail_ext AS thumbnail_ext,
                    items.tags          AS tags,
-                   items.permissions   AS permissions
+                   items.permissions   AS permissions,
+                   items.children_count    AS children_count,
+                   items.descendants_count AS descendants_count
             FROM items
             WHERE items.parent_id = :item_id
             UNION
@@ -226,7 +228,9 @@ class BrowseRepo(_BrowseRepoBase):
                    items.preview_ext   AS preview_ext,
                    items.thumbnail_ext AS thumbnail_ext,
                    items.tags          AS tags,
-                   items.permissions   AS permissions
+                   items.permissions   AS permissions,
+                   items.children_count    AS children_count,
+                   items.descendants_count AS descendants_count
             FROM items
                      INNER JOIN nested_items
                                 ON items.parent_id = nested_items.id)
@@ -245,12 +249,16 @@ class BrowseRepo(_BrowseRepoBase):
            nested_items.thumbnail_ext,
            nested_items.tags,
            nested_items.permissions,
+           nested_items.children_count,
+           nested_items.descendants_count,
            i2.name as parent_name,
            coalesce(m.thumbnail_width, :default_size) AS thumbnail_width,
-           coalesce(m.thumbnail_height, :default_size) AS thumbnail_height
+           coalesce(m.thumbnail_height, :default_size) AS thumbnail_height,
+           m.placeholder AS placeholder,
+           m.dominant_color AS dominant_color
     FROM nested_items
     LEFT JOIN items i2 ON nested_items.parent_id = i2.id
-    LEFT JOIN item_metainfo m ON m.item_id = i2.id
+    LEFT JOIN item_metainfo m ON m.item_id = nested_items.id
     WHERE nested_items.status = :status
       AND (
         nested_items.owner_id IN (SELECT id FROM users WHERE is_public)
@@ -287,11 +295,7 @@ class BrowseRepo(_BrowseRepoBase):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -338,6 +342,8 @@ class BrowseRepo(_BrowseRepoBase):
                 sa.func.coalesce(db_models.Metainfo.thumbnail_height, const.THUMBNAIL_SIZE).label(
                     'thumbnail_height'
                 ),
+                db_models.Metainfo.placeholder,
+                db_models.Metainfo.dominant_color,
             )
             .join(parents, parents.id == db_models.Item.parent_id, isouter=True)
             .join(db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id)
@@ -362,11 +368,7 @@ class BrowseRepo(_BrowseRepoBase):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -1,15 +1,21 @@
 """Repository that performs operations on commands."""
 
+from collections.abc import Collection
+from datetime import timedelta
 from typing import Any
 
 import python_utilz as pu
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from omoide import const
 from omoide import models
 from omoide.database import db_models
 from omoide.database.interfaces.abs_commands_repo import AbsCommandsRepo
 
+# enough failures in a row to reach the longest retry delay
+RECENT_CONTACT_SHEET_COMMANDS = 12
+
 
 class CommandsRepo(AbsCommandsRepo[AsyncConnection]):
     """Repository that performs operations on commands."""
@@ -72,8 +78,32 @@ class CommandsRepo(AbsCommandsRepo[AsyncConnection]):
         requested_by: models.User,
         source_item: models.Item,
         target_item: models.Item,
+        including_content: bool = False,
+        including_video: bool = False,
+        fallback: models.PendingUpload | None = None,
     ) -> int:
-        """Copy images between items."""
+        """Copy images between items.
+
+        Fallback is the same content uploaded for the target, it is
+        processed as a regular upload if the copy fails.
+        """
+        extras: dict[str, Any] = {
+            'item_id': source_item.id,
+            'source_item_id': source_item.id,
+            'target_item_id': target_item.id,
+            'including_content': including_content,
+            'including_video': including_video,
+        }
+
+        if fallback is not None:
+            # worker keeps storage object alive while command references it
+            extras['oid'] = fallback.oid
+            extras['fallback'] = {
+                'content_type': fallback.content_type,
+                'ext': fallback.ext,
+                'extras': fallback.extras,
+            }
+
         now = pu.now()
         stmt = (
             sa.insert(db_models.ParallelCommand)
@@ -81,11 +111,7 @@ class CommandsRepo(AbsCommandsRepo[AsyncConnection]):
                 requested_by=requested_by.id,
                 name=models.Command.COPY_IMAGE,
                 status=models.CommandStatus.CREATED,
-                extras={
-                    'item_id': source_item.id,
-                    'source_item_id': source_item.id,
-                    'target_item_id': target_item.id,
-                },
+                extras=extras,
                 log='',
                 created_at=now,
                 updated_at=now,
@@ -132,3 +158,110 @@ class CommandsRepo(AbsCommandsRepo[AsyncConnection]):
         )
         command_id = (await conn.execute(stmt)).scalar()
         return command_id if command_id is not None else -1
+
+    async def upload_many(
+        self,
+        conn: AsyncConnection,
+        requested_by: models.User,
+        uploads: Collection[models.PendingUpload],
+    ) -> list[int]:
+        """Upload several items at once, return ids in the same order."""
+        if not uploads:
+            return []
+
+        now = pu.now()
+        stmt = (
+            sa.insert(db_models.ParallelCommand)
+            .values(
+                [
+                    {
+                        'requested_by': requested_by.id,
+                        'name': models.Command.UPLOAD,
+                        'status': models.CommandStatus.CREATED,
+                        'extras': {
+                            'item_id': upload.item.id,
+                            'content_type': upload.content_type,
+                            'ext': upload.ext,
+                            'oid': upload.oid,
+                            **upload.extras,
+                        },
+                        'log': '',
+                        'created_at': now,
+                        'updated_at': now,
+                        'started_at': None,
+                        'ended_at': None,
+                    }
+                    for upload in uploads
+                ]
+            )
+            .returning(db_models.ParallelCommand.id)
+        )
+        # NOTE: ids are ascending, sorting restores order of the values
+        response = (await conn.execute(stmt)).scalars().all()
+        return sorted(response)
+
+    async def build_contact_sheet(
+        self,
+        conn: AsyncConnection,
+        requested_by: models.User,
+        item: models.Item,
+    ) -> int:
+        """Build contact sheet of the collection.
+
+        Does nothing if there is already unfinished command for the item
+        or the last one failed not long ago, returns -1 in that case.
+        """
+        # every page view of outdated sheet asks for a rebuild,
+        # lock is released at the end of the transaction
+        lock = sa.func.pg_advisory_xact_lock(int(const.LockNamespace.CONTACT_SHEETS), item.id)
+        await conn.execute(sa.select(lock))
+
+        query = (
+            sa.select(db_models.ParallelCommand.status, db_models.ParallelCommand.ended_at)
+            .where(
+                db_models.ParallelCommand.name == models.Command.BUILD_CONTACT_SHEET,
+                db_models.ParallelCommand.extras['item_id'].as_integer() == item.id,
+            )
+            .order_by(db_models.ParallelCommand.id.desc())
+            .limit(RECENT_CONTACT_SHEET_COMMANDS)
+        )
+        recent = (await conn.execute(query)).all()
+        now = pu.now()
+
+        if recent and recent[0].status in (
+            models.CommandStatus.CREATED,
+            models.CommandStatus.ACTIVE,
+        ):
+            return -1
+
+        failures = 0
+        for status, _ in recent:
+            if status != models.CommandStatus.FAILED:
+                break
+            failures += 1
+
+        if failures:
+            delay = min(
+                const.CONTACT_SHEET_RETRY_DELAY * 2 ** (failures - 1),
+                const.CONTACT_SHEET_MAX_RETRY_DELAY,
+            )
+            last_failure = recent[0].ended_at or now
+            if last_failure + timedelta(seconds=delay) > now:
+                return -1
+
+        stmt = (
+            sa.insert(db_models.ParallelCommand)
+            .values(
+                requested_by=requested_by.id,
+                name=models.Command.BUILD_CONTACT_SHEET,
+                status=models.CommandStatus.CREATED,
+                extras={'item_id': item.id},
+                log='',
+                created_at=now,
+                updated_at=now,
+                started_at=None,
+                ended_at=None,
+            )
+            .returning(db_models.ParallelCommand.id)
+        )
+        return (await conn.execute(stmt)).scalar_one()
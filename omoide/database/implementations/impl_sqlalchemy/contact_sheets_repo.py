@@ -0,0 +1,89 @@
+"""Repository that performs operations on contact sheets."""
+
+from dataclasses import asdict
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from omoide import models
+from omoide.database import db_models
+from omoide.database.implementations.impl_sqlalchemy import queries
+from omoide.database.interfaces.abs_contact_sheets_repo import AbsContactSheetsRepo
+
+
+class ContactSheetsRepo(AbsContactSheetsRepo[AsyncConnection]):
+    """Repository that performs operations on contact sheets."""
+
+    async def get_by_item(
+        self,
+        conn: AsyncConnection,
+        item: models.Item,
+    ) -> models.ContactSheet | None:
+        """Return contact sheet of the collection if it was ever built."""
+        query = sa.select(db_models.ContactSheet).where(db_models.ContactSheet.item_id == item.id)
+
+        response = (await conn.execute(query)).first()
+
+        if response is None:
+            return None
+
+        return db_models.ContactSheet.cast(response)
+
+    async def get_source(
+        self,
+        conn: AsyncConnection,
+        item: models.Item,
+        limit: int,
+    ) -> list[tuple[models.Item, datetime]]:
+        """Return children that go into the sheet with their update time.
+
+        Sheet is shared between everyone who can see the collection,
+        so only children of the same owner that have a thumbnail and
+        are visible at least to the same users are used. Children
+        could have narrower permissions than their parent.
+        """
+        query = (
+            queries.get_items_extended()
+            .add_columns(db_models.Metainfo.updated_at.label('metainfo_updated_at'))
+            .where(
+                db_models.Item.parent_id == item.id,
+                db_models.Item.owner_id == item.owner_id,
+                db_models.Item.permissions.contains(sorted(item.permissions)),
+                db_models.Item.status == models.Status.AVAILABLE,
+                db_models.Item.thumbnail_ext.is_not(None),
+            )
+            .order_by(db_models.Item.number)
+            .limit(limit)
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return [
+            (
+                models.Item.from_obj(row, extra_keys=queries.EXTENDED_ITEM_KEYS),
+                row.metainfo_updated_at,
+            )
+            for row in response
+        ]
+
+    async def save(self, conn: AsyncConnection, sheet: models.ContactSheet) -> None:
+        """Create or replace contact sheet of the collection."""
+        values = {
+            'item_id': sheet.item_id,
+            'version': sheet.version,
+            'source_key': sheet.source_key,
+            'ext': sheet.ext,
+            'width': sheet.width,
+            'height': sheet.height,
+            'tiles': [{**asdict(tile), 'item_uuid': str(tile.item_uuid)} for tile in sheet.tiles],
+            'updated_at': sheet.updated_at,
+        }
+        insert = pg_insert(db_models.ContactSheet).values(**values)
+
+        stmt = insert.on_conflict_do_update(
+            index_elements=[db_models.ContactSheet.item_id],
+            set_={key: insert.excluded[key] for key in values if key != 'item_id'},
+        )
+
+        await conn.execute(stmt)
@@ -1,8 +1,10 @@
 """Sqlalchemy database."""
 
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from types import TracebackType
+from typing import Any
 from typing import Literal
 from typing import Self
 
@@ -56,3 +58,24 @@ class SqlalchemyDatabase(AbsDatabase[AsyncConnection]):
         """Start transaction."""
         async with self._engine.begin() as connection:
             yield connection
+
+    @asynccontextmanager
+    async def listen(self, channel: str) -> AsyncIterator[asyncio.Queue[str]]:
+        """Receive payloads of NOTIFY events on given channel.
+
+        Occupies one connection from the pool for the whole time.
+        """
+        queue: asyncio.Queue[str] = asyncio.Queue()
+
+        def callback(*args: Any) -> None:
+            # asyncpg passes (connection, pid, channel, payload)
+            queue.put_nowait(args[-1])
+
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(channel, callback)  # type: ignore[union-attr]
+            try:
+                yield queue
+            finally:
+                await driver_connection.remove_listener(channel, callback)  # type: ignore[union-attr]
@@ -0,0 +1,215 @@
+"""Repository that searches for duplicated items."""
+
+from collections import defaultdict
+from collections.abc import Collection
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import aliased
+
+from omoide import models
+from omoide.database import db_models
+from omoide.database.implementations.impl_sqlalchemy import queries
+from omoide.database.interfaces.abs_duplicates_repo import AbsDuplicatesRepo
+from omoide.infra import perceptual_hash
+
+
+class DuplicatesRepo(AbsDuplicatesRepo[AsyncConnection]):
+    """Repository that searches for duplicated items."""
+
+    @staticmethod
+    def _get_conditions(
+        user: models.User,
+        item: models.Item | None,
+    ) -> list[sa.ColumnElement]:
+        """Return conditions for items that could be duplicates."""
+        conditions: list[sa.ColumnElement] = [
+            db_models.Item.owner_id == user.id,
+            db_models.Item.status != models.Status.DELETED,
+            ~db_models.Item.is_collection,
+        ]
+
+        if item is not None:
+            top_query = (
+                sa.select(db_models.Item.id)
+                .where(db_models.Item.id == item.id)
+                .cte('family', recursive=True)
+            )
+            bottom_query = sa.select(db_models.Item.id).join(
+                top_query, db_models.Item.parent_id == top_query.c.id
+            )
+            family = top_query.union_all(bottom_query)
+            conditions.append(db_models.Item.id.in_(sa.select(family.c.id)))
+
+        return conditions
+
+    async def get_md5_groups(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        item: models.Item | None,
+        offset: int,
+        limit: int,
+    ) -> list[tuple[str, list[int]]]:
+        """Return ids of items with same MD5 signature, biggest groups first."""
+        total = sa.func.count(db_models.Item.id)
+        query = (
+            sa.select(
+                db_models.SignatureMD5.signature,
+                sa.func.array_agg(db_models.Item.id).label('ids'),
+            )
+            .join(
+                db_models.SignatureMD5,
+                db_models.Item.id == db_models.SignatureMD5.item_id,
+            )
+            .where(*self._get_conditions(user, item))
+            .group_by(db_models.SignatureMD5.signature)
+            .having(total > 1)
+            .order_by(sa.desc(total), db_models.SignatureMD5.signature)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return [(row.signature, sorted(row.ids)) for row in response]
+
+    async def get_perceptual_signatures(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        item: models.Item | None,
+        max_distance: int,
+    ) -> dict[int, int]:
+        """Return perceptual signatures of items that could have similar ones.
+
+        Hash that shares no band with any other hash has nothing within
+        ``max_distance``, so such hashes are filtered out by the database.
+        """
+        signature = db_models.SignaturePerceptual.signature
+        bands = perceptual_hash.get_bands(max_distance)
+
+        scoped = (
+            sa.select(
+                db_models.SignaturePerceptual.item_id,
+                signature,
+                *(
+                    sa.func.count()
+                    .over(partition_by=_get_band(signature, shift, mask))
+                    .label(f'band_{i}')
+                    for i, (shift, mask) in enumerate(bands)
+                ),
+            )
+            .join(
+                db_models.Item,
+                db_models.Item.id == db_models.SignaturePerceptual.item_id,
+            )
+            .where(*self._get_conditions(user, item))
+            .subquery('scoped')
+        )
+
+        query = (
+            sa.select(scoped.c.item_id, scoped.c.signature)
+            .where(sa.or_(*(scoped.c[f'band_{i}'] > 1 for i in range(len(bands)))))
+            .order_by(scoped.c.item_id)
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return {row.item_id: perceptual_hash.to_unsigned(row.signature) for row in response}
+
+    async def resolve_groups(
+        self,
+        conn: AsyncConnection,
+        groups: Collection[tuple[str, list[int]]],
+    ) -> list[models.Duplicate]:
+        """Load items and their parents for given groups."""
+        all_ids = sorted({item_id for _, ids in groups for item_id in ids})
+
+        if not all_ids:
+            return []
+
+        query = queries.get_items_extended().where(db_models.Item.id.in_(all_ids))
+        response = (await conn.execute(query)).fetchall()
+        items = {
+            row.id: models.Item.from_obj(
+                row,
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
+            )
+            for row in response
+        }
+
+        parents = await self._get_all_parents(conn, all_ids)
+
+        result: list[models.Duplicate] = []
+        for signature, ids in groups:
+            duplicate = models.Duplicate(signature=signature, examples=[])
+
+            for item_id in ids:
+                item = items.get(item_id)
+
+                if item is None:
+                    continue
+
+                example = models.DuplicateExample(item, parents.get(item_id, []))
+                duplicate.examples.append(example)
+
+            result.append(duplicate)
+
+        return result
+
+    @staticmethod
+    async def _get_all_parents(
+        conn: AsyncConnection,
+        ids: Collection[int],
+    ) -> dict[int, list[models.Item]]:
+        """Return parents for every given item using single query."""
+        parents = aliased(db_models.Item)
+
+        top_query = (
+            sa.select(
+                db_models.Item.id.label('start_id'),
+                db_models.Item.parent_id.label('ancestor_id'),
+                sa.literal(1).label('depth'),
+            )
+            .where(
+                db_models.Item.id.in_(tuple(ids)),
+                db_models.Item.parent_id.is_not(None),
+            )
+            .cte('chain', recursive=True)
+        )
+
+        bottom_query = (
+            sa.select(
+                top_query.c.start_id,
+                parents.parent_id,
+                top_query.c.depth + 1,
+            )
+            .join(parents, parents.id == top_query.c.ancestor_id)
+            .where(parents.parent_id.is_not(None))
+        )
+
+        chain = top_query.union_all(bottom_query)
+
+        query = (
+            sa.select(chain.c.start_id, db_models.Item)
+            .join(db_models.Item, db_models.Item.id == chain.c.ancestor_id)
+            .order_by(chain.c.start_id, sa.desc(chain.c.depth))
+        )
+
+        response = (await conn.execute(query)).fetchall()
+
+        result: defaultdict[int, list[models.Item]] = defaultdict(list)
+        for row in response:
+            result[row.start_id].append(models.Item.from_obj(row))
+
+        return dict(result)
+
+
+def _get_band(signature: sa.ColumnElement, shift: int, mask: int) -> sa.ColumnElement:
+    """Return bits of the stored hash that belong to the band.
+
+    Shift of negative BIGINT fills high bits with ones, but they
+    are cut off by the mask, so bands match unsigned hashes.
+    """
+    if mask.bit_length() == perceptual_hash.HASH_BITS:
+        return signature
+    return signature.bitwise_rshift(shift).bitwise_and(mask)
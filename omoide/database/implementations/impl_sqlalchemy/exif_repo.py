@@ -1,13 +1,31 @@
 """Repository that performs operations on EXIF data."""
 
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from omoide import const
 from omoide import exceptions
 from omoide import models
 from omoide.database import db_models
+from omoide.database.implementations.impl_sqlalchemy import queries
 from omoide.database.interfaces.abs_exif_repo import AbsEXIFRepo
+from omoide.domain import exif as exif_domain
+
+
+def _get_values(item: models.Item, exif: models.Exif) -> dict[str, Any]:
+    """Return raw EXIF along with its typed fields."""
+    return {
+        'item_id': item.id,
+        'owner_id': item.owner_id,
+        'exif': exif.exif,
+        **asdict(exif_domain.extract_fields(exif.exif)),
+    }
 
 
 class EXIFRepo(AbsEXIFRepo[AsyncConnection]):
@@ -15,7 +33,7 @@ class EXIFRepo(AbsEXIFRepo[AsyncConnection]):
 
     async def create(self, conn: AsyncConnection, item: models.Item, exif: models.Exif) -> None:
         """Create EXIF record for the given item."""
-        stmt = sa.insert(db_models.EXIF).values(item_id=item.id, exif=exif.exif)
+        stmt = sa.insert(db_models.EXIF).values(**_get_values(item, exif))
 
         try:
             await conn.execute(stmt)
@@ -37,14 +55,12 @@ class EXIFRepo(AbsEXIFRepo[AsyncConnection]):
 
     async def save(self, conn: AsyncConnection, item: models.Item, exif: models.Exif) -> None:
         """Update existing EXIF for the given item or create new one."""
-        insert = pg_insert(db_models.EXIF).values(
-            item_id=item.id,
-            exif=exif.exif,
-        )
+        values = _get_values(item, exif)
+        insert = pg_insert(db_models.EXIF).values(**values)
 
         stmt = insert.on_conflict_do_update(
             index_elements=[db_models.EXIF.item_id],
-            set_={'exif': insert.excluded.exif},
+            set_={key: insert.excluded[key] for key in values if key != 'item_id'},
         )
 
         await conn.execute(stmt)
@@ -58,3 +74,229 @@ class EXIFRepo(AbsEXIFRepo[AsyncConnection]):
         if response is None:
             msg = 'EXIF data for item {item_uuid} does not exist'
             raise exceptions.DoesNotExistError(msg, item_uuid=item.uuid)
+
+    @staticmethod
+    def _visible_exif(user: models.User, owner: models.User | None) -> sa.Select:
+        """Return query for EXIF of all items user is allowed to see."""
+        query = (
+            sa.select()
+            .select_from(db_models.EXIF)
+            .join(db_models.Item, db_models.Item.id == db_models.EXIF.item_id)
+            .where(
+                db_models.EXIF.taken_at.is_not(None),
+                db_models.Item.status != models.Status.DELETED,
+            )
+        )
+
+        if owner is not None:
+            query = query.where(db_models.EXIF.owner_id == owner.id)
+
+        return queries.ensure_user_has_permissions(user, query)
+
+    async def get_timeline(  # noqa: PLR0913
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        owner: models.User | None,
+        since: datetime | None,
+        until: datetime | None,
+        order: str,
+        last_seen: tuple[datetime, int] | None,
+        limit: int,
+    ) -> list[tuple[models.Item, datetime]]:
+        """Return items taken in given period, in chronological order."""
+        query = self._visible_exif(user, owner)
+        query = query.join(
+            db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id
+        ).add_columns(
+            db_models.Item,
+            db_models.EXIF.taken_at,
+            sa.func.coalesce(db_models.Metainfo.thumbnail_width, const.THUMBNAIL_SIZE).label(
+                'thumbnail_width'
+            ),
+            sa.func.coalesce(db_models.Metainfo.thumbnail_height, const.THUMBNAIL_SIZE).label(
+                'thumbnail_height'
+            ),
+        )
+
+        if since is not None:
+            query = query.where(db_models.EXIF.taken_at >= since)
+
+        if until is not None:
+            query = query.where(db_models.EXIF.taken_at < until)
+
+        key = sa.tuple_(db_models.EXIF.taken_at, db_models.EXIF.item_id)
+
+        if order == const.DESC:
+            if last_seen is not None:
+                query = query.where(key < sa.tuple_(*last_seen))
+            query = query.order_by(
+                sa.desc(db_models.EXIF.taken_at), sa.desc(db_models.EXIF.item_id)
+            )
+        else:
+            if last_seen is not None:
+                query = query.where(key > sa.tuple_(*last_seen))
+            query = query.order_by(db_models.EXIF.taken_at, db_models.EXIF.item_id)
+
+        response = (await conn.execute(query.limit(limit))).fetchall()
+        return [
+            (
+                models.Item.from_obj(row, extra_keys=['thumbnail_width', 'thumbnail_height']),
+                row.taken_at,
+            )
+            for row in response
+        ]
+
+    async def get_histogram(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        owner: models.User | None,
+        year: int | None,
+    ) -> list[models.TimelineBucket]:
+        """Return amount of items per year, or per month of the given year."""
+        query = self._visible_exif(user, owner)
+        columns = [sa.extract('year', db_models.EXIF.taken_at).label('year')]
+
+        if year is not None:
+            columns.append(sa.extract('month', db_models.EXIF.taken_at).label('month'))
+            query = query.where(
+                db_models.EXIF.taken_at >= datetime(year, 1, 1),  # noqa: DTZ001
+                db_models.EXIF.taken_at < datetime(year + 1, 1, 1),  # noqa: DTZ001
+            )
+
+        query = (
+            query.add_columns(*columns, sa.func.count().label('total'))
+            .group_by(*columns)
+            .order_by(*columns)
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return [
+            models.TimelineBucket(
+                year=int(row.year),
+                month=int(row.month) if year is not None else None,
+                total=row.total,
+            )
+            for row in response
+        ]
+
+    @staticmethod
+    def _in_box(user: models.User, box: models.BoundingBox) -> sa.Select:
+        """Return query for EXIF of visible items located inside the box."""
+        location = sa.func.point(db_models.EXIF.longitude, db_models.EXIF.latitude)
+
+        def _contains(west: float, east: float) -> sa.ColumnElement:
+            area = sa.func.box(
+                sa.func.point(float(west), float(box.south)),
+                sa.func.point(float(east), float(box.north)),
+            )
+            return location.op('<@')(area)
+
+        if box.crosses_antimeridian:
+            condition = sa.or_(_contains(box.west, 180.0), _contains(-180.0, box.east))
+        else:
+            condition = _contains(box.west, box.east)
+
+        query = (
+            sa.select()
+            .select_from(db_models.EXIF)
+            .join(db_models.Item, db_models.Item.id == db_models.EXIF.item_id)
+            .where(
+                db_models.EXIF.latitude.is_not(None),
+                condition,
+                db_models.Item.status != models.Status.DELETED,
+            )
+        )
+        return queries.ensure_user_has_permissions(user, query)
+
+    async def get_in_box(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        box: models.BoundingBox,
+        limit: int,
+    ) -> list[tuple[models.Item, float, float]]:
+        """Return visible items inside the box with their coordinates."""
+        query = (
+            self._in_box(user, box)
+            .join(db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id)
+            .add_columns(
+                db_models.Item,
+                db_models.EXIF.latitude,
+                db_models.EXIF.longitude,
+                sa.func.coalesce(db_models.Metainfo.thumbnail_width, const.THUMBNAIL_SIZE).label(
+                    'thumbnail_width'
+                ),
+                sa.func.coalesce(db_models.Metainfo.thumbnail_height, const.THUMBNAIL_SIZE).label(
+                    'thumbnail_height'
+                ),
+            )
+            .order_by(sa.desc(db_models.Item.number))
+            .limit(limit)
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return [
+            (
+                models.Item.from_obj(row, extra_keys=['thumbnail_width', 'thumbnail_height']),
+                row.latitude,
+                row.longitude,
+            )
+            for row in response
+        ]
+
+    async def get_clusters(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        box: models.BoundingBox,
+        grid: int,
+    ) -> list[models.GeoCluster]:
+        """Group visible items inside the box into grid x grid cells."""
+        west, south = float(box.west), float(box.south)
+        longitude: sa.ColumnElement = db_models.EXIF.longitude
+        if box.crosses_antimeridian:
+            longitude = sa.case((longitude < west, longitude + 360.0), else_=longitude)
+
+        cell_width = box.width / grid or 1.0
+        cell_height = box.height / grid or 1.0
+
+        columns = [
+            sa.func.floor((longitude - west) / cell_width).label('cell_x'),
+            sa.func.floor((db_models.EXIF.latitude - south) / cell_height).label('cell_y'),
+        ]
+
+        query = (
+            self._in_box(user, box)
+            .add_columns(
+                *columns,
+                sa.func.avg(longitude).label('longitude'),
+                sa.func.avg(db_models.EXIF.latitude).label('latitude'),
+                sa.func.count().label('total'),
+                # the most recent item represents the whole cluster
+                pg.array_agg(
+                    pg.aggregate_order_by(db_models.Item.uuid, sa.desc(db_models.Item.number))
+                )[1].label('item_uuid'),
+            )
+            .group_by(*columns)
+            .order_by(sa.desc('total'))
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        return [
+            models.GeoCluster(
+                latitude=float(row.latitude),
+                longitude=_wrap_longitude(float(row.longitude)),
+                total=row.total,
+                item_uuid=row.item_uuid,
+            )
+            for row in response
+        ]
+
+
+def _wrap_longitude(longitude: float) -> float:
+    """Return longitude in -180..180 range."""
+    if longitude > 180.0:  # noqa: PLR2004
+        return longitude - 360.0
+    return longitude
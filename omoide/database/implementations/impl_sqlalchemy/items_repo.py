@@ -15,6 +15,9 @@ from omoide.database import db_models
 from omoide.database.implementations.impl_sqlalchemy import queries
 from omoide.database.interfaces.abs_items_repo import AbsItemsRepo
 
+# changes in these fields affect in-memory search index
+_SEARCH_INDEXED_FIELDS = frozenset(('status', 'number', 'owner_id', 'is_collection', 'permissions'))
+
 
 class ItemsRepo(AbsItemsRepo[AsyncConnection]):
     """Repository that performs operations on items."""
@@ -58,6 +61,20 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
             )
             await conn.execute(update_stmt)
             item.number = item_id
+
+        await conn.execute(queries.refresh_text_search(item_id))
+
+        if item.status == models.Status.AVAILABLE:
+            usage_stmt = queries.increment_user_usage(
+                item.owner_id,
+                total_items=1,
+                total_collections=int(item.is_collection),
+            )
+            await conn.execute(usage_stmt)
+
+        if item.status != models.Status.DELETED and item.parent_id is not None:
+            await self._update_ancestors(conn, item.parent_id, children=1, descendants=1)
+
         return item_id
 
     async def get_by_id(
@@ -144,11 +161,7 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -166,20 +179,6 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         response = (await conn.execute(query)).fetchone()
         return int(response.total_items) if response else 0
 
-    async def count_children(self, conn: AsyncConnection, item: models.Item) -> int:
-        """Count all children of an item with given UUID."""
-        query = (
-            sa.select(sa.func.count().label('total_items'))
-            .select_from(db_models.Item)
-            .where(
-                db_models.Item.parent_id == item.id,
-                db_models.Item.status != models.Status.DELETED,
-            )
-        )
-
-        response = (await conn.execute(query)).fetchone()
-        return int(response.total_items) if response else 0
-
     async def get_parents(self, conn: AsyncConnection, item: models.Item) -> list[models.Item]:
         """Return list of parents for given item."""
         parents: list[models.Item] = []
@@ -286,11 +285,7 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -318,11 +313,7 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -375,9 +366,246 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         if 'permissions' in changes:
             changes['permissions'] = tuple(changes['permissions'])
 
-        stmt = sa.update(db_models.Item).values(**changes).where(db_models.Item.id == item.id)
-        response = await conn.execute(stmt)
-        return bool(response.rowcount)
+        if changes.keys() & _SEARCH_INDEXED_FIELDS:
+            await conn.execute(queries.notify_search_index(item.id))
+
+        if not changes.keys() & {'status', 'is_collection', 'parent_id'}:
+            stmt = sa.update(db_models.Item).values(**changes).where(db_models.Item.id == item.id)
+            response = await conn.execute(stmt)
+
+            if 'name' in changes:
+                await conn.execute(queries.refresh_text_search(item.id))
+
+            return bool(response.rowcount)
+
+        # NOTE: we need previous state of the item to keep usage stats and counters correct
+        old = (
+            sa.select(
+                db_models.Item.id,
+                db_models.Item.status.label('old_status'),
+                db_models.Item.is_collection.label('old_is_collection'),
+                db_models.Item.parent_id.label('old_parent_id'),
+                db_models.Item.descendants_count.label('old_descendants_count'),
+            )
+            .where(db_models.Item.id == item.id)
+            .with_for_update()
+            .subquery('old')
+        )
+        stmt = (
+            sa.update(db_models.Item)
+            .values(**changes)
+            .where(db_models.Item.id == old.c.id)
+            .returning(
+                old.c.old_status,
+                old.c.old_is_collection,
+                old.c.old_parent_id,
+                old.c.old_descendants_count,
+            )
+        )
+        row = (await conn.execute(stmt)).fetchone()
+
+        if row is None:
+            return False
+
+        if 'name' in changes:
+            await conn.execute(queries.refresh_text_search(item.id))
+
+        await self._update_usage(
+            conn=conn,
+            item=item,
+            was_counted=row.old_status == models.Status.AVAILABLE,
+            was_collection=row.old_is_collection,
+            is_counted=item.status == models.Status.AVAILABLE,
+        )
+        await self._update_counters(
+            conn=conn,
+            old_parent_id=row.old_parent_id,
+            new_parent_id=item.parent_id,
+            was_counted=row.old_status != models.Status.DELETED,
+            is_counted=item.status != models.Status.DELETED,
+            descendants=row.old_descendants_count,
+        )
+        return True
+
+    async def set_status(
+        self,
+        conn: AsyncConnection,
+        items: Collection[models.Item],
+        status: models.Status,
+    ) -> int:
+        """Change status of several items that are not deleted.
+
+        Deletion changes counters, use ``save`` for that. Usage is
+        changed for items that become available or stop being available.
+        """
+        if status == models.Status.DELETED:
+            msg = 'Items must be deleted one by one'
+            raise ValueError(msg)
+
+        if not items:
+            return 0
+
+        old = (
+            sa.select(
+                db_models.Item.id,
+                db_models.Item.status.label('old_status'),
+                db_models.Item.is_collection.label('old_is_collection'),
+            )
+            .where(
+                db_models.Item.id.in_(tuple(item.id for item in items)),
+                db_models.Item.status != models.Status.DELETED,
+            )
+            .with_for_update()
+            .subquery('old')
+        )
+        stmt = (
+            sa.update(db_models.Item)
+            .values(status=status)
+            .where(db_models.Item.id == old.c.id)
+            .returning(db_models.Item.id, old.c.old_status, old.c.old_is_collection)
+        )
+
+        # NOTE: update and notification in one round trip
+        update = stmt.cte('update')
+        response = await conn.execute(
+            queries.notify_search_index(update.c.id)
+            .add_columns(update.c.id, update.c.old_status, update.c.old_is_collection)
+            .select_from(update)
+        )
+        rows = response.fetchall()
+
+        items_map = {item.id: item for item in items}
+        is_counted = status == models.Status.AVAILABLE
+        for row in rows:
+            was_counted = row.old_status == models.Status.AVAILABLE
+            if was_counted != is_counted:
+                await self._update_usage(
+                    conn=conn,
+                    item=items_map[row.id],
+                    was_counted=was_counted,
+                    was_collection=row.old_is_collection,
+                    is_counted=is_counted,
+                )
+
+        for item in items:
+            item.status = status
+            item.reset_changes()
+
+        return len(rows)
+
+    @classmethod
+    async def _update_counters(  # noqa: PLR0913
+        cls,
+        conn: AsyncConnection,
+        *,
+        old_parent_id: int | None,
+        new_parent_id: int | None,
+        was_counted: bool,
+        is_counted: bool,
+        descendants: int,
+    ) -> None:
+        """Change children/descendants counters of parents after item change."""
+        if old_parent_id == new_parent_id:
+            delta = int(is_counted) - int(was_counted)
+            if delta and new_parent_id is not None:
+                await cls._update_ancestors(conn, new_parent_id, children=delta, descendants=delta)
+            return
+
+        # NOTE: whole subtree moves together with the item
+        if old_parent_id is not None:
+            await cls._update_ancestors(
+                conn,
+                old_parent_id,
+                children=-int(was_counted),
+                descendants=-(int(was_counted) + descendants),
+            )
+
+        if new_parent_id is not None:
+            await cls._update_ancestors(
+                conn,
+                new_parent_id,
+                children=int(is_counted),
+                descendants=int(is_counted) + descendants,
+            )
+
+    @staticmethod
+    async def _update_ancestors(
+        conn: AsyncConnection,
+        parent_id: int,
+        *,
+        children: int,
+        descendants: int,
+    ) -> None:
+        """Add deltas to the direct parent and to all its ancestors."""
+        if not children and not descendants:
+            return
+
+        query = """
+        WITH RECURSIVE ancestors AS (
+            SELECT id, parent_id
+            FROM items
+            WHERE id = :parent_id
+            UNION ALL
+            SELECT i.id, i.parent_id
+            FROM items i
+                     INNER JOIN ancestors a ON i.id = a.parent_id
+        )
+        UPDATE items
+        SET children_count = items.children_count
+                + CASE WHEN items.id = :parent_id THEN :children ELSE 0 END,
+            descendants_count = items.descendants_count + :descendants
+        FROM ancestors
+        WHERE items.id = ancestors.id;
+        """
+
+        values = {
+            'parent_id': parent_id,
+            'children': children,
+            'descendants': descendants,
+        }
+        await conn.execute(sa.text(query), values)
+
+    @staticmethod
+    async def _update_usage(
+        conn: AsyncConnection,
+        item: models.Item,
+        *,
+        was_counted: bool,
+        was_collection: bool,
+        is_counted: bool,
+    ) -> None:
+        """Change aggregated usage of the owner after item change."""
+        total_items = int(is_counted) - int(was_counted)
+        total_collections = int(is_counted and item.is_collection) - int(
+            was_counted and was_collection
+        )
+
+        if not total_items and not total_collections:
+            return
+
+        content_bytes = preview_bytes = thumbnail_bytes = 0
+        if total_items:
+            query = sa.select(
+                sa.func.coalesce(db_models.Metainfo.content_size, 0).label('content_bytes'),
+                sa.func.coalesce(db_models.Metainfo.preview_size, 0).label('preview_bytes'),
+                sa.func.coalesce(db_models.Metainfo.thumbnail_size, 0).label('thumbnail_bytes'),
+            ).where(db_models.Metainfo.item_id == item.id)
+            sizes = (await conn.execute(query)).fetchone()
+
+            if sizes is not None:
+                content_bytes = sizes.content_bytes * total_items
+                preview_bytes = sizes.preview_bytes * total_items
+                thumbnail_bytes = sizes.thumbnail_bytes * total_items
+
+        stmt = queries.increment_user_usage(
+            item.owner_id,
+            content_bytes=content_bytes,
+            preview_bytes=preview_bytes,
+            thumbnail_bytes=thumbnail_bytes,
+            total_items=total_items,
+            total_collections=total_collections,
+        )
+        await conn.execute(stmt)
 
     async def soft_delete(self, conn: AsyncConnection, item: models.Item) -> bool:
         """Mark tem as deleted."""
@@ -386,6 +614,43 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
 
     async def hard_delete(self, conn: AsyncConnection, item: models.Item) -> bool:
         """Delete the given item."""
+        query = (
+            sa.select(
+                db_models.Item.status,
+                db_models.Item.is_collection,
+                db_models.Item.parent_id,
+                db_models.Item.descendants_count,
+            )
+            .where(db_models.Item.id == item.id)
+            .with_for_update()
+        )
+        old = (await conn.execute(query)).fetchone()
+
+        if old is None:
+            return False
+
+        if old.status == models.Status.AVAILABLE:
+            # NOTE: usually items are soft deleted first and already not counted
+            await self._update_usage(
+                conn=conn,
+                item=item,
+                was_counted=True,
+                was_collection=old.is_collection,
+                is_counted=False,
+            )
+
+        # NOTE: descendants are removed by cascade
+        await self._update_counters(
+            conn=conn,
+            old_parent_id=old.parent_id,
+            new_parent_id=None,
+            was_counted=old.status != models.Status.DELETED,
+            is_counted=False,
+            descendants=old.descendants_count,
+        )
+
+        await conn.execute(queries.notify_search_index(item.id))
+
         stmt = sa.delete(db_models.Item).where(db_models.Item.id == item.id)
         response = await conn.execute(stmt)
         return bool(response.rowcount)
@@ -420,30 +685,9 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
             set_={'tags': insert.excluded.tags},
         )
 
-        await conn.execute(stmt)
-
-    async def count_family(self, conn: AsyncConnection, item: models.Item) -> int:
-        """Count all descendants for given item (including the item itself)."""
-        top_query = (
-            sa.select(db_models.Item.parent_id, db_models.Item.status, db_models.Item.id)
-            .where(db_models.Item.id == item.id)
-            .cte('nested_items', recursive=True)
-        )
-
-        bottom_query = sa.select(
-            db_models.Item.parent_id, db_models.Item.status, db_models.Item.id
-        ).join(top_query, db_models.Item.parent_id == top_query.c.id)
-
-        recursive_query = top_query.union_all(bottom_query)
-
-        total_query = (
-            sa.select(sa.func.count().label('total'))
-            .select_from(recursive_query)
-            .where(recursive_query.c.status != models.Status.DELETED)
-        )
-
-        response = (await conn.execute(total_query)).fetchone()
-        return int(response.total) if response else 0
+        # NOTE: upsert and notification in one round trip
+        upsert = stmt.returning(db_models.ComputedTags.item_id).cte('upsert')
+        await conn.execute(queries.notify_search_index(upsert.c.item_id).select_from(upsert))
 
     async def get_parent_names(
         self,
@@ -527,79 +771,12 @@ class ItemsRepo(AbsItemsRepo[AsyncConnection]):
         for row in response:
             item = models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             items[item.id] = item
 
         return items
 
-    async def get_duplicates(
-        self,
-        conn: AsyncConnection,
-        user: models.User,
-        item: models.Item | None,
-        limit: int,
-    ) -> list[models.Duplicate]:
-        """Return groups of items with same hash."""
-        conditions = [
-            db_models.Item.owner_id == user.id,
-            db_models.Item.status != models.Status.DELETED,
-            ~db_models.Item.is_collection,
-        ]
-
-        if item is not None:
-            family = await self.get_family(conn, item)
-            conditions.append(db_models.Item.id.in_(tuple(item.id for item in family)))
-
-        query = (
-            sa.select(
-                db_models.SignatureMD5.signature,
-                sa.func.array_agg(db_models.Item.id).label('ids'),
-            )
-            .join(
-                db_models.SignatureMD5,
-                db_models.Item.id == db_models.SignatureMD5.item_id,
-            )
-            .where(*conditions)
-            .group_by(db_models.SignatureMD5.signature)
-            .having(sa.func.array_length(sa.func.array_agg(db_models.Item.id), 1) > 1)
-            .order_by(sa.desc(sa.func.array_length(sa.func.array_agg(db_models.Item.id), 1)))
-            .limit(limit)
-        )
-
-        response = (await conn.execute(query)).fetchall()
-
-        all_ids: set[int] = set()
-        signatures_to_groups: list[tuple[str, list[int]]] = []
-
-        for row in response:
-            ids = sorted(row.ids)
-            signatures_to_groups.append((row.signature, ids))
-            all_ids.update(ids)
-
-        all_items = await self.get_map(conn, all_ids)
-        result: list[models.Duplicate] = []
-
-        for signature, ids in signatures_to_groups:
-            duplication = models.Duplicate(signature=signature, examples=[])
-
-            for item_id in ids:
-                item = all_items.get(item_id)
-
-                if not item:
-                    continue
-
-                parents = await self.get_parents(conn, item)
-                duplication.examples.append(models.DuplicateExample(item, parents))
-
-            result.append(duplication)
-
-        return result
-
     async def select(
         self,
         conn: AsyncConnection,
@@ -10,8 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncConnection
 from omoide import exceptions
 from omoide import models
 from omoide.database import db_models
+from omoide.database.implementations.impl_sqlalchemy import queries
 from omoide.database.interfaces.abs_meta_repo import AbsMetaRepo
 
+SIZE_FIELDS = frozenset(('content_size', 'preview_size', 'thumbnail_size'))
+
 
 class MetaRepo(AbsMetaRepo[AsyncConnection]):
     """Repository that perform CRUD operations on metainfo."""
@@ -54,19 +57,68 @@ class MetaRepo(AbsMetaRepo[AsyncConnection]):
 
     async def save(self, conn: AsyncConnection, metainfo: models.Metainfo) -> None:
         """Update metainfo."""
+        changes = metainfo.get_changes()
+
+        if not SIZE_FIELDS.intersection(changes):
+            stmt = (
+                sa.update(db_models.Metainfo)
+                .where(db_models.Metainfo.item_id == metainfo.item_id)
+                .values(**changes)
+                .returning(1)
+            )
+
+            response = await conn.execute(stmt)
+
+            if response is None:
+                msg = 'Metainfo for item {item_id} does not exist'
+                raise exceptions.DoesNotExistError(msg, item_uuid=metainfo.item_id)
+            return
+
+        # NOTE: we need previous sizes to keep usage stats correct
+        old = (
+            sa.select(
+                db_models.Metainfo.item_id,
+                db_models.Metainfo.content_size.label('old_content_size'),
+                db_models.Metainfo.preview_size.label('old_preview_size'),
+                db_models.Metainfo.thumbnail_size.label('old_thumbnail_size'),
+                db_models.Item.owner_id,
+                db_models.Item.status,
+            )
+            .join(db_models.Item, db_models.Item.id == db_models.Metainfo.item_id)
+            .where(db_models.Metainfo.item_id == metainfo.item_id)
+            .with_for_update(of=db_models.Metainfo)
+            .subquery('old')
+        )
         stmt = (
             sa.update(db_models.Metainfo)
-            .where(db_models.Metainfo.item_id == metainfo.item_id)
-            .values(**metainfo.get_changes())
-            .returning(1)
+            .where(db_models.Metainfo.item_id == old.c.item_id)
+            .values(**changes)
+            .returning(
+                old.c.old_content_size,
+                old.c.old_preview_size,
+                old.c.old_thumbnail_size,
+                old.c.owner_id,
+                old.c.status,
+            )
         )
 
-        response = await conn.execute(stmt)
+        row = (await conn.execute(stmt)).fetchone()
 
-        if response is None:
+        if row is None:
             msg = 'Metainfo for item {item_id} does not exist'
             raise exceptions.DoesNotExistError(msg, item_uuid=metainfo.item_id)
 
+        if row.status != models.Status.AVAILABLE:
+            return
+
+        usage_stmt = queries.increment_user_usage(
+            row.owner_id,
+            content_bytes=(metainfo.content_size or 0) - (row.old_content_size or 0),
+            preview_bytes=(metainfo.preview_size or 0) - (row.old_preview_size or 0),
+            thumbnail_bytes=(metainfo.thumbnail_size or 0) - (row.old_thumbnail_size or 0),
+        )
+        await conn.execute(usage_stmt)
+
     async def soft_delete(self, conn: AsyncConnection, metainfo: models.Metainfo) -> int:
         """Mark item deleted."""
         stmt = (
@@ -104,6 +156,32 @@ class MetaRepo(AbsMetaRepo[AsyncConnection]):
         )
 
         await conn.execute(stmt)
+        await conn.execute(queries.refresh_text_search(item.id))
+
+    async def add_item_notes(
+        self,
+        conn: AsyncConnection,
+        key: str,
+        values: Collection[tuple[models.Item, str]],
+    ) -> None:
+        """Add note with the same key to several items."""
+        if not values:
+            return
+
+        insert = pg_insert(db_models.ItemNote).values(
+            [{'item_id': item.id, 'key': key, 'value': value} for item, value in values]
+        )
+
+        stmt = insert.on_conflict_do_update(
+            index_elements=[
+                db_models.ItemNote.item_id,
+                db_models.ItemNote.key,
+            ],
+            set_={'value': insert.excluded.value},
+        )
+
+        await conn.execute(stmt)
+        await conn.execute(queries.refresh_text_search([item.id for item, _ in values]))
 
     async def get_item_notes(self, conn: AsyncConnection, item: models.Item) -> dict[str, str]:
         """Return notes for given item."""
@@ -112,36 +190,3 @@ class MetaRepo(AbsMetaRepo[AsyncConnection]):
         ).where(db_models.ItemNote.item_id == item.id)
         response = (await conn.execute(query)).scalar()
         return response or {}
-
-    async def get_total_disk_usage(
-        self,
-        conn: AsyncConnection,
-        user: models.User,
-    ) -> models.DiskUsage:
-        """Return total disk usage for specified user."""
-        query = (
-            sa.select(
-                sa.func.sum(sa.func.coalesce(db_models.Metainfo.content_size, 0)).label(
-                    'content_bytes'
-                ),
-                sa.func.sum(sa.func.coalesce(db_models.Metainfo.preview_size, 0)).label(
-                    'preview_bytes'
-                ),
-                sa.func.sum(sa.func.coalesce(db_models.Metainfo.thumbnail_size, 0)).label(
-                    'thumbnail_bytes'
-                ),
-            )
-            .join(
-                db_models.Item,
-                db_models.Item.id == db_models.Metainfo.item_id,
-            )
-            .where(db_models.Item.owner_id == user.id)
-        )
-
-        response = (await conn.execute(query)).fetchone()
-
-        return models.DiskUsage(
-            content_bytes=int(response.content_bytes) if response else 0,
-            preview_bytes=int(response.preview_bytes) if response else 0,
-            thumbnail_bytes=int(response.thumbnail_bytes) if response else 0,
-        )
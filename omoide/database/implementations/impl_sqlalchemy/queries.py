@@ -1,8 +1,12 @@
 """Common database queries."""
 
+from collections.abc import Collection
 from uuid import UUID
 
+import python_utilz as pu
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql import Select
 
@@ -21,6 +25,86 @@ def item_is_public() -> sa.BinaryExpression:
     return db_models.Item.owner_id.in_(public_user_ids())
 
 
+def notify_search_index(item_id: int | sa.ColumnElement) -> Select:
+    """Return statement that tells in-memory search index to reload the item.
+
+    Notification is delivered only after commit, rolled back changes are
+    never announced.
+    """
+    payload = str(item_id) if isinstance(item_id, int) else sa.cast(item_id, sa.Text)
+    return sa.select(sa.func.pg_notify(const.SEARCH_INDEX_CHANNEL, payload))
+
+
+def text_search_config() -> sa.ColumnElement:
+    """Return text search configuration literal."""
+    return sa.literal_column(f"'{const.TEXT_SEARCH_CONFIG}'::regconfig")
+
+
+def refresh_text_search(item_id: int | Collection[int]) -> Insert:
+    """Return statement that rebuilds full-text search document of the item.
+
+    Name of the item weighs more than its notes.
+    """
+    ids = (item_id,) if isinstance(item_id, int) else tuple(item_id)
+    notes = (
+        sa.select(sa.func.string_agg(db_models.ItemNote.value, ' '))
+        .where(db_models.ItemNote.item_id == db_models.Item.id)
+        .scalar_subquery()
+    )
+    document = sa.func.setweight(
+        sa.func.to_tsvector(text_search_config(), db_models.Item.name),
+        sa.literal_column("'A'"),
+    ).op('||')(
+        sa.func.setweight(
+            sa.func.to_tsvector(text_search_config(), sa.func.coalesce(notes, '')),
+            sa.literal_column("'B'"),
+        )
+    )
+    insert = pg_insert(db_models.ItemTextSearch).from_select(
+        ['item_id', 'document'],
+        sa.select(db_models.Item.id, document).where(db_models.Item.id.in_(ids)),
+    )
+    return insert.on_conflict_do_update(
+        index_elements=[db_models.ItemTextSearch.item_id],
+        set_={'document': insert.excluded.document},
+    )
+
+
+def increment_user_usage(  # noqa: PLR0913
+    user_id: int,
+    *,
+    content_bytes: int = 0,
+    preview_bytes: int = 0,
+    thumbnail_bytes: int = 0,
+    total_items: int = 0,
+    total_collections: int = 0,
+) -> Insert:
+    """Return statement that changes aggregated usage of the user (by delta)."""
+    deltas = {
+        'content_bytes': content_bytes,
+        'preview_bytes': preview_bytes,
+        'thumbnail_bytes': thumbnail_bytes,
+        'total_items': total_items,
+        'total_collections': total_collections,
+    }
+    insert = pg_insert(db_models.UserUsage).values(
+        user_id=user_id,
+        updated_at=pu.now(),
+        **deltas,
+    )
+    return insert.on_conflict_do_update(
+        index_elements=[db_models.UserUsage.user_id],
+        set_={
+            **{
+                column: getattr(db_models.UserUsage, column) + getattr(insert.excluded, column)
+                for column, delta in deltas.items()
+                if delta
+            },
+            'updated_at': insert.excluded.updated_at,
+        },
+    )
+
+
 def extend_item_select(
     query: Select,
     owner_uuid: UUID | None,
@@ -42,6 +126,16 @@ def extend_item_select(
     return query
 
 
+# extra attributes of items selected by get_items_extended
+EXTENDED_ITEM_KEYS = (
+    'parent_name',
+    'thumbnail_width',
+    'thumbnail_height',
+    'placeholder',
+    'dominant_color',
+)
+
+
 def get_items_extended() -> Select:
     """Construct request that gathers item with extended parameters."""
     parents = aliased(db_models.Item)
@@ -55,6 +149,8 @@ def get_items_extended() -> Select:
             sa.func.coalesce(db_models.Metainfo.thumbnail_height, const.THUMBNAIL_SIZE).label(
                 'thumbnail_height'
             ),
+            db_models.Metainfo.placeholder,
+            db_models.Metainfo.dominant_color,
         )
         .join(parents, parents.id == db_models.Item.parent_id, isouter=True)
         .join(db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id)
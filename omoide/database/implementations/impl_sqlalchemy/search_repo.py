@@ -1,22 +1,40 @@
 """Search repository."""
 
 import abc
+import asyncio
+from collections.abc import Collection
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as pg
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import Select
 
+from omoide import const
+from omoide import custom_logging
+from omoide import limits
 from omoide import models
+from omoide import utils
 from omoide.database import db_models
 from omoide.database.implementations.impl_sqlalchemy import queries
+from omoide.database.implementations.impl_sqlalchemy.database import SqlalchemyDatabase
 from omoide.database.interfaces.abs_search_repo import AbsSearchRepo
+from omoide.domain import search_planner
+from omoide.domain.search_index import IndexEntry
+from omoide.domain.search_index import SearchIndex
+
+LOG = custom_logging.get_logger(__name__)
 
 
 class _SearchRepositoryBase(AbsSearchRepo[AsyncConnection], abc.ABC):
     """Base class with helper methods."""
 
     @staticmethod
-    def _expand_query(query: Select, user: models.User, plan: models.Plan) -> Select:
+    def _expand_query(
+        query: Select,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> Select:
         """Add access control and filtering."""
         query = query.join(
             db_models.ComputedTags,
@@ -25,15 +43,34 @@ class _SearchRepositoryBase(AbsSearchRepo[AsyncConnection], abc.ABC):
 
         query = queries.ensure_user_has_permissions(user, query)
 
-        if plan.tags_include:
-            query = query.where(
-                db_models.ComputedTags.tags.contains(tuple(plan.tags_include)),
+        tags: sa.ColumnElement = db_models.ComputedTags.tags
+        if query_plan.strategy is search_planner.Strategy.ORDERED_SCAN:
+            # NOTE: expression hides the column from GIN index, so Postgres
+            # walks items in order of their number and stops after LIMIT
+            tags = sa.type_coerce(
+                tags.op('||')(sa.literal_column("'{}'::text[]")),
+                pg.ARRAY(sa.Text),
             )
+        else:
+            # NOTE: single containment check is one lookup in GIN index
+            all_tags = [
+                tag
+                for predicate in query_plan.include
+                if predicate.kind == 'all'
+                for tag in predicate.tags
+            ]
+            if all_tags:
+                query = query.where(tags.contains(tuple(all_tags)))
 
-        if plan.tags_exclude:
-            query = query.where(
-                ~db_models.ComputedTags.tags.overlap(tuple(plan.tags_exclude)),
-            )
+        for predicate in query_plan.include:
+            if predicate.kind == 'any':
+                query = query.where(tags.overlap(predicate.tags))
+            elif query_plan.strategy is search_planner.Strategy.ORDERED_SCAN:
+                # most selective predicates go first and fail early
+                query = query.where(tags.contains(predicate.tags))
+
+        if query_plan.exclude:
+            query = query.where(~tags.overlap(query_plan.exclude))
 
         if plan.collections:
             query = query.where(db_models.Item.is_collection == sa.true())
@@ -61,11 +98,7 @@ class _SearchRepositoryBase(AbsSearchRepo[AsyncConnection], abc.ABC):
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
@@ -74,10 +107,65 @@ class _SearchRepositoryBase(AbsSearchRepo[AsyncConnection], abc.ABC):
 class SearchRepo(_SearchRepositoryBase):
     """Repository that performs all search queries."""
 
-    async def count(self, conn: AsyncConnection, user: models.User, plan: models.Plan) -> int:
+    async def plan_query(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+    ) -> search_planner.QueryPlan:
+        """Choose how to execute search query using known tag counters."""
+        if user.is_anon:
+            table = db_models.KnownTagsAnon
+            condition: sa.ColumnElement = sa.true()
+        else:
+            table = db_models.KnownTags
+            condition = db_models.KnownTags.user_id == user.id
+
+        expansions: dict[str, list[str]] = {}
+        for prefix in search_planner.get_prefixes(plan):
+            query = (
+                sa.select(table.tag)
+                .where(
+                    condition,
+                    table.tag.startswith(prefix, autoescape=True),
+                    table.counter > 0,
+                )
+                .order_by(sa.desc(table.counter))
+                .limit(limits.MAX_PREFIX_EXPANSION)
+            )
+            expansions[prefix] = list((await conn.execute(query)).scalars())
+
+        counters: dict[str, int] = {}
+        if tags := search_planner.get_tags(plan, expansions):
+            query = sa.select(table.tag, table.counter).where(
+                condition,
+                table.tag.in_(tuple(tags)),
+            )
+            response = (await conn.execute(query)).fetchall()
+            counters = {row.tag: row.counter for row in response}
+
+        # NOTE: statistics estimation, does not scan the table
+        stmt = sa.text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'computed_tags'")
+        total = int((await conn.execute(stmt)).scalar() or 0)
+
+        if total <= 0:
+            total = max(counters.values(), default=0)
+
+        return search_planner.make_plan(plan, counters, expansions, total)
+
+    async def count(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> int:
         """Return total amount of items relevant to this search query."""
+        if query_plan.is_empty:
+            return 0
+
         query = sa.select(sa.func.count().label('total_items')).select_from(db_models.Item)
-        query = self._expand_query(query, user, plan)
+        query = self._expand_query(query, user, plan, query_plan)
 
         response = (await conn.execute(query)).fetchone()
         return int(response.total_items) if response else 0
@@ -87,25 +175,111 @@ class SearchRepo(_SearchRepositoryBase):
         conn: AsyncConnection,
         user: models.User,
         plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
     ) -> list[models.Item]:
         """Find items for dynamic load."""
+        if query_plan.is_empty:
+            return []
+
         query = queries.get_items_extended()
-        query = self._expand_query(query, user, plan)
+        query = self._expand_query(query, user, plan, query_plan)
         query = queries.finalize_query(query, plan)
 
         response = (await conn.execute(query)).fetchall()
         return [
             models.Item.from_obj(
                 row,
-                extra_keys=[
-                    'parent_name',
-                    'thumbnail_width',
-                    'thumbnail_height',
-                ],
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
             )
             for row in response
         ]
 
+    async def search_text(  # noqa: PLR0913
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+        text: str,
+        last_seen: tuple[float, int] | None,
+    ) -> list[tuple[models.Item, float]]:
+        """Return items which names or notes match the text, best first."""
+        if query_plan.is_empty:
+            return []
+
+        ts_query = sa.func.websearch_to_tsquery(queries.text_search_config(), text)
+        rank = sa.func.ts_rank_cd(db_models.ItemTextSearch.document, ts_query)
+
+        query = (
+            queries.get_items_extended()
+            .add_columns(rank.label('rank'))
+            .join(
+                db_models.ItemTextSearch,
+                db_models.ItemTextSearch.item_id == db_models.Item.id,
+            )
+            .where(db_models.ItemTextSearch.document.op('@@')(ts_query))
+        )
+        query = self._expand_query(query, user, plan, query_plan)
+
+        if last_seen is not None:
+            last_rank, last_id = last_seen
+            query = query.where(
+                sa.tuple_(rank, db_models.Item.id) < sa.tuple_(sa.literal(last_rank), last_id)
+            )
+
+        query = query.order_by(sa.desc(rank), sa.desc(db_models.Item.id)).limit(plan.limit)
+
+        response = (await conn.execute(query)).fetchall()
+        return [
+            (
+                models.Item.from_obj(
+                    row,
+                    extra_keys=queries.EXTENDED_ITEM_KEYS,
+                ),
+                float(row.rank),
+            )
+            for row in response
+        ]
+
+    async def get_facets(  # noqa: PLR0913
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+        limit: int,
+        fraction: float | None,
+    ) -> list[tuple[str, int]]:
+        """Return most common computed tags among search results."""
+        if query_plan.is_empty:
+            return []
+
+        query = sa.select(db_models.ComputedTags.tags).select_from(db_models.Item)
+        query = self._expand_query(query, user, plan, query_plan)
+
+        if fraction is not None:
+            query = query.where(sa.func.random() < fraction)
+
+        matching = query.subquery('matching')
+        tags = sa.select(sa.func.unnest(matching.c.tags).label('tag')).subquery('tags')
+        total = sa.func.count().label('total')
+
+        stmt = (
+            sa.select(tags.c.tag, total)
+            .where(
+                # NOTE: computed tags contain uuids of all parents
+                ~tags.c.tag.regexp_match(utils.UUID_PATTERN.pattern),
+                tags.c.tag.not_in(sorted(search_planner.get_exact_tags(plan))),
+            )
+            .group_by(tags.c.tag)
+            .order_by(sa.desc(total), tags.c.tag)
+            .limit(limit)
+        )
+
+        response = (await conn.execute(stmt)).fetchall()
+        scale = 1.0 if fraction is None else 1.0 / fraction
+        return [(row.tag, round(row.total * scale)) for row in response]
+
     async def get_home_items_for_anon(
         self,
         conn: AsyncConnection,
@@ -127,3 +301,199 @@ class SearchRepo(_SearchRepositoryBase):
             db_models.Item.permissions.any_() == user.id,
         )
         return await self._home_base(conn, condition, plan)
+
+
+class BitmapSearchRepo(SearchRepo):
+    """Search repository that finds items using in-memory bitmaps.
+
+    Database is used only to fetch rows of the requested page. Until
+    the index is loaded all queries go to the database as usual.
+    """
+
+    def __init__(self, index: SearchIndex) -> None:
+        """Initialize instance."""
+        self.index = index
+
+    async def plan_query(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+    ) -> search_planner.QueryPlan:
+        """Choose how to execute search query using exact tag counters."""
+        if not self.index.is_ready:
+            return await super().plan_query(conn, user, plan)
+
+        visible = self.index.get_visible(user)
+        expansions = {
+            prefix: self.index.get_expansions(prefix, visible, limits.MAX_PREFIX_EXPANSION)
+            for prefix in search_planner.get_prefixes(plan)
+        }
+        tags = search_planner.get_tags(plan, expansions)
+        counters = self.index.get_counters(tags, visible)
+
+        query_plan = search_planner.make_plan(plan, counters, expansions, len(visible))
+
+        if not query_plan.is_empty:
+            query_plan.strategy = search_planner.Strategy.BITMAP
+            # NOTE: estimate becomes exact and makes count free
+            query_plan.estimate = len(self.index.match(user, plan, query_plan))
+
+        return query_plan
+
+    async def count(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> int:
+        """Return total amount of items relevant to this search query."""
+        if query_plan.strategy is search_planner.Strategy.BITMAP:
+            return query_plan.estimate
+        return await super().count(conn, user, plan, query_plan)
+
+    async def search(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> list[models.Item]:
+        """Find items for dynamic load."""
+        if query_plan.strategy is not search_planner.Strategy.BITMAP:
+            return await super().search(conn, user, plan, query_plan)
+
+        matches = self.index.match(user, plan, query_plan)
+        ids = self.index.paginate(matches, plan)
+
+        if not ids:
+            return []
+
+        # NOTE: access is checked once again, index may lag behind for a moment
+        query = queries.get_items_extended().where(db_models.Item.id.in_(ids))
+        query = queries.ensure_user_has_permissions(user, query)
+
+        response = (await conn.execute(query)).fetchall()
+        items = {
+            row.id: models.Item.from_obj(
+                row,
+                extra_keys=queries.EXTENDED_ITEM_KEYS,
+            )
+            for row in response
+        }
+        return [items[item_id] for item_id in ids if item_id in items]
+
+    async def get_facets(  # noqa: PLR0913
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+        limit: int,
+        fraction: float | None,
+    ) -> list[tuple[str, int]]:
+        """Return most common computed tags among search results."""
+        if query_plan.strategy is not search_planner.Strategy.BITMAP:
+            return await super().get_facets(conn, user, plan, query_plan, limit, fraction)
+
+        matches = self.index.match(user, plan, query_plan)
+        return self.index.get_facets(
+            matches=matches,
+            limit=limit,
+            fraction=fraction,
+            skip=search_planner.get_exact_tags(plan),
+        )
+
+    async def load(self, conn: AsyncConnection) -> None:
+        """Build index from scratch."""
+        self.index.clear()
+        self.index.set_public_users(await self._get_public_users(conn))
+
+        query = self._select_entries().where(
+            db_models.Item.status != models.Status.DELETED,
+        )
+
+        # NOTE: every bitmap is rebuilt once per batch, not once per item
+        stream = await conn.stream(query.order_by(db_models.Item.id))
+        async for rows in stream.partitions(const.SEARCH_INDEX_LOAD_BATCH):
+            self.index.add_many(self._make_entry(row) for row in rows)
+
+        self.index.is_ready = True
+
+    async def refresh(self, conn: AsyncConnection, item_ids: Collection[int]) -> None:
+        """Reload given items."""
+        self.index.set_public_users(await self._get_public_users(conn))
+
+        if not item_ids:
+            return
+
+        query = self._select_entries().where(db_models.Item.id.in_(tuple(item_ids)))
+        response = (await conn.execute(query)).fetchall()
+        found = {row.id: row for row in response}
+
+        for item_id in item_ids:
+            row = found.get(item_id)
+            if row is None or row.status == models.Status.DELETED:
+                self.index.remove(item_id)
+            else:
+                self.index.add(self._make_entry(row))
+
+    async def synchronize(self, database: SqlalchemyDatabase) -> None:
+        """Load index and keep it up to date until cancelled."""
+        while True:
+            try:
+                async with database.listen(const.SEARCH_INDEX_CHANNEL) as queue:
+                    # NOTE: subscribing before loading, so no change gets lost in between
+                    async with database.transaction() as conn:
+                        await self.load(conn)
+                    LOG.info('Search index loaded: {}', self.index)
+
+                    while True:
+                        item_ids = {await queue.get()}
+                        await asyncio.sleep(const.SEARCH_INDEX_BATCH_DELAY)
+                        while not queue.empty():
+                            item_ids.add(queue.get_nowait())
+
+                        async with database.transaction() as conn:
+                            await self.refresh(conn, {int(each) for each in item_ids if each})
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                LOG.exception('Search index synchronization failed, reloading')
+                self.index.is_ready = False
+                await asyncio.sleep(const.SEARCH_INDEX_BATCH_DELAY)
+
+    @staticmethod
+    def _select_entries() -> Select:
+        """Return query for everything index needs to know about items."""
+        return sa.select(
+            db_models.Item.id,
+            db_models.Item.number,
+            db_models.Item.owner_id,
+            db_models.Item.permissions,
+            db_models.Item.is_collection,
+            db_models.Item.status,
+            db_models.ComputedTags.tags,
+        ).join(
+            db_models.ComputedTags,
+            db_models.ComputedTags.item_id == db_models.Item.id,
+            isouter=True,
+        )
+
+    @staticmethod
+    def _make_entry(row: sa.Row) -> IndexEntry:
+        """Convert database row into index entry."""
+        return IndexEntry(
+            id=row.id,
+            number=row.number,
+            owner_id=row.owner_id,
+            permissions=tuple(row.permissions or ()),
+            is_collection=row.is_collection,
+            tags=tuple(row.tags or ()),
+        )
+
+    @staticmethod
+    async def _get_public_users(conn: AsyncConnection) -> set[int]:
+        """Return ids of public users."""
+        return set((await conn.execute(queries.public_user_ids())).scalars())
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncConnection
 from omoide import models
 from omoide.database import db_models
 from omoide.database.interfaces.abs_signatures_repo import AbsSignaturesRepo
+from omoide.infra import perceptual_hash
 
 
 class SignaturesRepo(AbsSignaturesRepo[AsyncConnection]):
@@ -64,6 +65,30 @@ class SignaturesRepo(AbsSignaturesRepo[AsyncConnection]):
 
         await conn.execute(stmt)
 
+    async def get_items_by_md5_signature(
+        self,
+        conn: AsyncConnection,
+        owner: models.User,
+        signature: str,
+    ) -> list[int]:
+        """Return ids of available items of the owner with same content."""
+        query = (
+            sa.select(db_models.Item.id)
+            .join(
+                db_models.SignatureMD5,
+                db_models.SignatureMD5.item_id == db_models.Item.id,
+            )
+            .where(
+                db_models.SignatureMD5.signature == signature,
+                db_models.Item.owner_id == owner.id,
+                db_models.Item.status == models.Status.AVAILABLE,
+                db_models.Item.content_ext.is_not(None),
+            )
+            .order_by(db_models.Item.id)
+        )
+        response = (await conn.execute(query)).scalars().all()
+        return list(response)
+
     async def get_cr32_signature(
         self,
         conn: AsyncConnection,
@@ -113,3 +138,37 @@ class SignaturesRepo(AbsSignaturesRepo[AsyncConnection]):
         )
 
         await conn.execute(stmt)
+
+    async def get_perceptual_signature(
+        self,
+        conn: AsyncConnection,
+        item: models.Item,
+    ) -> int | None:
+        """Get signature record."""
+        query = sa.select(db_models.SignaturePerceptual.signature).where(
+            db_models.SignaturePerceptual.item_id == item.id
+        )
+        signature = (await conn.execute(query)).scalar()
+
+        if signature is None:
+            return None
+        return perceptual_hash.to_unsigned(signature)
+
+    async def save_perceptual_signature(
+        self,
+        conn: AsyncConnection,
+        item: models.Item,
+        signature: int,
+    ) -> None:
+        """Create signature record."""
+        insert = pg_insert(db_models.SignaturePerceptual).values(
+            item_id=item.id,
+            signature=perceptual_hash.to_signed(signature),
+        )
+
+        stmt = insert.on_conflict_do_update(
+            index_elements=[db_models.SignaturePerceptual.item_id],
+            set_={'signature': insert.excluded.signature},
+        )
+
+        await conn.execute(stmt)
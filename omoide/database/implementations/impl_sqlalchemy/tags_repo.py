@@ -224,7 +224,19 @@ class TagsRepo(AbsTagsRepo[AsyncConnection]):
             set_={'tags': insert.excluded.tags},
         )
 
-        await conn.execute(stmt)
+        # NOTE: upsert and notification in one round trip
+        upsert = stmt.returning(db_models.ComputedTags.item_id).cte('upsert')
+        await conn.execute(queries.notify_search_index(upsert.c.item_id).select_from(upsert))
+
+    async def get_generation(self, conn: AsyncConnection) -> int:
+        """Return current generation of computed tags and permissions."""
+        stmt = sa.text('SELECT last_value FROM search_generation')
+        return int((await conn.execute(stmt)).scalar() or 0)
+
+    async def bump_generation(self, conn: AsyncConnection) -> int:
+        """Invalidate everything calculated for previous generations."""
+        stmt = sa.select(db_models.search_generation.next_value())
+        return int((await conn.execute(stmt)).scalar_one())
 
     async def get_known_tags_anon(self, conn: AsyncConnection) -> dict[str, int]:
         """Return known tags for anon."""
@@ -0,0 +1,111 @@
+"""Repository that performs operations on resumable uploads."""
+
+from dataclasses import asdict
+from datetime import datetime
+from uuid import UUID
+
+import python_utilz as pu
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from omoide import exceptions
+from omoide import models
+from omoide.database import db_models
+from omoide.database.interfaces.abs_upload_sessions_repo import AbsUploadSessionsRepo
+
+
+class UploadSessionsRepo(AbsUploadSessionsRepo[AsyncConnection]):
+    """Repository that performs operations on resumable uploads."""
+
+    async def create(self, conn: AsyncConnection, session: models.UploadSession) -> None:
+        """Save new upload session."""
+        stmt = sa.insert(db_models.UploadSession).values(**asdict(session))
+        await conn.execute(stmt)
+
+    async def get_by_uuid(self, conn: AsyncConnection, uuid: UUID) -> models.UploadSession:
+        """Return upload session."""
+        query = sa.select(db_models.UploadSession).where(db_models.UploadSession.uuid == uuid)
+
+        response = (await conn.execute(query)).first()
+
+        if response is None:
+            msg = 'Upload session {session_uuid} does not exist'
+            raise exceptions.DoesNotExistError(msg, session_uuid=uuid)
+
+        return db_models.UploadSession.cast(response)
+
+    async def claim(
+        self,
+        conn: AsyncConnection,
+        session: models.UploadSession,
+        writer: UUID,
+        until: datetime,
+    ) -> bool:
+        """Let writer append at current offset, return True on success."""
+        now = pu.now()
+        stmt = (
+            sa.update(db_models.UploadSession)
+            .values(writer=writer, writing_until=until, updated_at=now)
+            .where(
+                db_models.UploadSession.uuid == session.uuid,
+                db_models.UploadSession.offset == session.offset,
+                sa.or_(
+                    db_models.UploadSession.writing_until == sa.null(),
+                    db_models.UploadSession.writing_until < now,
+                ),
+            )
+        )
+        response = await conn.execute(stmt)
+
+        if not response.rowcount:
+            return False
+
+        session.writer = writer
+        session.writing_until = until
+        return True
+
+    async def advance(
+        self,
+        conn: AsyncConnection,
+        session: models.UploadSession,
+        offset: int,
+        expires_at: datetime,
+    ) -> bool:
+        """Move offset forward and release the claim, return True on success."""
+        stmt = (
+            sa.update(db_models.UploadSession)
+            .values(
+                offset=offset,
+                writer=None,
+                writing_until=None,
+                updated_at=pu.now(),
+                expires_at=expires_at,
+            )
+            .where(
+                db_models.UploadSession.uuid == session.uuid,
+                db_models.UploadSession.offset == session.offset,
+                db_models.UploadSession.writer == session.writer,
+            )
+        )
+        response = await conn.execute(stmt)
+        return bool(response.rowcount)
+
+    async def release(self, conn: AsyncConnection, session: models.UploadSession) -> None:
+        """Release the claim without moving offset."""
+        stmt = (
+            sa.update(db_models.UploadSession)
+            .values(writer=None, writing_until=None)
+            .where(
+                db_models.UploadSession.uuid == session.uuid,
+                db_models.UploadSession.writer == session.writer,
+            )
+        )
+        await conn.execute(stmt)
+
+    async def delete(self, conn: AsyncConnection, session: models.UploadSession) -> bool:
+        """Delete upload session, return True if it existed."""
+        stmt = sa.delete(db_models.UploadSession).where(
+            db_models.UploadSession.uuid == session.uuid
+        )
+        response = await conn.execute(stmt)
+        return bool(response.rowcount)
@@ -0,0 +1,125 @@
+"""Repository that performs operations on aggregated resource usage."""
+
+from collections.abc import Collection
+
+import python_utilz as pu
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from omoide import models
+from omoide.database import db_models
+from omoide.database.interfaces.abs_usage_repo import AbsUsageRepo
+
+
+class UsageRepo(AbsUsageRepo[AsyncConnection]):
+    """Repository that performs operations on aggregated resource usage."""
+
+    @staticmethod
+    def _empty(user: models.User) -> models.ResourceUsage:
+        """Return usage for user without any records."""
+        return models.ResourceUsage(
+            user=user,
+            total_items=0,
+            total_collections=0,
+            disk_usage=models.DiskUsage(
+                content_bytes=0,
+                preview_bytes=0,
+                thumbnail_bytes=0,
+            ),
+        )
+
+    @staticmethod
+    def _cast(user: models.User, row: sa.Row) -> models.ResourceUsage:
+        """Convert database row into model."""
+        return models.ResourceUsage(
+            user=user,
+            total_items=int(row.total_items),
+            total_collections=int(row.total_collections),
+            disk_usage=models.DiskUsage(
+                content_bytes=int(row.content_bytes),
+                preview_bytes=int(row.preview_bytes),
+                thumbnail_bytes=int(row.thumbnail_bytes),
+            ),
+        )
+
+    async def get_usage(self, conn: AsyncConnection, user: models.User) -> models.ResourceUsage:
+        """Return stored resource usage for the user."""
+        usage_map = await self.get_usage_map(conn, [user])
+        return usage_map[user.id]
+
+    async def get_usage_map(
+        self,
+        conn: AsyncConnection,
+        users: Collection[models.User],
+    ) -> dict[int, models.ResourceUsage]:
+        """Return stored resource usage for given users."""
+        users_map = {user.id: user for user in users}
+        usage_map = {user.id: self._empty(user) for user in users}
+
+        query = sa.select(db_models.UserUsage).where(
+            db_models.UserUsage.user_id.in_(tuple(users_map))
+        )
+
+        response = (await conn.execute(query)).fetchall()
+        for row in response:
+            usage_map[row.user_id] = self._cast(users_map[row.user_id], row)
+
+        return usage_map
+
+    async def calculate_usage(
+        self,
+        conn: AsyncConnection,
+        user: models.User,
+    ) -> models.ResourceUsage:
+        """Calculate actual resource usage for the user (slow)."""
+        query = (
+            sa.select(
+                sa.func.coalesce(sa.func.sum(db_models.Metainfo.content_size), 0).label(
+                    'content_bytes'
+                ),
+                sa.func.coalesce(sa.func.sum(db_models.Metainfo.preview_size), 0).label(
+                    'preview_bytes'
+                ),
+                sa.func.coalesce(sa.func.sum(db_models.Metainfo.thumbnail_size), 0).label(
+                    'thumbnail_bytes'
+                ),
+                sa.func.count(db_models.Item.id).label('total_items'),
+                sa.func.count(db_models.Item.id)
+                .filter(db_models.Item.is_collection)
+                .label('total_collections'),
+            )
+            .select_from(db_models.Item)
+            .outerjoin(
+                db_models.Metainfo,
+                db_models.Metainfo.item_id == db_models.Item.id,
+            )
+            .where(
+                db_models.Item.owner_id == user.id,
+                db_models.Item.status == models.Status.AVAILABLE,
+            )
+        )
+
+        response = (await conn.execute(query)).fetchone()
+
+        if response is None:
+            return self._empty(user)
+
+        return self._cast(user, response)
+
+    async def save_usage(self, conn: AsyncConnection, usage: models.ResourceUsage) -> None:
+        """Overwrite stored resource usage."""
+        values = {
+            'content_bytes': usage.disk_usage.content_bytes,
+            'preview_bytes': usage.disk_usage.preview_bytes,
+            'thumbnail_bytes': usage.disk_usage.thumbnail_bytes,
+            'total_items': usage.total_items,
+            'total_collections': usage.total_collections,
+            'updated_at': pu.now(),
+        }
+        insert = pg_insert(db_models.UserUsage).values(user_id=usage.user.id, **values)
+        stmt = insert.on_conflict_do_update(
+            index_elements=[db_models.UserUsage.user_id],
+            set_=values,
+        )
+        await conn.execute(stmt)
@@ -218,63 +218,6 @@ class UsersRepo(AbsUsersRepo[AsyncConnection]):
 
         return root_items
 
-    async def calc_total_space_used_by(
-        self,
-        conn: AsyncConnection,
-        user: models.User,
-    ) -> models.SpaceUsage:
-        """Return total amount of used space for user."""
-        query = (
-            sa.select(
-                sa.func.sum(db_models.Metainfo.content_size).label('content_size'),
-                sa.func.sum(db_models.Metainfo.preview_size).label('preview_size'),
-                sa.func.sum(db_models.Metainfo.thumbnail_size).label('thumbnail_size'),
-            )
-            .join(
-                db_models.Item,
-                db_models.Item.id == db_models.Metainfo.item_id,
-            )
-            .where(
-                sa.and_(
-                    db_models.Item.owner_id == user.id,
-                    db_models.Item.status == models.Status.AVAILABLE,
-                )
-            )
-        )
-
-        response = (await conn.execute(query)).fetchone()
-
-        return models.SpaceUsage(
-            uuid=user.uuid,
-            content_size=response.content_size or 0 if response else 0,
-            preview_size=response.preview_size or 0 if response else 0,
-            thumbnail_size=response.thumbnail_size or 0 if response else 0,
-        )
-
-    async def count_items_by_owner(
-        self,
-        conn: AsyncConnection,
-        user: models.User,
-        collections: bool = False,
-    ) -> int:
-        """Return total amount of items for given user uuid."""
-        query = (
-            sa.select(sa.func.count().label('total_items'))
-            .select_from(db_models.Item)
-            .where(
-                sa.and_(
-                    db_models.Item.owner_uuid == user.uuid,
-                    db_models.Item.status == models.Status.AVAILABLE,
-                )
-            )
-        )
-
-        if collections:
-            query = query.where(db_models.Item.is_collection)
-
-        response = (await conn.execute(query)).fetchone()
-        return int(response.total_items) if response else 0
-
     async def update_user_password(
         self,
         conn: AsyncConnection,
@@ -1,6 +1,8 @@
 from omoide.database.interfaces.abs_browse_repo import AbsBrowseRepo  # noqa: F401
 from omoide.database.interfaces.abs_commands_repo import AbsCommandsRepo  # noqa: F401
+from omoide.database.interfaces.abs_contact_sheets_repo import AbsContactSheetsRepo  # noqa: F401
 from omoide.database.interfaces.abs_database import AbsDatabase  # noqa: F401
+from omoide.database.interfaces.abs_duplicates_repo import AbsDuplicatesRepo  # noqa: F401
 from omoide.database.interfaces.abs_exif_repo import AbsEXIFRepo  # noqa: F401
 from omoide.database.interfaces.abs_items_repo import AbsItemsRepo  # noqa: F401
 from omoide.database.interfaces.abs_meta_repo import AbsMetaRepo  # noqa: F401
@@ -8,4 +10,6 @@ from omoide.database.interfaces.abs_misc_repo import AbsMiscRepo  # noqa: F401
 from omoide.database.interfaces.abs_search_repo import AbsSearchRepo  # noqa: F401
 from omoide.database.interfaces.abs_signatures_repo import AbsSignaturesRepo  # noqa: F401
 from omoide.database.interfaces.abs_tags_repo import AbsTagsRepo  # noqa: F401
+from omoide.database.interfaces.abs_upload_sessions_repo import AbsUploadSessionsRepo  # noqa: F401
+from omoide.database.interfaces.abs_usage_repo import AbsUsageRepo  # noqa: F401
 from omoide.database.interfaces.abs_users_repo import AbsUsersRepo  # noqa: F401
@@ -1,6 +1,7 @@
 """Repository that perform operations on commands."""
 
 import abc
+from collections.abc import Collection
 from typing import Any
 from typing import Generic
 from typing import TypeVar
@@ -38,8 +39,15 @@ class AbsCommandsRepo(abc.ABC, Generic[ConnectionT]):
         requested_by: models.User,
         source_item: models.Item,
         target_item: models.Item,
+        including_content: bool = False,
+        including_video: bool = False,
+        fallback: models.PendingUpload | None = None,
     ) -> int:
-        """Copy images between items."""
+        """Copy images between items.
+
+        Fallback is the same content uploaded for the target, it is
+        processed as a regular upload if the copy fails.
+        """
 
     @abc.abstractmethod
     async def upload(
@@ -53,3 +61,25 @@ class AbsCommandsRepo(abc.ABC, Generic[ConnectionT]):
         extras: dict[str, Any],
     ) -> int:
         """Upload an item."""
+
+    @abc.abstractmethod
+    async def upload_many(
+        self,
+        conn: ConnectionT,
+        requested_by: models.User,
+        uploads: Collection[models.PendingUpload],
+    ) -> list[int]:
+        """Upload several items at once, return ids in the same order."""
+
+    @abc.abstractmethod
+    async def build_contact_sheet(
+        self,
+        conn: ConnectionT,
+        requested_by: models.User,
+        item: models.Item,
+    ) -> int:
+        """Build contact sheet of the collection.
+
+        Does nothing if there is already unfinished command for the item
+        or the last one failed not long ago, returns -1 in that case.
+        """
@@ -0,0 +1,35 @@
+"""Repository that performs operations on contact sheets."""
+
+import abc
+from datetime import datetime
+from typing import Generic
+from typing import TypeVar
+
+from omoide import models
+
+ConnectionT = TypeVar('ConnectionT')
+
+
+class AbsContactSheetsRepo(abc.ABC, Generic[ConnectionT]):
+    """Repository that performs operations on contact sheets."""
+
+    @abc.abstractmethod
+    async def get_by_item(
+        self,
+        conn: ConnectionT,
+        item: models.Item,
+    ) -> models.ContactSheet | None:
+        """Return contact sheet of the collection if it was ever built."""
+
+    @abc.abstractmethod
+    async def get_source(
+        self,
+        conn: ConnectionT,
+        item: models.Item,
+        limit: int,
+    ) -> list[tuple[models.Item, datetime]]:
+        """Return children that go into the sheet with their update time."""
+
+    @abc.abstractmethod
+    async def save(self, conn: ConnectionT, sheet: models.ContactSheet) -> None:
+        """Create or replace contact sheet of the collection."""
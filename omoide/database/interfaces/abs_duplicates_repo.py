@@ -0,0 +1,43 @@
+"""Repository that searches for duplicated items."""
+
+import abc
+from collections.abc import Collection
+from typing import Generic
+from typing import TypeVar
+
+from omoide import models
+
+ConnectionT = TypeVar('ConnectionT')
+
+
+class AbsDuplicatesRepo(abc.ABC, Generic[ConnectionT]):
+    """Repository that searches for duplicated items."""
+
+    @abc.abstractmethod
+    async def get_md5_groups(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        item: models.Item | None,
+        offset: int,
+        limit: int,
+    ) -> list[tuple[str, list[int]]]:
+        """Return ids of items with same MD5 signature, biggest groups first."""
+
+    @abc.abstractmethod
+    async def get_perceptual_signatures(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        item: models.Item | None,
+        max_distance: int,
+    ) -> dict[int, int]:
+        """Return perceptual signatures of items that could have similar ones."""
+
+    @abc.abstractmethod
+    async def resolve_groups(
+        self,
+        conn: ConnectionT,
+        groups: Collection[tuple[str, list[int]]],
+    ) -> list[models.Duplicate]:
+        """Load items and their parents for given groups."""
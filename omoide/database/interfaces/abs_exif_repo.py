@@ -1,6 +1,7 @@
 """Repository that performs operations on EXIF data."""
 
 import abc
+from datetime import datetime
 from typing import Generic
 from typing import TypeVar
 
@@ -27,3 +28,47 @@ class AbsEXIFRepo(abc.ABC, Generic[ConnectionT]):
     @abc.abstractmethod
     async def delete(self, conn: ConnectionT, item: models.Item) -> None:
         """Delete EXIF record for the given item."""
+
+    @abc.abstractmethod
+    async def get_timeline(  # noqa: PLR0913
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        owner: models.User | None,
+        since: datetime | None,
+        until: datetime | None,
+        order: str,
+        last_seen: tuple[datetime, int] | None,
+        limit: int,
+    ) -> list[tuple[models.Item, datetime]]:
+        """Return items taken in given period, in chronological order."""
+
+    @abc.abstractmethod
+    async def get_histogram(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        owner: models.User | None,
+        year: int | None,
+    ) -> list[models.TimelineBucket]:
+        """Return amount of items per year, or per month of the given year."""
+
+    @abc.abstractmethod
+    async def get_in_box(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        box: models.BoundingBox,
+        limit: int,
+    ) -> list[tuple[models.Item, float, float]]:
+        """Return visible items inside the box with their coordinates."""
+
+    @abc.abstractmethod
+    async def get_clusters(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        box: models.BoundingBox,
+        grid: int,
+    ) -> list[models.GeoCluster]:
+        """Group visible items inside the box into grid x grid cells."""
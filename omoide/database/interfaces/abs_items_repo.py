@@ -60,10 +60,6 @@ class AbsItemsRepo(abc.ABC, Generic[ConnectionT]):
     async def count_all(self, conn: ConnectionT) -> int:
         """Return total amount of items."""
 
-    @abc.abstractmethod
-    async def count_children(self, conn: ConnectionT, item: models.Item) -> int:
-        """Count all children of an item with given UUID."""
-
     @abc.abstractmethod
     async def get_parents(self, conn: ConnectionT, item: models.Item) -> list[models.Item]:
         """Return list of parents for given item."""
@@ -117,6 +113,18 @@ class AbsItemsRepo(abc.ABC, Generic[ConnectionT]):
     async def save(self, conn: ConnectionT, item: models.Item) -> bool:
         """Save the given item."""
 
+    @abc.abstractmethod
+    async def set_status(
+        self,
+        conn: ConnectionT,
+        items: Collection[models.Item],
+        status: models.Status,
+    ) -> int:
+        """Change status of several items that are not deleted.
+
+        Deletion changes counters and usage, use ``save`` for that.
+        """
+
     @abc.abstractmethod
     async def soft_delete(self, conn: ConnectionT, item: models.Item) -> bool:
         """Mark tem as deleted."""
@@ -138,10 +146,6 @@ class AbsItemsRepo(abc.ABC, Generic[ConnectionT]):
     ) -> None:
         """Replace all computed tags with given set."""
 
-    @abc.abstractmethod
-    async def count_family(self, conn: ConnectionT, item: models.Item) -> int:
-        """Count all descendants for given item (including the item itself)."""
-
     @abc.abstractmethod
     async def get_parent_names(
         self,
@@ -174,16 +178,6 @@ class AbsItemsRepo(abc.ABC, Generic[ConnectionT]):
     ) -> dict[int, models.Item | None]:
         """Get map of items."""
 
-    @abc.abstractmethod
-    async def get_duplicates(
-        self,
-        conn: ConnectionT,
-        user: models.User,
-        item: models.Item | None,
-        limit: int,
-    ) -> list[models.Duplicate]:
-        """Return groups of items with same hash."""
-
     @abc.abstractmethod
     async def select(
         self,
@@ -48,13 +48,14 @@ class AbsMetaRepo(abc.ABC, Generic[ConnectionT]):
         """Add new note to given item."""
 
     @abc.abstractmethod
-    async def get_item_notes(self, conn: ConnectionT, item: models.Item) -> dict[str, str]:
-        """Return notes for given item."""
-
-    @abc.abstractmethod
-    async def get_total_disk_usage(
+    async def add_item_notes(
         self,
         conn: ConnectionT,
-        user: models.User,
-    ) -> models.DiskUsage:
-        """Return total disk usage for specified user."""
+        key: str,
+        values: Collection[tuple[models.Item, str]],
+    ) -> None:
+        """Add note with the same key to several items."""
+
+    @abc.abstractmethod
+    async def get_item_notes(self, conn: ConnectionT, item: models.Item) -> dict[str, str]:
+        """Return notes for given item."""
@@ -5,6 +5,7 @@ from typing import Generic
 from typing import TypeVar
 
 from omoide import models
+from omoide.domain import search_planner
 
 ConnectionT = TypeVar('ConnectionT')
 
@@ -13,7 +14,22 @@ class AbsSearchRepo(abc.ABC, Generic[ConnectionT]):
     """Repository that performs all search queries."""
 
     @abc.abstractmethod
-    async def count(self, conn: ConnectionT, user: models.User, plan: models.Plan) -> int:
+    async def plan_query(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        plan: models.Plan,
+    ) -> search_planner.QueryPlan:
+        """Choose how to execute search query."""
+
+    @abc.abstractmethod
+    async def count(
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> int:
         """Return total amount of items relevant to this search query."""
 
     @abc.abstractmethod
@@ -22,9 +38,42 @@ class AbsSearchRepo(abc.ABC, Generic[ConnectionT]):
         conn: ConnectionT,
         user: models.User,
         plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
     ) -> list[models.Item]:
         """Return matching items for search query."""
 
+    @abc.abstractmethod
+    async def search_text(  # noqa: PLR0913
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+        text: str,
+        last_seen: tuple[float, int] | None,
+    ) -> list[tuple[models.Item, float]]:
+        """Return items which names or notes match the text, best first.
+
+        Items are paginated by ``last_seen`` which is rank and id
+        of the last item from previous page.
+        """
+
+    @abc.abstractmethod
+    async def get_facets(  # noqa: PLR0913
+        self,
+        conn: ConnectionT,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+        limit: int,
+        fraction: float | None,
+    ) -> list[tuple[str, int]]:
+        """Return most common computed tags among search results.
+
+        With ``fraction`` only that share of matching items is used
+        and counters are scaled back.
+        """
+
     @abc.abstractmethod
     async def get_home_items_for_anon(
         self,
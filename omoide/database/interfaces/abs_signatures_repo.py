@@ -37,6 +37,15 @@ class AbsSignaturesRepo(abc.ABC, Generic[ConnectionT]):
     ) -> None:
         """Create signature record."""
 
+    @abc.abstractmethod
+    async def get_items_by_md5_signature(
+        self,
+        conn: ConnectionT,
+        owner: models.User,
+        signature: str,
+    ) -> list[int]:
+        """Return ids of available items of the owner with same content."""
+
     @abc.abstractmethod
     async def get_cr32_signature(
         self,
@@ -61,3 +70,20 @@ class AbsSignaturesRepo(abc.ABC, Generic[ConnectionT]):
         signature: int,
     ) -> None:
         """Create signature record."""
+
+    @abc.abstractmethod
+    async def get_perceptual_signature(
+        self,
+        conn: ConnectionT,
+        item: models.Item,
+    ) -> int | None:
+        """Get signature record."""
+
+    @abc.abstractmethod
+    async def save_perceptual_signature(
+        self,
+        conn: ConnectionT,
+        item: models.Item,
+        signature: int,
+    ) -> None:
+        """Create signature record."""
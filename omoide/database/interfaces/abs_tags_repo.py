@@ -100,6 +100,18 @@ class AbsTagsRepo(abc.ABC, Generic[ConnectionT]):
     ) -> None:
         """Save computed tags for given item."""
 
+    @abc.abstractmethod
+    async def get_generation(self, conn: ConnectionT) -> int:
+        """Return current generation of computed tags and permissions."""
+
+    @abc.abstractmethod
+    async def bump_generation(self, conn: ConnectionT) -> int:
+        """Invalidate everything calculated for previous generations.
+
+        Must be called after the change is committed, otherwise other
+        transactions could cache old state under the new generation.
+        """
+
     @abc.abstractmethod
     async def get_known_tags_anon(self, conn: ConnectionT) -> dict[str, int]:
         """Return known tags for anon."""
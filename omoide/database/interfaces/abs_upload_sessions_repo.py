@@ -0,0 +1,51 @@
+"""Repository that performs operations on resumable uploads."""
+
+import abc
+from datetime import datetime
+from typing import Generic
+from typing import TypeVar
+from uuid import UUID
+
+from omoide import models
+
+ConnectionT = TypeVar('ConnectionT')
+
+
+class AbsUploadSessionsRepo(abc.ABC, Generic[ConnectionT]):
+    """Repository that performs operations on resumable uploads."""
+
+    @abc.abstractmethod
+    async def create(self, conn: ConnectionT, session: models.UploadSession) -> None:
+        """Save new upload session."""
+
+    @abc.abstractmethod
+    async def get_by_uuid(self, conn: ConnectionT, uuid: UUID) -> models.UploadSession:
+        """Return upload session."""
+
+    @abc.abstractmethod
+    async def claim(
+        self,
+        conn: ConnectionT,
+        session: models.UploadSession,
+        writer: UUID,
+        until: datetime,
+    ) -> bool:
+        """Let writer append at current offset, return True on success."""
+
+    @abc.abstractmethod
+    async def advance(
+        self,
+        conn: ConnectionT,
+        session: models.UploadSession,
+        offset: int,
+        expires_at: datetime,
+    ) -> bool:
+        """Move offset forward and release the claim, return True on success."""
+
+    @abc.abstractmethod
+    async def release(self, conn: ConnectionT, session: models.UploadSession) -> None:
+        """Release the claim without moving offset."""
+
+    @abc.abstractmethod
+    async def delete(self, conn: ConnectionT, session: models.UploadSession) -> bool:
+        """Delete upload session, return True if it existed."""
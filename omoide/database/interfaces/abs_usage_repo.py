@@ -0,0 +1,34 @@
+"""Repository that performs operations on aggregated resource usage."""
+
+import abc
+from collections.abc import Collection
+from typing import Generic
+from typing import TypeVar
+
+from omoide import models
+
+ConnectionT = TypeVar('ConnectionT')
+
+
+class AbsUsageRepo(abc.ABC, Generic[ConnectionT]):
+    """Repository that performs operations on aggregated resource usage."""
+
+    @abc.abstractmethod
+    async def get_usage(self, conn: ConnectionT, user: models.User) -> models.ResourceUsage:
+        """Return stored resource usage for the user."""
+
+    @abc.abstractmethod
+    async def get_usage_map(
+        self,
+        conn: ConnectionT,
+        users: Collection[models.User],
+    ) -> dict[int, models.ResourceUsage]:
+        """Return stored resource usage for given users."""
+
+    @abc.abstractmethod
+    async def calculate_usage(self, conn: ConnectionT, user: models.User) -> models.ResourceUsage:
+        """Calculate actual resource usage for the user (slow)."""
+
+    @abc.abstractmethod
+    async def save_usage(self, conn: ConnectionT, usage: models.ResourceUsage) -> None:
+        """Overwrite stored resource usage."""
@@ -87,23 +87,6 @@ class AbsUsersRepo(abc.ABC, Generic[ConnectionT]):
     ) -> dict[int, models.Item | None]:
         """Return map of root items."""
 
-    @abc.abstractmethod
-    async def calc_total_space_used_by(
-        self,
-        conn: ConnectionT,
-        user: models.User,
-    ) -> models.SpaceUsage:
-        """Return total amount of used space for user."""
-
-    @abc.abstractmethod
-    async def count_items_by_owner(
-        self,
-        conn: ConnectionT,
-        user: models.User,
-        collections: bool = False,
-    ) -> int:
-        """Return total amount of items for given user uuid."""
-
     @abc.abstractmethod
     async def update_user_password(
         self,
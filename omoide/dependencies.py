@@ -1,7 +1,10 @@
 """Dependencies."""
 
 import functools
+from pathlib import Path
 from typing import Annotated
+from typing import Any
+from uuid import UUID
 
 from fastapi import Depends
 from fastapi import HTTPException
@@ -22,11 +25,18 @@ from omoide import models
 from omoide.database import interfaces as db_interfaces
 from omoide.database.implementations import impl_sqlalchemy
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain.search_index import SearchIndex
+from omoide.infra.disk_cache import DiskLRUCache
 from omoide.infra.interfaces import AbsAuthenticator
+from omoide.infra.locators import FilesystemLocator
 from omoide.infra.locators import WebLocator
+from omoide.infra.pack_store import PackStore
+from omoide.infra.ttl_cache import TTLCache
 from omoide.object_storage import interfaces as object_interfaces
+from omoide.object_storage.implementations.fs_object_storage import FilesystemObjectStorage
 from omoide.object_storage.implementations.pgl_object_storage import PgLargeObjectStorage
 from omoide.omoide_app.auth.auth_use_cases import LoginUserUseCase
+from omoide.omoide_app.media.media_use_cases import MediaAccess
 from omoide.presentation import web
 
 
@@ -89,13 +99,68 @@ def get_object_storage(
 ) -> object_interfaces.AbsObjectStorage:
     """Get long-term object storage.
 
-    Swap this factory's return value to switch the backend (e.g. an S3
-    implementation) — the controller / use case only depend on the
-    ``AbsObjectStorage`` interface.
+    Backend is chosen by ``upload_backend`` setting, the controller /
+    use case only depend on the ``AbsObjectStorage`` interface.
     """
+    config = get_config()
+    if config.upload_backend == 'filesystem':
+        staging_folder = config.staging_folder or config.data_folder / const.STAGING_FOLDER
+        return FilesystemObjectStorage(Path(staging_folder))
     return PgLargeObjectStorage(database=database)
 
 
+@functools.cache
+def get_fs_locator() -> FilesystemLocator:
+    """Get filesystem locator instance."""
+    config = get_config()
+    return FilesystemLocator(root=config.data_folder, prefix_size=config.prefix_size)
+
+
+@functools.cache
+def get_web_locator() -> WebLocator:
+    """Get web locator instance."""
+    config = get_config()
+    return WebLocator(root='content', prefix_size=config.prefix_size)
+
+
+@functools.cache
+def get_media_access_cache() -> TTLCache[UUID, MediaAccess]:
+    """Get cache for media access checks."""
+    return TTLCache(maxsize=const.MEDIA_ACCESS_CACHE_SIZE, ttl=const.MEDIA_ACCESS_CACHE_TTL)
+
+
+@functools.cache
+def get_resize_cache() -> DiskLRUCache:
+    """Get cache for images resized on demand."""
+    config = get_config()
+    return DiskLRUCache(
+        folder=config.data_folder / const.RESIZED_FOLDER,
+        max_size=config.resize_cache_size,
+        prefix_size=config.prefix_size,
+    )
+
+
+@functools.cache
+def get_pack_store() -> PackStore | None:
+    """Get store of packed previews and thumbnails if it is enabled."""
+    config = get_config()
+    if not config.media_packs:
+        return None
+    return PackStore(config.data_folder / const.PACKS_FOLDER)
+
+
+@functools.cache
+def get_search_cache() -> TTLCache[tuple, Any]:
+    """Get cache for totals and facets of search queries."""
+    return TTLCache(maxsize=const.SEARCH_CACHE_SIZE, ttl=const.SEARCH_CACHE_TTL)
+
+
+@functools.cache
+def get_similar_cache() -> TTLCache[tuple, list[tuple[str, list[int]]]]:
+    """Get cache for groups of similar items."""
+    return TTLCache(maxsize=const.SIMILAR_CACHE_SIZE, ttl=const.SIMILAR_CACHE_TTL)
+
+
 def get_users_repo() -> db_interfaces.AbsUsersRepo:
     """Get repo instance."""
     return impl_sqlalchemy.UsersRepo()
@@ -116,6 +181,11 @@ def get_meta_repo() -> db_interfaces.AbsMetaRepo:
     return impl_sqlalchemy.MetaRepo()
 
 
+def get_usage_repo() -> db_interfaces.AbsUsageRepo:
+    """Get repo instance."""
+    return impl_sqlalchemy.UsageRepo()
+
+
 def get_misc_repo() -> db_interfaces.AbsMiscRepo:
     """Get repo instance."""
     return impl_sqlalchemy.MiscRepo()
@@ -126,8 +196,16 @@ def get_browse_repo() -> db_interfaces.AbsBrowseRepo:
     return impl_sqlalchemy.BrowseRepo()
 
 
+@functools.cache
+def get_search_index() -> SearchIndex:
+    """Get in-memory search index (shared by the whole process)."""
+    return SearchIndex()
+
+
 def get_search_repo() -> db_interfaces.AbsSearchRepo:
     """Get repo instance."""
+    if get_config().search_backend == 'memory':
+        return impl_sqlalchemy.BitmapSearchRepo(get_search_index())
     return impl_sqlalchemy.SearchRepo()
 
 
@@ -141,11 +219,26 @@ def get_signatures_repo() -> db_interfaces.AbsSignaturesRepo:
     return impl_sqlalchemy.SignaturesRepo()
 
 
+def get_duplicates_repo() -> db_interfaces.AbsDuplicatesRepo:
+    """Get repo instance."""
+    return impl_sqlalchemy.DuplicatesRepo()
+
+
 def get_commands_repo() -> db_interfaces.AbsCommandsRepo:
     """Get repo instance."""
     return impl_sqlalchemy.CommandsRepo()
 
 
+def get_contact_sheets_repo() -> db_interfaces.AbsContactSheetsRepo:
+    """Get repo instance."""
+    return impl_sqlalchemy.ContactSheetsRepo()
+
+
+def get_upload_sessions_repo() -> db_interfaces.AbsUploadSessionsRepo:
+    """Get repo instance."""
+    return impl_sqlalchemy.UploadSessionsRepo()
+
+
 async def get_current_user(
     credentials: Annotated[HTTPBasicCredentials | None, Depends(get_credentials)],
     authenticator: Annotated[AbsAuthenticator, Depends(get_authenticator)],
@@ -193,11 +286,18 @@ def get_templates() -> Jinja2Templates:
     templates.env.globals['version'] = str(const.FRONTEND_VERSION)
 
     config = get_config()
-    locator = WebLocator(root='content', prefix_size=config.prefix_size)
+    locator = get_web_locator()
     templates.env.globals['get_video_url'] = locator.get_video_location
     templates.env.globals['get_content_url'] = locator.get_content_location
     templates.env.globals['get_preview_url'] = locator.get_preview_location
+    templates.env.globals['get_animated_preview_url'] = locator.get_animated_preview_location
     templates.env.globals['get_thumbnail_url'] = locator.get_thumbnail_location
+    templates.env.globals['get_thumbnail_srcset'] = locator.get_thumbnail_srcset
+
+    if config.download_backend == 'nginx':
+        templates.env.globals['download_route'] = 'nginx_download_collection'
+    else:
+        templates.env.globals['download_route'] = 'app_download_collection'
 
     templates.env.globals['human_readable_size'] = pu.human_readable_size
     templates.env.globals['sep_digits'] = pu.sep_digits
@@ -0,0 +1,67 @@
+"""Layout of contact sheets.
+
+Contact sheet is a single image with thumbnails of the first children
+of a collection placed in a grid. Clients render the grid from one
+image using the tile offsets.
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+import hashlib
+
+from omoide import const
+from omoide import models
+
+
+def get_source_key(
+    children: Sequence[tuple[models.Item, datetime]],
+    tile: int = const.CONTACT_SHEET_TILE,
+    columns: int = const.CONTACT_SHEET_COLUMNS,
+) -> str:
+    """Return digest of everything the sheet depends on.
+
+    Any added, removed, reordered or re-rendered child changes the key.
+    """
+    digest = hashlib.md5(f'{tile}:{columns}'.encode(), usedforsecurity=False)
+
+    for item, updated_at in children:
+        digest.update(f'|{item.uuid}:{item.thumbnail_ext}:{updated_at.isoformat()}'.encode())
+
+    return digest.hexdigest()
+
+
+def get_layout(
+    children: Sequence[models.Item],
+    tile: int = const.CONTACT_SHEET_TILE,
+    columns: int = const.CONTACT_SHEET_COLUMNS,
+) -> tuple[int, int, list[models.ContactSheetTile]]:
+    """Return size of the sheet and position of every child."""
+    tiles = [
+        models.ContactSheetTile(
+            item_uuid=item.uuid,
+            x=(position % columns) * tile,
+            y=(position // columns) * tile,
+            width=tile,
+            height=tile,
+        )
+        for position, item in enumerate(children)
+    ]
+
+    if not tiles:
+        return 0, 0, []
+
+    rows = (len(tiles) + columns - 1) // columns
+    width = min(len(tiles), columns) * tile
+    return width, rows * tile, tiles
+
+
+def is_covered(
+    sheet: models.ContactSheet,
+    children: Sequence[tuple[models.Item, datetime]],
+) -> bool:
+    """Return True if every tile of the sheet is still allowed to be shown.
+
+    Stale sheet could contain children that were hidden after it was built.
+    """
+    allowed = {item.uuid for item, _ in children}
+    return all(tile.item_uuid in allowed for tile in sheet.tiles)
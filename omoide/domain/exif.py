@@ -0,0 +1,167 @@
+"""Extraction of typed fields from raw EXIF data.
+
+Raw EXIF is stored as is, but filtering by it requires proper columns.
+Values could come from the upload worker (everything is a string there,
+nested IFDs are dicts) or from the API (any JSON), so parsing is lenient:
+anything that cannot be understood is just left empty.
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+import math
+import re
+from typing import Any
+
+from omoide import models
+
+MAX_TEXT_LENGTH = 64
+
+DATETIME_KEYS = ('DateTimeOriginal', 'DateTimeDigitized', 'DateTime')
+WIDTH_KEYS = ('ExifImageWidth', 'PixelXDimension', 'ImageWidth')
+HEIGHT_KEYS = ('ExifImageHeight', 'PixelYDimension', 'ImageLength', 'ImageHeight')
+
+DATETIME_FORMATS = (
+    '%Y:%m:%d %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y:%m:%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+)
+
+MIN_ORIENTATION = 1
+MAX_ORIENTATION = 8
+MAX_LATITUDE = 90.0
+MAX_LONGITUDE = 180.0
+MIN_YEAR = 1826  # oldest surviving photograph
+
+_NUMBER = re.compile(r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?|nan|inf', re.IGNORECASE)
+
+
+def find(exif: Mapping[str, Any], *keys: str) -> Any:
+    """Return value of the first present key, looking into nested IFDs too."""
+    nested = [value for value in exif.values() if isinstance(value, Mapping)]
+
+    for key in keys:
+        for source in (exif, *nested):
+            value = source.get(key)
+            if value is not None and value != '':
+                return value
+
+    return None
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    """Convert EXIF datetime like ``2007:08:10 08:23:29`` into naive datetime.
+
+    EXIF stores local time of the camera, so no timezone is attached.
+    """
+    if not isinstance(value, str):
+        return None
+
+    value = value.strip().rstrip('\x00')
+    # subseconds and timezones are stored in separate tags, but sometimes
+    # they are glued to the value
+    value = value.split('.')[0].split('+')[0].removesuffix('Z')
+
+    for fmt in DATETIME_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)  # noqa: DTZ007
+        except ValueError:
+            continue
+        if parsed.year >= MIN_YEAR:
+            return parsed
+        return None
+
+    return None
+
+
+def parse_numbers(value: Any) -> list[float]:
+    """Convert value or sequence of values into floats."""
+    if isinstance(value, bool):
+        return []
+
+    if isinstance(value, int | float):
+        return [float(value)]
+
+    if isinstance(value, list | tuple):
+        result: list[float] = []
+        for each in value:
+            result.extend(parse_numbers(each))
+        return result
+
+    if isinstance(value, str):
+        numbers: list[float] = []
+        for match in _NUMBER.findall(value):
+            numbers.append(float(match))
+        # rationals could be written as 1/3
+        if '/' in value and len(numbers) == 2:  # noqa: PLR2004
+            numerator, denominator = numbers
+            return [numerator / denominator] if denominator else [math.nan]
+        return numbers
+
+    return []
+
+
+def parse_int(value: Any) -> int | None:
+    """Convert value into positive integer."""
+    numbers = parse_numbers(value)
+    if len(numbers) != 1 or not math.isfinite(numbers[0]):
+        return None
+
+    number = int(numbers[0])
+    return number if number > 0 else None
+
+
+def parse_text(value: Any) -> str | None:
+    """Convert value into short clean string."""
+    if value is None or isinstance(value, Mapping | list | tuple):
+        return None
+
+    text = str(value).replace('\x00', '').strip()
+    return text[:MAX_TEXT_LENGTH] or None
+
+
+def parse_coordinate(value: Any, ref: Any, limit: float) -> float | None:
+    """Convert degrees, minutes and seconds into signed decimal degrees."""
+    numbers = parse_numbers(value)
+    if not numbers or len(numbers) > 3 or not all(math.isfinite(each) for each in numbers):  # noqa: PLR2004
+        return None
+
+    degrees = 0.0
+    for position, number in enumerate(numbers):
+        degrees += number / 60**position
+
+    if isinstance(ref, str) and ref.strip().upper()[:1] in ('S', 'W'):
+        degrees = -abs(degrees)
+
+    if abs(degrees) > limit:
+        return None
+
+    return round(degrees, 7)
+
+
+def extract_fields(exif: Mapping[str, Any]) -> models.ExifFields:
+    """Return typed fields found in raw EXIF."""
+    orientation = parse_int(find(exif, 'Orientation'))
+    if orientation is not None and not MIN_ORIENTATION <= orientation <= MAX_ORIENTATION:
+        orientation = None
+
+    latitude = longitude = None
+    gps = exif.get('GPSInfo')
+    if isinstance(gps, Mapping):
+        latitude = parse_coordinate(gps.get('GPSLatitude'), gps.get('GPSLatitudeRef'), MAX_LATITUDE)
+        longitude = parse_coordinate(
+            gps.get('GPSLongitude'), gps.get('GPSLongitudeRef'), MAX_LONGITUDE
+        )
+        if latitude is None or longitude is None:
+            latitude = longitude = None
+
+    return models.ExifFields(
+        taken_at=parse_datetime(find(exif, *DATETIME_KEYS)),
+        camera_make=parse_text(find(exif, 'Make')),
+        camera_model=parse_text(find(exif, 'Model')),
+        width=parse_int(find(exif, *WIDTH_KEYS)),
+        height=parse_int(find(exif, *HEIGHT_KEYS)),
+        orientation=orientation,
+        latitude=latitude,
+        longitude=longitude,
+    )
@@ -0,0 +1,288 @@
+"""In-memory index of computed tags.
+
+Every item is stored as its id in a set of bitmaps: one per computed tag,
+one per owner, one per user it was shared with and one for collections.
+Search becomes intersection and difference of those bitmaps, amount of
+matches is known before any row is fetched from the database.
+"""
+
+import bisect
+from collections import Counter
+from collections import defaultdict
+from collections.abc import Collection
+from collections.abc import Iterable
+import heapq
+import random
+import sys
+from typing import Any
+from typing import NamedTuple
+
+from omoide import const
+from omoide import models
+from omoide import utils
+from omoide.domain import search_planner
+from omoide.infra.bitmap import Bitmap
+
+
+class IndexEntry(NamedTuple):
+    """Everything index needs to know about the item."""
+
+    id: int
+    number: int
+    owner_id: int
+    permissions: tuple[int, ...]
+    is_collection: bool
+    tags: tuple[str, ...]
+
+
+class SearchIndex:
+    """Bitmaps of all not deleted items."""
+
+    def __init__(self) -> None:
+        """Initialize instance."""
+        self.is_ready = False
+        self.tags: dict[str, Bitmap] = {}
+        self.owners: dict[int, Bitmap] = {}
+        self.shared: dict[int, Bitmap] = {}
+        self.collections = Bitmap()
+        self.public_users: frozenset[int] = frozenset()
+        self._entries: dict[int, IndexEntry] = {}
+        self._public: Bitmap | None = None
+        self._sorted_tags: list[str] | None = None
+
+    def __repr__(self) -> str:
+        """Return textual representation."""
+        return f'<{type(self).__name__}, {len(self)} items, {len(self.tags)} tags>'
+
+    def __len__(self) -> int:
+        """Return amount of indexed items."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self.is_ready = False
+        self.tags.clear()
+        self.owners.clear()
+        self.shared.clear()
+        self.collections = Bitmap()
+        self._entries.clear()
+        self._public = None
+        self._sorted_tags = None
+
+    def set_public_users(self, user_ids: Collection[int]) -> None:
+        """Change list of users whose items are visible to anon."""
+        user_ids = frozenset(user_ids)
+        if user_ids != self.public_users:
+            self.public_users = user_ids
+            self._public = None
+
+    def add(self, entry: IndexEntry) -> None:
+        """Add item or replace its previous version."""
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[IndexEntry]) -> None:
+        """Add items or replace their previous versions.
+
+        Ids are grouped first, so every bitmap is updated once per call.
+        """
+        tags: defaultdict[str, list[int]] = defaultdict(list)
+        owners: defaultdict[int, list[int]] = defaultdict(list)
+        shared: defaultdict[int, list[int]] = defaultdict(list)
+        collections: list[int] = []
+
+        for entry in entries:
+            if entry.id in self._entries:
+                self.remove(entry.id)
+
+            interned = entry._replace(tags=tuple(sys.intern(tag) for tag in entry.tags))
+            self._entries[entry.id] = interned
+
+            for tag in interned.tags:
+                tags[tag].append(entry.id)
+
+            owners[entry.owner_id].append(entry.id)
+
+            for user_id in entry.permissions:
+                shared[user_id].append(entry.id)
+
+            if entry.is_collection:
+                collections.append(entry.id)
+
+            if entry.owner_id in self.public_users:
+                self._public = None
+
+        if not tags.keys() <= self.tags.keys():
+            self._sorted_tags = None
+
+        _update(self.tags, tags)
+        _update(self.owners, owners)
+        _update(self.shared, shared)
+        self.collections.update(collections)
+
+    def remove(self, item_id: int) -> None:
+        """Forget item."""
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+
+        for tag in entry.tags:
+            _discard(self.tags, tag, item_id)
+            if tag not in self.tags:
+                self._sorted_tags = None
+
+        _discard(self.owners, entry.owner_id, item_id)
+
+        for user_id in entry.permissions:
+            _discard(self.shared, user_id, item_id)
+
+        self.collections.discard(item_id)
+
+        if entry.owner_id in self.public_users:
+            self._public = None
+
+    def get_visible(self, user: models.User) -> Bitmap:
+        """Return all items user is allowed to see."""
+        if user.is_anon:
+            if self._public is None:
+                self._public = Bitmap.union(
+                    self.owners[user_id] for user_id in self.public_users if user_id in self.owners
+                )
+            return self._public
+
+        return self.owners.get(user.id, Bitmap()) | self.shared.get(user.id, Bitmap())
+
+    def get_expansions(self, prefix: str, visible: Bitmap, limit: int) -> list[str]:
+        """Return most popular visible tags that start with given prefix."""
+        if self._sorted_tags is None:
+            self._sorted_tags = sorted(self.tags)
+
+        start = bisect.bisect_left(self._sorted_tags, prefix)
+        candidates: list[tuple[int, str]] = []
+
+        for tag in self._sorted_tags[start:]:
+            if not tag.startswith(prefix):
+                break
+            if counter := len(self.tags[tag] & visible):
+                candidates.append((counter, tag))
+
+        return [tag for _, tag in heapq.nlargest(limit, candidates)]
+
+    def get_counters(self, tags: Iterable[str], visible: Bitmap) -> dict[str, int]:
+        """Return amount of visible items for every tag."""
+        counters: dict[str, int] = {}
+        for tag in tags:
+            bitmap = self.tags.get(tag)
+            if bitmap is not None:
+                counters[tag] = len(bitmap & visible)
+        return counters
+
+    def match(
+        self,
+        user: models.User,
+        plan: models.Plan,
+        query_plan: search_planner.QueryPlan,
+    ) -> Bitmap:
+        """Return all items that satisfy the query."""
+        if query_plan.is_empty:
+            return Bitmap()
+
+        candidates = [self.get_visible(user)]
+
+        if plan.collections:
+            candidates.append(self.collections)
+
+        for predicate in query_plan.include:
+            bitmaps = [self.tags.get(tag, Bitmap()) for tag in predicate.tags]
+            if predicate.kind == 'all':
+                candidates.extend(bitmaps)
+            else:
+                candidates.append(Bitmap.union(bitmaps))
+
+        result = Bitmap.intersection(candidates)
+
+        if result and query_plan.exclude:
+            result = result - Bitmap.union(
+                self.tags[tag] for tag in query_plan.exclude if tag in self.tags
+            )
+
+        return result
+
+    def get_facets(
+        self,
+        matches: Bitmap,
+        limit: int,
+        fraction: float | None,
+        skip: Collection[str],
+    ) -> list[tuple[str, int]]:
+        """Return most common tags among matching items."""
+        population: Iterable[int] = matches
+        scale = 1.0
+
+        if fraction is not None:
+            total = len(matches)
+            amount = max(1, round(total * fraction))
+            if amount < total:
+                population = random.sample(list(matches), amount)
+                scale = total / amount
+
+        counter: Counter[str] = Counter()
+        for item_id in population:
+            counter.update(self._entries[item_id].tags)
+
+        for tag in skip:
+            counter.pop(tag, None)
+
+        facets: list[tuple[str, int]] = []
+        for tag, total in sorted(counter.items(), key=lambda pair: (-pair[1], pair[0])):
+            if len(facets) >= limit:
+                break
+            if not utils.looks_like_uuid(tag):
+                facets.append((tag, round(total * scale)))
+
+        return facets
+
+    def paginate(self, matches: Bitmap, plan: models.Plan) -> list[int]:
+        """Return ids of requested page in requested order."""
+        if plan.order == const.RANDOM:
+            population = list(matches)
+            if 0 <= plan.limit < len(population):
+                return random.sample(population, plan.limit)
+            random.shuffle(population)
+            return population
+
+        numbers = {item_id: self._entries[item_id].number for item_id in matches}
+        last_seen = plan.last_seen if plan.last_seen is not None and plan.last_seen > 0 else None
+
+        if plan.order == const.ASC:
+            if last_seen is not None:
+                numbers = {key: value for key, value in numbers.items() if value > last_seen}
+            select = heapq.nsmallest
+        else:
+            if last_seen is not None:
+                numbers = {key: value for key, value in numbers.items() if value < last_seen}
+            select = heapq.nlargest
+
+        if plan.limit < 0:
+            return sorted(numbers, key=numbers.__getitem__, reverse=plan.order == const.DESC)
+
+        return select(plan.limit, numbers, key=numbers.__getitem__)
+
+
+def _discard(bitmaps: dict, key: str | int, item_id: int) -> None:
+    """Remove item from the bitmap, drop bitmap if it got empty."""
+    bitmap = bitmaps.get(key)
+    if bitmap is None:
+        return
+
+    bitmap.discard(item_id)
+    if not bitmap:
+        del bitmaps[key]
+
+
+def _update(bitmaps: dict, groups: dict[Any, list[int]]) -> None:
+    """Add items to bitmaps, create missing ones."""
+    for key, item_ids in groups.items():
+        bitmap = bitmaps.get(key)
+        if bitmap is None:
+            bitmap = bitmaps[key] = Bitmap()
+        bitmap.update(item_ids)
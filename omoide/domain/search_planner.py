@@ -0,0 +1,190 @@
+"""Cost based planning of tag search queries.
+
+Postgres has no statistics on individual elements of ``computed_tags``,
+so a single ``@>`` predicate is planned blindly. We do have per-user
+tag counters in ``known_tags`` and use them here to order predicates
+by selectivity, to skip queries that can't match anything and to choose
+between GIN index lookup and walking items in order of their number.
+"""
+
+from collections.abc import Collection
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+import enum
+from typing import Any
+
+from omoide import const
+from omoide import models
+
+PREFIX_MARKER = '*'
+
+# walking items by number is considered to be that much cheaper per row
+# than fetching row found via GIN index (random access + sort)
+ORDERED_SCAN_ROW_COST = 0.1
+
+
+class Strategy(enum.StrEnum):
+    """How to execute search."""
+
+    EMPTY = 'empty'
+    TAGS_INDEX = 'tags_index'
+    ORDERED_SCAN = 'ordered_scan'
+    BITMAP = 'bitmap'
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """Single condition of the search query."""
+
+    kind: str  # 'all', 'any' or 'none'
+    tags: tuple[str, ...]
+    estimate: int
+
+
+@dataclass
+class QueryPlan:
+    """Chosen way to execute search query."""
+
+    strategy: Strategy
+    total: int
+    estimate: int
+    include: list[Predicate] = field(default_factory=list)
+    exclude: tuple[str, ...] = ()
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return True if query is guaranteed to have no results."""
+        return self.strategy is Strategy.EMPTY
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return human-readable description of the plan."""
+        return {
+            'strategy': self.strategy.value,
+            'total': self.total,
+            'estimate': self.estimate,
+            'predicates': [
+                {
+                    'kind': predicate.kind,
+                    'tags': list(predicate.tags),
+                    'estimate': predicate.estimate,
+                }
+                for predicate in self.include
+            ]
+            + (
+                [{'kind': 'none', 'tags': list(self.exclude), 'estimate': None}]
+                if self.exclude
+                else []
+            ),
+            'timings': self.timings,
+        }
+
+
+def normalize_query(plan: models.Plan) -> tuple:
+    """Return representation of the query that does not depend on tag order."""
+    return (
+        tuple(sorted(plan.tags_include)),
+        tuple(sorted(plan.tags_exclude)),
+        tuple(sorted(tuple(sorted(group)) for group in plan.tags_any)),
+        plan.collections,
+    )
+
+
+def is_prefix(tag: str) -> bool:
+    """Return True if tag is a prefix pattern like ``cat*``."""
+    return tag.endswith(PREFIX_MARKER) and len(tag) > len(PREFIX_MARKER)
+
+
+def get_exact_tags(plan: models.Plan) -> set[str]:
+    """Return tags every search result is guaranteed to have."""
+    return {tag for tag in plan.tags_include if not is_prefix(tag)}
+
+
+def get_prefixes(plan: models.Plan) -> set[str]:
+    """Return all prefixes (without marker) used in the query."""
+    tags = set(plan.tags_include) | set(plan.tags_exclude)
+    for group in plan.tags_any:
+        tags.update(group)
+    return {tag.removesuffix(PREFIX_MARKER) for tag in tags if is_prefix(tag)}
+
+
+def get_tags(
+    plan: models.Plan,
+    expansions: Mapping[str, Collection[str]],
+) -> set[str]:
+    """Return all concrete tags we need counters for."""
+    tags: set[str] = set()
+    for tag in (*plan.tags_include, *plan.tags_exclude):
+        tags.update(_expand(tag, expansions))
+    for group in plan.tags_any:
+        for tag in group:
+            tags.update(_expand(tag, expansions))
+    return tags
+
+
+def _expand(tag: str, expansions: Mapping[str, Collection[str]]) -> tuple[str, ...]:
+    """Replace prefix with known tags."""
+    if is_prefix(tag):
+        return tuple(sorted(expansions.get(tag.removesuffix(PREFIX_MARKER), ())))
+    return (tag,)
+
+
+def make_plan(
+    plan: models.Plan,
+    counters: Mapping[str, int],
+    expansions: Mapping[str, Collection[str]],
+    total: int,
+) -> QueryPlan:
+    """Choose how to execute the query."""
+    total = max(total, 0)
+    include: list[Predicate] = []
+
+    for tag in plan.tags_include:
+        variants = _expand(tag, expansions)
+        if is_prefix(tag):
+            estimate = min(total, sum(counters.get(each, 0) for each in variants))
+            include.append(Predicate('any', variants, estimate))
+        else:
+            include.append(Predicate('all', variants, counters.get(tag, 0)))
+
+    for group in plan.tags_any:
+        variants = tuple(sorted({each for tag in group for each in _expand(tag, expansions)}))
+        estimate = min(total, sum(counters.get(each, 0) for each in variants))
+        include.append(Predicate('any', variants, estimate))
+
+    exclude: set[str] = set()
+    for tag in plan.tags_exclude:
+        exclude.update(_expand(tag, expansions))
+
+    include.sort(key=lambda predicate: (predicate.estimate, predicate.tags))
+    query_plan = QueryPlan(
+        strategy=Strategy.TAGS_INDEX,
+        total=total,
+        estimate=include[0].estimate if include else total,
+        include=include,
+        exclude=tuple(sorted(exclude)),
+    )
+
+    if any(not predicate.estimate for predicate in include):
+        query_plan.strategy = Strategy.EMPTY
+        query_plan.estimate = 0
+        return query_plan
+
+    if not include:
+        # nothing to look up in the index
+        query_plan.strategy = Strategy.ORDERED_SCAN
+        return query_plan
+
+    if plan.order == const.RANDOM or plan.limit < 0 or not total:
+        # all matching rows have to be read anyway
+        return query_plan
+
+    selectivity = query_plan.estimate / total
+    index_cost = float(query_plan.estimate)
+    scan_cost = min(plan.limit / selectivity, total) * ORDERED_SCAN_ROW_COST
+
+    if scan_cost < index_cost:
+        query_plan.strategy = Strategy.ORDERED_SCAN
+
+    return query_plan
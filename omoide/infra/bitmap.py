@@ -0,0 +1,330 @@
+"""Compressed bitmap of non-negative integers.
+
+Layout follows roaring bitmaps: value is split into high and low 16 bits,
+every high part gets its own container. Sparse container is a sorted
+``array('H')``, dense container is python int used as a 65536-bit set,
+so bitwise operations on dense parts are done in C.
+"""
+
+from array import array
+import bisect
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Self
+from typing import TypeAlias
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+_LOW_MASK = CHUNK_SIZE - 1
+
+# sorted array takes 2 bytes per value and bitset takes 8KB,
+# so above this amount of values bitset is smaller
+SPARSE_LIMIT = 4096
+
+Container: TypeAlias = array | int
+
+
+def _to_set(values: Iterable[int]) -> int:
+    """Convert values into bitset."""
+    # setting bits of python int one by one copies it every time
+    buffer = bytearray(CHUNK_SIZE // 8)
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _from_set(bits: int) -> array:
+    """Convert bitset into sorted values."""
+    values = array('H')
+    while bits:
+        lowest = bits & -bits
+        values.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return values
+
+
+def _normalize(container: Container) -> Container | None:
+    """Choose best representation, return None for empty container."""
+    if isinstance(container, int):
+        total = container.bit_count()
+        if not total:
+            return None
+        if total <= SPARSE_LIMIT:
+            return _from_set(container)
+        return container
+
+    if not container:
+        return None
+    if len(container) > SPARSE_LIMIT:
+        return _to_set(container)
+    return container
+
+
+def _size(container: Container) -> int:
+    """Return amount of values in container."""
+    if isinstance(container, int):
+        return container.bit_count()
+    return len(container)
+
+
+def _and(left: Container, right: Container) -> Container:
+    """Intersect containers."""
+    if isinstance(left, int) and isinstance(right, int):
+        return left & right
+    if isinstance(left, int):
+        left, right = right, left
+    if isinstance(right, int):
+        return array('H', (value for value in left if right >> value & 1))
+    if len(left) > len(right):
+        left, right = right, left
+    lookup = set(right)
+    return array('H', (value for value in left if value in lookup))
+
+
+def _or(left: Container, right: Container) -> Container:
+    """Unite containers."""
+    if isinstance(left, int) and isinstance(right, int):
+        return left | right
+    if isinstance(left, int):
+        return left | _to_set(right)
+    if isinstance(right, int):
+        return right | _to_set(left)
+    return array('H', sorted(set(left).union(right)))
+
+
+def _andnot(left: Container, right: Container) -> Container:
+    """Subtract right container from left one."""
+    if isinstance(left, int) and isinstance(right, int):
+        return left & ~right
+    if isinstance(left, int):
+        return left & ~_to_set(right)
+    if isinstance(right, int):
+        return array('H', (value for value in left if not right >> value & 1))
+    lookup = set(right)
+    return array('H', (value for value in left if value not in lookup))
+
+
+class Bitmap:
+    """Set of non-negative integers with fast set operations."""
+
+    __slots__ = ('_chunks',)
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """Initialize instance."""
+        self._chunks: dict[int, Container] = {}
+        self.update(values)
+
+    @classmethod
+    def _from_chunks(cls, chunks: dict[int, Container]) -> Self:
+        """Create instance from ready containers."""
+        instance = cls()
+        instance._chunks = chunks
+        return instance
+
+    def __repr__(self) -> str:
+        """Return textual representation."""
+        return f'<{type(self).__name__}, {len(self)} values>'
+
+    def __len__(self) -> int:
+        """Return amount of values."""
+        return sum(_size(container) for container in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        """Return True if there are any values."""
+        return bool(self._chunks)
+
+    def __contains__(self, value: object) -> bool:
+        """Return True if value is in the bitmap."""
+        if not isinstance(value, int) or value < 0:
+            return False
+
+        container = self._chunks.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+
+        low = value & _LOW_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+
+        position = bisect.bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both bitmaps have same values."""
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over values in ascending order."""
+        for high in sorted(self._chunks):
+            base = high << CHUNK_BITS
+            container = self._chunks[high]
+            values = _from_set(container) if isinstance(container, int) else container
+            for low in values:
+                yield base + low
+
+    def __reversed__(self) -> Iterator[int]:
+        """Iterate over values in descending order."""
+        for high in sorted(self._chunks, reverse=True):
+            base = high << CHUNK_BITS
+            container = self._chunks[high]
+            values = _from_set(container) if isinstance(container, int) else container
+            for low in reversed(values):
+                yield base + low
+
+    def add(self, value: int) -> None:
+        """Add value to the bitmap."""
+        if value < 0:
+            msg = f'Bitmap can only store non-negative values, got {value}'
+            raise ValueError(msg)
+
+        high, low = value >> CHUNK_BITS, value & _LOW_MASK
+        container = self._chunks.get(high)
+
+        if container is None:
+            self._chunks[high] = array('H', (low,))
+        elif isinstance(container, int):
+            self._chunks[high] = container | (1 << low)
+        elif not container or container[-1] < low:
+            # fast path for values that come in ascending order
+            container.append(low)
+            if len(container) > SPARSE_LIMIT:
+                self._chunks[high] = _to_set(container)
+        else:
+            position = bisect.bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > SPARSE_LIMIT:
+                    self._chunks[high] = _to_set(container)
+
+    def update(self, values: Iterable[int]) -> None:
+        """Add many values to the bitmap.
+
+        Dense container is immutable, adding values one by one copies
+        it every time. Here every container is rebuilt only once.
+        """
+        groups: dict[int, set[int]] = {}
+        for value in values:
+            if value < 0:
+                msg = f'Bitmap can only store non-negative values, got {value}'
+                raise ValueError(msg)
+            groups.setdefault(value >> CHUNK_BITS, set()).add(value & _LOW_MASK)
+
+        for high, lows in groups.items():
+            new: Container = array('H', sorted(lows))
+            container = self._chunks.get(high)
+            if container is not None:
+                new = _or(container, new)
+            normalized = _normalize(new)
+            if normalized is not None:
+                self._chunks[high] = normalized
+
+    def discard(self, value: int) -> None:
+        """Remove value from the bitmap if it is present."""
+        if value < 0:
+            return
+
+        high, low = value >> CHUNK_BITS, value & _LOW_MASK
+        container = self._chunks.get(high)
+
+        if container is None:
+            return
+
+        if isinstance(container, int):
+            new = _normalize(container & ~(1 << low))
+        else:
+            position = bisect.bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+            new = _normalize(container)
+
+        if new is None:
+            del self._chunks[high]
+        else:
+            self._chunks[high] = new
+
+    def copy(self) -> Self:
+        """Return independent copy."""
+        return self._from_chunks(
+            {
+                high: container if isinstance(container, int) else array('H', container)
+                for high, container in self._chunks.items()
+            }
+        )
+
+    def _combine(
+        self,
+        other: 'Bitmap',
+        operation: Callable[[Container, Container], Container],
+        keys: Iterable[int],
+    ) -> Self:
+        """Apply operation to matching containers."""
+        chunks: dict[int, Container] = {}
+
+        for high in keys:
+            left = self._chunks.get(high)
+            right = other._chunks.get(high)
+
+            if left is None or right is None:
+                container = left if right is None else right
+                if container is None:
+                    continue
+                new = container if isinstance(container, int) else array('H', container)
+            else:
+                new = _normalize(operation(left, right))
+
+            if new is not None:
+                chunks[high] = new
+
+        return self._from_chunks(chunks)
+
+    def __and__(self, other: 'Bitmap') -> Self:
+        """Return intersection."""
+        return self._combine(other, _and, self._chunks.keys() & other._chunks.keys())
+
+    def __or__(self, other: 'Bitmap') -> Self:
+        """Return union."""
+        return self._combine(other, _or, self._chunks.keys() | other._chunks.keys())
+
+    def __sub__(self, other: 'Bitmap') -> Self:
+        """Return difference."""
+        chunks: dict[int, Container] = {}
+
+        for high, left in self._chunks.items():
+            right = other._chunks.get(high)
+
+            if right is None:
+                new = left if isinstance(left, int) else array('H', left)
+            else:
+                new = _normalize(_andnot(left, right))
+
+            if new is not None:
+                chunks[high] = new
+
+        return self._from_chunks(chunks)
+
+    @classmethod
+    def union(cls, bitmaps: Iterable['Bitmap']) -> 'Bitmap':
+        """Return union of all given bitmaps."""
+        result = cls()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+    @classmethod
+    def intersection(cls, bitmaps: Iterable['Bitmap']) -> 'Bitmap':
+        """Return intersection of all given bitmaps (smallest first)."""
+        ordered = sorted(bitmaps, key=len)
+        if not ordered:
+            return cls()
+
+        result = ordered[0]
+        for bitmap in ordered[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result
@@ -0,0 +1,152 @@
+"""Content-addressed storage of files that are shared between items.
+
+Copying image between items used to duplicate every byte. Now the file
+is moved into ``blobs/<aa>/<bb>/<sha256>`` and every item gets a hard
+link to it. Reference count is the link count of the blob minus one,
+so it is kept by the filesystem itself and cannot drift: deleting file
+of the item is just ``unlink``. Blobs nobody links to anymore are
+removed by garbage collection.
+
+Hard links share everything, so files must never be rewritten in place,
+only replaced. Where hard links are not possible, reflink (copy on write
+clone) is tried and the regular copy is the last resort.
+"""
+
+from collections.abc import Iterator
+import enum
+import errno
+import fcntl
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import uuid
+
+CHUNK_SIZE = 1024 * 1024
+
+# ioctl that clones file extents, from linux/fs.h
+FICLONE = 0x40049409
+
+# failures that mean "try something else", anything else is a real error
+_NO_LINK = frozenset((errno.EXDEV, errno.EMLINK, errno.EPERM, errno.ENOTSUP))
+_NO_REFLINK = _NO_LINK | {errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP}
+
+
+class CopyMethod(enum.StrEnum):
+    """How the copy was made."""
+
+    HARDLINK = 'hardlink'
+    REFLINK = 'reflink'
+    COPY = 'copy'
+
+
+def get_digest(path: Path) -> str:
+    """Return SHA-256 of the file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _replace_with(source: Path, target: Path, method: CopyMethod) -> None:
+    """Atomically put a copy of the source at the target path."""
+    tmp_path = target.with_name(f'.{uuid.uuid4().hex}.tmp')
+    try:
+        if method == CopyMethod.HARDLINK:
+            os.link(source, tmp_path)
+        elif method == CopyMethod.REFLINK:
+            with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        else:
+            shutil.copyfile(source, tmp_path)
+        tmp_path.replace(target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def clone(source: Path, target: Path) -> CopyMethod:
+    """Make target share content with the source as cheap as possible."""
+    for method in (CopyMethod.HARDLINK, CopyMethod.REFLINK):
+        try:
+            _replace_with(source, target, method)
+        except OSError as exc:
+            if exc.errno not in _NO_REFLINK:
+                raise
+        else:
+            return method
+
+    _replace_with(source, target, CopyMethod.COPY)
+    return CopyMethod.COPY
+
+
+class BlobStore:
+    """Files stored under their SHA-256 and shared by hard links."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize instance."""
+        self.root = root
+
+    def get_blob_path(self, digest: str) -> Path:
+        """Return location of the blob."""
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def adopt(self, path: Path) -> Path:
+        """Make the file a link to the blob with the same content.
+
+        If identical blob already exists, the file is replaced by a link
+        to it and space taken by the duplicate is freed.
+        """
+        digest = get_digest(path)
+        blob_path = self.get_blob_path(digest)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            os.link(path, blob_path)
+        except FileExistsError:
+            if not blob_path.samefile(path):
+                _replace_with(blob_path, path, CopyMethod.HARDLINK)
+
+        return blob_path
+
+    def copy(self, source: Path, target: Path) -> CopyMethod:
+        """Place copy of the source at the target path.
+
+        Target is replaced, never rewritten, so other items that
+        share its content are not affected.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if source.stat().st_nlink == 1:
+                self.adopt(source)
+        except OSError as exc:
+            # blobs are on another filesystem or links are not supported
+            if exc.errno not in _NO_LINK:
+                raise
+
+        # any link of the blob is as good as the blob itself
+        return clone(source, target)
+
+    @staticmethod
+    def get_references(blob_path: Path) -> int:
+        """Return amount of files that share the blob."""
+        return blob_path.stat().st_nlink - 1
+
+    def iter_blobs(self) -> Iterator[Path]:
+        """Yield paths of all blobs."""
+        for path in sorted(self.root.glob('*/*/*')):
+            if path.is_file() and not path.name.startswith('.'):
+                yield path
+
+    def collect(self, blob_path: Path) -> bool:
+        """Remove blob if nobody uses it, return True if it was removed."""
+        if self.get_references(blob_path) > 0:
+            return False
+        blob_path.unlink()
+        return True
+
+    @staticmethod
+    def verify(blob_path: Path) -> bool:
+        """Return True if content of the blob matches its name."""
+        return get_digest(blob_path) == blob_path.name
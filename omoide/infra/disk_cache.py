@@ -0,0 +1,233 @@
+"""Size-bounded cache of files on disk."""
+
+import asyncio
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextlib import suppress
+import fcntl
+import os
+from pathlib import Path
+import time
+import uuid
+
+LOCK_FILENAME = '.lock'
+TOTAL_FILENAME = '.total'
+
+# eviction frees a bit more than needed, so the folder is not scanned on every write
+LOW_WATERMARK = 0.9
+
+# temporary file that old belongs to a write that was interrupted
+STALE_TMP_AGE = 60 * 60  # seconds
+
+
+class DiskLRUCache:
+    """Files on disk, least recently used ones are removed when cache is full.
+
+    Folder is shared by all processes, so everything they need to agree
+    on is kept there too. Recency is the modification time of a file,
+    it is updated on every hit. Total size is kept in a small file
+    under a lock. When it grows above the limit, the folder is scanned
+    and the oldest files are removed. Scan also fixes the total if any
+    process missed an update. Meant for derived files that can always
+    be created again.
+    """
+
+    def __init__(self, folder: Path, max_size: int, prefix_size: int = 2) -> None:
+        """Initialize instance."""
+        self.folder = folder
+        self.max_size = max_size
+        self.prefix_size = prefix_size
+        self._pending: dict[str, asyncio.Future[bytes]] = {}
+
+    @property
+    def total_size(self) -> int:
+        """Return size of all stored files."""
+        with self._exclusive():
+            total = self._read_total()
+            if total is None:
+                total = self._scan(keep=None)
+                self._write_total(total)
+        return total
+
+    def get_relative_path(self, key: str) -> Path:
+        """Return location of the file inside cache folder."""
+        return Path(key[: self.prefix_size], key)
+
+    def get(self, key: str) -> Path | None:
+        """Return path to the file if it is cached."""
+        path = self.folder / self.get_relative_path(key)
+
+        try:
+            _touch(path)
+        except FileNotFoundError:
+            return None
+
+        return path
+
+    def read(self, key: str) -> bytes | None:
+        """Return content of the file if it is cached.
+
+        File is opened before anything else, so it could be read
+        even if another process evicts it right after that.
+        """
+        path = self.folder / self.get_relative_path(key)
+
+        try:
+            with open(path, 'rb') as file:
+                with suppress(FileNotFoundError):
+                    _touch(path)
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, create: Callable[[Path], None]) -> Path:
+        """Create file using given function and store it."""
+        path = self.folder / self.get_relative_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # readers must never see half-written file
+        tmp_path = path.with_name(f'.{uuid.uuid4().hex}.tmp')
+        try:
+            create(tmp_path)
+            size = tmp_path.stat().st_size
+            _touch(tmp_path)
+
+            with self._exclusive():
+                previous = path.stat().st_size if path.exists() else 0
+                tmp_path.replace(path)
+                self._account(key, size - previous)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return path
+
+    async def get_or_create(self, key: str, create: Callable[[Path], None]) -> bytes:
+        """Return content of cached file, create it in a thread if needed.
+
+        Concurrent requests for the same key wait for single creation.
+        Content is returned instead of path, because path could point
+        to nothing by the time it is sent.
+        """
+        content = self.read(key)
+        if content is not None:
+            return content
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self._put_and_read, key, create)
+        self._pending[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._pending.pop(key, None)
+            else:
+                future.add_done_callback(lambda _: self._pending.pop(key, None))
+
+    def _put_and_read(self, key: str, create: Callable[[Path], None]) -> bytes:
+        """Store new file, return its content.
+
+        Content is read from temporary file, which is never evicted.
+        """
+        content = b''
+
+        def _create(path: Path) -> None:
+            nonlocal content
+            create(path)
+            content = path.read_bytes()
+
+        self.put(key, _create)
+        return content
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold lock that is shared by all processes using the folder."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.folder / LOCK_FILENAME, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _account(self, key: str, delta: int) -> None:
+        """Change total size, evict old files if it is too big now."""
+        total = self._read_total()
+
+        if total is None:
+            total = self._scan(keep=key)
+        else:
+            total += delta
+
+        if total > self.max_size:
+            total = self._scan(keep=key)
+
+        self._write_total(total)
+
+    def _scan(self, keep: str | None) -> int:
+        """Walk the folder, remove least recently used files over the limit.
+
+        Returns size of files that are left.
+        """
+        found: list[tuple[int, str, int]] = []
+        stale = time.time() - STALE_TMP_AGE
+
+        for root, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                path = Path(root) / filename
+
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+
+                if filename.startswith('.'):
+                    if filename.endswith('.tmp') and stat.st_mtime < stale:
+                        path.unlink(missing_ok=True)
+                    continue
+
+                found.append((stat.st_mtime_ns, filename, stat.st_size))
+
+        found.sort()
+        total = sum(size for _, _, size in found)
+
+        if total <= self.max_size:
+            return total
+
+        target = self.max_size * LOW_WATERMARK
+        for _, key, size in found:
+            if total <= target:
+                break
+
+            if key == keep:
+                continue
+
+            (self.folder / self.get_relative_path(key)).unlink(missing_ok=True)
+            total -= size
+
+        return total
+
+    def _read_total(self) -> int | None:
+        """Return total size that processes agreed on."""
+        try:
+            return int((self.folder / TOTAL_FILENAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_total(self, total: int) -> None:
+        """Save total size for other processes."""
+        (self.folder / TOTAL_FILENAME).write_text(str(total))
+
+
+def _touch(path: Path) -> None:
+    """Mark file as recently used.
+
+    Clock is finer than timestamps the filesystem sets on its own,
+    so files used one after another keep their order.
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
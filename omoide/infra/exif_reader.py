@@ -0,0 +1,166 @@
+"""Read EXIF without decoding the image.
+
+Metadata lives near the start of the file (JPEG APP1 segment, PNG eXIf
+chunk) or in a separate chunk that can be reached by seeking (WebP).
+Only those bytes are read, Pillow is used just to parse the IFD
+structure. Result has the same shape as EXIF taken from opened image.
+"""
+
+from pathlib import Path
+import struct
+from typing import Any
+from typing import BinaryIO
+
+from PIL import ExifTags
+from PIL import Image
+
+EXIF_HEADER = b'Exif\x00\x00'
+JPEG_SOI = b'\xff\xd8'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+RIFF_SIGNATURE = b'RIFF'
+WEBP_SIGNATURE = b'WEBP'
+
+# JPEG markers that have no payload
+_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD8)})
+_JPEG_APP1 = 0xE1
+_JPEG_SOS = 0xDA
+_JPEG_EOI = 0xD9
+
+# EXIF of any sane photo is way smaller, anything bigger is broken
+MAX_EXIF_SIZE = 1024 * 1024
+
+IFD_CODE_LOOKUP = {i.value: i.name for i in ExifTags.IFD}
+
+
+def _read_jpeg_marker(fd: BinaryIO) -> int | None:
+    """Return code of the next JPEG marker."""
+    if fd.read(1) != b'\xff':
+        return None  # not a marker, file is broken
+
+    code = fd.read(1)
+    while code == b'\xff':  # fill bytes
+        code = fd.read(1)
+
+    return code[0] if code else None
+
+
+def _read_jpeg(fd: BinaryIO) -> bytes | None:
+    """Return payload of APP1 segment with EXIF."""
+    while True:
+        marker = _read_jpeg_marker(fd)
+        if marker is None or marker in (_JPEG_SOS, _JPEG_EOI):
+            # compressed data starts here, metadata must have been earlier
+            return None
+        if marker in _STANDALONE_MARKERS:
+            continue
+
+        raw_length = fd.read(2)
+        if len(raw_length) != 2:  # noqa: PLR2004
+            return None
+        (length,) = struct.unpack('>H', raw_length)
+
+        if marker == _JPEG_APP1:
+            payload = fd.read(length - 2)
+            if payload.startswith(EXIF_HEADER):
+                return payload
+        else:
+            fd.seek(length - 2, 1)
+
+
+def _read_png(fd: BinaryIO) -> bytes | None:
+    """Return content of eXIf chunk."""
+    while True:
+        header = fd.read(8)
+        if len(header) != 8:  # noqa: PLR2004
+            return None
+        length, kind = struct.unpack('>I4s', header)
+
+        if kind == b'eXIf':
+            return fd.read(length) if length <= MAX_EXIF_SIZE else None
+        if kind in (b'IDAT', b'IEND'):
+            return None
+
+        fd.seek(length + 4, 1)  # data and crc
+
+
+def _read_webp(fd: BinaryIO) -> bytes | None:
+    """Return content of EXIF chunk."""
+    while True:
+        header = fd.read(8)
+        if len(header) != 8:  # noqa: PLR2004
+            return None
+        kind, length = struct.unpack('<4sI', header)
+
+        if kind == b'EXIF':
+            return fd.read(length) if length <= MAX_EXIF_SIZE else None
+
+        fd.seek(length + (length & 1), 1)  # chunks are padded to even size
+
+
+def read_exif_bytes(fd: BinaryIO) -> bytes | None:
+    """Return raw EXIF block of the file or None if there is none."""
+    start = fd.read(12)
+
+    if start.startswith(JPEG_SOI):
+        fd.seek(len(JPEG_SOI))
+        return _read_jpeg(fd)
+
+    if start.startswith(PNG_SIGNATURE):
+        fd.seek(len(PNG_SIGNATURE))
+        return _read_png(fd)
+
+    if start.startswith(RIFF_SIGNATURE) and start[8:12] == WEBP_SIGNATURE:
+        return _read_webp(fd)
+
+    return None
+
+
+def exif_to_dict(img_exif: Image.Exif) -> dict[str, Any]:
+    """Convert parsed EXIF into JSON-friendly dict with readable names."""
+    exif: dict[str, Any] = {}
+
+    def cast(maybe_string: Any) -> str:
+        """Convert to string. Also strip unicode \u0000."""
+        return str(maybe_string).replace('\u0000', '')
+
+    for tag_code, value in img_exif.items():
+        if tag_code in IFD_CODE_LOOKUP:
+            ifd_tag_name = cast(IFD_CODE_LOOKUP[tag_code])
+
+            if ifd_tag_name not in exif:
+                exif[ifd_tag_name] = {}
+
+            ifd_data = img_exif.get_ifd(tag_code).items()
+
+            for nested_key, nested_value in ifd_data:
+                nested_tag_name = (
+                    ExifTags.GPSTAGS.get(nested_key, None)
+                    or ExifTags.TAGS.get(nested_key, None)
+                    or nested_key
+                )
+                exif[ifd_tag_name][cast(nested_tag_name)] = cast(nested_value)
+
+        else:
+            exif[cast(ExifTags.TAGS.get(tag_code))] = cast(value)
+
+    return exif
+
+
+def extract_exif_from_file(path: Path | str) -> dict[str, Any] | None:
+    """Return EXIF of the file without decoding pixels.
+
+    None means that format is not supported, file has no EXIF
+    or it is broken.
+    """
+    with open(path, 'rb') as fd:
+        data = read_exif_bytes(fd)
+
+    if not data or len(data) > MAX_EXIF_SIZE:
+        return None
+
+    img_exif = Image.Exif()
+    try:
+        img_exif.load(data)
+        return exif_to_dict(img_exif)
+    except (OSError, ValueError, KeyError, SyntaxError, struct.error):
+        return None
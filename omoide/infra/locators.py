@@ -1,5 +1,7 @@
 """Pathfinders."""
 
+from collections.abc import Collection
+from collections.abc import Mapping
 from pathlib import Path
 from typing import assert_never
 
@@ -43,6 +45,60 @@ class WebLocator(LocatorMixin):
         self.root = root
         self.prefix_size = prefix_size
 
+    @staticmethod
+    def get_accepted_types(accept: str | None) -> set[str]:
+        """Return content types explicitly listed in the Accept header.
+
+        Wildcards are ignored on purpose: old browsers send ``image/*``
+        without being able to show WebP or AVIF.
+        """
+        accepted: set[str] = set()
+
+        for part in (accept or '').split(','):
+            content_type, *params = (each.strip() for each in part.split(';'))
+            quality = 1.0
+
+            for param in params:
+                key, _, value = param.partition('=')
+                if key.strip() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+
+            if content_type and '*' not in content_type and quality > 0:
+                accepted.add(content_type.lower())
+
+        return accepted
+
+    @classmethod
+    def pick_format(
+        cls,
+        accept: str | None,
+        default_ext: str,
+        default_size: int | None,
+        renditions: Mapping[str, int],
+    ) -> str:
+        """Return extension of the smallest file that client can show.
+
+        Default format is always acceptable, extra ones only
+        when client asks for them.
+        """
+        accepted = cls.get_accepted_types(accept)
+        best_ext = default_ext
+        best_size = default_size
+
+        for ext, size in renditions.items():
+            content_type = const.RENDITION_CONTENT_TYPES.get(ext)
+            if content_type not in accepted:
+                continue
+
+            if best_size is None or size < best_size:
+                best_ext = ext
+                best_size = size
+
+        return best_ext
+
     def get_video_location(self, item: models.Item) -> str | None:
         """Return location of the video."""
         if item.content_ext is None:
@@ -82,6 +138,23 @@ class WebLocator(LocatorMixin):
             f'/{self.get_filename(item, item.preview_ext)}'
         )
 
+    def get_animated_preview_location(
+        self,
+        item: models.Item,
+        metainfo: models.Metainfo,
+    ) -> str | None:
+        """Return location of the animated preview of the video."""
+        if metainfo.animated_preview_size is None:
+            return None
+
+        return (
+            f'/{self.root}'
+            f'/{const.MediaType.PREVIEW}'
+            f'/{item.owner_uuid}'  # FIXME - do not use `owner_uuid` attribute
+            f'/{self.get_prefix(item)}'
+            f'/{self.get_filename(item, const.ANIMATED_PREVIEW_EXT)}'
+        )
+
     def get_thumbnail_location(self, item: models.Item) -> str | None:
         """Return location of the thumbnail."""
         if item.thumbnail_ext is None:
@@ -95,6 +168,53 @@ class WebLocator(LocatorMixin):
             f'/{self.get_filename(item, item.thumbnail_ext)}'
         )
 
+    def get_resized_location(self, item: models.Item, width: int) -> str | None:
+        """Return location of the image resized on demand."""
+        if item.thumbnail_ext is None:
+            return None
+
+        return (
+            f'/{self.root}'
+            f'/{const.RESIZED_FOLDER}'
+            f'/{width}'
+            f'/{item.owner_uuid}'  # FIXME - do not use `owner_uuid` attribute
+            f'/{self.get_prefix(item)}'
+            f'/{self.get_filename(item, item.thumbnail_ext)}'
+        )
+
+    def get_thumbnail_srcset(
+        self,
+        item: models.Item,
+        widths: Collection[int] = const.RESPONSIVE_WIDTHS,
+    ) -> str | None:
+        """Return value for the srcset attribute of the thumbnail."""
+        candidates = []
+        for width in widths:
+            location = self.get_resized_location(item, width)
+            if location is None:
+                return None
+            candidates.append(f'{location} {width}w')
+
+        return ', '.join(candidates)
+
+    def get_contact_sheet_location(
+        self,
+        item: models.Item,
+        sheet: models.ContactSheet,
+    ) -> str:
+        """Return location of the contact sheet of the collection.
+
+        Version is a part of the path, so the sheet could be cached forever.
+        """
+        return (
+            f'/{self.root}'
+            f'/{const.CONTACT_SHEET_FOLDER}'
+            f'/{sheet.version}'
+            f'/{item.owner_uuid}'  # FIXME - do not use `owner_uuid` attribute
+            f'/{self.get_prefix(item)}'
+            f'/{self.get_filename(item, sheet.ext)}'
+        )
+
 
 class FilesystemLocator(LocatorMixin):
     """Filesystem locator."""
@@ -165,3 +285,56 @@ class FilesystemLocator(LocatorMixin):
 
         _root, _media, _uuid, _prefix, _filename = segments
         return _root / _media / _uuid / _prefix / _filename
+
+    def get_extra_paths(
+        self,
+        owner: models.User,
+        item: models.Item,
+        *,
+        deleted: bool = False,
+    ) -> list[Path]:
+        """Return paths to all optional files of the item.
+
+        These are previews and thumbnails in extra formats and the animated
+        preview of the video. Any of them may not exist.
+        """
+        variants = [
+            (const.MediaType.PREVIEW, const.ANIMATED_PREVIEW_EXT),
+            *(
+                (media_type, ext)
+                for media_type in (const.MediaType.PREVIEW, const.MediaType.THUMBNAIL)
+                for ext in const.RENDITION_FORMATS
+            ),
+        ]
+
+        paths: list[Path] = []
+        for media_type, ext in variants:
+            path = self.get_path(owner, item, media_type, deleted=deleted, force_ext=ext)
+            if path is not None:
+                paths.append(path)
+
+        return paths
+
+    def get_contact_sheet_folder(self, owner: models.User, item: models.Item) -> Path:
+        """Return folder with all versions of the contact sheet."""
+        return (
+            self.root
+            / const.CONTACT_SHEET_FOLDER
+            / str(owner.uuid)
+            / self.get_prefix(item)
+            / str(item.uuid)
+        )
+
+    def get_contact_sheet_path(
+        self,
+        owner: models.User,
+        item: models.Item,
+        version: int,
+        ext: str = const.CONTACT_SHEET_EXT,
+    ) -> Path:
+        """Return path to the given version of the contact sheet.
+
+        Every version is a separate file, so the one that is served
+        never changes under the same URL.
+        """
+        return self.get_contact_sheet_folder(owner, item) / f'{version}.{ext}'
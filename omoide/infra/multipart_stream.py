@@ -0,0 +1,194 @@
+"""Incremental parsing of multipart/form-data requests.
+
+Starlette reads the whole form into temporary files before the handler
+gets it. Here every part is given to the caller as soon as its headers
+arrive and its body is an async iterator that pulls bytes straight from
+the request, so a part could be streamed into storage while the next
+one is still on the wire.
+
+Parts must be consumed in order: body that was not read is skipped
+when the next part is requested.
+"""
+
+from collections import deque
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+import enum
+from typing import Any
+
+from python_multipart.multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+
+
+class MultipartError(ValueError):
+    """Request body is not a valid multipart/form-data."""
+
+
+class _Event(enum.Enum):
+    """What parser has found."""
+
+    PART_BEGIN = enum.auto()
+    HEADER = enum.auto()
+    HEADERS_DONE = enum.auto()
+    DATA = enum.auto()
+    PART_END = enum.auto()
+    END = enum.auto()
+
+
+@dataclass
+class MultipartPart:
+    """One field of the form."""
+
+    name: str
+    filename: str | None
+    content_type: str
+    headers: dict[str, str]
+    body: AsyncIterator[bytes]
+
+
+def get_boundary(content_type: str | None) -> bytes:
+    """Return boundary from the Content-Type header."""
+    media_type, params = parse_options_header(content_type)
+
+    if media_type != b'multipart/form-data':
+        msg = 'Expected multipart/form-data request'
+        raise MultipartError(msg)
+
+    boundary = params.get(b'boundary')
+    if not boundary:
+        msg = 'Multipart boundary is not specified'
+        raise MultipartError(msg)
+
+    return boundary
+
+
+class _EventReader:
+    """Feed the parser from the stream and hand out what it found."""
+
+    def __init__(self, boundary: bytes, stream: AsyncIterable[bytes]) -> None:
+        """Initialize instance."""
+        self._stream = aiter(stream)
+        self._events: deque[tuple[_Event, Any]] = deque()
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._finished = False
+        self._parser = MultipartParser(
+            boundary,
+            {
+                'on_part_begin': self._on_part_begin,
+                'on_part_data': self._on_part_data,
+                'on_part_end': self._on_part_end,
+                'on_header_field': self._on_header_field,
+                'on_header_value': self._on_header_value,
+                'on_header_end': self._on_header_end,
+                'on_headers_finished': self._on_headers_finished,
+                'on_end': self._on_end,
+            },
+        )
+
+    async def next(self) -> tuple[_Event, Any]:
+        """Return next event, reading more of the stream if necessary."""
+        while not self._events:
+            if self._finished:
+                msg = 'Multipart body ended unexpectedly'
+                raise MultipartError(msg)
+
+            chunk = await anext(self._stream, None)
+
+            try:
+                if chunk is None:
+                    self._finished = True
+                    self._parser.finalize()
+                elif chunk:
+                    self._parser.write(chunk)
+            except ValueError as exc:
+                msg = f'Malformed multipart body: {exc}'
+                raise MultipartError(msg) from exc
+
+        return self._events.popleft()
+
+    def _on_part_begin(self) -> None:
+        self._events.append((_Event.PART_BEGIN, None))
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        # parser reuses its buffer, data must be copied
+        self._events.append((_Event.DATA, bytes(data[start:end])))
+
+    def _on_part_end(self) -> None:
+        self._events.append((_Event.PART_END, None))
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        field = self._header_field.decode('latin-1').lower()
+        value = self._header_value.decode('utf-8', errors='replace')
+        self._events.append((_Event.HEADER, (field, value)))
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        self._events.append((_Event.HEADERS_DONE, None))
+
+    def _on_end(self) -> None:
+        self._events.append((_Event.END, None))
+
+
+async def _read_body(reader: _EventReader) -> AsyncIterator[bytes]:
+    """Yield body of the current part."""
+    while True:
+        event, payload = await reader.next()
+
+        if event is _Event.DATA:
+            yield payload
+        else:
+            return
+
+
+def _make_part(headers: dict[str, str], body: AsyncIterator[bytes]) -> MultipartPart:
+    """Describe the part by its headers."""
+    _, disposition = parse_options_header(headers.get('content-disposition'))
+    name = disposition.get(b'name')
+
+    if name is None:
+        msg = 'Multipart part has no name'
+        raise MultipartError(msg)
+
+    filename = disposition.get(b'filename')
+    return MultipartPart(
+        name=name.decode('utf-8', errors='replace'),
+        filename=None if filename is None else filename.decode('utf-8', errors='replace'),
+        content_type=headers.get('content-type', 'application/octet-stream'),
+        headers=headers,
+        body=body,
+    )
+
+
+async def iter_parts(
+    content_type: str | None,
+    stream: AsyncIterable[bytes],
+) -> AsyncIterator[MultipartPart]:
+    """Yield parts of the multipart body as they arrive."""
+    reader = _EventReader(get_boundary(content_type), stream)
+    headers: dict[str, str] = {}
+
+    while True:
+        event, payload = await reader.next()
+
+        if event is _Event.END:
+            return
+
+        if event is _Event.PART_BEGIN:
+            headers = {}
+        elif event is _Event.HEADER:
+            field, value = payload
+            headers[field] = value
+        elif event is _Event.HEADERS_DONE:
+            body = _read_body(reader)
+            yield _make_part(headers, body)
+            # whatever caller did not read is skipped below
+            await body.aclose()
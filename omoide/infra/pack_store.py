@@ -0,0 +1,396 @@
+"""Append-only pack files for small media files.
+
+Millions of thumbnails stored as separate files exhaust inodes and cost
+a seek per file on cold cache. Pack keeps files of one owner and prefix
+together: data is appended to ``<prefix>.pack``, location of every file
+is appended to ``<prefix>.idx``. Later records win and deletion is
+a record too, so both files only grow. Space of deleted and replaced
+files is reclaimed by compaction.
+
+Index is kept in memory and re-read when it grows or gets replaced.
+Files found in the index are served without looking at the index file
+for a short while, so writes of other processes become visible with
+a small delay. Every record has a checksum of the data, so reader
+also notices when compaction replaced pack under its feet.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+import fcntl
+import os
+from pathlib import Path
+import struct
+import threading
+import time
+from typing import NamedTuple
+import uuid
+import zlib
+
+PACK_EXT = 'pack'
+INDEX_EXT = 'idx'
+LOCK_EXT = 'lock'
+
+MAX_KEY_LENGTH = 64
+MAX_OPEN_PACKS = 256
+MAX_CACHED_INDEXES = 4096
+INDEX_TTL = 1.0  # seconds
+
+# key, offset, length, checksum, is deleted
+_RECORD = struct.Struct(f'<{MAX_KEY_LENGTH}sQII?')
+_PRESENT = False
+_DELETED = True
+
+
+class PackEntry(NamedTuple):
+    """Location of the file inside the pack."""
+
+    offset: int
+    length: int
+    checksum: int
+
+
+class _Index(NamedTuple):
+    """Parsed index file."""
+
+    inode: int
+    consumed: int
+    entries: dict[str, PackEntry]
+    checked_at: float = 0.0
+
+
+def _parse_records(data: bytes, entries: dict[str, PackEntry]) -> int:
+    """Apply records to entries, return amount of consumed bytes.
+
+    Incomplete record at the end is a write that is still in progress
+    (or was interrupted), it is ignored.
+    """
+    usable = len(data) - len(data) % _RECORD.size
+
+    for raw_key, offset, length, checksum, is_deleted in _RECORD.iter_unpack(data[:usable]):
+        key = raw_key.rstrip(b'\x00').decode('utf-8')
+        if is_deleted:
+            entries.pop(key, None)
+        else:
+            entries[key] = PackEntry(offset, length, checksum)
+
+    return usable
+
+
+class PackStore:
+    """Files grouped into pack files by folder, owner and prefix."""
+
+    def __init__(
+        self,
+        root: Path,
+        max_open_packs: int = MAX_OPEN_PACKS,
+        max_cached_indexes: int = MAX_CACHED_INDEXES,
+        index_ttl: float = INDEX_TTL,
+    ) -> None:
+        """Initialize instance."""
+        self.root = root
+        self.max_open_packs = max_open_packs
+        self.max_cached_indexes = max_cached_indexes
+        self.index_ttl = index_ttl
+        self._indexes: OrderedDict[Path, _Index] = OrderedDict()
+        self._packs: OrderedDict[Path, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_base_path(self, folder: str, owner_uuid: str, prefix: str) -> Path:
+        """Return path of the pack without extension."""
+        return self.root / folder / owner_uuid / prefix
+
+    @staticmethod
+    def _with_ext(base: Path, ext: str) -> Path:
+        """Return path to one of the pack files."""
+        return base.with_name(f'{base.name}.{ext}')
+
+    def get(self, folder: str, owner_uuid: str, prefix: str, key: str) -> PackEntry | None:
+        """Return location of the file if it is in the pack."""
+        base = self.get_base_path(folder, owner_uuid, prefix)
+        with self._lock:
+            return self._lookup(base, key)
+
+    def read(self, folder: str, owner_uuid: str, prefix: str, key: str) -> bytes | None:
+        """Return content of the file or None if it is not in the pack."""
+        base = self.get_base_path(folder, owner_uuid, prefix)
+
+        for attempt in range(2):
+            with self._lock:
+                entry = self._lookup(base, key)
+                if entry is None:
+                    return None
+                fd = self._acquire(base)
+
+            # reading does not need the lock, readers run in parallel
+            data = self._pread(fd, entry)
+
+            if len(data) == entry.length and zlib.crc32(data) == entry.checksum:
+                return data
+
+            if not attempt:
+                # pack was compacted after index had been read,
+                # wait until compaction is finished and start over
+                with self._exclusive(base), self._lock:
+                    self._forget(base)
+
+        msg = f'Checksum mismatch for {key} in {self._with_ext(base, PACK_EXT)}'
+        raise OSError(msg)
+
+    def put(self, folder: str, owner_uuid: str, prefix: str, key: str, data: bytes) -> None:
+        """Append file to the pack, replacing previous version if any."""
+        raw_key = self._encode_key(key)
+        base = self.get_base_path(folder, owner_uuid, prefix)
+        base.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._exclusive(base):
+            with open(self._with_ext(base, PACK_EXT), 'ab') as pack:
+                offset = pack.seek(0, os.SEEK_END)
+                pack.write(data)
+
+            # data must be in place before anybody can find it
+            self._append(base, _RECORD.pack(raw_key, offset, len(data), zlib.crc32(data), _PRESENT))
+
+        self._expire(base)
+
+    def delete(self, folder: str, owner_uuid: str, prefix: str, key: str) -> bool:
+        """Mark file as deleted, return True if it was in the pack."""
+        raw_key = self._encode_key(key)
+        base = self.get_base_path(folder, owner_uuid, prefix)
+
+        if not self._with_ext(base, INDEX_EXT).exists():
+            return False
+
+        with self._exclusive(base):
+            entries: dict[str, PackEntry] = {}
+            _parse_records(self._with_ext(base, INDEX_EXT).read_bytes(), entries)
+
+            if key not in entries:
+                return False
+
+            self._append(base, _RECORD.pack(raw_key, 0, 0, 0, _DELETED))
+
+        self._expire(base)
+        return True
+
+    def compact(self, folder: str, owner_uuid: str, prefix: str) -> int:
+        """Rewrite the pack without deleted and replaced files.
+
+        Returns amount of reclaimed bytes.
+        """
+        base = self.get_base_path(folder, owner_uuid, prefix)
+        pack_path = self._with_ext(base, PACK_EXT)
+        index_path = self._with_ext(base, INDEX_EXT)
+
+        if not index_path.exists():
+            return 0
+
+        with self._exclusive(base):
+            entries: dict[str, PackEntry] = {}
+            _parse_records(index_path.read_bytes(), entries)
+
+            old_size = pack_path.stat().st_size
+            new_size = sum(entry.length for entry in entries.values())
+
+            if new_size == old_size:
+                return 0
+
+            if not entries:
+                pack_path.unlink()
+                index_path.unlink()
+                return old_size
+
+            tmp = uuid.uuid4().hex
+            tmp_pack = base.with_name(f'.{base.name}.{tmp}.{PACK_EXT}')
+            tmp_index = base.with_name(f'.{base.name}.{tmp}.{INDEX_EXT}')
+
+            try:
+                self._copy_live(pack_path, tmp_pack, tmp_index, entries)
+                tmp_pack.replace(pack_path)
+                tmp_index.replace(index_path)
+            finally:
+                tmp_pack.unlink(missing_ok=True)
+                tmp_index.unlink(missing_ok=True)
+
+        self._expire(base)
+        return old_size - new_size
+
+    def read_relative(self, relative_path: Path) -> bytes | None:
+        """Return file that would be at the same path inside data folder."""
+        folder, owner_uuid, prefix, key = relative_path.parts
+        return self.read(folder, owner_uuid, prefix, key)
+
+    def delete_relative(self, relative_path: Path) -> bool:
+        """Mark file that would be at the same path inside data folder as deleted."""
+        folder, owner_uuid, prefix, key = relative_path.parts
+        return self.delete(folder, owner_uuid, prefix, key)
+
+    def iter_packs(self, folder: str) -> Iterator[tuple[str, str]]:
+        """Yield owner and prefix of every pack in the folder."""
+        for index_path in sorted((self.root / folder).glob(f'*/*.{INDEX_EXT}')):
+            if not index_path.name.startswith('.'):
+                yield index_path.parent.name, index_path.stem
+
+    def close(self) -> None:
+        """Close all opened packs."""
+        with self._lock:
+            for fd in self._packs.values():
+                os.close(fd)
+            self._packs.clear()
+            self._indexes.clear()
+
+    @staticmethod
+    def _encode_key(key: str) -> bytes:
+        """Return key as stored in the index."""
+        raw_key = key.encode('utf-8')
+        if len(raw_key) > MAX_KEY_LENGTH:
+            msg = f'Key is too long for the pack: {key!r}'
+            raise ValueError(msg)
+        return raw_key
+
+    def _append(self, base: Path, record: bytes) -> None:
+        """Add record to the index, must be called under the lock."""
+        with open(self._with_ext(base, INDEX_EXT), 'ab') as index:
+            size = index.seek(0, os.SEEK_END)
+            if size % _RECORD.size:
+                # tail of interrupted write, would shift all next records
+                index.truncate(size - size % _RECORD.size)
+            index.write(record)
+
+    @staticmethod
+    def _copy_live(
+        pack_path: Path,
+        tmp_pack: Path,
+        tmp_index: Path,
+        entries: dict[str, PackEntry],
+    ) -> None:
+        """Write files that are still in use into new pack."""
+        with (
+            open(pack_path, 'rb') as source,
+            open(tmp_pack, 'wb') as pack,
+            open(tmp_index, 'wb') as index,
+        ):
+            for key, entry in sorted(entries.items(), key=lambda pair: pair[1].offset):
+                data = os.pread(source.fileno(), entry.length, entry.offset)
+                if zlib.crc32(data) != entry.checksum:
+                    msg = f'Checksum mismatch for {key} in {pack_path}'
+                    raise OSError(msg)
+
+                offset = pack.tell()
+                pack.write(data)
+                index.write(
+                    _RECORD.pack(key.encode(), offset, entry.length, entry.checksum, _PRESENT)
+                )
+
+            pack.flush()
+            os.fsync(pack.fileno())
+            index.flush()
+            os.fsync(index.fileno())
+
+    @contextmanager
+    def _exclusive(self, base: Path) -> Iterator[None]:
+        """Hold lock that is shared by all processes writing into the pack.
+
+        Separate file is used because pack and index are replaced
+        by compaction, lock on them would be lost.
+        """
+        with open(self._with_ext(base, LOCK_EXT), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _lookup(self, base: Path, key: str) -> PackEntry | None:
+        """Return location of the file, must be called under the lock.
+
+        Index file is checked only when it was not checked recently
+        or the file is not in the index yet.
+        """
+        index = self._indexes.get(base)
+
+        if index is not None:
+            entry = index.entries.get(key)
+            if entry is not None and time.monotonic() - index.checked_at < self.index_ttl:
+                self._indexes.move_to_end(base)
+                return entry
+
+        return self._refresh(base).entries.get(key)
+
+    def _expire(self, base: Path) -> None:
+        """Make next lookup check the index file again."""
+        with self._lock:
+            index = self._indexes.get(base)
+            if index is not None:
+                self._indexes[base] = index._replace(checked_at=0.0)
+
+    def _refresh(self, base: Path) -> _Index:
+        """Return index of the pack, read new records if there are any."""
+        index_path = self._with_ext(base, INDEX_EXT)
+
+        try:
+            stat = index_path.stat()
+        except FileNotFoundError:
+            self._forget(base)
+            return _Index(inode=0, consumed=0, entries={})
+
+        index = self._indexes.get(base)
+
+        if index is None or index.inode != stat.st_ino:
+            self._forget(base)
+            index = _Index(inode=stat.st_ino, consumed=0, entries={})
+
+        if stat.st_size > index.consumed:
+            with open(index_path, 'rb') as file:
+                file.seek(index.consumed)
+                consumed = _parse_records(file.read(stat.st_size - index.consumed), index.entries)
+            index = index._replace(consumed=index.consumed + consumed)
+
+        index = index._replace(checked_at=time.monotonic())
+        self._indexes[base] = index
+        self._indexes.move_to_end(base)
+        while len(self._indexes) > self.max_cached_indexes:
+            self._indexes.popitem(last=False)
+
+        return index
+
+    def _acquire(self, base: Path) -> int | None:
+        """Return duplicate of the cached descriptor of the pack.
+
+        Caller owns the duplicate, so the cached one could be closed
+        by other threads while the caller is still reading.
+        """
+        fd = self._packs.get(base)
+
+        if fd is None:
+            try:
+                fd = os.open(self._with_ext(base, PACK_EXT), os.O_RDONLY)
+            except FileNotFoundError:
+                return None
+
+            self._packs[base] = fd
+            while len(self._packs) > self.max_open_packs:
+                _, old_fd = self._packs.popitem(last=False)
+                os.close(old_fd)
+        else:
+            self._packs.move_to_end(base)
+
+        return os.dup(fd)
+
+    @staticmethod
+    def _pread(fd: int | None, entry: PackEntry) -> bytes:
+        """Read file from the pack and close the descriptor."""
+        if fd is None:
+            return b''
+
+        try:
+            return os.pread(fd, entry.length, entry.offset)
+        finally:
+            os.close(fd)
+
+    def _forget(self, base: Path) -> None:
+        """Drop cached index and descriptor of the pack."""
+        self._indexes.pop(base, None)
+        fd = self._packs.pop(base, None)
+        if fd is not None:
+            os.close(fd)
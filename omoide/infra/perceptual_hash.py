@@ -0,0 +1,163 @@
+"""Calculation and search of similar 64-bit perceptual hashes.
+
+Hashes are compared using Hamming distance. Lookup uses multi-index
+hashing: hash is split into ``max_distance + 1`` disjoint bands and
+by pigeonhole principle two hashes within ``max_distance`` must have
+at least one identical band.
+"""
+
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Generic
+from typing import TypeVar
+
+from PIL import Image
+from PIL import ImageOps
+
+HASH_BITS = 64
+_HASH_MASK = (1 << HASH_BITS) - 1
+_SIGN_BIT = 1 << (HASH_BITS - 1)
+
+KeyT = TypeVar('KeyT')
+
+
+def distance(left: int, right: int) -> int:
+    """Return Hamming distance between two hashes."""
+    return ((left ^ right) & _HASH_MASK).bit_count()
+
+
+def to_signed(value: int) -> int:
+    """Convert unsigned hash so it could fit into BIGINT column."""
+    value &= _HASH_MASK
+    return value - (1 << HASH_BITS) if value & _SIGN_BIT else value
+
+
+def to_unsigned(value: int) -> int:
+    """Convert value from BIGINT column back into hash."""
+    return value & _HASH_MASK
+
+
+def get_bands(max_distance: int) -> list[tuple[int, int]]:
+    """Return (shift, mask) for every band.
+
+    Two hashes within ``max_distance`` have identical value
+    of ``(value >> shift) & mask`` for at least one band.
+    """
+    total = max_distance + 1
+    base, extra = divmod(HASH_BITS, total)
+    bands: list[tuple[int, int]] = []
+    shift = 0
+
+    for i in range(total):
+        width = base + (1 if i < extra else 0)
+        bands.append((shift, (1 << width) - 1))
+        shift += width
+
+    return bands
+
+
+class MultiIndexHash(Generic[KeyT]):
+    """Index that finds hashes within given Hamming distance."""
+
+    def __init__(self, max_distance: int) -> None:
+        """Initialize instance."""
+        if not 0 <= max_distance < HASH_BITS:
+            msg = f'Distance must be in range [0, {HASH_BITS}), got {max_distance}'
+            raise ValueError(msg)
+
+        self.max_distance = max_distance
+        self._bands = get_bands(max_distance)
+        self._tables: list[defaultdict[int, list[KeyT]]] = [defaultdict(list) for _ in self._bands]
+        self._hashes: dict[KeyT, int] = {}
+
+    def __len__(self) -> int:
+        """Return amount of stored hashes."""
+        return len(self._hashes)
+
+    def add(self, key: KeyT, value: int) -> None:
+        """Store hash."""
+        value = to_unsigned(value)
+        self._hashes[key] = value
+
+        for table, (shift, mask) in zip(self._tables, self._bands, strict=True):
+            table[(value >> shift) & mask].append(key)
+
+    def search(self, value: int) -> list[tuple[KeyT, int]]:
+        """Return keys and distances of all close enough hashes."""
+        value = to_unsigned(value)
+        seen: set[KeyT] = set()
+        result: list[tuple[KeyT, int]] = []
+
+        for table, (shift, mask) in zip(self._tables, self._bands, strict=True):
+            for key in table.get((value >> shift) & mask, ()):
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                delta = distance(value, self._hashes[key])
+
+                if delta <= self.max_distance:
+                    result.append((key, delta))
+
+        result.sort(key=lambda pair: pair[1])
+        return result
+
+
+def group_similar(
+    hashes: Mapping[int, int],
+    max_distance: int,
+) -> list[list[int]]:
+    """Split keys into groups of similar hashes.
+
+    Similarity is transitive here: if A is close to B and B is close to C,
+    all three end up in the same group. Groups with single element are
+    omitted, biggest groups go first.
+    """
+    index: MultiIndexHash[int] = MultiIndexHash(max_distance)
+    parents: dict[int, int] = {}
+
+    def find(key: int) -> int:
+        while parents[key] != key:
+            parents[key] = parents[parents[key]]
+            key = parents[key]
+        return key
+
+    for key, value in hashes.items():
+        parents[key] = key
+
+        for other, _ in index.search(value):
+            root_a, root_b = find(key), find(other)
+            if root_a != root_b:
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+
+        index.add(key, value)
+
+    groups: defaultdict[int, list[int]] = defaultdict(list)
+    for key in hashes:
+        groups[find(key)].append(key)
+
+    return sorted(
+        (sorted(group) for group in groups.values() if len(group) > 1),
+        key=lambda group: (-len(group), group[0]),
+    )
+
+
+def difference_hash(img: Image.Image) -> int:
+    """Calculate 64-bit perceptual hash (dHash) of the image.
+
+    Image is shrunk to 9x8 grayscale and every bit tells if pixel
+    is brighter than its right neighbour. Hash survives resizing,
+    recompression and small colour corrections.
+    """
+    img = ImageOps.exif_transpose(img)
+    small = img.convert('L').resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+    signature = 0
+
+    for row in range(8):
+        for col in range(8):
+            offset = row * 9 + col
+            bit = pixels[offset] > pixels[offset + 1]
+            signature = (signature << 1) | int(bit)
+
+    return signature
@@ -0,0 +1,57 @@
+"""Tiny placeholders shown while real thumbnail is loading."""
+
+import base64
+import io
+from pathlib import Path
+from typing import NamedTuple
+
+from PIL import Image
+
+# few hundred bytes, small enough to be sent inline with item listings
+PLACEHOLDER_SIDE = 16
+PLACEHOLDER_QUALITY = 40
+PALETTE_SIZE = 8
+
+
+class Placeholder(NamedTuple):
+    """Base64 encoded micro JPEG and the dominant colour."""
+
+    image: str
+    color: str
+
+
+def get_dominant_color(img: Image.Image) -> str:
+    """Return most common colour of the image as ``#rrggbb``.
+
+    Colours are reduced to a small palette first, otherwise every pixel
+    of a photo would be unique.
+    """
+    quantized = img.convert('RGB').quantize(colors=PALETTE_SIZE)
+    palette = quantized.getpalette() or []
+    colors = quantized.getcolors() or [(0, 0)]
+    _, index = max(colors)
+    red, green, blue = palette[index * 3 : index * 3 + 3] or (0, 0, 0)
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def make_placeholder(img: Image.Image) -> Placeholder:
+    """Return placeholder for already oriented image."""
+    small = img.convert('RGB')
+    small.thumbnail((PLACEHOLDER_SIDE * 4, PLACEHOLDER_SIDE * 4))
+    color = get_dominant_color(small)
+
+    small.thumbnail((PLACEHOLDER_SIDE, PLACEHOLDER_SIDE))
+    buffer = io.BytesIO()
+    small.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY, optimize=True)
+
+    return Placeholder(
+        image=base64.b64encode(buffer.getvalue()).decode('ascii'),
+        color=color,
+    )
+
+
+def make_placeholder_from_file(path: Path | str) -> Placeholder:
+    """Return placeholder for the image file (thumbnail is enough)."""
+    with Image.open(path) as img:
+        img.draft('RGB', (PLACEHOLDER_SIDE * 4, PLACEHOLDER_SIDE * 4))
+        return make_placeholder(img)
@@ -0,0 +1,58 @@
+"""Small in-memory cache with expiration."""
+
+from collections import OrderedDict
+import time
+from typing import Generic
+from typing import TypeVar
+
+KeyT = TypeVar('KeyT')
+ValueT = TypeVar('ValueT')
+
+
+class TTLCache(Generic[KeyT, ValueT]):
+    """LRU cache where every record lives limited amount of time.
+
+    Cache is local for the process, so it is meant for data where
+    a few seconds of staleness are acceptable.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize instance."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[KeyT, tuple[float, ValueT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return amount of stored records."""
+        return len(self._data)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """Return value if it is still fresh."""
+        record = self._data.get(key)
+
+        if record is None:
+            return None
+
+        expires_at, value = record
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: KeyT, value: ValueT) -> None:
+        """Store value."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: KeyT) -> None:
+        """Forget value."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._data.clear()
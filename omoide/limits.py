@@ -20,6 +20,26 @@ DEF_LAST_SEEN = None
 MIN_AUTOCOMPLETE = 2
 AUTOCOMPLETE_LIMIT = 10
 
+# how many known tags could replace single `prefix*` in search query
+MAX_PREFIX_EXPANSION = 50
+
+# co-occurring tags of search results
+MAX_FACETS = 100
+DEF_FACETS = 20
+
+# Timeline
+MIN_YEAR = 1826
+MAX_YEAR = 9998
+
+# Map
+MIN_CLUSTER_GRID = 1
+MAX_CLUSTER_GRID = 64
+DEF_CLUSTER_GRID = 16
+
+# Duplicates
+MAX_PERCEPTUAL_DISTANCE = 10
+DEF_PERCEPTUAL_DISTANCE = 4
+
 # Items
 MAX_ITEM_FIELD_LENGTH = 256
 MAX_TAGS = 100
@@ -28,6 +48,7 @@ MAX_PERMISSIONS = 100
 # Media
 MAX_MEDIA_SIZE = 1024 * 1024 * 2500  # 2500 MiB
 MAX_MEDIA_SIZE_HR = pu.human_readable_size(MAX_MEDIA_SIZE)
+MAX_FILES_IN_BATCH = 100
 
 SUPPORTED_EXTENSION = frozenset(
     (
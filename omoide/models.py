@@ -207,7 +207,13 @@ class Item(OmoideModel):
 
     extras: dict[str, Any]  # ephemeral attribute
 
-    _ignore_changes: frozenset[str] = frozenset(('id', 'uuid'))
+    # maintained by the database, not supposed to be changed directly
+    children_count: int = 0
+    descendants_count: int = 0
+
+    _ignore_changes: frozenset[str] = frozenset(
+        ('id', 'uuid', 'children_count', 'descendants_count')
+    )
 
     def __eq__(self, other: object) -> bool:
         """Return True if other has the same UUID."""
@@ -275,6 +281,8 @@ class Item(OmoideModel):
             tags=set(obj.tags),
             permissions=set(obj.permissions),
             extras=_extras,
+            children_count=getattr(obj, 'children_count', 0),
+            descendants_count=getattr(obj, 'descendants_count', 0),
         )
 
 
@@ -302,8 +310,30 @@ class Metainfo(OmoideModel):
     thumbnail_width: int | None
     thumbnail_height: int | None
 
+    duration: float | None = None
+    video_codec: str | None = None
+    fps: float | None = None
+    animated_preview_size: int | None = None
+
+    preview_webp_size: int | None = None
+    preview_avif_size: int | None = None
+    thumbnail_webp_size: int | None = None
+    thumbnail_avif_size: int | None = None
+
+    placeholder: str | None = None
+    dominant_color: str | None = None
+
     _ignore_changes: frozenset[str] = frozenset(('item_id',))
 
+    def get_rendition_sizes(self, media_type: str) -> dict[str, int]:
+        """Return sizes of extra formats that exist for given media type."""
+        sizes: dict[str, int] = {}
+        for ext in const.RENDITION_FORMATS:
+            size = getattr(self, f'{media_type}_{ext}_size', None)
+            if size is not None:
+                sizes[ext] = size
+        return sizes
+
     def copy_from(self, obj: 'Metainfo', *, including_content: bool = False) -> None:
         """Copy parameters from given object."""
         self.content_type = obj.content_type
@@ -312,14 +342,25 @@ class Metainfo(OmoideModel):
             self.content_width = obj.content_width
             self.content_height = obj.content_height
             self.content_size = obj.content_size
+            self.duration = obj.duration
+            self.video_codec = obj.video_codec
+            self.fps = obj.fps
 
         self.preview_width = obj.preview_width
         self.preview_height = obj.preview_height
         self.preview_size = obj.preview_size
+        self.preview_webp_size = obj.preview_webp_size
+        self.preview_avif_size = obj.preview_avif_size
+        self.animated_preview_size = obj.animated_preview_size
 
         self.thumbnail_width = obj.thumbnail_width
         self.thumbnail_height = obj.thumbnail_height
         self.thumbnail_size = obj.thumbnail_size
+        self.thumbnail_webp_size = obj.thumbnail_webp_size
+        self.thumbnail_avif_size = obj.thumbnail_avif_size
+
+        self.placeholder = obj.placeholder
+        self.dominant_color = obj.dominant_color
 
         self.updated_at = pu.now()
 
@@ -349,6 +390,16 @@ class Metainfo(OmoideModel):
             preview_height=obj.preview_height,
             thumbnail_width=obj.thumbnail_width,
             thumbnail_height=obj.thumbnail_height,
+            duration=obj.duration,
+            video_codec=obj.video_codec,
+            fps=obj.fps,
+            animated_preview_size=obj.animated_preview_size,
+            preview_webp_size=obj.preview_webp_size,
+            preview_avif_size=obj.preview_avif_size,
+            thumbnail_webp_size=obj.thumbnail_webp_size,
+            thumbnail_avif_size=obj.thumbnail_avif_size,
+            placeholder=obj.placeholder,
+            dominant_color=obj.dominant_color,
         )
 
 
@@ -391,61 +442,6 @@ class Media(OmoideModel):
         )
 
 
-@dataclass
-class SpaceUsage:
-    """Total size of user data for specific user."""
-
-    uuid: UUID
-    content_size: int
-    preview_size: int
-    thumbnail_size: int
-
-    def __str__(self) -> str:
-        """Return textual representation."""
-        name = type(self).__name__
-        return (
-            f'<{name}, uuid={self.uuid}, '
-            f'content={self.content_size_hr}, '
-            f'preview={self.preview_size_hr}, '
-            f'thumbnail={self.thumbnail_size_hr}>'
-        )
-
-    def __repr__(self) -> str:
-        """Return textual representation."""
-        name = type(self).__name__
-        return (
-            f'{name}(uuid={self.uuid!r}, '
-            f'content_size={self.content_size}, '
-            f'preview_size={self.preview_size}, '
-            f'thumbnail_size={self.thumbnail_size})'
-        )
-
-    @classmethod
-    def empty(cls, uuid: UUID) -> Self:
-        """Return result with zero bytes used."""
-        return cls(
-            uuid=uuid,
-            content_size=0,
-            preview_size=0,
-            thumbnail_size=0,
-        )
-
-    @property
-    def content_size_hr(self) -> str:
-        """Return human-readable value."""
-        return pu.human_readable_size(self.content_size)
-
-    @property
-    def preview_size_hr(self) -> str:
-        """Return human-readable value."""
-        return pu.human_readable_size(self.preview_size)
-
-    @property
-    def thumbnail_size_hr(self) -> str:
-        """Return human-readable value."""
-        return pu.human_readable_size(self.thumbnail_size)
-
-
 @dataclass(frozen=True)
 class DiskUsage:
     """Total disk usage of a specific user."""
@@ -504,6 +500,7 @@ class Plan:
     direct: bool
     last_seen: int | None
     limit: int
+    tags_any: list[set[str]] = field(default_factory=list)  # at least one from each group
 
 
 @dataclass
@@ -528,6 +525,29 @@ class Features:
 
     extract_exif: bool | None = None
     last_modified: datetime | None = None
+    animated_preview: bool | None = None
+    content_md5: str | None = None
+    reject_duplicates: bool | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON compatible dictionary."""
+        result = asdict(self)
+        if self.last_modified is not None:
+            result['last_modified'] = self.last_modified.isoformat()
+        return result
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> Self:
+        """Restore from dictionary."""
+        last_modified = raw.get('last_modified')
+        return cls(
+            **{
+                **raw,
+                'last_modified': None
+                if last_modified is None
+                else datetime.fromisoformat(last_modified),
+            }
+        )
 
 
 @dataclass
@@ -544,6 +564,17 @@ class NewFile:
     features: Features = field(default_factory=Features)
 
 
+@dataclass
+class PendingUpload:
+    """Content that is saved in the storage and waits for processing."""
+
+    item: Item
+    content_type: str
+    ext: str
+    oid: int
+    extras: dict[str, Any]
+
+
 @dataclass
 class Exif:
     """Exchangeable Image File Format data."""
@@ -551,6 +582,121 @@ class Exif:
     exif: dict[str, Any]
 
 
+@dataclass(frozen=True)
+class ExifFields:
+    """Typed subset of EXIF data that can be filtered and sorted on."""
+
+    taken_at: datetime | None = None
+    camera_make: str | None = None
+    camera_model: str | None = None
+    width: int | None = None
+    height: int | None = None
+    orientation: int | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """Area on the map, in decimal degrees.
+
+    West could be greater than east if the box crosses the antimeridian.
+    """
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+    @property
+    def crosses_antimeridian(self) -> bool:
+        """Return True if box wraps around 180th meridian."""
+        return self.west > self.east
+
+    @property
+    def width(self) -> float:
+        """Return width of the box in degrees."""
+        if self.crosses_antimeridian:
+            return self.east - self.west + 360.0
+        return self.east - self.west
+
+    @property
+    def height(self) -> float:
+        """Return height of the box in degrees."""
+        return self.north - self.south
+
+
+@dataclass(frozen=True)
+class GeoCluster:
+    """Group of items that are close to each other on the map."""
+
+    latitude: float
+    longitude: float
+    total: int
+    item_uuid: UUID
+
+
+@dataclass(frozen=True)
+class ContactSheetTile:
+    """Position of child thumbnail inside the contact sheet."""
+
+    item_uuid: UUID
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class ContactSheet:
+    """Single image with thumbnails of the first children of a collection."""
+
+    item_id: int
+    version: int
+    source_key: str
+    ext: str
+    width: int
+    height: int
+    tiles: list[ContactSheetTile]
+    updated_at: datetime
+
+
+@dataclass
+class UploadSession:
+    """Upload that is sent in several requests and could be resumed."""
+
+    uuid: UUID
+    owner_id: int
+    item_id: int
+    backend: str
+    oid: int
+    size: int
+    offset: int
+    content_type: str
+    filename: str
+    ext: str
+    features: dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
+    expires_at: datetime
+    writer: UUID | None = None
+    writing_until: datetime | None = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Return True if all bytes were received."""
+        return self.offset == self.size
+
+
+@dataclass(frozen=True)
+class TimelineBucket:
+    """Amount of items taken in given year (and month)."""
+
+    year: int
+    month: int | None
+    total: int
+
+
 @dataclass
 class InputMedia:
     """What we received from user."""
@@ -591,6 +737,7 @@ class Command(StrEnum):
     HARD_DELETE = 'hard_delete'
     COPY_IMAGE = 'copy_image'
     UPLOAD = 'upload'
+    BUILD_CONTACT_SHEET = 'build_contact_sheet'
 
 
 class CommandStatus(StrEnum):
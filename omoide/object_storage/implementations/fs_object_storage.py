@@ -0,0 +1,181 @@
+"""Content storage backed by files in a staging folder."""
+
+import asyncio
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+import os
+from pathlib import Path
+import secrets
+import time
+from typing import Any
+
+import aiofiles
+
+from omoide import custom_logging
+from omoide.infra import blob_store
+from omoide.object_storage.interfaces.abs_object_storage import AbsObjectStorage
+
+LOG = custom_logging.get_logger(__name__)
+
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+# references are locked with pg_try_advisory_lock(int, int)
+_MAX_OID = 2**31 - 1
+
+
+class FilesystemObjectStorage(AbsObjectStorage):
+    """Spool uploads into files of a folder shared with the workers.
+
+    Keeps uploaded bytes out of PostgreSQL: no large objects in WAL and
+    backups. Content is written into a hidden temporary file, flushed
+    to disk and renamed, so the worker never sees a partial file. Name
+    of the file is a random number that is used as ``oid`` everywhere
+    else, so queue records and locks work the same as with large objects.
+
+    If the staging folder is on the same filesystem as the data folder,
+    the worker gets the content as a hard link instead of a copy.
+    """
+
+    backend = 'filesystem'
+
+    def __init__(self, folder: Path) -> None:
+        """Initialize instance."""
+        self.folder = folder
+
+    def get_path(self, oid: int) -> Path:
+        """Return location of the object."""
+        return self.folder / str(oid)
+
+    async def read(self, oid: int) -> AsyncIterator[bytes]:
+        """Load object from the staging folder."""
+        buffer = bytearray(READ_BUFFER_SIZE)
+        view = memoryview(buffer)
+
+        async with aiofiles.open(self.get_path(oid), 'rb', buffering=0) as file:
+            while size := await file.readinto(view):
+                yield bytes(view[:size])
+
+    async def write(self, chunks: AsyncIterable[bytes]) -> dict[str, Any]:
+        """Stream ``chunks`` into a new file and return its OID."""
+        oid, tmp_path = await asyncio.to_thread(self._reserve)
+
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as file:
+                async for chunk in chunks:
+                    if chunk:
+                        await file.write(chunk)
+                await file.flush()
+                await asyncio.to_thread(os.fsync, file.fileno())
+
+            await asyncio.to_thread(self._publish, tmp_path, self.get_path(oid))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return {'oid': oid}
+
+    async def create(self) -> dict[str, Any]:
+        """Create empty file, return its OID."""
+        oid, tmp_path = await asyncio.to_thread(self._reserve)
+
+        try:
+            await asyncio.to_thread(self._publish, tmp_path, self.get_path(oid))
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return {'oid': oid}
+
+    async def write_at(self, oid: int, offset: int, chunks: AsyncIterable[bytes]) -> int:
+        """Write ``chunks`` into existing file starting at ``offset``.
+
+        File is cut back to ``offset`` if iteration fails, so it looks
+        the same as before the call.
+        """
+        written = 0
+
+        async with aiofiles.open(self.get_path(oid), 'r+b') as file:
+            await file.seek(offset)
+
+            try:
+                async for chunk in chunks:
+                    if chunk:
+                        await file.write(chunk)
+                        written += len(chunk)
+            except BaseException:
+                await file.truncate(offset)
+                raise
+
+            await file.flush()
+            await asyncio.to_thread(os.fsync, file.fileno())
+
+        return written
+
+    async def hand_off(self, oid: int, path: Path) -> bool:
+        """Place content at the path, hard link if possible."""
+        method = await asyncio.to_thread(blob_store.clone, self.get_path(oid), path)
+        LOG.debug('Handed off object {} as {}: {}', oid, method, path)
+        return True
+
+    async def delete(self, oid: int) -> None:
+        """Delete file."""
+        try:
+            await asyncio.to_thread(self.get_path(oid).unlink, missing_ok=True)
+        except Exception:
+            LOG.exception('Error deleting staged object {}', oid)
+            raise
+
+    def _reserve(self) -> tuple[int, Path]:
+        """Return new OID and temporary file that was created for it.
+
+        Temporary file is created exclusively, so two writers
+        could not get the same OID.
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        while True:
+            oid = secrets.randbelow(_MAX_OID) + 1
+            tmp_path = self.folder / f'.{oid}.tmp'
+
+            try:
+                # same mode as for regular open(), umask decides the rest
+                os.close(os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            except FileExistsError:
+                continue
+
+            if self.get_path(oid).exists():
+                tmp_path.unlink()
+                continue
+
+            return oid, tmp_path
+
+    def _publish(self, tmp_path: Path, path: Path) -> None:
+        """Make the file visible under its final name."""
+        tmp_path.replace(path)
+
+        # rename itself is durable only after the folder is flushed
+        fd = os.open(self.folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def remove_stale_temporary_files(folder: Path, max_age: float, dry_run: bool) -> list[Path]:
+    """Delete temporary files that were left by interrupted writes.
+
+    Write renames its temporary file or deletes it right away, so
+    a file that was not touched for ``max_age`` seconds belongs
+    to a process that was killed in the middle of a write.
+    """
+    threshold = time.time() - max_age
+    stale = [
+        path
+        for path in folder.glob('.*.tmp')
+        if path.is_file() and path.stat().st_mtime < threshold
+    ]
+
+    for path in stale:
+        LOG.info('Removing stale temporary file {}', path)
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    return stale
@@ -24,6 +24,8 @@ class PgLargeObjectStorage(AbsObjectStorage):
     the ``lo_create`` — no orphan large objects are left behind.
     """
 
+    backend = 'database'
+
     def __init__(self, database: SqlalchemyDatabase) -> None:
         """Initialize instance."""
         self.database = database
@@ -51,6 +53,32 @@ class PgLargeObjectStorage(AbsObjectStorage):
 
         return {'oid': int(lob_oid)}
 
+    async def create(self) -> dict[str, Any]:
+        """Create empty large object, return its OID."""
+        async with self.database.session_maker() as session:
+            lob_oid = await PGLargeObject.create_large_object(session)
+            await session.commit()
+
+        return {'oid': int(lob_oid)}
+
+    async def write_at(self, oid: int, offset: int, chunks: AsyncIterable[bytes]) -> int:
+        """Write ``chunks`` into existing large object starting at ``offset``."""
+        written = 0
+
+        async with self.database.session_maker() as session:
+            pgl = PGLargeObject(session, oid, mode='w')
+            pgl.writes = 0
+            pgl.pos = offset
+
+            async for chunk in chunks:
+                if chunk:
+                    await pgl.write(chunk)
+                    written += len(chunk)
+
+            await session.commit()
+
+        return written
+
     async def delete(self, oid: int) -> None:
         """Delete large object."""
         try:
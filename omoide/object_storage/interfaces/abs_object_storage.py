@@ -3,6 +3,7 @@
 import abc
 from collections.abc import AsyncIterable
 from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import Any
 
 
@@ -10,12 +11,16 @@ class AbsObjectStorage(abc.ABC):
     """Long-term storage for content uploaded by users.
 
     The concrete implementation decides where the bytes live (PostgreSQL
-    large object today, S3 tomorrow) and how the worker will find them
+    large object, files in a staging folder, S3 tomorrow) and how the worker will find them
     later. ``save()`` returns a small reference dict that the caller
     merges into ``queue_input_media.extras``; the worker reads the same
     extras to retrieve the payload.
     """
 
+    # same as ``upload_backend`` setting, saved along with references
+    # that outlive the request, so they are removed from the right place
+    backend: str
+
     @abc.abstractmethod
     def read(self, oid: int) -> AsyncIterator[bytes]:
         """Load large object from the database."""
@@ -29,6 +34,26 @@ class AbsObjectStorage(abc.ABC):
         ``{'s3_key': '...'}`` for S3, etc.).
         """
 
+    @abc.abstractmethod
+    async def create(self) -> dict[str, Any]:
+        """Create empty object that is filled later, return the reference."""
+
+    @abc.abstractmethod
+    async def write_at(self, oid: int, offset: int, chunks: AsyncIterable[bytes]) -> int:
+        """Write ``chunks`` into existing object starting at ``offset``.
+
+        Returns amount of written bytes. Nothing is written when iteration
+        over ``chunks`` raises, so the caller can verify data on the fly.
+        """
+
+    async def hand_off(self, oid: int, path: Path) -> bool:  # noqa: ARG002
+        """Place content of the object at the path without reading it.
+
+        Returns False if storage cannot do that, caller reads the object
+        then. Object itself stays in the storage until it is deleted.
+        """
+        return False
+
     @abc.abstractmethod
     async def delete(self, oid: int) -> None:
         """Delete given object."""
@@ -45,8 +45,20 @@ TAGS_METADATA = [
         'name': 'EXIF',
         'description': 'Operations with item EXIF info.',
     },
+    {
+        'name': 'Timeline',
+        'description': 'Browsing items by the date they were taken.',
+    },
+    {
+        'name': 'Geo',
+        'description': 'Showing items on the map.',
+    },
     {
         'name': 'Actions',
         'description': 'Computationally heavy operations.',
     },
+    {
+        'name': 'Uploads',
+        'description': 'Uploading big files in several requests.',
+    },
 ]
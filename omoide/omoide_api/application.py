@@ -11,13 +11,17 @@ from omoide.exceptions import BaseOmoideError
 from omoide.omoide_api import api_info
 from omoide.omoide_api.actions import actions_controllers
 from omoide.omoide_api.browse import browse_controllers
+from omoide.omoide_api.duplicates import duplicates_controllers
 from omoide.omoide_api.exception_handlers import handle_omoide_error
 from omoide.omoide_api.exif import exif_controllers
+from omoide.omoide_api.geo import geo_controllers
 from omoide.omoide_api.home import home_controllers
 from omoide.omoide_api.info import info_controllers
 from omoide.omoide_api.items import item_controllers
 from omoide.omoide_api.metainfo import metainfo_controllers
 from omoide.omoide_api.search import search_controllers
+from omoide.omoide_api.timeline import timeline_controllers
+from omoide.omoide_api.uploads import upload_controllers
 from omoide.omoide_api.users import user_controllers
 
 
@@ -46,12 +50,16 @@ def apply_api_routes_v1(current_api: FastAPI) -> None:
 
     api_router_v1.include_router(actions_controllers.api_actions_router)
     api_router_v1.include_router(browse_controllers.api_browse_router)
+    api_router_v1.include_router(duplicates_controllers.api_duplicates_router)
     api_router_v1.include_router(exif_controllers.api_exif_router)
+    api_router_v1.include_router(geo_controllers.api_geo_router)
     api_router_v1.include_router(home_controllers.api_home_router)
     api_router_v1.include_router(info_controllers.api_info_router)
     api_router_v1.include_router(item_controllers.api_items_router)
     api_router_v1.include_router(metainfo_controllers.api_metainfo_router)
     api_router_v1.include_router(search_controllers.api_search_router)
+    api_router_v1.include_router(timeline_controllers.api_timeline_router)
+    api_router_v1.include_router(upload_controllers.api_uploads_router)
     api_router_v1.include_router(user_controllers.api_users_router)
 
     current_api.include_router(api_router_v1)
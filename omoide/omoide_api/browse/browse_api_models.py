@@ -0,0 +1,51 @@
+"""Web level API models."""
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ContactSheetTileOutput(BaseModel):
+    """Position of child thumbnail inside the contact sheet."""
+
+    item_uuid: UUID
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class ContactSheetOutput(BaseModel):
+    """Single image with thumbnails of the first children of a collection."""
+
+    url: str | None
+    version: int
+    width: int
+    height: int
+    is_stale: bool
+    tiles: list[ContactSheetTileOutput]
+
+    model_config = {
+        'json_schema_extra': {
+            'examples': [
+                {
+                    'url': '/content/contact_sheet/3/'
+                    '92b0fece-1db6-4c3b-8d1e-3d5f0a7b1e2c/f8/'
+                    'f8a2b4c6-d8e0-4f12-a345-6789abcdef01.webp',
+                    'version': 3,
+                    'width': 1600,
+                    'height': 320,
+                    'is_stale': False,
+                    'tiles': [
+                        {
+                            'item_uuid': '0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d',
+                            'x': 0,
+                            'y': 0,
+                            'width': 160,
+                            'height': 160,
+                        },
+                    ],
+                }
+            ],
+        },
+    }
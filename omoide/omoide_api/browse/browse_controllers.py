@@ -14,6 +14,8 @@ from omoide import limits
 from omoide import models
 from omoide.database import interfaces as db_interfaces
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.locators import WebLocator
+from omoide.omoide_api.browse import browse_api_models
 from omoide.omoide_api.browse import browse_use_cases
 from omoide.omoide_api.common import common_api_models
 
@@ -62,3 +64,66 @@ async def api_browse(  # noqa: PLR0913
         duration=result.duration,
         items=common_api_models.convert_items(result.items, result.users_map),
     )
+
+
+@api_browse_router.get(
+    '/{item_uuid}/contact-sheet',
+    summary='Get contact sheet of the collection',
+    status_code=status.HTTP_200_OK,
+    response_model=browse_api_models.ContactSheetOutput,
+)
+async def api_get_contact_sheet(  # noqa: PLR0913,PLR0917
+    item_uuid: UUID,
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    contact_sheets_repo: db_interfaces.AbsContactSheetsRepo = Depends(dep.get_contact_sheets_repo),
+    commands_repo: db_interfaces.AbsCommandsRepo = Depends(dep.get_commands_repo),
+    locator: WebLocator = Depends(dep.get_web_locator),
+) -> browse_api_models.ContactSheetOutput:
+    """Get contact sheet of the collection.
+
+    Contact sheet is a single image with square thumbnails of the first
+    children, tiles describe where each of them is. This allows to render
+    the whole grid with one image request.
+
+    Sheet is built in background. If children changed, rebuild is requested
+    and previous version (or nothing, `url` is null then) is returned with
+    `is_stale` set. Clients may ask again later.
+    """
+    use_case = browse_use_cases.GetContactSheetUseCase(
+        database, users_repo, items_repo, contact_sheets_repo, commands_repo
+    )
+
+    result = await use_case.execute(user, item_uuid)
+
+    if result.sheet is None:
+        return browse_api_models.ContactSheetOutput(
+            url=None,
+            version=0,
+            width=0,
+            height=0,
+            is_stale=result.is_stale,
+            tiles=[],
+        )
+
+    return browse_api_models.ContactSheetOutput(
+        url=locator.get_contact_sheet_location(result.item, result.sheet)
+        if result.sheet.tiles
+        else None,
+        version=result.sheet.version,
+        width=result.sheet.width,
+        height=result.sheet.height,
+        is_stale=result.is_stale,
+        tiles=[
+            browse_api_models.ContactSheetTileOutput(
+                item_uuid=tile.item_uuid,
+                x=tile.x,
+                y=tile.y,
+                width=tile.width,
+                height=tile.height,
+            )
+            for tile in result.sheet.tiles
+        ],
+    )
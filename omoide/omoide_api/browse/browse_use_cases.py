@@ -4,9 +4,12 @@ import time
 from typing import NamedTuple
 from uuid import UUID
 
+from omoide import const
 from omoide import models
 from omoide.database import interfaces as db_interfaces
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain import contact_sheet
+from omoide.domain import ensure
 
 
 class BrowseResult(NamedTuple):
@@ -59,3 +62,58 @@ class ApiBrowseUseCase:
         duration = time.perf_counter() - start
 
         return BrowseResult(duration=duration, items=items, users_map=users_map)
+
+
+class ContactSheetResult(NamedTuple):
+    """Stored contact sheet and whether it reflects current children."""
+
+    item: models.Item
+    sheet: models.ContactSheet | None
+    is_stale: bool
+
+
+class GetContactSheetUseCase:
+    """Use case for getting contact sheet of the collection."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        users: db_interfaces.AbsUsersRepo,
+        items: db_interfaces.AbsItemsRepo,
+        contact_sheets: db_interfaces.AbsContactSheetsRepo,
+        commands: db_interfaces.AbsCommandsRepo,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.users = users
+        self.items = items
+        self.contact_sheets = contact_sheets
+        self.commands = commands
+
+    async def execute(self, user: models.User, item_uuid: UUID) -> ContactSheetResult:
+        """Return contact sheet, ask for a rebuild if children changed.
+
+        Outdated sheet is still returned, it is better than nothing
+        and the new one will be ready on one of the next requests.
+        Unless it shows children that are no longer allowed to be there.
+        """
+        async with self.database.transaction() as conn:
+            item = await self.items.get_by_uuid(conn, item_uuid)
+            ensure.can_see(user, item, 'You are not allowed to see this item')
+
+            sheet = await self.contact_sheets.get_by_item(conn, item)
+            source = await self.contact_sheets.get_source(
+                conn, item, limit=const.CONTACT_SHEET_SIZE
+            )
+            is_stale = sheet is None or sheet.source_key != contact_sheet.get_source_key(source)
+
+            if is_stale:
+                requested_by = user
+                if user.is_anon:
+                    requested_by = await self.users.get_by_id(conn, item.owner_id)
+                await self.commands.build_contact_sheet(conn, requested_by, item)
+
+        if sheet is not None and not contact_sheet.is_covered(sheet, source):
+            sheet = None
+
+        return ContactSheetResult(item=item, sheet=sheet, is_stale=is_stale)
@@ -65,6 +65,8 @@ class ItemOutput(BaseModel):
     content_ext: str | None
     preview_ext: str | None
     thumbnail_ext: str | None
+    children_count: int = 0
+    descendants_count: int = 0
     tags: list[str] = []
     permissions: list[Permission] = []
     extras: dict[str, Any] = {}
@@ -81,6 +83,8 @@ DEFAULT_ITEM_EXAMPLE: JsonDict = {
     'content_ext': 'jpg',
     'preview_ext': 'jpg',
     'thumbnail_ext': 'jpg',
+    'children_count': 0,
+    'descendants_count': 0,
     'tags': ['cats'],
     'permissions': ['2e81dc5a-fdc9-45ee-bd78-f276328a14bf'],
     'extras': {
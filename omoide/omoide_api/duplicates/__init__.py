@@ -0,0 +1 @@
+"""Duplicates related API operations."""
@@ -0,0 +1,49 @@
+"""Web level API models."""
+
+from pydantic import BaseModel
+
+from omoide import models
+from omoide.omoide_api.common import common_api_models
+
+
+class DuplicateExampleOutput(BaseModel):
+    """One duplicated item with its parents (root first)."""
+
+    item: common_api_models.ItemOutput
+    parents: list[common_api_models.ItemOutput]
+
+
+class DuplicateOutput(BaseModel):
+    """Group of items with same or similar content."""
+
+    signature: str
+    examples: list[DuplicateExampleOutput]
+
+
+class ManyDuplicatesOutput(BaseModel):
+    """Response with one page of duplicate groups."""
+
+    duration: float
+    offset: int
+    limit: int
+    duplicates: list[DuplicateOutput]
+
+
+def convert_duplicates(
+    duplicates: list[models.Duplicate],
+    users: dict[int, models.User | None],
+) -> list[DuplicateOutput]:
+    """Convert domain-level duplicates into API format."""
+    return [
+        DuplicateOutput(
+            signature=duplicate.signature,
+            examples=[
+                DuplicateExampleOutput(
+                    item=common_api_models.convert_item(example.item, users),
+                    parents=common_api_models.convert_items(example.parents, users),
+                )
+                for example in duplicate.examples
+            ],
+        )
+        for duplicate in duplicates
+    ]
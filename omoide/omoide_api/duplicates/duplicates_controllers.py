@@ -0,0 +1,72 @@
+"""Duplicates related API operations."""
+
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from fastapi import status
+
+from omoide import dependencies as dep
+from omoide import limits
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.ttl_cache import TTLCache
+from omoide.omoide_api.duplicates import duplicates_api_models
+from omoide.omoide_api.duplicates import duplicates_use_cases
+
+api_duplicates_router = APIRouter(prefix='/duplicates', tags=['Duplicates'])
+
+
+@api_duplicates_router.get(
+    '',
+    summary='Find duplicated items of the current user',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'description': 'Ok'},
+        status.HTTP_401_UNAUTHORIZED: {'description': 'Anonymous user'},
+        status.HTTP_403_FORBIDDEN: {'description': 'Permission denied'},
+        status.HTTP_404_NOT_FOUND: {'description': 'Object does not exist'},
+    },
+    response_model=duplicates_api_models.ManyDuplicatesOutput,
+)
+async def api_get_duplicates(  # noqa: PLR0913,PLR0917
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    duplicates_repo: db_interfaces.AbsDuplicatesRepo = Depends(dep.get_duplicates_repo),
+    similar_cache: TTLCache[tuple, list[tuple[str, list[int]]]] = Depends(dep.get_similar_cache),
+    item_uuid: Annotated[UUID | None, Query()] = None,
+    kind: Annotated[duplicates_use_cases.DUPLICATES_KIND, Query()] = 'exact',
+    max_distance: Annotated[
+        int, Query(ge=0, le=limits.MAX_PERCEPTUAL_DISTANCE)
+    ] = limits.DEF_PERCEPTUAL_DISTANCE,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
+) -> duplicates_api_models.ManyDuplicatesOutput:
+    """Find duplicated items of the current user.
+
+    Kind `exact` groups items with identical content (same MD5 signature).
+    Kind `similar` groups items with close perceptual hashes, it finds
+    resized or recompressed copies of the same image, `max_distance`
+    is the allowed amount of different bits in 64-bit hash.
+
+    Search can be limited to descendants of the given item. Groups of
+    similar items are kept for a few minutes, so next pages are fast,
+    but changes made meanwhile may not show up right away.
+    """
+    use_case = duplicates_use_cases.ApiDuplicatesUseCase(
+        database, items_repo, users_repo, duplicates_repo, similar_cache
+    )
+
+    result = await use_case.execute(user, item_uuid, kind, max_distance, offset, limit)
+
+    return duplicates_api_models.ManyDuplicatesOutput(
+        duration=result.duration,
+        offset=offset,
+        limit=limit,
+        duplicates=duplicates_api_models.convert_duplicates(result.duplicates, result.users_map),
+    )
@@ -0,0 +1,105 @@
+"""Use cases for duplicates search."""
+
+import time
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+from uuid import UUID
+
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain import ensure
+from omoide.infra import perceptual_hash
+from omoide.infra.ttl_cache import TTLCache
+
+DUPLICATES_KIND = Literal['exact', 'similar']
+
+
+class DuplicatesResult(NamedTuple):
+    """Page of duplicate groups with users referenced and elapsed time."""
+
+    duration: float
+    duplicates: list[models.Duplicate]
+    users_map: dict[int, models.User | None]
+
+
+class ApiDuplicatesUseCase:
+    """Use case for duplicates search."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        items: db_interfaces.AbsItemsRepo,
+        users: db_interfaces.AbsUsersRepo,
+        duplicates: db_interfaces.AbsDuplicatesRepo,
+        similar_cache: TTLCache[tuple, list[tuple[str, list[int]]]],
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.items = items
+        self.users = users
+        self.duplicates = duplicates
+        self.similar_cache = similar_cache
+
+    async def execute(  # noqa: PLR0913
+        self,
+        user: models.User,
+        item_uuid: UUID | None,
+        kind: DUPLICATES_KIND,
+        max_distance: int,
+        offset: int,
+        limit: int,
+    ) -> DuplicatesResult:
+        """Execute."""
+        ensure.registered(user, 'Anonymous users have no duplicates')
+        start = time.perf_counter()
+
+        async with self.database.transaction() as conn:
+            if item_uuid is None:
+                item = None
+            else:
+                item = await self.items.get_by_uuid(conn, item_uuid)
+                ensure.owner(user, item, f'You must own item {item_uuid} to search in it')
+
+            if kind == 'exact':
+                groups = await self.duplicates.get_md5_groups(conn, user, item, offset, limit)
+            else:
+                similar = await self.get_similar(conn, user, item, max_distance)
+                groups = similar[offset : offset + limit]
+
+            duplicates = await self.duplicates.resolve_groups(conn, groups)
+
+            items = [
+                each
+                for duplicate in duplicates
+                for example in duplicate.examples
+                for each in (example.item, *example.parents)
+            ]
+            users_map = await self.users.get_map(conn, items)
+
+        duration = time.perf_counter() - start
+        return DuplicatesResult(duration=duration, duplicates=duplicates, users_map=users_map)
+
+    async def get_similar(
+        self,
+        conn: Any,
+        user: models.User,
+        item: models.Item | None,
+        max_distance: int,
+    ) -> list[tuple[str, list[int]]]:
+        """Return all groups of similar items, reuse them for next pages."""
+        key = (user.id, None if item is None else item.id, max_distance)
+        similar = self.similar_cache.get(key)
+
+        if similar is None:
+            signatures = await self.duplicates.get_perceptual_signatures(
+                conn, user, item, max_distance
+            )
+            similar = [
+                (f'{signatures[ids[0]]:016x}', ids)
+                for ids in perceptual_hash.group_similar(signatures, max_distance)
+            ]
+            self.similar_cache.set(key, similar)
+
+        return similar
@@ -0,0 +1,52 @@
+"""Web level API models."""
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from omoide.omoide_api.common import common_api_models
+
+
+class LocationOutput(BaseModel):
+    """Coordinates of the item in decimal degrees."""
+
+    latitude: float
+    longitude: float
+
+
+class GeoItemsOutput(common_api_models.ManyItemsOutput):
+    """Items inside the bounding box along with their coordinates."""
+
+    locations: list[LocationOutput]
+
+
+class ClusterOutput(BaseModel):
+    """Group of items that are close to each other."""
+
+    latitude: float
+    longitude: float
+    total: int
+    item_uuid: UUID
+
+
+class ClustersOutput(BaseModel):
+    """Items inside the bounding box grouped by proximity."""
+
+    clusters: list[ClusterOutput]
+
+    model_config = {
+        'json_schema_extra': {
+            'examples': [
+                {
+                    'clusters': [
+                        {
+                            'latitude': 55.7558,
+                            'longitude': 37.6173,
+                            'total': 120,
+                            'item_uuid': 'f8a2b4c6-d8e0-4f12-a345-6789abcdef01',
+                        },
+                    ],
+                }
+            ],
+        }
+    }
@@ -0,0 +1,111 @@
+"""API operations that show items on the map."""
+
+from typing import Annotated
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from fastapi import status
+
+from omoide import dependencies as dep
+from omoide import limits
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.omoide_api.common import common_api_models
+from omoide.omoide_api.geo import geo_api_models
+from omoide.omoide_api.geo import geo_use_cases
+
+api_geo_router = APIRouter(prefix='/geo', tags=['Geo'])
+
+Latitude = Annotated[float, Query(ge=-90.0, le=90.0)]
+Longitude = Annotated[float, Query(ge=-180.0, le=180.0)]
+
+
+@api_geo_router.get(
+    '/items',
+    summary='Return items inside the bounding box',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'description': 'Ok'},
+        status.HTTP_400_BAD_REQUEST: {'description': 'Invalid bounding box'},
+    },
+    response_model=geo_api_models.GeoItemsOutput,
+)
+async def api_geo_items(  # noqa: PLR0913,PLR0917
+    south: Latitude,
+    west: Longitude,
+    north: Latitude,
+    east: Longitude,
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
+) -> geo_api_models.GeoItemsOutput:
+    """Return items inside the bounding box.
+
+    Coordinates are taken from EXIF GPS data. Box may cross
+    the antimeridian, in this case `west` is greater than `east`.
+    Most recent items come first.
+    """
+    use_case = geo_use_cases.ApiGeoItemsUseCase(database, users_repo, exif_repo)
+    box = models.BoundingBox(south=south, west=west, north=north, east=east)
+
+    result = await use_case.execute(user, box, limit)
+
+    return geo_api_models.GeoItemsOutput(
+        items=common_api_models.convert_items(result.items, result.users_map),
+        locations=[
+            geo_api_models.LocationOutput(latitude=latitude, longitude=longitude)
+            for latitude, longitude in result.locations
+        ],
+    )
+
+
+@api_geo_router.get(
+    '/clusters',
+    summary='Return items inside the bounding box grouped by proximity',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'description': 'Ok'},
+        status.HTTP_400_BAD_REQUEST: {'description': 'Invalid bounding box'},
+    },
+    response_model=geo_api_models.ClustersOutput,
+)
+async def api_geo_clusters(  # noqa: PLR0913,PLR0917
+    south: Latitude,
+    west: Longitude,
+    north: Latitude,
+    east: Longitude,
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    grid: Annotated[
+        int,
+        Query(ge=limits.MIN_CLUSTER_GRID, le=limits.MAX_CLUSTER_GRID),
+    ] = limits.DEF_CLUSTER_GRID,
+) -> geo_api_models.ClustersOutput:
+    """Return items inside the bounding box grouped by proximity.
+
+    Box is split into `grid` x `grid` cells, every non-empty cell
+    becomes a cluster placed in the average position of its items.
+    Each cluster is represented by its most recent item.
+    """
+    use_case = geo_use_cases.ApiGeoClustersUseCase(database, users_repo, exif_repo)
+    box = models.BoundingBox(south=south, west=west, north=north, east=east)
+
+    clusters = await use_case.execute(user, box, grid)
+
+    return geo_api_models.ClustersOutput(
+        clusters=[
+            geo_api_models.ClusterOutput(
+                latitude=cluster.latitude,
+                longitude=cluster.longitude,
+                total=cluster.total,
+                item_uuid=cluster.item_uuid,
+            )
+            for cluster in clusters
+        ]
+    )
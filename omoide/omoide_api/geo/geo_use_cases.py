@@ -0,0 +1,78 @@
+"""Use cases for showing items on the map."""
+
+from typing import NamedTuple
+
+from omoide import exceptions
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+
+
+class GeoItemsResult(NamedTuple):
+    """Items inside the bounding box with their coordinates."""
+
+    items: list[models.Item]
+    locations: list[tuple[float, float]]
+    users_map: dict[int, models.User | None]
+
+
+class BaseGeoUseCase:
+    """Base use case class."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        users: db_interfaces.AbsUsersRepo,
+        exif: db_interfaces.AbsEXIFRepo,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.users = users
+        self.exif = exif
+
+    @staticmethod
+    def ensure_valid(box: models.BoundingBox) -> None:
+        """Raise if box makes no sense."""
+        if box.south > box.north:
+            msg = 'South border of the box must not be above the north one'
+            raise exceptions.InvalidInputError(msg)
+
+
+class ApiGeoItemsUseCase(BaseGeoUseCase):
+    """Return visible items inside the bounding box."""
+
+    async def execute(
+        self,
+        user: models.User,
+        box: models.BoundingBox,
+        limit: int,
+    ) -> GeoItemsResult:
+        """Execute."""
+        self.ensure_valid(box)
+
+        async with self.database.transaction() as conn:
+            found = await self.exif.get_in_box(conn, user, box, limit)
+            items = [item for item, _, _ in found]
+            users_map = await self.users.get_map(conn, items)
+
+        return GeoItemsResult(
+            items=items,
+            locations=[(latitude, longitude) for _, latitude, longitude in found],
+            users_map=users_map,
+        )
+
+
+class ApiGeoClustersUseCase(BaseGeoUseCase):
+    """Return visible items inside the bounding box grouped by proximity."""
+
+    async def execute(
+        self,
+        user: models.User,
+        box: models.BoundingBox,
+        grid: int,
+    ) -> list[models.GeoCluster]:
+        """Execute."""
+        self.ensure_valid(box)
+
+        async with self.database.transaction() as conn:
+            return await self.exif.get_clusters(conn, user, box, grid)
@@ -15,6 +15,7 @@ from pydantic import model_validator
 
 from omoide import const
 from omoide import custom_logging
+from omoide import exceptions
 from omoide import limits
 from omoide import models
 
@@ -95,6 +96,31 @@ class PermissionsInput(BaseModel):
     apply_to_children_as: const.ApplyAs = const.ApplyAs.DELTA
 
 
+class UploadedItemOutput(BaseModel):
+    """What happened to the content of one item in batch upload."""
+
+    item_uuid: UUID
+    operation_id: int | None
+    duplicate_uuid: UUID | None
+
+
+class ManyUploadsOutput(BaseModel):
+    """Result of batch upload."""
+
+    result: str
+    items: list[UploadedItemOutput]
+
+
+def get_upload_ext(filename: str) -> str:
+    """Return extension of uploaded file if it is supported."""
+    ext = filename.lower().split('.')[-1]
+    if ext not in limits.SUPPORTED_EXTENSION:
+        extensions = ', '.join(sorted(limits.SUPPORTED_EXTENSION))
+        msg = f'Only support extensions {extensions}, got {ext!r}'
+        raise exceptions.InvalidInputError(msg)
+    return ext
+
+
 def extract_features(request: Request) -> models.Features:
     """Extract features from headers."""
     headers = {key.lower(): value for key, value in request.headers.items()}
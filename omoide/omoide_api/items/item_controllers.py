@@ -21,6 +21,7 @@ from omoide import limits
 from omoide import models
 from omoide.database import interfaces as db_interfaces
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra import multipart_stream
 from omoide.object_storage import interfaces as object_interfaces
 from omoide.omoide_api.common import common_api_models
 from omoide.omoide_api.items import item_api_models
@@ -320,12 +321,15 @@ async def api_item_update_permissions(  # noqa: PLR0913
     items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
     users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
     misc_repo: db_interfaces.AbsMiscRepo = Depends(dep.get_misc_repo),
+    tags_repo: db_interfaces.AbsTagsRepo = Depends(dep.get_tags_repo),
 ) -> dict[str, Any]:
     """Change permissions for given item.
 
     Can affect parents and children.
     """
-    use_case = item_use_cases.ChangePermissionsUseCase(database, items_repo, users_repo, misc_repo)
+    use_case = item_use_cases.ChangePermissionsUseCase(
+        database, items_repo, users_repo, misc_repo, tags_repo
+    )
 
     operation_id = await use_case.execute(
         user=user,
@@ -346,6 +350,90 @@ async def api_item_update_permissions(  # noqa: PLR0913
     }
 
 
+@api_items_router.put(
+    '/bulk/upload',
+    summary='Store content data for many items',
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=item_api_models.ManyUploadsOutput,
+)
+async def api_upload_many_items(  # noqa: PLR0913,PLR0917
+    request: Request,
+    item_uuid: Annotated[list[UUID], Query(max_length=limits.MAX_FILES_IN_BATCH)],
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    misc_repo: db_interfaces.AbsMiscRepo = Depends(dep.get_misc_repo),
+    commands_repo: db_interfaces.AbsCommandsRepo = Depends(dep.get_commands_repo),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+) -> item_api_models.ManyUploadsOutput:
+    """Store content data for several items in one multipart request.
+
+    Every item listed in ``item_uuid`` must get exactly one file part,
+    named after the item UUID. Parts are stored as they arrive and
+    ``X-Feature-*`` headers apply to all of them.
+    """
+    use_case = item_use_cases.UploadManyItemsUseCase(
+        database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+    )
+    features = item_api_models.extract_features(request)
+
+    async def _limited(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        # every file has its own size limit, same as in single upload
+        total = 0
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > limits.MAX_MEDIA_SIZE:
+                msg = f'Maximum upload size is {limits.MAX_MEDIA_SIZE_HR}'
+                raise exceptions.NotAllowedError(msg)
+            yield chunk
+
+    async def _parts() -> AsyncIterator[tuple[UUID, models.NewFile, AsyncIterator[bytes]]]:
+        try:
+            async for part in multipart_stream.iter_parts(
+                request.headers.get('content-type'), request.stream()
+            ):
+                try:
+                    part_uuid = UUID(part.name)
+                except ValueError as exc:
+                    msg = 'Name of the part must be UUID of the item, got {name!r}'
+                    raise exceptions.InvalidInputError(msg, name=part.name) from exc
+
+                filename = str(part.filename)
+                file = models.NewFile(
+                    content_type=part.content_type,
+                    filename=filename,
+                    ext=item_api_models.get_upload_ext(filename),
+                    features=features,
+                )
+                yield part_uuid, file, _limited(part.body)
+        except multipart_stream.MultipartError as exc:
+            raise exceptions.InvalidInputError(str(exc)) from exc
+
+    results = await use_case.execute(user=user, item_uuids=item_uuid, parts=_parts())
+
+    return item_api_models.ManyUploadsOutput(
+        result='enqueued content adding',
+        items=[
+            item_api_models.UploadedItemOutput(
+                item_uuid=item.uuid,
+                operation_id=result.operation_id,
+                duplicate_uuid=result.duplicate.uuid if result.duplicate else None,
+            )
+            for item, result in results
+        ],
+    )
+
+
 @api_items_router.put(
     '/{item_uuid}/upload',
     summary='Store content data for given item',
@@ -363,8 +451,16 @@ async def api_upload_item(  # noqa: PLR0913
     misc_repo: db_interfaces.AbsMiscRepo = Depends(dep.get_misc_repo),
     commands_repo: db_interfaces.AbsCommandsRepo = Depends(dep.get_commands_repo),
     object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
 ) -> dict[str, Any]:
-    """Store content data for given item."""
+    """Store content data for given item.
+
+    Content that the owner already has in another item is not converted
+    again, files of that item are copied instead. Send the MD5 of the
+    file in ``X-Feature-Content-Md5`` to skip storing the body of such
+    upload and ``X-Feature-Reject-Duplicates: true`` to get 409 instead.
+    """
     # Early rejection based on the declared Content-Length. Handles a
     # missing/invalid header gracefully — the in-stream counter below is
     # the ultimate line of defence, but we still want to spare bandwidth
@@ -380,14 +476,17 @@ async def api_upload_item(  # noqa: PLR0913
             msg = f'Maximum upload size is {limits.MAX_MEDIA_SIZE_HR}'
             raise exceptions.NotAllowedError(msg)
 
-    ext = str(file.filename).lower().split('.')[-1]
-    if ext not in limits.SUPPORTED_EXTENSION:
-        extensions = ', '.join(sorted(limits.SUPPORTED_EXTENSION))
-        msg = f'Only support extensions {extensions}, got {ext!r}'
-        raise exceptions.InvalidInputError(msg)
+    ext = item_api_models.get_upload_ext(str(file.filename))
 
     use_case = item_use_cases.UploadItemUseCase(
-        database, items_repo, meta_repo, misc_repo, commands_repo, object_storage
+        database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
     )
     features = item_api_models.extract_features(request)
 
@@ -409,7 +508,7 @@ async def api_upload_item(  # noqa: PLR0913
                 raise exceptions.NotAllowedError(msg)
             yield chunk
 
-    await use_case.execute(
+    result = await use_case.execute(
         user=user,
         item_uuid=item_uuid,
         file=models.NewFile(
@@ -421,4 +520,11 @@ async def api_upload_item(  # noqa: PLR0913
         chunks=_chunks(),
     )
 
+    if result.duplicate is not None:
+        return {
+            'result': 'enqueued copying from duplicate',
+            'item_uuid': str(item_uuid),
+            'duplicate_uuid': str(result.duplicate.uuid),
+        }
+
     return {'result': 'enqueued content adding', 'item_uuid': str(item_uuid)}
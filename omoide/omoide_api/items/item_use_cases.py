@@ -2,7 +2,10 @@
 
 from collections.abc import AsyncIterable
 from collections.abc import AsyncIterator
+from collections.abc import Collection
 from contextlib import asynccontextmanager
+import hashlib
+import re
 from typing import Any
 from typing import Literal
 from typing import NamedTuple
@@ -14,6 +17,7 @@ import python_utilz as pu
 from omoide import const
 from omoide import custom_logging
 from omoide import exceptions
+from omoide import limits
 from omoide import models
 from omoide import utils
 from omoide.database import interfaces as db_interfaces
@@ -23,6 +27,8 @@ from omoide.object_storage import interfaces as object_interfaces
 
 LOG = custom_logging.get_logger(__name__)
 
+MD5_PATTERN = re.compile('[0-9a-f]{32}')
+
 
 class ItemResult(NamedTuple):
     """Single-item lookup result with users referenced by its permissions."""
@@ -38,6 +44,13 @@ class ItemsResult(NamedTuple):
     users_map: dict[int, models.User | None]
 
 
+class UploadResult(NamedTuple):
+    """Enqueued operation and the item with same content, if there was one."""
+
+    operation_id: int | None
+    duplicate: models.Item | None
+
+
 class BaseItemUseCase:
     """Cache helpers and tag-propagation logic shared between item use cases.
 
@@ -283,6 +296,9 @@ class CreateManyItemsUseCase(BaseItemUseCase):
                 new_users = await self.update_tags(user, item, conn)
                 users_map.update(new_users)
 
+        async with self.database.transaction() as conn:
+            await self.tags.bump_generation(conn)
+
         LOG.info(
             'User {user} created {total} items: {items}',
             user=user,
@@ -710,6 +726,9 @@ class DeleteItemUseCase(BaseItemUseCase):
                 await self.meta.soft_delete(conn, member_metainfo)
                 await self.items.soft_delete(conn, member)
 
+        async with self.database.transaction() as conn:
+            await self.tags.bump_generation(conn)
+
         return switch_to
 
 
@@ -724,6 +743,8 @@ class UploadItemUseCase(BaseItemUseCase):
         misc: db_interfaces.AbsMiscRepo,
         commands_repo: db_interfaces.AbsCommandsRepo,
         object_storage: object_interfaces.AbsObjectStorage,
+        signatures: db_interfaces.AbsSignaturesRepo,
+        exif: db_interfaces.AbsEXIFRepo,
     ) -> None:
         """Initialize instance."""
         super().__init__()
@@ -733,6 +754,8 @@ class UploadItemUseCase(BaseItemUseCase):
         self.misc = misc
         self.commands = commands_repo
         self.object_storage = object_storage
+        self.signatures = signatures
+        self.exif = exif
 
     async def execute(
         self,
@@ -740,31 +763,121 @@ class UploadItemUseCase(BaseItemUseCase):
         item_uuid: UUID,
         file: models.NewFile,
         chunks: AsyncIterable[bytes],
-    ) -> int | None:
+    ) -> UploadResult:
         """Execute."""
         ensure.registered(
             user,
             'Anonymous users are not allowed to upload items',
         )
 
+        declared_md5 = self.get_declared_md5(file)
+
         # Pre-flight ownership check before the HTTP body is consumed.
         # Failing here avoids streaming the payload only to reject it.
         async with self.database.transaction() as conn:
-            item = await self.items.get_by_uuid(conn, item_uuid)
-            ensure.owner(
-                user,
-                item,
-                "You cannot upload media to someone else's item",
-            )
+            item = await self.get_target(conn, user, item_uuid)
+
+            duplicate = None
+            if declared_md5 is not None:
+                duplicate = await self._find_duplicate(conn, user, item, declared_md5)
+
+        # Client told us what it is going to send and we already have it
+        if duplicate is not None and declared_md5 is not None:
+            return await self._use_duplicate(user, item, file, duplicate, declared_md5)
 
         # Stream the upload into long-term storage with no DB transaction
         # held; the storage commits on its own session.
-        reference = await self.object_storage.write(chunks)
+        digest = hashlib.md5()  # noqa: S324
+        reference = await self.object_storage.write(_hash_chunks(chunks, digest))
         oid = reference['oid']
         LOG.info('Saved upload for item {} as {}', item.uuid, oid)
 
+        return await self.enqueue(user, item, file, oid, digest.hexdigest())
+
+    @staticmethod
+    def get_declared_md5(file: models.NewFile) -> str | None:
+        """Return MD5 that client promised to send, if any."""
+        declared_md5 = file.features.content_md5
+
+        if declared_md5 is None:
+            return None
+
+        declared_md5 = declared_md5.lower()
+        if MD5_PATTERN.fullmatch(declared_md5) is None:
+            msg = 'Declared MD5 hash must be 32 hexadecimal digits'
+            raise exceptions.InvalidInputError(msg)
+
+        return declared_md5
+
+    @staticmethod
+    def make_pending_upload(
+        item: models.Item,
+        file: models.NewFile,
+        oid: int,
+        ancestors: list[int],
+    ) -> models.PendingUpload:
+        """Return content that waits for processing."""
+        return models.PendingUpload(
+            item=item,
+            content_type=file.content_type,
+            ext='jpg' if file.ext == 'jpeg' else file.ext,
+            oid=oid,
+            extras={
+                'extract_exif': file.features.extract_exif,
+                'animated_preview': file.features.animated_preview,
+                'ancestors': ancestors,
+            },
+        )
+
+    async def get_target(self, conn: Any, user: models.User, item_uuid: UUID) -> models.Item:
+        """Return item that is going to get the content."""
+        item = await self.items.get_by_uuid(conn, item_uuid)
+        ensure.owner(
+            user,
+            item,
+            "You cannot upload media to someone else's item",
+        )
+        return item
+
+    async def enqueue(
+        self,
+        user: models.User,
+        item: models.Item,
+        file: models.NewFile,
+        oid: int,
+        signature: str,
+    ) -> UploadResult:
+        """Start processing of content that is already in the storage.
+
+        Storage object is deleted when content does not match. When it
+        is a duplicate, the object is kept until the worker copies files
+        of the existing item, so it could be processed if the copy fails.
+        """
+        declared_md5 = self.get_declared_md5(file)
+        if declared_md5 is not None and declared_md5 != signature:
+            await self.object_storage.delete(oid)
+            msg = 'Uploaded content does not match declared MD5 hash'
+            raise exceptions.InvalidInputError(msg)
+
+        async with self.database.transaction() as conn:
+            duplicate = await self._find_duplicate(conn, user, item, signature)
+
+        if duplicate is not None:
+            LOG.info('Upload {} for item {} is the same as {}', oid, item.uuid, duplicate.uuid)
+            try:
+                return await self._use_duplicate(user, item, file, duplicate, signature, oid)
+            except Exception:
+                await self.object_storage.delete(oid)
+                raise
+
         # Write all queue/metadata side effects in one short transaction.
         async with self.database.transaction() as conn:
+            ancestors = await self.mark_parent_as_collection(
+                conn=conn,
+                original_item=item,
+                parent_id=item.parent_id,
+            )
+
             operation_id = await self.commands.upload(
                 conn=conn,
                 requested_by=user,
@@ -772,7 +885,11 @@ class UploadItemUseCase(BaseItemUseCase):
                 content_type=file.content_type,
                 ext='jpg' if file.ext == 'jpeg' else file.ext,
                 oid=oid,
-                extras={'extract_exif': file.features.extract_exif},
+                extras={
+                    'extract_exif': file.features.extract_exif,
+                    'animated_preview': file.features.animated_preview,
+                    'ancestors': ancestors,
+                },
             )
 
             item.status = models.Status.PROCESSING
@@ -783,26 +900,120 @@ class UploadItemUseCase(BaseItemUseCase):
                 key='original_filename',
                 value=str(file.filename),
             )
-            await self.mark_parent_as_collection(
+
+        return UploadResult(operation_id, duplicate=None)
+
+    async def _find_duplicate(
+        self,
+        conn: Any,
+        user: models.User,
+        item: models.Item,
+        signature: str,
+    ) -> models.Item | None:
+        """Return other item of the user with the same content."""
+        item_ids = await self.signatures.get_items_by_md5_signature(conn, user, signature)
+
+        for item_id in item_ids:
+            if item_id != item.id:
+                return await self.items.get_by_id(conn, item_id)
+
+        return None
+
+    async def _use_duplicate(  # noqa: PLR0913
+        self,
+        user: models.User,
+        item: models.Item,
+        file: models.NewFile,
+        duplicate: models.Item,
+        signature: str,
+        oid: int | None = None,
+    ) -> UploadResult:
+        """Copy files of the existing item instead of converting them again.
+
+        Uploaded content, if there is one, becomes the fallback of the copy.
+        """
+        if file.features.reject_duplicates:
+            msg = 'Same file was already uploaded as item {duplicate_uuid}'
+            raise exceptions.AlreadyExistsError(msg, duplicate_uuid=duplicate.uuid)
+
+        is_video = file.content_type not in const.CONTENT_TYPE_IMAGES
+
+        async with self.database.transaction() as conn:
+            ancestors = await self.mark_parent_as_collection(
                 conn=conn,
-                user=user,
                 original_item=item,
                 parent_id=item.parent_id,
-                file=file,
-                oid=oid,
             )
 
-        return operation_id
+            fallback = None
+            if oid is not None:
+                fallback = self.make_pending_upload(item, file, oid, ancestors)
+
+            operation_id = await self.commands.copy_image(
+                conn=conn,
+                requested_by=user,
+                source_item=duplicate,
+                target_item=item,
+                including_content=not is_video,
+                including_video=is_video,
+                fallback=fallback,
+            )
+
+            for ancestor_id in ancestors:
+                ancestor = await self.items.get_by_id(conn, ancestor_id)
+                await self.commands.copy_image(
+                    conn=conn,
+                    requested_by=user,
+                    source_item=duplicate,
+                    target_item=ancestor,
+                )
+
+            item.status = models.Status.PROCESSING
+            await self.items.save(conn, item)
+            await self.signatures.save_md5_signature(conn, item, signature)
+            await self._copy_signatures(conn, duplicate, item)
+            await self.meta.add_item_note(
+                conn,
+                item=item,
+                key='original_filename',
+                value=str(file.filename),
+            )
+
+        return UploadResult(operation_id, duplicate=duplicate)
+
+    async def _copy_signatures(
+        self,
+        conn: Any,
+        source: models.Item,
+        target: models.Item,
+    ) -> None:
+        """Give target the same EXIF and signatures the source has.
+
+        Copy command only copies files, but content is the same, so
+        everything calculated from it during conversion applies as is.
+        """
+        crc32 = await self.signatures.get_cr32_signature(conn, source)
+        if crc32 is not None:
+            await self.signatures.save_cr32_signature(conn, target, crc32)
+
+        perceptual = await self.signatures.get_perceptual_signature(conn, source)
+        if perceptual is not None:
+            await self.signatures.save_perceptual_signature(conn, target, perceptual)
+
+        try:
+            exif = await self.exif.get_by_item(conn, source)
+        except exceptions.DoesNotExistError:
+            return
+
+        await self.exif.save(conn, target, exif)
 
     async def mark_parent_as_collection(
         self,
         conn: Any,
-        user: models.User,
         original_item: models.Item,
         parent_id: int | None,
-        file: models.NewFile,
-        oid: int,
-    ) -> None:
+        visited: set[int] | None = None,
+    ) -> list[int]:
         """Walk up the ancestor chain, ensuring each is a collection with a thumbnail.
 
         The traversal ALWAYS reaches the root: an intermediate ancestor
@@ -813,8 +1024,23 @@ class UploadItemUseCase(BaseItemUseCase):
         earlier iteration of this method itself did (fixed here). The
         state changes are idempotent: unchanged ancestors incur only a
         cheap read.
+
+        Returns ids of ancestors that need a thumbnail. Upload of the
+        original item shares its renditions with them after conversion,
+        so the image is converted only once for the whole chain.
+
+        Ancestors in ``visited`` were handled earlier in the same
+        transaction together with everything above them, so the walk
+        stops there. Ids of the ancestors seen now are added to it.
         """
+        ancestors: list[int] = []
+
         while parent_id is not None:
+            if visited is not None:
+                if parent_id in visited:
+                    break
+                visited.add(parent_id)
+
             parent_item = await self.items.get_by_id(conn, parent_id)
             changed = False
 
@@ -827,22 +1053,7 @@ class UploadItemUseCase(BaseItemUseCase):
                 # so next item in batch will not copy again
                 parent_item.thumbnail_ext = 'tmp'
                 changed = True
-
-                # Reuse the same long-term reference for the parent
-                # thumbnail. The converter only deletes the OID when
-                # no other queue entry still references it.
-                await self.commands.upload(
-                    conn=conn,
-                    requested_by=user,
-                    item=parent_item,
-                    content_type=file.content_type,
-                    ext='jpg' if file.ext == 'jpeg' else file.ext,
-                    oid=oid,
-                    extras={
-                        'extract_exif': False,
-                        'skip_content': True,
-                    },
-                )
+                ancestors.append(parent_item.id)
 
                 await self.meta.add_item_note(
                     conn=conn,
@@ -856,6 +1067,186 @@ class UploadItemUseCase(BaseItemUseCase):
 
             parent_id = parent_item.parent_id
 
+        return ancestors
+
+
+class UploadManyItemsUseCase(UploadItemUseCase):
+    """Use case for processing content of several items sent at once."""
+
+    async def execute(  # type: ignore [override]
+        self,
+        user: models.User,
+        item_uuids: Collection[UUID],
+        parts: AsyncIterable[tuple[UUID, models.NewFile, AsyncIterable[bytes]]],
+    ) -> list[tuple[models.Item, UploadResult]]:
+        """Execute.
+
+        Every part is streamed into the storage as soon as it arrives.
+        Queue records, statuses and notes of the whole batch are written
+        in one transaction. If anything fails, nothing is enqueued and
+        all stored content is deleted. Identical files of one batch share
+        single stored copy. Duplicates of existing items are handled after
+        that one by one, content of any that could not be handled is
+        deleted.
+        """
+        ensure.registered(
+            user,
+            'Anonymous users are not allowed to upload items',
+        )
+
+        if len(item_uuids) > limits.MAX_FILES_IN_BATCH:
+            msg = f'Maximum {limits.MAX_FILES_IN_BATCH} files could be uploaded at once'
+            raise exceptions.NotAllowedError(msg)
+
+        async with self.database.transaction() as conn:
+            targets = {
+                item_uuid: await self.get_target(conn, user, item_uuid) for item_uuid in item_uuids
+            }
+
+        received: list[tuple[models.Item, models.NewFile, int, str]] = []
+
+        try:
+            await self._receive(targets, parts, received)
+            duplicates = await self._find_duplicates(user, received)
+            fresh = self._share_identical(
+                [entry for entry in received if duplicates[entry[0].id] is None]
+            )
+            results = await self._enqueue_many(user, fresh)
+        except BaseException:
+            for _, _, oid, _ in received:
+                await self.object_storage.delete(oid)
+            raise
+
+        shared = {oid for _, _, oid, _ in fresh}
+        for item, _, oid, _ in received:
+            if duplicates[item.id] is None and oid not in shared:
+                await self.object_storage.delete(oid)
+
+        # rare case, every duplicate is handled on its own
+        remaining = [
+            (entry, duplicate)
+            for entry in received
+            if (duplicate := duplicates[entry[0].id]) is not None
+        ]
+        try:
+            while remaining:
+                (item, file, oid, signature), duplicate = remaining[0]
+                results[item.id] = await self._use_duplicate(
+                    user, item, file, duplicate, signature, oid
+                )
+                remaining.pop(0)
+        except BaseException:
+            for (_, _, oid, _), _ in remaining:
+                await self.object_storage.delete(oid)
+            raise
+
+        return [(item, results[item.id]) for item, *_ in received]
+
+    async def _receive(
+        self,
+        targets: dict[UUID, models.Item],
+        parts: AsyncIterable[tuple[UUID, models.NewFile, AsyncIterable[bytes]]],
+        received: list[tuple[models.Item, models.NewFile, int, str]],
+    ) -> None:
+        """Stream every part into the storage.
+
+        Stored parts are added to ``received`` right away, so caller
+        could delete them if something goes wrong later.
+        """
+        async for item_uuid, file, chunks in parts:
+            item = targets.pop(item_uuid, None)
+
+            if item is None:
+                msg = 'Item {item_uuid} was not declared or was sent twice'
+                raise exceptions.InvalidInputError(msg, item_uuid=item_uuid)
+
+            if self.get_declared_md5(file) is not None:
+                msg = 'Declared MD5 hash is not supported for batch upload'
+                raise exceptions.InvalidInputError(msg)
+
+            digest = hashlib.md5()  # noqa: S324
+            reference = await self.object_storage.write(_hash_chunks(chunks, digest))
+            received.append((item, file, reference['oid'], digest.hexdigest()))
+            LOG.info('Saved upload for item {} as {}', item.uuid, reference['oid'])
+
+        if targets:
+            missing = ', '.join(str(item_uuid) for item_uuid in targets)
+            msg = f'Files for items {missing} were not sent'
+            raise exceptions.InvalidInputError(msg)
+
+    async def _find_duplicates(
+        self,
+        user: models.User,
+        received: list[tuple[models.Item, models.NewFile, int, str]],
+    ) -> dict[int, models.Item | None]:
+        """Return existing items with the same content.
+
+        Raises before anything is enqueued if duplicates are rejected.
+        """
+        async with self.database.transaction() as conn:
+            duplicates = {
+                item.id: await self._find_duplicate(conn, user, item, signature)
+                for item, _, _, signature in received
+            }
+
+        for item, file, _, _ in received:
+            duplicate = duplicates[item.id]
+            if duplicate is not None and file.features.reject_duplicates:
+                msg = 'Same file was already uploaded as item {duplicate_uuid}'
+                raise exceptions.AlreadyExistsError(msg, duplicate_uuid=duplicate.uuid)
+
+        return duplicates
+
+    @staticmethod
+    def _share_identical(
+        received: list[tuple[models.Item, models.NewFile, int, str]],
+    ) -> list[tuple[models.Item, models.NewFile, int, str]]:
+        """Point identical files of the batch to the first stored copy.
+
+        Every item still gets its own upload command, so everything
+        calculated during conversion belongs to it. Worker keeps shared
+        content until the last command referencing it is done.
+        """
+        first_oids: dict[str, int] = {}
+        return [
+            (item, file, first_oids.setdefault(signature, oid), signature)
+            for item, file, oid, signature in received
+        ]
+
+    async def _enqueue_many(
+        self,
+        user: models.User,
+        received: list[tuple[models.Item, models.NewFile, int, str]],
+    ) -> dict[int, UploadResult]:
+        """Write everything for the batch in one transaction."""
+        uploads: list[models.PendingUpload] = []
+        visited: set[int] = set()
+
+        async with self.database.transaction() as conn:
+            for item, file, oid, _ in received:
+                ancestors = await self.mark_parent_as_collection(
+                    conn=conn,
+                    original_item=item,
+                    parent_id=item.parent_id,
+                    visited=visited,
+                )
+                uploads.append(self.make_pending_upload(item, file, oid, ancestors))
+
+            operation_ids = await self.commands.upload_many(conn, user, uploads)
+            await self.items.set_status(
+                conn, [upload.item for upload in uploads], models.Status.PROCESSING
+            )
+            await self.meta.add_item_notes(
+                conn,
+                key='original_filename',
+                values=[(item, str(file.filename)) for item, file, _, _ in received],
+            )
+
+        return {
+            upload.item.id: UploadResult(operation_id, duplicate=None)
+            for upload, operation_id in zip(uploads, operation_ids, strict=True)
+        }
+
 
 class ChangePermissionsUseCase(BaseItemUseCase):
     """Use case for item permissions change."""
@@ -866,6 +1257,7 @@ class ChangePermissionsUseCase(BaseItemUseCase):
         items: db_interfaces.AbsItemsRepo,
         users: db_interfaces.AbsUsersRepo,
         misc: db_interfaces.AbsMiscRepo,
+        tags: db_interfaces.AbsTagsRepo,
     ) -> None:
         """Initialize instance."""
         super().__init__()
@@ -873,6 +1265,7 @@ class ChangePermissionsUseCase(BaseItemUseCase):
         self.items = items
         self.users = users
         self.misc = misc
+        self.tags = tags
 
     async def execute(
         self,
@@ -925,4 +1318,17 @@ class ChangePermissionsUseCase(BaseItemUseCase):
             item.permissions = user_ids
             await self.items.save(conn, item)
 
+        async with self.database.transaction() as conn:
+            await self.tags.bump_generation(conn)
+
         return operation_id
+
+
+async def _hash_chunks(
+    chunks: AsyncIterable[bytes],
+    digest: Any,
+) -> AsyncIterator[bytes]:
+    """Pass chunks through, updating the hash on the way."""
+    async for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
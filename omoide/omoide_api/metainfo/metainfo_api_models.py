@@ -51,6 +51,19 @@ class MetainfoOutput(BaseModel):
     thumbnail_width: int | None = None
     thumbnail_height: int | None = None
 
+    duration: float | None = None
+    video_codec: str | None = None
+    fps: float | None = None
+    animated_preview_size: int | None = None
+
+    preview_webp_size: int | None = None
+    preview_avif_size: int | None = None
+    thumbnail_webp_size: int | None = None
+    thumbnail_avif_size: int | None = None
+
+    placeholder: str | None = None
+    dominant_color: str | None = None
+
     model_config = {
         'json_schema_extra': {
             'examples': [
@@ -1,5 +1,7 @@
 """Web level API models."""
 
+from typing import Any
+
 from pydantic import BaseModel
 
 from omoide.omoide_api.common import common_api_models
@@ -34,6 +36,8 @@ class SearchTotalOutput(BaseModel):
 
     total: int
     duration: float
+    is_approximate: bool = False
+    explain: dict[str, Any] | None = None
 
     model_config = {
         'json_schema_extra': {
@@ -45,3 +49,48 @@ class SearchTotalOutput(BaseModel):
             ],
         }
     }
+
+
+class SearchTextOutput(common_api_models.ManyItemsOutput):
+    """Items found by text, best matches first."""
+
+    duration: float
+    last_rank: float | None = None
+    last_id: int | None = None
+
+
+class FacetOutput(BaseModel):
+    """Tag and amount of search results that have it."""
+
+    tag: str
+    count: int
+
+
+class SearchFacetsOutput(BaseModel):
+    """Most common tags among search results."""
+
+    facets: list[FacetOutput]
+    duration: float
+    is_sampled: bool = False
+
+    model_config = {
+        'json_schema_extra': {
+            'examples': [
+                {
+                    'facets': [
+                        {'tag': 'cats', 'count': 120},
+                        {'tag': 'dogs', 'count': 45},
+                    ],
+                    'duration': 0.012,
+                    'is_sampled': False,
+                }
+            ],
+        }
+    }
+
+
+class SearchOutput(common_api_models.ManyItemsOutput):
+    """Found items, optionally with description of the chosen plan."""
+
+    duration: float
+    explain: dict[str, Any] | None = None
@@ -1,6 +1,7 @@
 """API operations that process textual requests from users."""
 
 from typing import Annotated
+from typing import Any
 
 from fastapi import APIRouter
 from fastapi import Depends
@@ -15,6 +16,7 @@ from omoide import models
 from omoide import utils
 from omoide.database import interfaces as db_interfaces
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.ttl_cache import TTLCache
 from omoide.omoide_api.common import common_api_models
 from omoide.omoide_api.search import search_api_models
 from omoide.omoide_api.search import search_use_cases
@@ -117,19 +119,31 @@ async def api_get_recent_updates(  # noqa: PLR0913
     summary='Return total amount of items that correspond to search query',
     response_model=search_api_models.SearchTotalOutput,
 )
-async def api_search_total(
+async def api_search_total(  # noqa: PLR0913,PLR0917
     user: models.User = Depends(dep.get_current_user),
     database: AbsDatabase = Depends(dep.get_database),
     search_repo: db_interfaces.AbsSearchRepo = Depends(dep.get_search_repo),
+    tags_repo: db_interfaces.AbsTagsRepo = Depends(dep.get_tags_repo),
+    cache: TTLCache[tuple, Any] = Depends(dep.get_search_cache),
     q: Annotated[str, Query(max_length=limits.MAX_QUERY)] = limits.DEF_QUERY,
     collections: Annotated[bool, Query()] = False,
+    approximate: Annotated[bool, Query()] = False,
+    explain: Annotated[bool, Query()] = False,
 ) -> search_api_models.SearchTotalOutput:
-    """Return total amount of items that correspond to search query."""
+    """Return total amount of items that correspond to search query.
+
+    Results are cached until tags or permissions of any item change.
+
+    With `approximate` huge totals are estimated instead of being counted,
+    such estimate can be bigger than actual amount of items.
+
+    With `explain` response also contains chosen plan and timings.
+    """
     if len(q) < limits.MIN_QUERY:
         return search_api_models.SearchTotalOutput(total=0, duration=0.0)
 
-    use_case = search_use_cases.ApiSearchTotalUseCase(database, search_repo)
-    tags_include, tags_exclude = utils.parse_tags(q)
+    use_case = search_use_cases.ApiSearchTotalUseCase(database, search_repo, tags_repo, cache)
+    tags_include, tags_exclude, tags_any = utils.parse_tags(q)
 
     plan = models.Plan(
         query=q,
@@ -140,20 +154,139 @@ async def api_search_total(
         direct=False,
         last_seen=None,
         limit=-1,
+        tags_any=tags_any,
     )
 
-    result = await use_case.execute(user, plan)
+    result = await use_case.execute(user, plan, approximate=approximate)
 
-    return search_api_models.SearchTotalOutput(total=result.total, duration=result.duration)
+    return search_api_models.SearchTotalOutput(
+        total=result.total,
+        duration=result.duration,
+        is_approximate=result.is_approximate,
+        explain={**result.query_plan.to_dict(), 'cached': result.is_cached} if explain else None,
+    )
+
+
+@api_search_router.get(
+    '/text',
+    summary='Perform full-text search over names and notes',
+    status_code=status.HTTP_200_OK,
+    response_model=search_api_models.SearchTextOutput,
+)
+async def api_search_text(  # noqa: PLR0913,PLR0917
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    search_repo: db_interfaces.AbsSearchRepo = Depends(dep.get_search_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    text: Annotated[str, Query(max_length=limits.MAX_QUERY)] = limits.DEF_QUERY,
+    q: Annotated[str, Query(max_length=limits.MAX_QUERY)] = limits.DEF_QUERY,
+    collections: Annotated[bool, Query()] = const.DEF_COLLECTIONS,
+    last_rank: Annotated[float | None, Query()] = None,
+    last_id: Annotated[int | None, Query()] = None,
+    limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
+) -> search_api_models.SearchTextOutput:
+    """Perform full-text search over names and notes.
+
+    Words from `text` are looked up in item names and notes
+    (for example original filename). Quoted phrases, `or` and
+    `-word` are supported. Optional `q` narrows results with tags
+    using the same syntax as regular search.
+
+    Results are ordered by relevance. To get next page pass
+    `last_rank` and `last_id` from the previous response.
+    """
+    if len(text) < limits.MIN_QUERY:
+        return search_api_models.SearchTextOutput(duration=0.0, items=[])
+
+    use_case = search_use_cases.ApiSearchTextUseCase(database, search_repo, users_repo)
+    tags_include, tags_exclude, tags_any = utils.parse_tags(q)
+
+    plan = models.Plan(
+        query=q,
+        tags_include=tags_include,
+        tags_exclude=tags_exclude,
+        order=const.DESC,
+        collections=collections,
+        direct=False,
+        last_seen=None,
+        limit=limit,
+        tags_any=tags_any,
+    )
+
+    last_seen = None
+    if last_rank is not None and last_id is not None:
+        last_seen = (last_rank, last_id)
+
+    result = await use_case.execute(user, plan, text, last_seen)
+
+    return search_api_models.SearchTextOutput(
+        duration=result.duration,
+        items=common_api_models.convert_items(result.items, result.users_map),
+        last_rank=result.last_seen[0] if result.last_seen else None,
+        last_id=result.last_seen[1] if result.last_seen else None,
+    )
+
+
+@api_search_router.get(
+    '/facets',
+    summary='Return most common tags among search results',
+    status_code=status.HTTP_200_OK,
+    response_model=search_api_models.SearchFacetsOutput,
+)
+async def api_search_facets(  # noqa: PLR0913,PLR0917
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    search_repo: db_interfaces.AbsSearchRepo = Depends(dep.get_search_repo),
+    tags_repo: db_interfaces.AbsTagsRepo = Depends(dep.get_tags_repo),
+    cache: TTLCache[tuple, Any] = Depends(dep.get_search_cache),
+    q: Annotated[str, Query(max_length=limits.MAX_QUERY)] = limits.DEF_QUERY,
+    collections: Annotated[bool, Query()] = False,
+    limit: Annotated[int, Query(ge=limits.MIN_LIMIT, le=limits.MAX_FACETS)] = limits.DEF_FACETS,
+) -> search_api_models.SearchFacetsOutput:
+    """Return most common tags among search results.
+
+    Helps to refine the query: every tag comes with amount of found
+    items that have it. Tags from the query itself are not included.
+
+    For huge results tags are counted on random sample of items and
+    amounts are scaled, `is_sampled` is set in this case.
+    """
+    if len(q) < limits.MIN_QUERY:
+        return search_api_models.SearchFacetsOutput(facets=[], duration=0.0)
+
+    use_case = search_use_cases.ApiSearchFacetsUseCase(database, search_repo, tags_repo, cache)
+    tags_include, tags_exclude, tags_any = utils.parse_tags(q)
+
+    plan = models.Plan(
+        query=q,
+        tags_include=tags_include,
+        tags_exclude=tags_exclude,
+        order=const.ASC,
+        collections=collections,
+        direct=False,
+        last_seen=None,
+        limit=-1,
+        tags_any=tags_any,
+    )
+
+    result = await use_case.execute(user, plan, limit)
+
+    return search_api_models.SearchFacetsOutput(
+        facets=[
+            search_api_models.FacetOutput(tag=tag, count=count) for tag, count in result.facets
+        ],
+        duration=result.duration,
+        is_sampled=result.is_sampled,
+    )
 
 
 @api_search_router.get(
     '',
     summary='Perform search request',
     status_code=status.HTTP_200_OK,
-    response_model=common_api_models.ManyItemsOutput,
+    response_model=search_api_models.SearchOutput,
 )
-async def api_search(  # noqa: PLR0913
+async def api_search(  # noqa: PLR0913,PLR0917
     user: models.User = Depends(dep.get_current_user),
     database: AbsDatabase = Depends(dep.get_database),
     search_repo: db_interfaces.AbsSearchRepo = Depends(dep.get_search_repo),
@@ -163,18 +296,25 @@ async def api_search(  # noqa: PLR0913
     collections: Annotated[bool, Query()] = const.DEF_COLLECTIONS,
     last_seen: Annotated[int | None, Query()] = limits.DEF_LAST_SEEN,
     limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
-) -> common_api_models.ManyItemsOutput:
+    explain: Annotated[bool, Query()] = False,
+) -> search_api_models.SearchOutput:
     """Perform search request.
 
     Given input will be split into tags.
     For example 'cats + dogs - frogs' will be treated as
     [must include 'cats', must include 'dogs', must not include 'frogs'].
+
+    Alternatives are separated with `|`: 'cats | dogs - frogs' means
+    [must include 'cats' or 'dogs', must not include 'frogs'].
+    Tag ending with `*` matches every known tag with this prefix.
+
+    With `explain` response also contains chosen plan and timings.
     """
     if len(q) < limits.MIN_QUERY:
-        return common_api_models.ManyItemsOutput(duration=0.0, items=[])
+        return search_api_models.SearchOutput(duration=0.0, items=[])
 
     use_case = search_use_cases.ApiSearchUseCase(database, search_repo, users_repo)
-    tags_include, tags_exclude = utils.parse_tags(q)
+    tags_include, tags_exclude, tags_any = utils.parse_tags(q)
 
     plan = models.Plan(
         query=q,
@@ -185,11 +325,13 @@ async def api_search(  # noqa: PLR0913
         direct=False,
         last_seen=last_seen,
         limit=limit,
+        tags_any=tags_any,
     )
 
     result = await use_case.execute(user, plan)
 
-    return common_api_models.ManyItemsOutput(
+    return search_api_models.SearchOutput(
         duration=result.duration,
         items=common_api_models.convert_items(result.items, result.users_map),
+        explain=result.query_plan.to_dict() if explain else None,
     )
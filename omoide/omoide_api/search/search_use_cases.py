@@ -1,12 +1,16 @@
 """Use cases that process search requests from users."""
 
 import time
+from typing import Any
 from typing import NamedTuple
 
+from omoide import const
 from omoide import models
 from omoide import utils
 from omoide.database import interfaces as db_interfaces
 from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain import search_planner
+from omoide.infra.ttl_cache import TTLCache
 
 
 class ItemsResult(NamedTuple):
@@ -21,6 +25,27 @@ class SearchTotalResult(NamedTuple):
 
     total: int
     duration: float
+    query_plan: search_planner.QueryPlan
+    is_cached: bool = False
+    is_approximate: bool = False
+
+
+class SearchTextResult(NamedTuple):
+    """Items found by text together with position for the next page."""
+
+    duration: float
+    items: list[models.Item]
+    users_map: dict[int, models.User | None]
+    last_seen: tuple[float, int] | None
+
+
+class SearchFacetsResult(NamedTuple):
+    """Most common tags among search results."""
+
+    facets: list[tuple[str, int]]
+    duration: float
+    is_sampled: bool
+    is_cached: bool = False
 
 
 class SearchResult(NamedTuple):
@@ -29,6 +54,7 @@ class SearchResult(NamedTuple):
     duration: float
     items: list[models.Item]
     users_map: dict[int, models.User | None]
+    query_plan: search_planner.QueryPlan
 
 
 class AutocompleteUseCase:
@@ -97,27 +123,134 @@ class RecentUpdatesUseCase:
 
 
 class ApiSearchTotalUseCase:
-    """Use case for calculating total results of search."""
+    """Use case for calculating total results of search.
+
+    Exact totals are cached until computed tags or permissions change.
+    """
 
     def __init__(
         self,
         database: AbsDatabase,
         search: db_interfaces.AbsSearchRepo,
+        tags: db_interfaces.AbsTagsRepo,
+        cache: TTLCache[tuple, Any],
     ) -> None:
         """Initialize instance."""
         self.database = database
         self.search = search
+        self.tags = tags
+        self.cache = cache
 
-    async def execute(self, user: models.User, plan: models.Plan) -> SearchTotalResult:
+    async def execute(
+        self,
+        user: models.User,
+        plan: models.Plan,
+        approximate: bool = False,
+    ) -> SearchTotalResult:
         """Execute."""
         start = time.perf_counter()
 
         async with self.database.transaction() as conn:
-            total = await self.search.count(conn, user, plan)
+            # NOTE: generation must be read before counting
+            generation = await self.tags.get_generation(conn)
+            key = (
+                'total',
+                generation,
+                const.ANON if user.is_anon else user.id,
+                search_planner.normalize_query(plan),
+            )
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                duration = time.perf_counter() - start
+                return cached._replace(duration=duration, is_cached=True)
+
+            query_plan = await self.search.plan_query(conn, user, plan)
+            planned = time.perf_counter()
+
+            is_approximate = (
+                approximate
+                and bool(query_plan.include)
+                and query_plan.estimate >= const.SEARCH_APPROXIMATE_THRESHOLD
+            )
+
+            if is_approximate:
+                # NOTE: estimate is an upper bound, exclusions are not applied
+                total = query_plan.estimate
+            else:
+                total = await self.search.count(conn, user, plan, query_plan)
 
         duration = time.perf_counter() - start
+        query_plan.timings = {'planning': planned - start, 'total': duration}
+
+        result = SearchTotalResult(
+            total=total,
+            duration=duration,
+            query_plan=query_plan,
+            is_approximate=is_approximate,
+        )
+
+        if not is_approximate:
+            self.cache.set(key, result)
+
+        return result
+
+
+class ApiSearchFacetsUseCase:
+    """Use case for counting tags that co-occur in search results."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        search: db_interfaces.AbsSearchRepo,
+        tags: db_interfaces.AbsTagsRepo,
+        cache: TTLCache[tuple, Any],
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.search = search
+        self.tags = tags
+        self.cache = cache
+
+    async def execute(
+        self,
+        user: models.User,
+        plan: models.Plan,
+        limit: int,
+    ) -> SearchFacetsResult:
+        """Execute."""
+        start = time.perf_counter()
+
+        async with self.database.transaction() as conn:
+            generation = await self.tags.get_generation(conn)
+            key = (
+                'facets',
+                generation,
+                const.ANON if user.is_anon else user.id,
+                search_planner.normalize_query(plan),
+                limit,
+            )
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                duration = time.perf_counter() - start
+                return cached._replace(duration=duration, is_cached=True)
 
-        return SearchTotalResult(total=total, duration=duration)
+            query_plan = await self.search.plan_query(conn, user, plan)
+
+            fraction = None
+            if query_plan.estimate > const.SEARCH_FACETS_SAMPLE_SIZE:
+                fraction = const.SEARCH_FACETS_SAMPLE_SIZE / query_plan.estimate
+
+            facets = await self.search.get_facets(conn, user, plan, query_plan, limit, fraction)
+
+        result = SearchFacetsResult(
+            facets=facets,
+            duration=time.perf_counter() - start,
+            is_sampled=fraction is not None,
+        )
+        self.cache.set(key, result)
+        return result
 
 
 class ApiSearchUseCase:
@@ -143,9 +276,65 @@ class ApiSearchUseCase:
         start = time.perf_counter()
 
         async with self.database.transaction() as conn:
-            items = await self.search.search(conn, user, plan)
+            query_plan = await self.search.plan_query(conn, user, plan)
+            planned = time.perf_counter()
+            items = await self.search.search(conn, user, plan, query_plan)
+            searched = time.perf_counter()
             users_map = await self.users.get_map(conn, items)
 
         duration = time.perf_counter() - start
+        query_plan.timings = {
+            'planning': planned - start,
+            'execution': searched - planned,
+            'total': duration,
+        }
+
+        return SearchResult(
+            duration=duration,
+            items=items,
+            users_map=users_map,
+            query_plan=query_plan,
+        )
+
+
+class ApiSearchTextUseCase:
+    """Use case for full-text search over names and notes."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        search: db_interfaces.AbsSearchRepo,
+        users: db_interfaces.AbsUsersRepo,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.search = search
+        self.users = users
+
+    async def execute(
+        self,
+        user: models.User,
+        plan: models.Plan,
+        text: str,
+        last_seen: tuple[float, int] | None,
+    ) -> SearchTextResult:
+        """Execute."""
+        start = time.perf_counter()
+
+        async with self.database.transaction() as conn:
+            query_plan = await self.search.plan_query(conn, user, plan)
+            found = await self.search.search_text(conn, user, plan, query_plan, text, last_seen)
+            items = [item for item, _ in found]
+            users_map = await self.users.get_map(conn, items)
 
-        return SearchResult(duration=duration, items=items, users_map=users_map)
+        next_seen = None
+        if found and len(found) >= plan.limit:
+            last_item, last_rank = found[-1]
+            next_seen = (last_rank, last_item.id)
+
+        return SearchTextResult(
+            duration=time.perf_counter() - start,
+            items=items,
+            users_map=users_map,
+            last_seen=next_seen,
+        )
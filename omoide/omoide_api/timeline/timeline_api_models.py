@@ -0,0 +1,42 @@
+"""Web level API models."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from omoide.omoide_api.common import common_api_models
+
+
+class TimelineOutput(common_api_models.ManyItemsOutput):
+    """Items in order of capture along with position for the next page."""
+
+    taken_at: list[datetime]
+    last_taken_at: datetime | None = None
+    last_id: int | None = None
+
+
+class BucketOutput(BaseModel):
+    """Amount of items taken in given year (and month)."""
+
+    year: int
+    month: int | None
+    total: int
+
+
+class HistogramOutput(BaseModel):
+    """Amount of items per period of time."""
+
+    buckets: list[BucketOutput]
+
+    model_config = {
+        'json_schema_extra': {
+            'examples': [
+                {
+                    'buckets': [
+                        {'year': 2007, 'month': 8, 'total': 120},
+                        {'year': 2007, 'month': 9, 'total': 45},
+                    ],
+                }
+            ],
+        }
+    }
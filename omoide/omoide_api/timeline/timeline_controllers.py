@@ -0,0 +1,119 @@
+"""API operations that show items in order of their capture date."""
+
+from datetime import datetime
+from typing import Annotated
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from fastapi import status
+
+from omoide import const
+from omoide import dependencies as dep
+from omoide import limits
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.omoide_api.common import common_api_models
+from omoide.omoide_api.timeline import timeline_api_models
+from omoide.omoide_api.timeline import timeline_use_cases
+
+api_timeline_router = APIRouter(prefix='/timeline', tags=['Timeline'])
+
+
+@api_timeline_router.get(
+    '',
+    summary='Return items taken in given period',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'description': 'Ok'},
+        status.HTTP_404_NOT_FOUND: {'description': 'Object does not exist'},
+    },
+    response_model=timeline_api_models.TimelineOutput,
+)
+async def api_timeline(  # noqa: PLR0913,PLR0917
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    owner_uuid: Annotated[UUID | None, Query()] = None,
+    since: Annotated[datetime | None, Query()] = None,
+    until: Annotated[datetime | None, Query()] = None,
+    order: Annotated[Literal['asc', 'desc'], Query()] = const.DESC,
+    last_taken_at: Annotated[datetime | None, Query()] = None,
+    last_id: Annotated[int | None, Query()] = None,
+    limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
+) -> timeline_api_models.TimelineOutput:
+    """Return items taken in given period.
+
+    Capture date is taken from EXIF, items without it are not shown.
+    Dates are local time of the camera, so `since` and `until` must
+    be given without timezone. `since` is inclusive, `until` is not.
+
+    To get next page pass `last_taken_at` and `last_id`
+    from the previous response.
+    """
+    use_case = timeline_use_cases.ApiTimelineUseCase(database, users_repo, exif_repo)
+
+    last_seen = None
+    if last_taken_at is not None and last_id is not None:
+        last_seen = (last_taken_at.replace(tzinfo=None), last_id)
+
+    result = await use_case.execute(
+        user=user,
+        owner_uuid=owner_uuid,
+        since=since.replace(tzinfo=None) if since is not None else None,
+        until=until.replace(tzinfo=None) if until is not None else None,
+        order=order,
+        last_seen=last_seen,
+        limit=limit,
+    )
+
+    return timeline_api_models.TimelineOutput(
+        items=common_api_models.convert_items(result.items, result.users_map),
+        taken_at=result.taken_at,
+        last_taken_at=result.last_seen[0] if result.last_seen else None,
+        last_id=result.last_seen[1] if result.last_seen else None,
+    )
+
+
+@api_timeline_router.get(
+    '/histogram',
+    summary='Return amount of items per year or per month',
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {'description': 'Ok'},
+        status.HTTP_404_NOT_FOUND: {'description': 'Object does not exist'},
+    },
+    response_model=timeline_api_models.HistogramOutput,
+)
+async def api_timeline_histogram(  # noqa: PLR0913,PLR0917
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    owner_uuid: Annotated[UUID | None, Query()] = None,
+    year: Annotated[int | None, Query(ge=limits.MIN_YEAR, le=limits.MAX_YEAR)] = None,
+) -> timeline_api_models.HistogramOutput:
+    """Return amount of items per year or per month.
+
+    Without `year` items are counted per year, with it -
+    per month of the given year. Only items user is allowed
+    to see are counted.
+    """
+    use_case = timeline_use_cases.ApiTimelineHistogramUseCase(database, users_repo, exif_repo)
+
+    buckets = await use_case.execute(user, owner_uuid, year)
+
+    return timeline_api_models.HistogramOutput(
+        buckets=[
+            timeline_api_models.BucketOutput(
+                year=bucket.year,
+                month=bucket.month,
+                total=bucket.total,
+            )
+            for bucket in buckets
+        ]
+    )
@@ -0,0 +1,89 @@
+"""Use cases for browsing items by their capture date."""
+
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+
+
+class TimelineResult(NamedTuple):
+    """Items in order of capture together with position for the next page."""
+
+    items: list[models.Item]
+    taken_at: list[datetime]
+    users_map: dict[int, models.User | None]
+    last_seen: tuple[datetime, int] | None
+
+
+class BaseTimelineUseCase:
+    """Base use case class."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        users: db_interfaces.AbsUsersRepo,
+        exif: db_interfaces.AbsEXIFRepo,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.users = users
+        self.exif = exif
+
+
+class ApiTimelineUseCase(BaseTimelineUseCase):
+    """Return items taken in given period."""
+
+    async def execute(  # noqa: PLR0913
+        self,
+        user: models.User,
+        owner_uuid: UUID | None,
+        since: datetime | None,
+        until: datetime | None,
+        order: str,
+        last_seen: tuple[datetime, int] | None,
+        limit: int,
+    ) -> TimelineResult:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            owner = None
+            if owner_uuid is not None:
+                owner = await self.users.get_by_uuid(conn, owner_uuid)
+
+            found = await self.exif.get_timeline(
+                conn, user, owner, since, until, order, last_seen, limit
+            )
+            items = [item for item, _ in found]
+            users_map = await self.users.get_map(conn, items)
+
+        next_seen = None
+        if found and len(found) >= limit:
+            last_item, last_taken_at = found[-1]
+            next_seen = (last_taken_at, last_item.id)
+
+        return TimelineResult(
+            items=items,
+            taken_at=[taken_at for _, taken_at in found],
+            users_map=users_map,
+            last_seen=next_seen,
+        )
+
+
+class ApiTimelineHistogramUseCase(BaseTimelineUseCase):
+    """Return amount of items per year or per month."""
+
+    async def execute(
+        self,
+        user: models.User,
+        owner_uuid: UUID | None,
+        year: int | None,
+    ) -> list[models.TimelineBucket]:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            owner = None
+            if owner_uuid is not None:
+                owner = await self.users.get_by_uuid(conn, owner_uuid)
+
+            return await self.exif.get_histogram(conn, user, owner, year)
@@ -0,0 +1 @@
+"""Resumable upload related API operations."""
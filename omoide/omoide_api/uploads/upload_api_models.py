@@ -0,0 +1,54 @@
+"""Web level API models."""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from omoide import limits
+from omoide import models
+
+MAX_LENGTH_FOR_UPLOAD_FIELD = 1024
+
+
+class UploadSessionInput(BaseModel):
+    """Description of the file that is going to be uploaded."""
+
+    item_uuid: UUID
+    filename: str = Field(..., min_length=1, max_length=MAX_LENGTH_FOR_UPLOAD_FIELD)
+    content_type: str = Field(..., min_length=1, max_length=MAX_LENGTH_FOR_UPLOAD_FIELD)
+    size: int = Field(..., gt=0, le=limits.MAX_MEDIA_SIZE)
+
+    model_config = {
+        'json_schema_extra': {
+            'examples': [
+                {
+                    'item_uuid': '00000000-0000-0000-0000-000000000000',
+                    'filename': 'cat.jpg',
+                    'content_type': 'image/jpeg',
+                    'size': 1048576,
+                },
+            ]
+        }
+    }
+
+
+class UploadSessionOutput(BaseModel):
+    """State of the upload."""
+
+    uuid: UUID | None
+    size: int
+    offset: int
+    expires_at: datetime | None
+    duplicate_uuid: UUID | None = None
+
+
+def convert_session(session: models.UploadSession) -> UploadSessionOutput:
+    """Convert domain-level upload session into API format."""
+    return UploadSessionOutput(
+        uuid=session.uuid,
+        size=session.size,
+        offset=session.offset,
+        expires_at=session.expires_at,
+    )
@@ -0,0 +1,229 @@
+"""Resumable upload related API operations.
+
+Big files are sent in parts, every part continues from the offset
+the server reports, so an interrupted upload is resumed instead of
+being restarted. Protocol follows the idea of tus, but is not tus.
+"""
+
+from typing import Annotated
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Header
+from fastapi import Request
+from fastapi import Response
+from fastapi import status
+
+from omoide import dependencies as dep
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.object_storage import interfaces as object_interfaces
+from omoide.omoide_api.items import item_api_models
+from omoide.omoide_api.uploads import upload_api_models
+from omoide.omoide_api.uploads import upload_use_cases
+
+api_uploads_router = APIRouter(prefix='/uploads', tags=['Uploads'])
+
+
+@api_uploads_router.post(
+    '',
+    summary='Start resumable upload',
+    status_code=status.HTTP_201_CREATED,
+    response_model=upload_api_models.UploadSessionOutput,
+)
+async def api_create_upload(  # noqa: PLR0913,PLR0917
+    request: Request,
+    response: Response,
+    upload_in: upload_api_models.UploadSessionInput,
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    misc_repo: db_interfaces.AbsMiscRepo = Depends(dep.get_misc_repo),
+    commands_repo: db_interfaces.AbsCommandsRepo = Depends(dep.get_commands_repo),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    upload_sessions_repo: db_interfaces.AbsUploadSessionsRepo = Depends(
+        dep.get_upload_sessions_repo
+    ),
+) -> upload_api_models.UploadSessionOutput:
+    """Start resumable upload of the content for given item.
+
+    Features are taken from ``X-Feature-*`` headers, same as for the
+    regular upload. If ``X-Feature-Content-Md5`` matches content the
+    owner already has, no session is created and nothing has to be sent.
+    """
+    ext = item_api_models.get_upload_ext(upload_in.filename)
+
+    use_case = upload_use_cases.CreateUploadUseCase(
+        database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+        upload_sessions_repo,
+    )
+
+    result = await use_case.execute(
+        user=user,
+        item_uuid=upload_in.item_uuid,
+        file=models.NewFile(
+            content_type=upload_in.content_type,
+            filename=upload_in.filename,
+            ext=ext,
+            features=item_api_models.extract_features(request),
+        ),
+        size=upload_in.size,
+    )
+
+    if result.session is None:
+        return upload_api_models.UploadSessionOutput(
+            uuid=None,
+            size=upload_in.size,
+            offset=upload_in.size,
+            expires_at=None,
+            duplicate_uuid=result.duplicate.uuid if result.duplicate else None,
+        )
+
+    response.headers['Location'] = str(
+        request.url_for('api_get_upload', session_uuid=result.session.uuid)
+    )
+    response.headers['Upload-Offset'] = str(result.session.offset)
+    return upload_api_models.convert_session(result.session)
+
+
+@api_uploads_router.get(
+    '/{session_uuid}',
+    summary='Get state of the upload',
+    response_model=upload_api_models.UploadSessionOutput,
+)
+async def api_get_upload(
+    session_uuid: UUID,
+    response: Response,
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    upload_sessions_repo: db_interfaces.AbsUploadSessionsRepo = Depends(
+        dep.get_upload_sessions_repo
+    ),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+) -> upload_api_models.UploadSessionOutput:
+    """Get state of the upload, client continues from returned offset."""
+    use_case = upload_use_cases.GetUploadUseCase(database, upload_sessions_repo, object_storage)
+
+    session = await use_case.execute(user, session_uuid)
+
+    response.headers['Upload-Offset'] = str(session.offset)
+    return upload_api_models.convert_session(session)
+
+
+@api_uploads_router.patch(
+    '/{session_uuid}',
+    summary='Send next part of the upload',
+    response_model=upload_api_models.UploadSessionOutput,
+)
+async def api_append_upload(  # noqa: PLR0913,PLR0917
+    request: Request,
+    response: Response,
+    session_uuid: UUID,
+    upload_offset: Annotated[int, Header(alias='Upload-Offset', ge=0)],
+    upload_checksum: Annotated[str | None, Header(alias='Upload-Checksum')] = None,
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    upload_sessions_repo: db_interfaces.AbsUploadSessionsRepo = Depends(
+        dep.get_upload_sessions_repo
+    ),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+) -> upload_api_models.UploadSessionOutput:
+    """Write request body into the upload starting at ``Upload-Offset``.
+
+    Optional ``Upload-Checksum: <md5|sha1|sha256> <base64 digest>``
+    is checked against the body, part that does not match is dropped.
+    """
+    use_case = upload_use_cases.AppendUploadUseCase(database, upload_sessions_repo, object_storage)
+
+    session = await use_case.execute(
+        user=user,
+        session_uuid=session_uuid,
+        offset=upload_offset,
+        chunks=request.stream(),
+        checksum=upload_checksum,
+    )
+
+    response.headers['Upload-Offset'] = str(session.offset)
+    return upload_api_models.convert_session(session)
+
+
+@api_uploads_router.post(
+    '/{session_uuid}/finish',
+    summary='Process completely received upload',
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=dict[str, str | int | None],
+)
+async def api_finish_upload(  # noqa: PLR0913,PLR0917
+    session_uuid: UUID,
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    misc_repo: db_interfaces.AbsMiscRepo = Depends(dep.get_misc_repo),
+    commands_repo: db_interfaces.AbsCommandsRepo = Depends(dep.get_commands_repo),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    exif_repo: db_interfaces.AbsEXIFRepo = Depends(dep.get_exif_repo),
+    upload_sessions_repo: db_interfaces.AbsUploadSessionsRepo = Depends(
+        dep.get_upload_sessions_repo
+    ),
+) -> dict[str, Any]:
+    """Start processing of the upload, same as after the regular upload."""
+    use_case = upload_use_cases.FinishUploadUseCase(
+        database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+        upload_sessions_repo,
+    )
+
+    item, result = await use_case.execute(user, session_uuid)
+
+    if result.duplicate is not None:
+        return {
+            'result': 'enqueued copying from duplicate',
+            'item_uuid': str(item.uuid),
+            'duplicate_uuid': str(result.duplicate.uuid),
+        }
+
+    return {
+        'result': 'enqueued content adding',
+        'item_uuid': str(item.uuid),
+        'operation_id': result.operation_id,
+    }
+
+
+@api_uploads_router.delete(
+    '/{session_uuid}',
+    summary='Abandon the upload',
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def api_delete_upload(
+    session_uuid: UUID,
+    user: models.User = Depends(dep.get_known_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    upload_sessions_repo: db_interfaces.AbsUploadSessionsRepo = Depends(
+        dep.get_upload_sessions_repo
+    ),
+    object_storage: object_interfaces.AbsObjectStorage = Depends(dep.get_object_storage),
+) -> None:
+    """Abandon the upload and free space taken by received parts."""
+    use_case = upload_use_cases.DeleteUploadUseCase(database, upload_sessions_repo, object_storage)
+    await use_case.execute(user, session_uuid)
@@ -0,0 +1,346 @@
+"""Use cases for resumable uploads."""
+
+import base64
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from datetime import timedelta
+import hashlib
+from typing import Any
+from typing import NamedTuple
+from uuid import UUID
+from uuid import uuid4
+
+import python_utilz as pu
+
+from omoide import const
+from omoide import custom_logging
+from omoide import exceptions
+from omoide import limits
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain import ensure
+from omoide.object_storage import interfaces as object_interfaces
+from omoide.omoide_api.items.item_use_cases import UploadItemUseCase
+from omoide.omoide_api.items.item_use_cases import UploadResult
+
+LOG = custom_logging.get_logger(__name__)
+
+CHECKSUM_ALGORITHMS = frozenset(('md5', 'sha1', 'sha256'))
+
+
+class CreateUploadResult(NamedTuple):
+    """New upload session or the item that already has this content."""
+
+    session: models.UploadSession | None
+    duplicate: models.Item | None
+
+
+def get_expiration() -> Any:
+    """Return time when session with no activity since now is forgotten."""
+    return pu.now() + timedelta(seconds=const.UPLOAD_SESSION_TTL)
+
+
+async def get_session(
+    conn: Any,
+    upload_sessions: db_interfaces.AbsUploadSessionsRepo,
+    user: models.User,
+    session_uuid: UUID,
+) -> models.UploadSession:
+    """Return upload session of the user if it is still alive."""
+    ensure.registered(user, 'Anonymous users are not allowed to upload items')
+
+    session = await upload_sessions.get_by_uuid(conn, session_uuid)
+
+    # sessions of other users are not even shown to exist
+    if session.owner_id != user.id or session.expires_at < pu.now():
+        msg = 'Upload session {session_uuid} does not exist'
+        raise exceptions.DoesNotExistError(msg, session_uuid=session_uuid)
+
+    return session
+
+
+class CreateUploadUseCase(UploadItemUseCase):
+    """Use case for starting resumable upload."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database: AbsDatabase,
+        items: db_interfaces.AbsItemsRepo,
+        meta: db_interfaces.AbsMetaRepo,
+        misc: db_interfaces.AbsMiscRepo,
+        commands_repo: db_interfaces.AbsCommandsRepo,
+        object_storage: object_interfaces.AbsObjectStorage,
+        signatures: db_interfaces.AbsSignaturesRepo,
+        exif: db_interfaces.AbsEXIFRepo,
+        upload_sessions: db_interfaces.AbsUploadSessionsRepo,
+    ) -> None:
+        """Initialize instance."""
+        super().__init__(
+            database, items, meta, misc, commands_repo, object_storage, signatures, exif
+        )
+        self.upload_sessions = upload_sessions
+
+    async def execute(  # type: ignore [override]
+        self,
+        user: models.User,
+        item_uuid: UUID,
+        file: models.NewFile,
+        size: int,
+    ) -> CreateUploadResult:
+        """Execute."""
+        ensure.registered(user, 'Anonymous users are not allowed to upload items')
+
+        if size > limits.MAX_MEDIA_SIZE:
+            msg = f'Maximum upload size is {limits.MAX_MEDIA_SIZE_HR}'
+            raise exceptions.NotAllowedError(msg)
+
+        declared_md5 = self.get_declared_md5(file)
+
+        async with self.database.transaction() as conn:
+            item = await self.get_target(conn, user, item_uuid)
+
+            duplicate = None
+            if declared_md5 is not None:
+                duplicate = await self._find_duplicate(conn, user, item, declared_md5)
+
+        # nothing has to be sent at all
+        if duplicate is not None and declared_md5 is not None:
+            result = await self._use_duplicate(user, item, file, duplicate, declared_md5)
+            return CreateUploadResult(session=None, duplicate=result.duplicate)
+
+        reference = await self.object_storage.create()
+        now = pu.now()
+        session = models.UploadSession(
+            uuid=uuid4(),
+            owner_id=user.id,
+            item_id=item.id,
+            backend=self.object_storage.backend,
+            oid=reference['oid'],
+            size=size,
+            offset=0,
+            content_type=file.content_type,
+            filename=file.filename,
+            ext=file.ext,
+            features=file.features.to_dict(),
+            created_at=now,
+            updated_at=now,
+            expires_at=get_expiration(),
+        )
+
+        async with self.database.transaction() as conn:
+            await self.upload_sessions.create(conn, session)
+
+        LOG.info('Started upload {} of {} bytes for item {}', session.uuid, size, item.uuid)
+        return CreateUploadResult(session=session, duplicate=None)
+
+
+class BaseUploadSessionUseCase:
+    """Base class for operations on existing upload sessions."""
+
+    def __init__(
+        self,
+        database: AbsDatabase,
+        upload_sessions: db_interfaces.AbsUploadSessionsRepo,
+        object_storage: object_interfaces.AbsObjectStorage,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.upload_sessions = upload_sessions
+        self.object_storage = object_storage
+
+
+class GetUploadUseCase(BaseUploadSessionUseCase):
+    """Use case for getting state of the upload."""
+
+    async def execute(self, user: models.User, session_uuid: UUID) -> models.UploadSession:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            return await get_session(conn, self.upload_sessions, user, session_uuid)
+
+
+class AppendUploadUseCase(BaseUploadSessionUseCase):
+    """Use case for writing next part of the upload."""
+
+    async def execute(
+        self,
+        user: models.User,
+        session_uuid: UUID,
+        offset: int,
+        chunks: AsyncIterable[bytes],
+        checksum: str | None,
+    ) -> models.UploadSession:
+        """Execute.
+
+        Part is written into the storage object at given offset. If it is
+        bigger than declared or does not match the checksum, nothing is
+        written and the client could send it again.
+
+        Request claims the session before it writes anything, so parts
+        sent concurrently never touch the same bytes: every one but the
+        first is rejected. The part itself is streamed with no
+        transaction held, same as the regular upload.
+        """
+        async with self.database.transaction() as conn:
+            session = await get_session(conn, self.upload_sessions, user, session_uuid)
+
+            if offset != session.offset:
+                msg = 'Upload {session_uuid} continues from offset {expected}, got {offset}'
+                raise exceptions.InvalidInputError(
+                    msg, session_uuid=session_uuid, expected=session.offset, offset=offset
+                )
+
+            until = pu.now() + timedelta(seconds=const.UPLOAD_PART_LEASE)
+            claimed = await self.upload_sessions.claim(conn, session, uuid4(), until)
+
+        if not claimed:
+            msg = 'Upload {session_uuid} is receiving another part'
+            raise exceptions.InvalidInputError(msg, session_uuid=session_uuid)
+
+        try:
+            verified = _verify_chunks(chunks, session.size - offset, _parse_checksum(checksum))
+            written = await self.object_storage.write_at(session.oid, offset, verified)
+        except Exception:
+            async with self.database.transaction() as conn:
+                await self.upload_sessions.release(conn, session)
+            raise
+
+        async with self.database.transaction() as conn:
+            moved = await self.upload_sessions.advance(
+                conn, session, offset + written, get_expiration()
+            )
+
+        if not moved:
+            msg = 'Upload {session_uuid} was changed by another request'
+            raise exceptions.InvalidInputError(msg, session_uuid=session_uuid)
+
+        session.offset += written
+        session.writer = None
+        session.writing_until = None
+        return session
+
+
+class FinishUploadUseCase(UploadItemUseCase):
+    """Use case for processing completely received upload."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database: AbsDatabase,
+        items: db_interfaces.AbsItemsRepo,
+        meta: db_interfaces.AbsMetaRepo,
+        misc: db_interfaces.AbsMiscRepo,
+        commands_repo: db_interfaces.AbsCommandsRepo,
+        object_storage: object_interfaces.AbsObjectStorage,
+        signatures: db_interfaces.AbsSignaturesRepo,
+        exif: db_interfaces.AbsEXIFRepo,
+        upload_sessions: db_interfaces.AbsUploadSessionsRepo,
+    ) -> None:
+        """Initialize instance."""
+        super().__init__(
+            database, items, meta, misc, commands_repo, object_storage, signatures, exif
+        )
+        self.upload_sessions = upload_sessions
+
+    async def execute(  # type: ignore [override]
+        self,
+        user: models.User,
+        session_uuid: UUID,
+    ) -> tuple[models.Item, UploadResult]:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            session = await get_session(conn, self.upload_sessions, user, session_uuid)
+            item = await self.items.get_by_id(conn, session.item_id)
+            ensure.owner(user, item, "You cannot upload media to someone else's item")
+
+        if not session.is_complete:
+            msg = 'Upload {session_uuid} got {offset} bytes of {size}'
+            raise exceptions.InvalidInputError(
+                msg, session_uuid=session_uuid, offset=session.offset, size=session.size
+            )
+
+        # parts could be sent in any number of requests, the only way
+        # to get hash of the whole content is to read it once again
+        digest = hashlib.md5()  # noqa: S324
+        async for chunk in self.object_storage.read(session.oid):
+            digest.update(chunk)
+
+        async with self.database.transaction() as conn:
+            if not await self.upload_sessions.delete(conn, session):
+                msg = 'Upload session {session_uuid} does not exist'
+                raise exceptions.DoesNotExistError(msg, session_uuid=session_uuid)
+
+        file = models.NewFile(
+            content_type=session.content_type,
+            filename=session.filename,
+            ext=session.ext,
+            features=models.Features.from_dict(session.features),
+        )
+
+        result = await self.enqueue(user, item, file, session.oid, digest.hexdigest())
+        return item, result
+
+
+class DeleteUploadUseCase(BaseUploadSessionUseCase):
+    """Use case for abandoning the upload."""
+
+    async def execute(self, user: models.User, session_uuid: UUID) -> None:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            session = await get_session(conn, self.upload_sessions, user, session_uuid)
+            deleted = await self.upload_sessions.delete(conn, session)
+
+        if deleted:
+            await self.object_storage.delete(session.oid)
+            LOG.info('Deleted upload {}', session.uuid)
+
+
+def _parse_checksum(checksum: str | None) -> tuple[Any, bytes] | None:
+    """Return hash object and expected digest from the checksum header.
+
+    Format is ``<algorithm> <base64 digest>``, same as in tus protocol.
+    """
+    if checksum is None:
+        return None
+
+    algorithm, _, encoded = checksum.strip().partition(' ')
+    algorithm = algorithm.lower()
+
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        supported = ', '.join(sorted(CHECKSUM_ALGORITHMS))
+        msg = f'Supported checksum algorithms are {supported}, got {algorithm!r}'
+        raise exceptions.InvalidInputError(msg)
+
+    try:
+        expected = base64.b64decode(encoded.strip(), validate=True)
+    except ValueError as exc:
+        msg = 'Checksum must be encoded in base64'
+        raise exceptions.InvalidInputError(msg) from exc
+
+    return hashlib.new(algorithm), expected
+
+
+async def _verify_chunks(
+    chunks: AsyncIterable[bytes],
+    remaining: int,
+    checksum: tuple[Any, bytes] | None,
+) -> AsyncIterator[bytes]:
+    """Pass chunks through, fail if they do not fit or do not match.
+
+    Failing before the storage commits rolls back everything
+    that was written in this request.
+    """
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > remaining:
+            msg = f'Upload is bigger than declared, only {remaining} bytes left'
+            raise exceptions.NotAllowedError(msg)
+
+        if checksum is not None:
+            checksum[0].update(chunk)
+
+        yield chunk
+
+    if checksum is not None and checksum[0].digest() != checksum[1]:
+        msg = 'Checksum of the uploaded part does not match'
+        raise exceptions.InvalidInputError(msg)
@@ -141,10 +141,10 @@ async def api_get_user_resource_usage(
     user: models.User = Depends(dep.get_known_user),
     database: AbsDatabase = Depends(dep.get_database),
     users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
-    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    usage_repo: db_interfaces.AbsUsageRepo = Depends(dep.get_usage_repo),
 ) -> user_api_models.UserResourceUsageOutput:
     """Get resource usage info for specific user."""
-    use_case = user_use_cases.GetUserResourceUsageUseCase(database, users_repo, meta_repo)
+    use_case = user_use_cases.GetUserResourceUsageUseCase(database, users_repo, usage_repo)
 
     output = await use_case.execute(user, user_uuid)
 
@@ -396,12 +396,12 @@ class GetUserResourceUsageUseCase:
         self,
         database: AbsDatabase,
         users: db_interfaces.AbsUsersRepo,
-        meta: db_interfaces.AbsMetaRepo,
+        usage: db_interfaces.AbsUsageRepo,
     ) -> None:
         """Initialize instance."""
         self.database = database
         self.users = users
-        self.meta = meta
+        self.usage = usage
 
     async def execute(
         self,
@@ -414,21 +414,7 @@ class GetUserResourceUsageUseCase:
         async with self.database.transaction() as conn:
             target_user = await self.users.get_by_uuid(conn, user_uuid)
             ensure.represents(user, target_user, "You cannot see someone else's resource usage")
-
-            disk_usage = await self.meta.get_total_disk_usage(conn, target_user)
-            total_items = await self.users.count_items_by_owner(conn, target_user)
-            total_collections = await self.users.count_items_by_owner(
-                conn,
-                target_user,
-                collections=True,
-            )
-
-        return models.ResourceUsage(
-            user=target_user,
-            total_items=total_items,
-            total_collections=total_collections,
-            disk_usage=disk_usage,
-        )
+            return await self.usage.get_usage(conn, target_user)
 
 
 class GetAnonUserTagsUseCase:
@@ -54,10 +54,10 @@ async def app_admin_resource_usage(
     aim_wrapper: Annotated[web.AimWrapper, Depends(dep.get_aim)],
     database: Annotated[AbsDatabase, Depends(dep.get_database)],
     users_repo: Annotated[db_interfaces.AbsUsersRepo, Depends(dep.get_users_repo)],
-    meta_repo: Annotated[db_interfaces.AbsMetaRepo, Depends(dep.get_meta_repo)],
+    usage_repo: Annotated[db_interfaces.AbsUsageRepo, Depends(dep.get_usage_repo)],
 ) -> HTMLResponse:
     """Show resource usage for every user."""
-    use_case = admin_use_cases.ShowResourceUsageUseCase(database, users_repo, meta_repo)
+    use_case = admin_use_cases.ShowResourceUsageUseCase(database, users_repo, usage_repo)
     resource_usage = await use_case.execute(admin)
 
     context = {
@@ -13,38 +13,22 @@ class ShowResourceUsageUseCase:
         self,
         database: AbsDatabase,
         users: db_interfaces.AbsUsersRepo,
-        meta: db_interfaces.AbsMetaRepo,
+        usage: db_interfaces.AbsUsageRepo,
     ) -> None:
         """Initialize instance."""
         self.database = database
         self.users = users
-        self.meta = meta
+        self.usage = usage
 
     async def execute(self, user: models.User) -> models.ResourceUsageStats:
         """Execute."""
         ensure.admin(user, 'Only admins can see resource usage')
-        resource_usage: list[models.ResourceUsage] = []
 
         async with self.database.transaction() as conn:
             users = await self.users.select(conn)
-            for each_user in users:
-                items = await self.users.count_items_by_owner(conn, each_user)
-
-                if items <= 1:
-                    continue
-
-                disk = await self.meta.get_total_disk_usage(conn, each_user)
-                collections = await self.users.count_items_by_owner(
-                    conn, each_user, collections=True
-                )
-                usage = models.ResourceUsage(
-                    user=each_user,
-                    total_items=items,
-                    total_collections=collections,
-                    disk_usage=disk,
-                )
-                resource_usage.append(usage)
+            usage_map = await self.usage.get_usage_map(conn, users)
 
+        resource_usage = [usage for usage in usage_map.values() if usage.total_items > 1]
         resource_usage.sort(key=lambda x: x.total_items, reverse=True)
         return models.ResourceUsageStats(
             users=resource_usage,
@@ -3,8 +3,10 @@
 All interactions with user are here.
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from collections.abc import Iterator
+import contextlib
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -13,13 +15,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from omoide import dependencies as dep
+from omoide.database.implementations import impl_sqlalchemy
 from omoide.exceptions import BaseOmoideError
 from omoide.omoide_app.admin import admin_controllers
 from omoide.omoide_app.auth import auth_controllers
 from omoide.omoide_app.browse import browse_controllers
+from omoide.omoide_app.download import download_controllers
 from omoide.omoide_app.exception_handlers import handle_omoide_error
 from omoide.omoide_app.home import home_controllers
 from omoide.omoide_app.items import item_controllers
+from omoide.omoide_app.media import media_controllers
 from omoide.omoide_app.preview import preview_controllers
 from omoide.omoide_app.profile import profile_controllers
 from omoide.omoide_app.search import search_controllers
@@ -34,9 +39,22 @@ def get_app() -> FastAPI:
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         """Application lifespan."""
         _ = app
-        await dep.get_database().connect()
+        database = dep.get_database()
+        await database.connect()
+
+        synchronization: asyncio.Task | None = None
+        if dep.get_config().search_backend == 'memory':
+            search_repo = impl_sqlalchemy.BitmapSearchRepo(dep.get_search_index())
+            synchronization = asyncio.create_task(search_repo.synchronize(database))
+
         yield
-        await dep.get_database().disconnect()
+
+        if synchronization is not None:
+            synchronization.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await synchronization
+
+        await database.disconnect()
 
     new_app = FastAPI(
         lifespan=lifespan,
@@ -54,13 +72,6 @@ def get_app() -> FastAPI:
         name='static',
     )
 
-    if config.env != 'prod':
-        new_app.mount(
-            '/content',
-            StaticFiles(directory=config.data_folder),
-            name='content',
-        )
-
     return new_app
 
 
@@ -69,8 +80,10 @@ def apply_app_routes(current_app: FastAPI) -> None:
     current_app.include_router(admin_controllers.app_admin_router)
     current_app.include_router(auth_controllers.app_auth_router)
     current_app.include_router(browse_controllers.app_browse_router)
+    current_app.include_router(download_controllers.app_download_router)
     current_app.include_router(home_controllers.app_home_router)
     current_app.include_router(item_controllers.app_items_router)
+    current_app.include_router(media_controllers.app_media_router)
     current_app.include_router(preview_controllers.app_preview_router)
     current_app.include_router(profile_controllers.app_profile_router)
     current_app.include_router(search_controllers.app_search_router)
@@ -126,7 +126,7 @@ class AppBrowsePagedUseCase:
             )
 
             names = await self.items.get_parent_names(conn, children)
-            total_items = await self.items.count_children(conn, item)
+            total_items = item.children_count
             metainfo = await self.meta.get_by_item(conn, item)
 
         return BrowseResult(
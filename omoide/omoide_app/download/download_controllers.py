@@ -0,0 +1,57 @@
+"""Downloading related routes."""
+
+import urllib.parse
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi import Depends
+
+from omoide import dependencies as dep
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.locators import FilesystemLocator
+from omoide.omoide_app.download import download_use_cases
+from omoide.presentation.infra.zip_stream import ZipStreamResponse
+
+app_download_router = APIRouter(tags=['Download'])
+
+
+@app_download_router.get(
+    '/download/{item_uuid}',
+    summary='Return all child items as a zip archive',
+    response_model=None,
+    response_class=ZipStreamResponse,
+)
+async def app_download_collection(  # noqa: PLR0913
+    item_uuid: UUID,
+    user: models.User = Depends(dep.get_current_user),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    locator: FilesystemLocator = Depends(dep.get_fs_locator),
+) -> ZipStreamResponse:
+    """Return all child items as a zip archive.
+
+    Pure python alternative to NGINX mod_zip. Archive is not compressed
+    and is streamed directly from the filesystem.
+    """
+    use_case = download_use_cases.StreamCollectionUseCase(
+        database, items_repo, users_repo, signatures_repo, locator
+    )
+
+    result = await use_case.execute(
+        user=user,
+        item_uuid=item_uuid,
+    )
+
+    if result.item.name:
+        filename = urllib.parse.quote(result.item.name)
+    else:
+        filename = 'unnamed collection'
+
+    return ZipStreamResponse(
+        entries=result.entries,
+        filename=f'Omoide - {filename}.zip',
+    )
@@ -0,0 +1,122 @@
+"""Use cases for download-related operations."""
+
+from typing import NamedTuple
+from uuid import UUID
+
+import aiofiles.os
+
+from omoide import const
+from omoide import custom_logging
+from omoide import exceptions
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.locators import FilesystemLocator
+from omoide.presentation.infra.zip_stream import ZipEntry
+
+LOG = custom_logging.get_logger(__name__)
+
+
+class StreamResult(NamedTuple):
+    """DTO for streamed archive."""
+
+    entries: list[ZipEntry]
+    item: models.Item
+
+
+class StreamCollectionUseCase:
+    """Use case for streaming whole group of items as zip archive.
+
+    Fallback for setups without NGINX mod_zip. Files are taken directly
+    from the filesystem, stored CRC32 signatures are used, so nothing
+    gets hashed during request.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database: AbsDatabase,
+        items: db_interfaces.AbsItemsRepo,
+        users: db_interfaces.AbsUsersRepo,
+        signatures: db_interfaces.AbsSignaturesRepo,
+        locator: FilesystemLocator,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.items = items
+        self.users = users
+        self.signatures = signatures
+        self.locator = locator
+
+    async def execute(
+        self,
+        user: models.User,
+        item_uuid: UUID,
+    ) -> StreamResult:
+        """Execute."""
+        async with self.database.transaction() as conn:
+            item = await self.items.get_by_uuid(conn, item_uuid)
+            owner = await self.users.get_by_id(conn, item.owner_id)
+            public_users = await self.users.get_public_user_ids(conn)
+
+            if all(
+                (
+                    owner.id not in public_users,
+                    user.id != owner.id,
+                    user.id not in item.permissions,
+                )
+            ):
+                # NOTE - hiding the fact
+                msg = 'Item {item_uuid} does not exist'
+                raise exceptions.DoesNotExistError(msg, item_uuid=item_uuid)
+
+            children = await self.items.get_children(conn, item)
+            valid_children = [
+                child
+                for child in children
+                if child.content_ext is not None and not child.is_collection
+            ]
+            signatures = await self.signatures.get_cr32_signatures_map(
+                conn=conn,
+                items=valid_children,
+            )
+
+        entries: list[ZipEntry] = []
+        digits = len(str(len(valid_children)))
+
+        for i, child in enumerate(valid_children, start=1):
+            media_type = const.MediaType.VIDEO if child.is_video else const.MediaType.CONTENT
+            path = self.locator.get_path(owner, child, media_type)
+
+            if path is None:
+                continue
+
+            try:
+                stat = await aiofiles.os.stat(path)
+            except FileNotFoundError:
+                LOG.warning(
+                    'User {} requested download for item {}, but file {} is missing',
+                    user,
+                    child,
+                    path,
+                )
+                continue
+
+            signature = signatures.get(child.id)
+            if signature is None:
+                LOG.warning(
+                    'User {} requested download for item {}, but is has no signature',
+                    user,
+                    child,
+                )
+
+            entries.append(
+                ZipEntry(
+                    path=path,
+                    arcname=f'{i:0{digits}d}___{child.uuid}.{child.content_ext}',
+                    size=stat.st_size,
+                    crc32=signature,
+                    mtime=stat.st_mtime,
+                )
+            )
+
+        return StreamResult(entries=entries, item=item)
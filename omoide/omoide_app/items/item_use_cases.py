@@ -100,7 +100,7 @@ class AppUpdateItemUseCase:
 
         async with self.database.transaction() as conn:
             item = await self.items.get_by_uuid(conn, item_uuid)
-            total = await self.items.count_family(conn, item)
+            total = item.descendants_count + 1
             can_see = await self.users.select(conn, ids=item.permissions)
             computed_tags = await self.items.get_computed_tags(conn, item)
             metainfo = await self.meta.get_by_item(conn, item)
@@ -145,6 +145,6 @@ class AppDeleteItemUseCase:
                 msg = 'You must own item {item_uuid} to delete it'
                 raise exceptions.AccessDeniedError(msg, item_uuid=item_uuid)
 
-            total = await self.items.count_family(conn, item)
+            total = item.descendants_count + 1
 
         return DeleteItemPage(item=item, total=total)
@@ -0,0 +1,222 @@
+"""Media related routes."""
+
+from typing import Annotated
+from uuid import UUID
+import zlib
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Header
+from fastapi import Response
+from fastapi import status
+from fastapi.responses import FileResponse
+
+from omoide import cfg
+from omoide import const
+from omoide import dependencies as dep
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.infra.disk_cache import DiskLRUCache
+from omoide.infra.pack_store import PackStore
+from omoide.infra.ttl_cache import TTLCache
+from omoide.omoide_app.media import media_use_cases
+
+app_media_router = APIRouter(tags=['Media'])
+
+# only contact sheets have version in the URL, other files
+# are changed in place and must be checked again
+REVALIDATE = f'max-age={const.MEDIA_CACHE_MAX_AGE}, must-revalidate'
+IMMUTABLE = f'max-age={const.MEDIA_VERSIONED_MAX_AGE}, immutable'
+
+
+@app_media_router.get(
+    '/content/{media_type}/{owner_uuid}/{prefix}/{filename}',
+    summary='Return file of the item',
+    response_model=None,
+)
+async def app_media(  # noqa: PLR0913,PLR0917
+    media_type: const.MediaType,
+    owner_uuid: UUID,
+    prefix: str,
+    filename: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+    user: models.User = Depends(dep.get_current_user),
+    config: cfg.Config = Depends(dep.get_config),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    cache: TTLCache[UUID, media_use_cases.MediaAccess] = Depends(dep.get_media_access_cache),
+    packs: PackStore | None = Depends(dep.get_pack_store),
+) -> Response:
+    """Return file of the item if user is allowed to see it.
+
+    Previews and thumbnails are served in the smallest format
+    that browser accepts. Behind NGINX actual sending is delegated via X-Accel-Redirect,
+    otherwise file is sent by the application itself
+    (with byte ranges support). Files from pack files are always sent
+    by the application.
+    """
+    use_case = media_use_cases.ServeMediaUseCase(
+        database, items_repo, users_repo, meta_repo, signatures_repo, cache, packs
+    )
+
+    result = await use_case.execute(
+        user=user,
+        media_type=media_type,
+        owner_uuid=owner_uuid,
+        prefix=prefix,
+        filename=filename,
+        accept=accept,
+    )
+
+    return make_response(result, config, if_none_match)
+
+
+@app_media_router.get(
+    f'/content/{const.RESIZED_FOLDER}/{{width}}/{{owner_uuid}}/{{prefix}}/{{filename}}',
+    summary='Return thumbnail of the item with given width',
+    response_model=None,
+)
+async def app_resized_media(  # noqa: PLR0913,PLR0917
+    width: int,
+    owner_uuid: UUID,
+    prefix: str,
+    filename: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept: Annotated[str | None, Header()] = None,
+    user: models.User = Depends(dep.get_current_user),
+    config: cfg.Config = Depends(dep.get_config),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    cache: TTLCache[UUID, media_use_cases.MediaAccess] = Depends(dep.get_media_access_cache),
+    files: DiskLRUCache = Depends(dep.get_resize_cache),
+    packs: PackStore | None = Depends(dep.get_pack_store),
+) -> Response:
+    """Return thumbnail of the item resized to one of allowed widths.
+
+    Meant for srcset of thumbnails. Access rules are the same as for
+    regular files, resized image is created on first request.
+    """
+    media = media_use_cases.ServeMediaUseCase(
+        database, items_repo, users_repo, meta_repo, signatures_repo, cache, packs
+    )
+    use_case = media_use_cases.ServeResizedMediaUseCase(media, files, config.data_folder)
+
+    result = await use_case.execute(
+        user=user,
+        width=width,
+        owner_uuid=owner_uuid,
+        prefix=prefix,
+        filename=filename,
+        accept=accept,
+    )
+
+    return make_response(result, config, if_none_match)
+
+
+@app_media_router.get(
+    f'/content/{const.CONTACT_SHEET_FOLDER}/{{version}}/{{owner_uuid}}/{{prefix}}/{{filename}}',
+    summary='Return contact sheet of the collection',
+    response_model=None,
+)
+async def app_contact_sheet(  # noqa: PLR0913,PLR0917
+    version: int,
+    owner_uuid: UUID,
+    prefix: str,
+    filename: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+    user: models.User = Depends(dep.get_current_user),
+    config: cfg.Config = Depends(dep.get_config),
+    database: AbsDatabase = Depends(dep.get_database),
+    items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    meta_repo: db_interfaces.AbsMetaRepo = Depends(dep.get_meta_repo),
+    signatures_repo: db_interfaces.AbsSignaturesRepo = Depends(dep.get_signatures_repo),
+    cache: TTLCache[UUID, media_use_cases.MediaAccess] = Depends(dep.get_media_access_cache),
+    contact_sheets_repo: db_interfaces.AbsContactSheetsRepo = Depends(dep.get_contact_sheets_repo),
+) -> Response:
+    """Return single image with thumbnails of the first children of a collection.
+
+    Access rules are the same as for regular files of the collection.
+    Only the current version of the sheet is served.
+    """
+    media = media_use_cases.ServeMediaUseCase(
+        database, items_repo, users_repo, meta_repo, signatures_repo, cache
+    )
+    use_case = media_use_cases.ServeContactSheetUseCase(
+        media, contact_sheets_repo, config.data_folder
+    )
+
+    result = await use_case.execute(
+        user=user,
+        version=version,
+        owner_uuid=owner_uuid,
+        prefix=prefix,
+        filename=filename,
+    )
+
+    return make_response(result, config, if_none_match)
+
+
+def make_response(
+    result: media_use_cases.MediaResult,
+    config: cfg.Config,
+    if_none_match: str | None,
+) -> Response:
+    """Send file or delegate sending to NGINX."""
+    visibility = 'public' if result.is_public else 'private'
+    policy = IMMUTABLE if result.is_versioned else REVALIDATE
+    headers = {'Cache-Control': f'{visibility}, {policy}'}
+
+    if result.is_negotiated:
+        headers['Vary'] = 'Accept'
+
+    etag = result.etag or get_fallback_etag(result, config)
+    if etag is not None:
+        headers['ETag'] = etag
+
+        if if_none_match is not None and etag in if_none_match:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if result.content is not None:
+        return Response(
+            content=result.content,
+            media_type=const.RENDITION_CONTENT_TYPES.get(result.relative_path.suffix.lstrip('.')),
+            headers=headers,
+        )
+
+    if config.media_backend == 'nginx':
+        location = config.media_internal_location.rstrip('/')
+        headers['X-Accel-Redirect'] = f'{location}/{result.relative_path.as_posix()}'
+        return Response(headers=headers)
+
+    return FileResponse(
+        config.data_folder / result.relative_path,
+        headers=headers,
+    )
+
+
+def get_fallback_etag(
+    result: media_use_cases.MediaResult,
+    config: cfg.Config,
+) -> str | None:
+    """Return ETag for files without checksum of the content.
+
+    Collections, for example, get thumbnails of their children.
+    """
+    if result.content is not None:
+        return f'"{zlib.crc32(result.content):08x}-{len(result.content):x}"'
+
+    try:
+        stat = (config.data_folder / result.relative_path).stat()
+    except OSError:
+        return None
+
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
@@ -0,0 +1,398 @@
+"""Use cases for media-related operations."""
+
+import asyncio
+import functools
+import io
+from pathlib import Path
+from typing import BinaryIO
+from typing import NamedTuple
+from uuid import UUID
+
+from PIL import Image
+
+from omoide import const
+from omoide import custom_logging
+from omoide import exceptions
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.database.interfaces.abs_database import AbsDatabase
+from omoide.domain import contact_sheet
+from omoide.infra.disk_cache import DiskLRUCache
+from omoide.infra.locators import WebLocator
+from omoide.infra.pack_store import PackStore
+from omoide.infra.ttl_cache import TTLCache
+
+LOG = custom_logging.get_logger(__name__)
+
+
+class MediaAccess(NamedTuple):
+    """Everything we need to know about the item to serve its files."""
+
+    owner_id: int
+    owner_uuid: UUID
+    owner_is_public: bool
+    permissions: frozenset[int]
+    extensions: dict[const.MediaType, str | None]
+    sizes: dict[const.MediaType, int | None]
+    renditions: dict[const.MediaType, dict[str, int]]
+    widths: dict[const.MediaType, int | None]
+    animated_preview_size: int | None
+    crc32: int | None
+
+
+class MediaResult(NamedTuple):
+    """DTO for served file."""
+
+    relative_path: Path
+    etag: str | None
+    is_public: bool
+    is_negotiated: bool
+    content: bytes | None = None
+    is_versioned: bool = False
+
+
+class ServeMediaUseCase:
+    """Use case for serving item files with access check.
+
+    Access info is cached per item for a short time, so permission changes
+    apply with a small delay, but pages with hundreds of thumbnails
+    do not hit the database for each of them.
+
+    Previews and thumbnails could also exist in modern formats. When
+    the default file is requested, the smallest one that client accepts
+    is served instead. They also could be moved into pack files,
+    packed version is preferred when packs are enabled. Videos could
+    have animated preview next to the static one, it is never
+    negotiated and only served when asked for by its own name.
+    """
+
+    PACKED_MEDIA = frozenset((const.MediaType.PREVIEW, const.MediaType.THUMBNAIL))
+
+    def __init__(  # noqa: PLR0913
+        self,
+        database: AbsDatabase,
+        items: db_interfaces.AbsItemsRepo,
+        users: db_interfaces.AbsUsersRepo,
+        meta: db_interfaces.AbsMetaRepo,
+        signatures: db_interfaces.AbsSignaturesRepo,
+        cache: TTLCache[UUID, MediaAccess],
+        packs: PackStore | None = None,
+    ) -> None:
+        """Initialize instance."""
+        self.database = database
+        self.items = items
+        self.users = users
+        self.meta = meta
+        self.signatures = signatures
+        self.cache = cache
+        self.packs = packs
+
+    async def execute(  # noqa: PLR0913
+        self,
+        user: models.User,
+        media_type: const.MediaType,
+        owner_uuid: UUID,
+        prefix: str,
+        filename: str,
+        accept: str | None = None,
+    ) -> MediaResult:
+        """Execute."""
+        stem, ext, access = await self.get_allowed_access(user, owner_uuid, prefix, filename)
+
+        default_ext = access.extensions.get(media_type)
+        renditions = access.renditions.get(media_type, {})
+        is_animated = all(
+            (
+                media_type == const.MediaType.PREVIEW,
+                ext == const.ANIMATED_PREVIEW_EXT,
+                access.animated_preview_size is not None,
+            )
+        )
+
+        if default_ext != ext and ext not in renditions and not is_animated:
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        size = renditions.get(ext) or access.sizes.get(media_type)
+        if is_animated:
+            size = access.animated_preview_size
+
+        is_negotiated = ext == default_ext and bool(renditions)
+
+        if is_negotiated:
+            ext = WebLocator.pick_format(accept, ext, size, renditions)
+            size = renditions.get(ext, size)
+
+        etag = None
+        if access.crc32 is not None:
+            etag = f'"{access.crc32:08x}-{media_type}-{ext}-{size or 0}"'
+
+        relative_path = Path(media_type, str(owner_uuid), prefix, f'{stem}.{ext}')
+
+        content = None
+        if self.packs is not None and media_type in self.PACKED_MEDIA:
+            content = await asyncio.to_thread(self.packs.read_relative, relative_path)
+
+        return MediaResult(
+            relative_path=relative_path,
+            etag=etag,
+            is_public=access.owner_is_public,
+            is_negotiated=is_negotiated,
+            content=content,
+        )
+
+    async def get_allowed_access(
+        self,
+        user: models.User,
+        owner_uuid: UUID,
+        prefix: str,
+        filename: str,
+    ) -> tuple[str, str, MediaAccess]:
+        """Return stem, extension and access info, raise if file is not for the user."""
+        stem, _, ext = filename.partition('.')
+
+        try:
+            item_uuid = UUID(stem)
+        except ValueError:
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename) from None
+
+        access = await self.get_access(item_uuid)
+
+        if all(
+            (
+                not access.owner_is_public,
+                user.id != access.owner_id,
+                user.id not in access.permissions,
+            )
+        ):
+            # NOTE - hiding the fact
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        if any(
+            (
+                access.owner_uuid != owner_uuid,
+                prefix != stem[: len(prefix)],
+                not ext,
+            )
+        ):
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        return stem, ext, access
+
+    async def get_access(self, item_uuid: UUID) -> MediaAccess:
+        """Return access info for the item."""
+        access = self.cache.get(item_uuid)
+
+        if access is not None:
+            return access
+
+        async with self.database.transaction() as conn:
+            item = await self.items.get_by_uuid(conn, item_uuid)
+            public_users = await self.users.get_public_user_ids(conn)
+            crc32 = await self.signatures.get_cr32_signature(conn, item)
+            metainfo = (await self.meta.get_metainfo_map(conn, [item])).get(item.id)
+
+        video_ext = item.content_ext if item.is_video else None
+        content_ext = None if item.is_video else item.content_ext
+
+        access = MediaAccess(
+            owner_id=item.owner_id,
+            owner_uuid=item.owner_uuid,
+            owner_is_public=item.owner_id in public_users,
+            permissions=frozenset(item.permissions),
+            extensions={
+                const.MediaType.VIDEO: video_ext,
+                const.MediaType.CONTENT: content_ext,
+                const.MediaType.PREVIEW: item.preview_ext,
+                const.MediaType.THUMBNAIL: item.thumbnail_ext,
+            },
+            sizes={
+                const.MediaType.VIDEO: metainfo.content_size if metainfo else None,
+                const.MediaType.CONTENT: metainfo.content_size if metainfo else None,
+                const.MediaType.PREVIEW: metainfo.preview_size if metainfo else None,
+                const.MediaType.THUMBNAIL: metainfo.thumbnail_size if metainfo else None,
+            },
+            renditions={
+                const.MediaType.PREVIEW: (
+                    metainfo.get_rendition_sizes(const.MediaType.PREVIEW) if metainfo else {}
+                ),
+                const.MediaType.THUMBNAIL: (
+                    metainfo.get_rendition_sizes(const.MediaType.THUMBNAIL) if metainfo else {}
+                ),
+            },
+            widths={
+                const.MediaType.PREVIEW: metainfo.preview_width if metainfo else None,
+                const.MediaType.THUMBNAIL: metainfo.thumbnail_width if metainfo else None,
+            },
+            animated_preview_size=metainfo.animated_preview_size if metainfo else None,
+            crc32=crc32,
+        )
+        self.cache.set(item_uuid, access)
+        return access
+
+
+class ServeResizedMediaUseCase:
+    """Use case for serving images of arbitrary allowed width.
+
+    Image is created from the smallest stored thumbnail or preview
+    that is wide enough, then kept in disk cache. Images are never
+    upscaled, so any width above the preview gives preview-sized file.
+    Cache is shared with other processes that could evict the file
+    at any moment, so content is sent from memory instead of path.
+    """
+
+    def __init__(
+        self,
+        media: ServeMediaUseCase,
+        files: DiskLRUCache,
+        data_folder: Path,
+    ) -> None:
+        """Initialize instance."""
+        self.media = media
+        self.files = files
+        self.data_folder = data_folder
+
+    async def execute(  # noqa: PLR0913
+        self,
+        user: models.User,
+        width: int,
+        owner_uuid: UUID,
+        prefix: str,
+        filename: str,
+        accept: str | None = None,
+    ) -> MediaResult:
+        """Execute."""
+        if width not in const.RESPONSIVE_WIDTHS:
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        stem, ext, access = await self.media.get_allowed_access(user, owner_uuid, prefix, filename)
+
+        if ext != access.extensions.get(const.MediaType.THUMBNAIL):
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        source_type = self.get_source(access, width)
+        source_ext = access.extensions[source_type]
+        source_size = access.sizes.get(source_type) or 0
+        relative_source = Path(source_type, str(owner_uuid), prefix, f'{stem}.{source_ext}')
+
+        target_ext = 'jpg'
+        if const.RENDITION_CONTENT_TYPES['webp'] in WebLocator.get_accepted_types(accept):
+            target_ext = 'webp'
+
+        # source size changes when item is uploaded again
+        key = f'{stem}_{width}_{source_size}.{target_ext}'
+
+        source: Path | BinaryIO = self.data_folder / relative_source
+        if self.media.packs is not None and self.files.get(key) is None:
+            data = await asyncio.to_thread(self.media.packs.read_relative, relative_source)
+            if data is not None:
+                source = io.BytesIO(data)
+
+        content = await self.files.get_or_create(
+            key,
+            functools.partial(make_resized, source, width=width, ext=target_ext),
+        )
+
+        etag = None
+        if access.crc32 is not None:
+            etag = f'"{access.crc32:08x}-{width}-{target_ext}-{source_size}"'
+
+        return MediaResult(
+            relative_path=Path(const.RESIZED_FOLDER) / self.files.get_relative_path(key),
+            etag=etag,
+            is_public=access.owner_is_public,
+            is_negotiated=True,
+            content=content,
+        )
+
+    @staticmethod
+    def get_source(access: MediaAccess, width: int) -> const.MediaType:
+        """Return stored image that is the closest one to given width."""
+        thumbnail_width = access.widths.get(const.MediaType.THUMBNAIL)
+        if thumbnail_width is not None and thumbnail_width >= width:
+            return const.MediaType.THUMBNAIL
+
+        if access.extensions.get(const.MediaType.PREVIEW) is None:
+            return const.MediaType.THUMBNAIL
+
+        return const.MediaType.PREVIEW
+
+
+class ServeContactSheetUseCase:
+    """Use case for serving contact sheets of collections.
+
+    Every version is a separate file, previous one is removed after
+    the rebuild is saved. Since the response is cached forever, only
+    the version the database points to is served.
+    """
+
+    def __init__(
+        self,
+        media: ServeMediaUseCase,
+        contact_sheets: db_interfaces.AbsContactSheetsRepo,
+        data_folder: Path,
+    ) -> None:
+        """Initialize instance."""
+        self.media = media
+        self.contact_sheets = contact_sheets
+        self.data_folder = data_folder
+
+    async def execute(  # noqa: PLR0913
+        self,
+        user: models.User,
+        version: int,
+        owner_uuid: UUID,
+        prefix: str,
+        filename: str,
+    ) -> MediaResult:
+        """Execute."""
+        stem, ext, access = await self.media.get_allowed_access(user, owner_uuid, prefix, filename)
+
+        relative_path = Path(
+            const.CONTACT_SHEET_FOLDER, str(owner_uuid), prefix, stem, f'{version}.{ext}'
+        )
+
+        if ext != const.CONTACT_SHEET_EXT or not (self.data_folder / relative_path).exists():
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        async with self.media.database.transaction() as conn:
+            item = await self.media.items.get_by_uuid(conn, UUID(stem))
+            sheet = await self.contact_sheets.get_by_item(conn, item)
+            source = await self.contact_sheets.get_source(
+                conn, item, limit=const.CONTACT_SHEET_SIZE
+            )
+
+        if sheet is None or sheet.version != version or not contact_sheet.is_covered(sheet, source):
+            msg = 'File {filename} does not exist'
+            raise exceptions.DoesNotExistError(msg, filename=filename)
+
+        return MediaResult(
+            relative_path=relative_path,
+            etag=f'"{stem}-sheet-{version}"',
+            is_public=access.owner_is_public,
+            is_negotiated=False,
+            is_versioned=True,
+        )
+
+
+def make_resized(source: Path | BinaryIO, target_path: Path, width: int, ext: str) -> None:
+    """Save smaller copy of the image."""
+    with Image.open(source) as img:
+        # JPEG could be decoded right into reduced size, which is much faster
+        img.draft('RGB', (width, width * img.height // max(img.width, 1)))
+        new_img = img.convert('RGB')
+
+    if new_img.width > width:
+        height = max(1, round(new_img.height * width / new_img.width))
+        new_img = new_img.resize((width, height), Image.Resampling.LANCZOS)
+
+    if ext == 'webp':
+        new_img.save(target_path, 'WEBP', quality=const.IMAGE_QUALITY, method=4)
+    else:
+        new_img.save(target_path, 'JPEG', quality=const.IMAGE_QUALITY, optimize=True)
@@ -60,11 +60,11 @@ async def app_profile_usage(  # noqa: PLR0913
     aim_wrapper: Annotated[web.AimWrapper, Depends(dep.get_aim)],
     user: models.User = Depends(dep.get_current_user),
     database: AbsDatabase = Depends(dep.get_database),
-    users_repo: db_interfaces.AbsUsersRepo = Depends(dep.get_users_repo),
+    usage_repo: db_interfaces.AbsUsageRepo = Depends(dep.get_usage_repo),
     response_class: type[Response] = HTMLResponse,  # noqa: ARG001
 ) -> HTMLResponse:
     """Show space usage stats."""
-    use_case = profile_use_cases.AppProfileUsageUseCase(database, users_repo)
+    use_case = profile_use_cases.AppProfileUsageUseCase(database, usage_repo)
     result = await use_case.execute(user)
 
     context = {
@@ -123,12 +123,13 @@ async def app_profile_duplicates(  # noqa: PLR0913
     user: models.User = Depends(dep.get_current_user),
     database: AbsDatabase = Depends(dep.get_database),
     items_repo: db_interfaces.AbsItemsRepo = Depends(dep.get_items_repo),
+    duplicates_repo: db_interfaces.AbsDuplicatesRepo = Depends(dep.get_duplicates_repo),
     item_uuid: Annotated[str | None, Query()] = None,
     limit: Annotated[int, Query(ge=limits.MIN_LIMIT, lt=limits.MAX_LIMIT)] = limits.DEF_LIMIT,
     response_class: type[Response] = HTMLResponse,  # noqa: ARG001
 ) -> HTMLResponse:
     """Show duplicated items."""
-    use_case = profile_use_cases.AppProfileDuplicatesUseCase(database, items_repo)
+    use_case = profile_use_cases.AppProfileDuplicatesUseCase(database, items_repo, duplicates_repo)
     result = await use_case.execute(user, item_uuid, limit)
 
     context = {
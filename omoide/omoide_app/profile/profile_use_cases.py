@@ -14,7 +14,7 @@ from omoide.domain import ensure
 class ProfileUsage(NamedTuple):
     """Disk usage stats shown on the profile usage page."""
 
-    size: models.SpaceUsage
+    size: models.DiskUsage
     total_items: int
     total_collections: int
 
@@ -32,11 +32,11 @@ class AppProfileUsageUseCase:
     def __init__(
         self,
         database: AbsDatabase,
-        users: db_interfaces.AbsUsersRepo,
+        usage: db_interfaces.AbsUsageRepo,
     ) -> None:
         """Initialize instance."""
         self.database = database
-        self.users = users
+        self.usage = usage
 
     async def execute(
         self,
@@ -46,18 +46,12 @@ class AppProfileUsageUseCase:
         ensure.registered(user, 'Anonymous users have no resource usage')
 
         async with self.database.transaction() as conn:
-            size = await self.users.calc_total_space_used_by(conn, user)
-            total_items = await self.users.count_items_by_owner(conn, user)
-            total_collections = await self.users.count_items_by_owner(
-                conn=conn,
-                user=user,
-                collections=True,
-            )
+            usage = await self.usage.get_usage(conn, user)
 
         return ProfileUsage(
-            size=size,
-            total_items=total_items,
-            total_collections=total_collections,
+            size=usage.disk_usage,
+            total_items=usage.total_items,
+            total_collections=usage.total_collections,
         )
 
 
@@ -94,10 +88,12 @@ class AppProfileDuplicatesUseCase:
         self,
         database: AbsDatabase,
         items: db_interfaces.AbsItemsRepo,
+        duplicates: db_interfaces.AbsDuplicatesRepo,
     ) -> None:
         """Initialize instance."""
         self.database = database
         self.items = items
+        self.duplicates = duplicates
 
     async def execute(
         self,
@@ -114,6 +110,7 @@ class AppProfileDuplicatesUseCase:
             else:
                 item = None
 
-            duplicates = await self.items.get_duplicates(conn, user, item, limit)
+            groups = await self.duplicates.get_md5_groups(conn, user, item, offset=0, limit=limit)
+            duplicates = await self.duplicates.resolve_groups(conn, groups)
 
         return ProfileDuplicates(item=item, duplicates=duplicates)
@@ -2,20 +2,31 @@
 
 import asyncio
 import json
+import os
+from pathlib import Path
 from typing import Annotated
 
+import python_utilz as pu
 import sqlalchemy as sa
 import typer
 
+from omoide import const
 from omoide.omoide_cli import rebuild_computed_tags as rebuild_computed_tags_module
 from omoide.omoide_cli import rebuild_known_tags as rebuild_known_tags_module
+from omoide.omoide_cli import rebuild_user_usage as rebuild_user_usage_module
 from omoide.omoide_cli import utils
 from omoide.omoide_cli.audit import main as audit_module
+from omoide.omoide_cli.blobs import code as blobs
 from omoide.omoide_cli.db import main as db
 from omoide.omoide_cli.display import main as display
+from omoide.omoide_cli.exif import code as exif
 from omoide.omoide_cli.fs import main as filesystem
+from omoide.omoide_cli.packs import code as packs
+from omoide.omoide_cli.perceptual import code as perceptual
+from omoide.omoide_cli.placeholders import code as placeholders
 from omoide.omoide_cli.signatures import code as signatures
 from omoide.omoide_cli.thumbnails import code as thumbnails
+from omoide.omoide_cli.uploads import code as uploads
 
 app = typer.Typer(no_args_is_help=True)
 
@@ -34,6 +45,17 @@ def rebuild_known_tags() -> None:
     asyncio.run(rebuild_known_tags_module.run())
 
 
+@app.command()
+def rebuild_user_usage(
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show the difference, do not save anything'),
+    ] = False,
+) -> None:
+    """Reconcile aggregated resource usage with actual items and metainfo."""
+    asyncio.run(rebuild_user_usage_module.run(dry_run=dry_run))
+
+
 @app.command()
 def fix_signatures(
     check_missing: Annotated[
@@ -117,6 +139,204 @@ def fix_missing_thumbnails(
     thumbnails.fix_missing_thumbnails(engine, site_url, create, marker, limit, user, password)
 
 
+@app.command()
+def backfill_exif(
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not save anything'),
+    ] = False,
+    refresh_fields: Annotated[
+        bool,
+        typer.Option(help='Re-extract typed fields from already stored EXIF instead'),
+    ] = False,
+    marker: Annotated[
+        int,
+        typer.Option(help='Id of last processed item'),
+    ] = -1,
+    limit: Annotated[
+        int,
+        typer.Option(help='Maximum amount of rows to process'),
+    ] = 10_000,
+    batch_size: Annotated[
+        int,
+        typer.Option(help='Amount of rows processed in one transaction'),
+    ] = 500,
+) -> None:
+    """Read EXIF for items that were uploaded without it."""
+    db_url = utils.get_env('OMOIDE_CLI__DB__URL')
+    engine = sa.create_engine(db_url, pool_pre_ping=True, future=True)
+
+    if refresh_fields:
+        marker = exif.refresh_exif_fields(engine, marker, limit, batch_size)
+    else:
+        data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+        marker = exif.backfill_exif(engine, data_folder, dry_run, marker, limit, batch_size)
+
+    print(f'Last processed item id: {marker}')  # noqa: T201
+
+
+@app.command()
+def backfill_perceptual_signatures(
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not save anything'),
+    ] = False,
+    marker: Annotated[
+        int,
+        typer.Option(help='Id of last processed item'),
+    ] = -1,
+    limit: Annotated[
+        int,
+        typer.Option(help='Maximum amount of rows to process'),
+    ] = 10_000,
+    batch_size: Annotated[
+        int,
+        typer.Option(help='Amount of rows processed in one transaction'),
+    ] = 500,
+) -> None:
+    """Calculate perceptual signatures for images that were uploaded without them."""
+    db_url = utils.get_env('OMOIDE_CLI__DB__URL')
+    data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+    engine = sa.create_engine(db_url, pool_pre_ping=True, future=True)
+
+    marker = perceptual.backfill_perceptual_signatures(
+        engine, data_folder, dry_run, marker, limit, batch_size
+    )
+
+    print(f'Last processed item id: {marker}')  # noqa: T201
+
+
+@app.command()
+def backfill_placeholders(
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not save anything'),
+    ] = False,
+    marker: Annotated[
+        int,
+        typer.Option(help='Id of last processed item'),
+    ] = -1,
+    limit: Annotated[
+        int,
+        typer.Option(help='Maximum amount of rows to process'),
+    ] = 10_000,
+    batch_size: Annotated[
+        int,
+        typer.Option(help='Amount of rows processed in one transaction'),
+    ] = 500,
+) -> None:
+    """Create thumbnail placeholders for items that were uploaded without them."""
+    db_url = utils.get_env('OMOIDE_CLI__DB__URL')
+    data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+    engine = sa.create_engine(db_url, pool_pre_ping=True, future=True)
+
+    marker = placeholders.backfill_placeholders(
+        engine, data_folder, dry_run, marker, limit, batch_size
+    )
+
+    print(f'Last processed item id: {marker}')  # noqa: T201
+
+
+@app.command()
+def pack_media(
+    media_type: Annotated[
+        const.MediaType,
+        typer.Option(help='Which files to pack, previews or thumbnails'),
+    ] = const.MediaType.THUMBNAIL,
+    remove_files: Annotated[
+        bool,
+        typer.Option(help='Remove regular files once they are packed'),
+    ] = False,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not change anything'),
+    ] = False,
+) -> None:
+    """Move previews or thumbnails into append-only pack files."""
+    data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+
+    if media_type not in (const.MediaType.PREVIEW, const.MediaType.THUMBNAIL):
+        print(f'Only previews and thumbnails could be packed, got {media_type}')  # noqa: T201
+        raise typer.Exit(1)
+
+    files, size = packs.pack_files(data_folder, media_type, remove_files, dry_run)
+
+    print(f'Packed {files} files, {pu.human_readable_size(size)}')  # noqa: T201
+
+
+@app.command()
+def compact_packs(
+    media_type: Annotated[
+        const.MediaType,
+        typer.Option(help='Which packs to compact, previews or thumbnails'),
+    ] = const.MediaType.THUMBNAIL,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not change anything'),
+    ] = False,
+) -> None:
+    """Reclaim space taken by deleted and replaced files in pack files."""
+    data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+
+    reclaimed = packs.compact_packs(data_folder, media_type, dry_run)
+
+    print(f'Reclaimed {pu.human_readable_size(reclaimed)}')  # noqa: T201
+
+
+@app.command()
+def check_blobs(
+    verify: Annotated[
+        bool,
+        typer.Option(help='Compare content of every blob with its hash'),
+    ] = False,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not change anything'),
+    ] = False,
+) -> None:
+    """Remove shared files nobody uses anymore and look for damaged ones."""
+    data_folder = utils.get_path('OMOIDE_CLI__DATA_FOLDER')
+
+    report = blobs.check_blobs(data_folder, verify, dry_run)
+
+    print(f'Blobs: {report.blobs}, references: {report.references}')  # noqa: T201
+    print(  # noqa: T201
+        f'Removed {report.collected} unused blobs, '
+        f'reclaimed {pu.human_readable_size(report.reclaimed)}'
+    )
+
+    if report.broken:
+        print(f'Damaged blobs: {report.broken}')  # noqa: T201
+        raise typer.Exit(1)
+
+
+@app.command()
+def expire_uploads(
+    staging_folder: Annotated[
+        Path | None,
+        typer.Option(help='Staging folder, if uploads are stored as files'),
+    ] = None,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help='Only show what was found, do not change anything'),
+    ] = False,
+) -> None:
+    """Remove resumable uploads that expired or belong to deleted items.
+
+    Staging folder defaults to the one inside the data folder,
+    same as in the application.
+    """
+    db_url = utils.get_env('OMOIDE_CLI__DB__URL')
+    engine = sa.create_engine(db_url, pool_pre_ping=True, future=True)
+
+    if staging_folder is None and (data_folder := os.getenv('OMOIDE_CLI__DATA_FOLDER')):
+        staging_folder = Path(data_folder) / const.STAGING_FOLDER
+
+    total = uploads.expire_upload_sessions(engine, dry_run, staging_folder)
+
+    print(f'Expired {total} upload sessions')  # noqa: T201
+
+
 app.add_typer(db.app, name='db')
 app.add_typer(display.app, name='display')
 app.add_typer(filesystem.app, name='fs')
@@ -0,0 +1,58 @@
+"""Check and clean content-addressed blobs."""
+
+from pathlib import Path
+from typing import NamedTuple
+
+from omoide import const
+from omoide import custom_logging
+from omoide.infra.blob_store import BlobStore
+
+LOG = custom_logging.get_logger(__name__)
+
+
+class BlobsReport(NamedTuple):
+    """Result of the check."""
+
+    blobs: int
+    references: int
+    collected: int
+    reclaimed: int
+    broken: int
+
+
+def check_blobs(data_folder: Path, verify: bool, dry_run: bool) -> BlobsReport:
+    """Remove blobs nobody links to, optionally verify the rest.
+
+    Reference count is the link count of the blob, so the filesystem
+    is the only source of truth and there is nothing else to reconcile.
+    Broken blobs are only reported, every item that links to them
+    is broken as well and has to be re-uploaded.
+    """
+    store = BlobStore(data_folder / const.BLOBS_FOLDER)
+    blobs = 0
+    references = 0
+    collected = 0
+    reclaimed = 0
+    broken = 0
+
+    for blob_path in store.iter_blobs():
+        blobs += 1
+        size = blob_path.stat().st_size
+        count = store.get_references(blob_path)
+        references += count
+
+        if not count:
+            if dry_run:
+                LOG.info('Will remove unused blob {}', blob_path)
+            else:
+                store.collect(blob_path)
+                LOG.info('Removed unused blob {}', blob_path)
+            collected += 1
+            reclaimed += size
+            continue
+
+        if verify and not store.verify(blob_path):
+            LOG.error('Blob {} is damaged, {} files share it', blob_path, count)
+            broken += 1
+
+    return BlobsReport(blobs, references, collected, reclaimed, broken)
@@ -0,0 +1,143 @@
+"""Fill EXIF for items that were uploaded without it."""
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from omoide import custom_logging
+from omoide import models
+from omoide import utils
+from omoide.database import db_models
+from omoide.domain import exif as exif_domain
+from omoide.infra import exif_reader
+
+LOG = custom_logging.get_logger(__name__)
+
+
+def backfill_exif(  # noqa: PLR0913
+    engine: Engine,
+    data_folder: Path,
+    dry_run: bool,
+    marker: int,
+    limit: int,
+    batch_size: int,
+) -> int:
+    """Read EXIF from content files of items that have none.
+
+    Only metadata part of every file is read, pixels are never decoded.
+    Every batch is committed separately. Returns id of the last
+    processed item, so it can be used as marker for the next run.
+    """
+    processed = 0
+
+    while processed < limit:
+        with engine.begin() as conn:
+            batch = _get_items_without_exif(conn, marker, min(batch_size, limit - processed))
+
+            if not batch:
+                break
+
+            for item_id, owner_id, owner_uuid, item_uuid, ext in batch:
+                marker = item_id
+                path = utils.get_content_path(data_folder, owner_uuid, item_uuid, ext)
+
+                try:
+                    exif = exif_reader.extract_exif_from_file(path)
+                except OSError:
+                    LOG.exception('Failed to read content of item_uuid={}', item_uuid)
+                    continue
+
+                if not exif:
+                    LOG.info('No EXIF: item_id={}, item_uuid={}', item_id, item_uuid)
+                    continue
+
+                LOG.info('Found EXIF: item_id={}, item_uuid={}', item_id, item_uuid)
+                if not dry_run:
+                    _save_exif(conn, item_id, owner_id, exif)
+
+            processed += len(batch)
+
+        LOG.info('Processed {} items, marker={}', processed, marker)
+
+    return marker
+
+
+def _get_items_without_exif(conn: Connection, marker: int, limit: int) -> list[Any]:
+    """Return next batch of items that have content but no EXIF."""
+    query = (
+        sa.select(
+            db_models.Item.id,
+            db_models.Item.owner_id,
+            db_models.Item.owner_uuid,
+            db_models.Item.uuid,
+            db_models.Item.content_ext,
+        )
+        .join(
+            db_models.EXIF,
+            db_models.EXIF.item_id == db_models.Item.id,
+            isouter=True,
+        )
+        .where(
+            db_models.Item.status == models.Status.AVAILABLE,
+            db_models.Item.content_ext != sa.null(),
+            db_models.EXIF.item_id == sa.null(),
+            db_models.Item.id > marker,
+        )
+        .order_by(db_models.Item.id)
+        .limit(limit)
+    )
+    return list(conn.execute(query).all())
+
+
+def _save_exif(conn: Connection, item_id: int, owner_id: int, exif: dict[str, Any]) -> None:
+    """Store EXIF along with its typed fields."""
+    values = {
+        'item_id': item_id,
+        'owner_id': owner_id,
+        'exif': exif,
+        **asdict(exif_domain.extract_fields(exif)),
+    }
+    insert = pg_insert(db_models.EXIF).values(**values)
+    stmt = insert.on_conflict_do_nothing(index_elements=[db_models.EXIF.item_id])
+    conn.execute(stmt)
+
+
+def refresh_exif_fields(engine: Engine, marker: int, limit: int, batch_size: int) -> int:
+    """Extract typed fields again from already stored EXIF.
+
+    Returns id of the last processed item.
+    """
+    processed = 0
+
+    while processed < limit:
+        with engine.begin() as conn:
+            query = (
+                sa.select(db_models.EXIF.item_id, db_models.EXIF.exif)
+                .where(db_models.EXIF.item_id > marker)
+                .order_by(db_models.EXIF.item_id)
+                .limit(min(batch_size, limit - processed))
+            )
+            batch = conn.execute(query).all()
+
+            if not batch:
+                break
+
+            for item_id, exif in batch:
+                marker = item_id
+                stmt = (
+                    sa.update(db_models.EXIF)
+                    .values(**asdict(exif_domain.extract_fields(exif)))
+                    .where(db_models.EXIF.item_id == item_id)
+                )
+                conn.execute(stmt)
+
+            processed += len(batch)
+
+        LOG.info('Processed {} items, marker={}', processed, marker)
+
+    return marker
@@ -0,0 +1,85 @@
+"""Move previews and thumbnails into pack files and maintain them."""
+
+from pathlib import Path
+
+from omoide import const
+from omoide import custom_logging
+from omoide.infra.pack_store import PackStore
+
+LOG = custom_logging.get_logger(__name__)
+
+DELETED_PREFIX = 'deleted___'
+
+
+def pack_files(
+    data_folder: Path,
+    media_type: const.MediaType,
+    remove_files: bool,
+    dry_run: bool,
+) -> tuple[int, int]:
+    """Put regular files into packs, return amount of files and bytes.
+
+    Soft deleted files are left as is, restoring item renames them.
+    Files are removed only after packed copy was read back successfully.
+    Running this again is safe, already packed files are not duplicated.
+    """
+    store = PackStore(data_folder / const.PACKS_FOLDER)
+    total_files = 0
+    total_bytes = 0
+
+    for prefix_folder in sorted((data_folder / media_type).glob('*/*')):
+        if not prefix_folder.is_dir():
+            continue
+
+        owner_uuid, prefix = prefix_folder.parent.name, prefix_folder.name
+        packed = 0
+
+        for path in sorted(prefix_folder.iterdir()):
+            if (
+                not path.is_file()
+                or path.name.startswith('.')
+                or path.name.startswith(DELETED_PREFIX)
+            ):
+                continue
+
+            data = path.read_bytes()
+            if dry_run:
+                LOG.info('Will pack {}', path)
+            else:
+                if store.read(media_type, owner_uuid, prefix, path.name) != data:
+                    store.put(media_type, owner_uuid, prefix, path.name, data)
+
+                if remove_files:
+                    if store.read(media_type, owner_uuid, prefix, path.name) != data:
+                        msg = f'Packed copy of {path} is broken'
+                        raise OSError(msg)
+                    path.unlink()
+
+            packed += 1
+            total_bytes += len(data)
+
+        if packed:
+            LOG.info('Packed {} files from {}', packed, prefix_folder)
+        total_files += packed
+
+    store.close()
+    return total_files, total_bytes
+
+
+def compact_packs(data_folder: Path, media_type: const.MediaType, dry_run: bool) -> int:
+    """Remove deleted and replaced files from packs, return reclaimed bytes."""
+    store = PackStore(data_folder / const.PACKS_FOLDER)
+    total = 0
+
+    for owner_uuid, prefix in store.iter_packs(media_type):
+        if dry_run:
+            LOG.info('Will compact {}/{}', owner_uuid, prefix)
+            continue
+
+        reclaimed = store.compact(media_type, owner_uuid, prefix)
+        if reclaimed:
+            LOG.info('Compacted {}/{}, reclaimed {} bytes', owner_uuid, prefix, reclaimed)
+        total += reclaimed
+
+    store.close()
+    return total
@@ -0,0 +1,108 @@
+"""Fill perceptual signatures for items that were uploaded without them."""
+
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from omoide import const
+from omoide import custom_logging
+from omoide import models
+from omoide import utils
+from omoide.database import db_models
+from omoide.infra import perceptual_hash
+
+LOG = custom_logging.get_logger(__name__)
+
+
+def backfill_perceptual_signatures(  # noqa: PLR0913
+    engine: Engine,
+    data_folder: Path,
+    dry_run: bool,
+    marker: int,
+    limit: int,
+    batch_size: int,
+) -> int:
+    """Calculate perceptual hashes from content files of images.
+
+    Hash is the same the worker calculates during upload. Videos are
+    skipped, their hash comes from the poster that is not stored.
+    Every batch is committed separately. Returns id of the last
+    processed item, so it can be used as marker for the next run.
+    """
+    processed = 0
+
+    while processed < limit:
+        with engine.begin() as conn:
+            batch = _get_images_without_signature(conn, marker, min(batch_size, limit - processed))
+
+            if not batch:
+                break
+
+            for item_id, owner_uuid, item_uuid, ext in batch:
+                marker = item_id
+                path = utils.get_content_path(data_folder, owner_uuid, item_uuid, ext)
+
+                try:
+                    with Image.open(path) as img:
+                        signature = perceptual_hash.difference_hash(img)
+                except OSError:
+                    LOG.exception('Failed to read content of item_uuid={}', item_uuid)
+                    continue
+
+                LOG.info(
+                    'Calculated perceptual signature: item_id={}, item_uuid={}, {:016x}',
+                    item_id,
+                    item_uuid,
+                    signature,
+                )
+                if not dry_run:
+                    _save_signature(conn, item_id, signature)
+
+            processed += len(batch)
+
+        LOG.info('Processed {} items, marker={}', processed, marker)
+
+    return marker
+
+
+def _get_images_without_signature(conn: Connection, marker: int, limit: int) -> list[Any]:
+    """Return next batch of images that have content but no perceptual signature."""
+    query = (
+        sa.select(
+            db_models.Item.id,
+            db_models.Item.owner_uuid,
+            db_models.Item.uuid,
+            db_models.Item.content_ext,
+        )
+        .join(db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id)
+        .join(
+            db_models.SignaturePerceptual,
+            db_models.SignaturePerceptual.item_id == db_models.Item.id,
+            isouter=True,
+        )
+        .where(
+            db_models.Item.status == models.Status.AVAILABLE,
+            db_models.Item.content_ext != sa.null(),
+            db_models.Metainfo.content_type.in_(const.CONTENT_TYPE_IMAGES),
+            db_models.SignaturePerceptual.item_id == sa.null(),
+            db_models.Item.id > marker,
+        )
+        .order_by(db_models.Item.id)
+        .limit(limit)
+    )
+    return list(conn.execute(query).all())
+
+
+def _save_signature(conn: Connection, item_id: int, signature: int) -> None:
+    """Store signature unless worker did it first."""
+    insert = pg_insert(db_models.SignaturePerceptual).values(
+        item_id=item_id,
+        signature=perceptual_hash.to_signed(signature),
+    )
+    stmt = insert.on_conflict_do_nothing(index_elements=[db_models.SignaturePerceptual.item_id])
+    conn.execute(stmt)
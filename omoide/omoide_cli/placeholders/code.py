@@ -0,0 +1,92 @@
+"""Create placeholders for items that were uploaded without them."""
+
+from pathlib import Path
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+
+from omoide import const
+from omoide import custom_logging
+from omoide import models
+from omoide.database import db_models
+from omoide.infra import placeholder
+
+LOG = custom_logging.get_logger(__name__)
+
+
+def backfill_placeholders(  # noqa: PLR0913
+    engine: Engine,
+    data_folder: Path,
+    dry_run: bool,
+    marker: int,
+    limit: int,
+    batch_size: int,
+) -> int:
+    """Make placeholder and dominant colour from existing thumbnails.
+
+    Every batch is committed separately. Returns id of the last
+    processed item, so it can be used as marker for the next run.
+    """
+    processed = 0
+
+    while processed < limit:
+        with engine.begin() as conn:
+            batch = _get_items_without_placeholder(conn, marker, min(batch_size, limit - processed))
+
+            if not batch:
+                break
+
+            for item_id, owner_uuid, item_uuid, ext in batch:
+                marker = item_id
+                path = (
+                    data_folder
+                    / const.MediaType.THUMBNAIL
+                    / str(owner_uuid)
+                    / str(item_uuid)[: const.STORAGE_PREFIX_SIZE]
+                    / f'{item_uuid}.{ext}'
+                )
+
+                try:
+                    result = placeholder.make_placeholder_from_file(path)
+                except OSError:
+                    LOG.exception('Failed to read thumbnail of item_uuid={}', item_uuid)
+                    continue
+
+                LOG.info('Made placeholder: item_id={}, item_uuid={}', item_id, item_uuid)
+                if not dry_run:
+                    stmt = (
+                        sa.update(db_models.Metainfo)
+                        .values(placeholder=result.image, dominant_color=result.color)
+                        .where(db_models.Metainfo.item_id == item_id)
+                    )
+                    conn.execute(stmt)
+
+            processed += len(batch)
+
+        LOG.info('Processed {} items, marker={}', processed, marker)
+
+    return marker
+
+
+def _get_items_without_placeholder(conn: Connection, marker: int, limit: int) -> list[Any]:
+    """Return next batch of items that have thumbnail but no placeholder."""
+    query = (
+        sa.select(
+            db_models.Item.id,
+            db_models.Item.owner_uuid,
+            db_models.Item.uuid,
+            db_models.Item.thumbnail_ext,
+        )
+        .join(db_models.Metainfo, db_models.Metainfo.item_id == db_models.Item.id)
+        .where(
+            db_models.Item.status == models.Status.AVAILABLE,
+            db_models.Item.thumbnail_ext != sa.null(),
+            db_models.Metainfo.placeholder == sa.null(),
+            db_models.Item.id > marker,
+        )
+        .order_by(db_models.Item.id)
+        .limit(limit)
+    )
+    return list(conn.execute(query).all())
@@ -0,0 +1,38 @@
+"""Perform full recalculation of aggregated resource usage."""
+
+from omoide.database.implementations import impl_sqlalchemy
+from omoide.omoide_cli import utils
+
+
+async def run(*, dry_run: bool) -> None:
+    """Entry point."""
+    db_url = utils.get_env('OMOIDE__DB_URL_ADMIN')
+    database = impl_sqlalchemy.SqlalchemyDatabase(
+        db_url=db_url,
+        echo=False,
+    )
+    users_repo = impl_sqlalchemy.UsersRepo()
+    usage_repo = impl_sqlalchemy.UsageRepo()
+
+    try:
+        async with database.transaction() as conn:
+            users = await users_repo.select(conn)
+            existing_usage = await usage_repo.get_usage_map(conn, users)
+            for user in users:
+                existing = existing_usage[user.id]
+                actual = await usage_repo.calculate_usage(conn, user)
+
+                if existing == actual:
+                    continue
+
+                print(  # noqa: T201
+                    f'{user.name}: '
+                    f'items {existing.total_items} -> {actual.total_items}, '
+                    f'collections {existing.total_collections} -> {actual.total_collections}, '
+                    f'bytes {existing.disk_usage.total_size} -> {actual.disk_usage.total_size}'
+                )
+
+                if not dry_run:
+                    await usage_repo.save_usage(conn, actual)
+    finally:
+        await database.disconnect()
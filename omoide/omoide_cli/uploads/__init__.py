@@ -0,0 +1 @@
+"""Forget resumable uploads that were never finished."""
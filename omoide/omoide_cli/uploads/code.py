@@ -0,0 +1,83 @@
+"""Forget resumable uploads that were never finished."""
+
+from pathlib import Path
+
+import python_utilz as pu
+import sqlalchemy as sa
+from sqlalchemy import Engine
+
+from omoide import const
+from omoide import custom_logging
+from omoide import models
+from omoide.database import db_models
+from omoide.object_storage.implementations.fs_object_storage import remove_stale_temporary_files
+
+LOG = custom_logging.get_logger(__name__)
+
+
+def expire_upload_sessions(
+    engine: Engine,
+    dry_run: bool,
+    staging_folder: Path | None = None,
+) -> int:
+    """Delete expired sessions and sessions of deleted items.
+
+    Every session knows which backend holds its content. Large object
+    with received parts is removed in the same transaction, so nothing
+    is left behind even if it fails. Files are removed from the
+    ``staging_folder`` after the commit, along with temporary files of
+    interrupted writes. Without the folder sessions stored as files
+    are kept. Returns amount of removed sessions.
+    """
+    condition = sa.or_(
+        db_models.UploadSession.expires_at < pu.now(),
+        db_models.UploadSession.item_id.in_(
+            sa.select(db_models.Item.id).where(db_models.Item.status == models.Status.DELETED)
+        ),
+    )
+    columns = (
+        db_models.UploadSession.uuid,
+        db_models.UploadSession.backend,
+        db_models.UploadSession.oid,
+    )
+
+    is_file = db_models.UploadSession.backend == 'filesystem'
+    if staging_folder is None:
+        _warn_about_kept_files(engine, sa.and_(condition, is_file))
+        condition = sa.and_(condition, sa.not_(is_file))
+
+    with engine.begin() as conn:
+        if dry_run:
+            rows = conn.execute(sa.select(*columns).where(condition)).fetchall()
+        else:
+            stmt = sa.delete(db_models.UploadSession).where(condition).returning(*columns)
+            rows = conn.execute(stmt).fetchall()
+
+        for session_uuid, backend, oid in rows:
+            LOG.info('Expired upload session {}, {} object {}', session_uuid, backend, oid)
+            if not dry_run and backend == 'database':
+                conn.execute(sa.text('SELECT lo_unlink(:oid)'), {'oid': oid})
+
+    if staging_folder is None:
+        return len(rows)
+
+    if not dry_run:
+        for _, backend, oid in rows:
+            if backend == 'filesystem':
+                (staging_folder / str(oid)).unlink(missing_ok=True)
+
+    remove_stale_temporary_files(staging_folder, const.UPLOAD_SESSION_TTL, dry_run)
+    return len(rows)
+
+
+def _warn_about_kept_files(engine: Engine, condition: sa.ColumnElement) -> None:
+    """Tell that some sessions could not be removed."""
+    query = sa.select(sa.func.count()).select_from(db_models.UploadSession).where(condition)
+
+    with engine.connect() as conn:
+        total = conn.execute(query).scalar()
+
+    if total:
+        LOG.warning(
+            '{} expired upload sessions are stored as files, staging folder is not set', total
+        )
@@ -0,0 +1,417 @@
+"""Streaming ZIP archives without compression.
+
+Archive is built in store mode (no compression), so every byte of the
+payload goes to the client as is and the total size of the archive can
+be calculated before the first byte is sent. CRC32 of each file is
+expected to be known in advance (we store it on upload). Files without
+known CRC32 are still supported, but they get a data descriptor and
+are hashed while streaming.
+
+ZIP64 records are added only when limits of the classic format are
+exceeded, so small archives stay readable by very old tools.
+"""
+
+from collections.abc import Iterator
+from collections.abc import MutableMapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+import struct
+import time
+from typing import Any
+import zlib
+
+import aiofiles
+from starlette.responses import Response
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from omoide import const
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP16_LIMIT = 0xFFFF
+
+VERSION_DEFAULT = 20
+VERSION_ZIP64 = 45
+VERSION_MADE_BY = (3 << 8) | VERSION_ZIP64  # unix
+EXTERNAL_ATTR = (0o100644 & 0xFFFF) << 16
+
+FLAG_DATA_DESCRIPTOR = 1 << 3
+FLAG_UTF8 = 1 << 11
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+DATA_DESCRIPTOR_32 = struct.Struct('<IIII')
+DATA_DESCRIPTOR_64 = struct.Struct('<IIQQ')
+ZIP64_EXTRA_HEADER = struct.Struct('<HH')
+ZIP64_END = struct.Struct('<IQHHIIQQQQ')
+ZIP64_LOCATOR = struct.Struct('<IIQI')
+END = struct.Struct('<IHHHHIIH')
+
+SIG_LOCAL = 0x04034B50
+SIG_CENTRAL = 0x02014B50
+SIG_DATA_DESCRIPTOR = 0x08074B50
+SIG_ZIP64_END = 0x06064B50
+SIG_ZIP64_LOCATOR = 0x07064B50
+SIG_END = 0x06054B50
+
+ZIP64_EXTRA_ID = 0x0001
+STREAM_CHUNK_SIZE = const.MEGABYTE
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    """One file inside the archive."""
+
+    path: Path
+    arcname: str
+    size: int
+    crc32: int | None
+    mtime: float
+
+    @property
+    def is_zip64(self) -> bool:
+        """Return True if file is too big for classic ZIP."""
+        return self.size >= ZIP32_LIMIT
+
+    @property
+    def has_descriptor(self) -> bool:
+        """Return True if CRC32 will be calculated during streaming."""
+        return self.crc32 is None
+
+
+def _dos_datetime(timestamp: float) -> tuple[int, int]:
+    """Convert timestamp to MS-DOS format (ZIP cannot store dates before 1980)."""
+    moment = time.localtime(max(timestamp, const.OLDEST_ALLOWED_TIMESTAMP))
+    dos_time = (moment.tm_hour << 11) | (moment.tm_min << 5) | (moment.tm_sec // 2)
+    dos_date = ((moment.tm_year - 1980) << 9) | (moment.tm_mon << 5) | moment.tm_mday
+    return dos_time, dos_date
+
+
+class ZipLayout:
+    """Precalculated byte layout of the archive.
+
+    Knows offsets of all records, so headers can be rendered lazily,
+    one by one, and memory consumption does not depend on the amount
+    or size of files.
+    """
+
+    def __init__(self, entries: Sequence[ZipEntry]) -> None:
+        """Initialize instance."""
+        self.entries = entries
+        self.names = [entry.arcname.encode('utf-8') for entry in entries]
+        self.offsets: list[int] = []
+
+        offset = 0
+        for entry, name in zip(entries, self.names, strict=True):
+            self.offsets.append(offset)
+            offset += self._local_header_size(entry, name)
+            offset += entry.size
+            offset += self._descriptor_size(entry)
+
+        self.central_directory_offset = offset
+        self.central_directory_size = sum(
+            self._central_header_size(entry, name, entry_offset)
+            for entry, name, entry_offset in zip(entries, self.names, self.offsets, strict=True)
+        )
+
+    @property
+    def is_zip64(self) -> bool:
+        """Return True if archive needs ZIP64 end records."""
+        return (
+            len(self.entries) >= ZIP16_LIMIT
+            or self.central_directory_offset >= ZIP32_LIMIT
+            or self.central_directory_size >= ZIP32_LIMIT
+        )
+
+    @property
+    def total_size(self) -> int:
+        """Return size of the whole archive in bytes."""
+        size = self.central_directory_offset + self.central_directory_size + END.size
+        if self.is_zip64:
+            size += ZIP64_END.size + ZIP64_LOCATOR.size
+        return size
+
+    @staticmethod
+    def _local_extra_size(entry: ZipEntry) -> int:
+        """Return size of the ZIP64 extra field in local header."""
+        if entry.is_zip64:
+            return ZIP64_EXTRA_HEADER.size + 16
+        return 0
+
+    def _local_header_size(self, entry: ZipEntry, name: bytes) -> int:
+        """Return size of the local header."""
+        return LOCAL_HEADER.size + len(name) + self._local_extra_size(entry)
+
+    @staticmethod
+    def _descriptor_size(entry: ZipEntry) -> int:
+        """Return size of the data descriptor."""
+        if not entry.has_descriptor:
+            return 0
+        if entry.is_zip64:
+            return DATA_DESCRIPTOR_64.size
+        return DATA_DESCRIPTOR_32.size
+
+    @staticmethod
+    def _central_extra_fields(entry: ZipEntry, offset: int) -> list[int]:
+        """Return values that do not fit into central directory header."""
+        fields = []
+        if entry.is_zip64:
+            fields.extend([entry.size, entry.size])
+        if offset >= ZIP32_LIMIT:
+            fields.append(offset)
+        return fields
+
+    def _central_header_size(self, entry: ZipEntry, name: bytes, offset: int) -> int:
+        """Return size of the central directory header."""
+        fields = self._central_extra_fields(entry, offset)
+        extra = ZIP64_EXTRA_HEADER.size + 8 * len(fields) if fields else 0
+        return CENTRAL_HEADER.size + len(name) + extra
+
+    @staticmethod
+    def _flags(entry: ZipEntry) -> int:
+        """Return general purpose flags."""
+        flags = FLAG_UTF8
+        if entry.has_descriptor:
+            flags |= FLAG_DATA_DESCRIPTOR
+        return flags
+
+    @staticmethod
+    def _version(entry: ZipEntry, offset: int = 0) -> int:
+        """Return version needed to extract."""
+        if entry.is_zip64 or offset >= ZIP32_LIMIT:
+            return VERSION_ZIP64
+        return VERSION_DEFAULT
+
+    def local_header(self, index: int) -> bytes:
+        """Render local header for the file."""
+        entry = self.entries[index]
+        name = self.names[index]
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+
+        if entry.has_descriptor:
+            crc32 = 0
+            size = ZIP32_LIMIT if entry.is_zip64 else 0
+            extra_size = 0
+        else:
+            crc32 = entry.crc32 or 0
+            size = ZIP32_LIMIT if entry.is_zip64 else entry.size
+            extra_size = entry.size
+
+        extra = b''
+        if entry.is_zip64:
+            extra = ZIP64_EXTRA_HEADER.pack(ZIP64_EXTRA_ID, 16) + struct.pack(
+                '<QQ', extra_size, extra_size
+            )
+
+        header = LOCAL_HEADER.pack(
+            SIG_LOCAL,
+            self._version(entry),
+            self._flags(entry),
+            0,  # stored
+            dos_time,
+            dos_date,
+            crc32,
+            size,
+            size,
+            len(name),
+            len(extra),
+        )
+        return header + name + extra
+
+    def data_descriptor(self, index: int, crc32: int) -> bytes:
+        """Render data descriptor for the file."""
+        entry = self.entries[index]
+
+        if not entry.has_descriptor:
+            return b''
+
+        if entry.is_zip64:
+            return DATA_DESCRIPTOR_64.pack(SIG_DATA_DESCRIPTOR, crc32, entry.size, entry.size)
+        return DATA_DESCRIPTOR_32.pack(SIG_DATA_DESCRIPTOR, crc32, entry.size, entry.size)
+
+    def central_header(self, index: int, crc32: int) -> bytes:
+        """Render central directory header for the file."""
+        entry = self.entries[index]
+        name = self.names[index]
+        offset = self.offsets[index]
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+
+        fields = self._central_extra_fields(entry, offset)
+        extra = b''
+        if fields:
+            extra = ZIP64_EXTRA_HEADER.pack(ZIP64_EXTRA_ID, 8 * len(fields)) + struct.pack(
+                f'<{len(fields)}Q', *fields
+            )
+
+        size = ZIP32_LIMIT if entry.is_zip64 else entry.size
+
+        header = CENTRAL_HEADER.pack(
+            SIG_CENTRAL,
+            VERSION_MADE_BY,
+            self._version(entry, offset),
+            self._flags(entry),
+            0,  # stored
+            dos_time,
+            dos_date,
+            crc32,
+            size,
+            size,
+            len(name),
+            len(extra),
+            0,  # comment length
+            0,  # disk number
+            0,  # internal attributes
+            EXTERNAL_ATTR,
+            min(offset, ZIP32_LIMIT),
+        )
+        return header + name + extra
+
+    def end_records(self) -> bytes:
+        """Render end of central directory records."""
+        total = len(self.entries)
+        cd_size = self.central_directory_size
+        cd_offset = self.central_directory_offset
+        records = b''
+
+        if self.is_zip64:
+            zip64_end_offset = cd_offset + cd_size
+            records += ZIP64_END.pack(
+                SIG_ZIP64_END,
+                ZIP64_END.size - 12,
+                VERSION_MADE_BY,
+                VERSION_ZIP64,
+                0,
+                0,
+                total,
+                total,
+                cd_size,
+                cd_offset,
+            )
+            records += ZIP64_LOCATOR.pack(SIG_ZIP64_LOCATOR, 0, zip64_end_offset, 1)
+
+        records += END.pack(
+            SIG_END,
+            0,
+            0,
+            min(total, ZIP16_LIMIT),
+            min(total, ZIP16_LIMIT),
+            min(cd_size, ZIP32_LIMIT),
+            min(cd_offset, ZIP32_LIMIT),
+            0,
+        )
+        return records
+
+    def central_directory(self, crcs: Sequence[int]) -> Iterator[bytes]:
+        """Render central directory and end records."""
+        for index, crc32 in enumerate(crcs):
+            yield self.central_header(index, crc32)
+        yield self.end_records()
+
+
+class ZipStreamResponse(Response):
+    """Send ZIP archive built on the fly.
+
+    Uses ``http.response.zerocopysend`` ASGI extension when server
+    supports it and file CRC32 is known, otherwise reads files
+    in chunks of constant size.
+    """
+
+    media_type = 'application/zip'
+
+    def __init__(
+        self,
+        entries: Sequence[ZipEntry],
+        filename: str,
+        headers: MutableMapping[str, str] | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> None:
+        """Initialize instance."""
+        self.layout = ZipLayout(entries)
+        self.chunk_size = chunk_size
+        self.status_code = 200
+        self.background = None
+
+        self.init_headers(headers)
+        self.headers['content-length'] = str(self.layout.total_size)
+        self.headers['content-type'] = self.media_type
+        self.headers['content-disposition'] = f'attachment; filename="{filename}"'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Send the archive."""
+        _ = receive
+        zerocopy = 'http.response.zerocopysend' in scope.get('extensions', {})
+
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': self.status_code,
+                'headers': self.raw_headers,
+            }
+        )
+
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            return
+
+        crcs: list[int] = []
+        for index, entry in enumerate(self.layout.entries):
+            await self._send_bytes(send, self.layout.local_header(index))
+
+            if zerocopy and not entry.has_descriptor:
+                crc32 = await self._send_zerocopy(send, entry)
+            else:
+                crc32 = await self._send_chunked(send, entry)
+
+            await self._send_bytes(send, self.layout.data_descriptor(index, crc32))
+            crcs.append(crc32)
+
+        for chunk in self.layout.central_directory(crcs):
+            await self._send_bytes(send, chunk)
+
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    @staticmethod
+    async def _send_bytes(send: Send, body: bytes) -> None:
+        """Send part of the archive."""
+        if body:
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+    @staticmethod
+    async def _send_zerocopy(send: Send, entry: ZipEntry) -> int:
+        """Let the server send the file using sendfile."""
+        with entry.path.open('rb') as file:
+            message: dict[str, Any] = {
+                'type': 'http.response.zerocopysend',
+                'file': file,
+                'offset': 0,
+                'count': entry.size,
+                'more_body': True,
+            }
+            await send(message)
+        return entry.crc32 or 0
+
+    async def _send_chunked(self, send: Send, entry: ZipEntry) -> int:
+        """Read file in chunks and send it, calculate CRC32 if needed."""
+        crc32 = 0
+        remaining = entry.size
+
+        async with aiofiles.open(entry.path, mode='rb') as file:
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+
+                if not chunk:
+                    msg = f'File {entry.path} is shorter than expected'
+                    raise OSError(msg)
+
+                remaining -= len(chunk)
+
+                if entry.has_descriptor:
+                    crc32 = zlib.crc32(chunk, crc32)
+
+                await self._send_bytes(send, chunk)
+
+        if entry.has_descriptor:
+            return crc32
+        return entry.crc32 or 0
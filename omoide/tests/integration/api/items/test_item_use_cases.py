@@ -6,6 +6,7 @@ same async stack the API uses in production.
 """
 
 from collections.abc import AsyncIterator
+import hashlib
 import uuid
 
 import pytest
@@ -17,6 +18,7 @@ from omoide.database import db_models
 from omoide.object_storage.implementations.pgl_object_storage import PgLargeObjectStorage
 from omoide.omoide_api.items.item_use_cases import DeleteItemUseCase
 from omoide.omoide_api.items.item_use_cases import UploadItemUseCase
+from omoide.omoide_api.items.item_use_cases import UploadManyItemsUseCase
 
 
 @pytest.fixture
@@ -53,10 +55,43 @@ def upload_item_use_case(
     misc_repo,
     commands_repo,
     object_storage,
+    signatures_repo,
+    exif_repo,
 ):
     """Build ``UploadItemUseCase`` wired with real repos + storage."""
     return UploadItemUseCase(
-        async_database, items_repo, meta_repo, misc_repo, commands_repo, object_storage
+        async_database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+    )
+
+
+@pytest.fixture
+def upload_many_items_use_case(
+    async_database,
+    items_repo,
+    meta_repo,
+    misc_repo,
+    commands_repo,
+    object_storage,
+    signatures_repo,
+    exif_repo,
+):
+    """Build ``UploadManyItemsUseCase`` wired with real repos + storage."""
+    return UploadManyItemsUseCase(
+        async_database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
     )
 
 
@@ -680,8 +715,8 @@ class TestDeleteItemUseCaseCascade:
 # early-return the moment it saw an ancestor that was already a
 # collection with a thumbnail, silently skipping every higher ancestor
 # that still needed the update. These tests pin the fixed behaviour:
-# the walk ALWAYS reaches the root, and it emits an upload command
-# only for ancestors that were actually missing the thumbnail.
+# the walk ALWAYS reaches the root, and the single upload command lists
+# only ancestors that were actually missing the thumbnail.
 
 
 async def _chunks_of(payload: bytes) -> AsyncIterator[bytes]:
@@ -767,8 +802,8 @@ class TestUploadItemUseCaseChain:
         """Baseline: nobody has been touched yet.
 
         Every ancestor MUST be marked as a collection with the placeholder
-        ``thumbnail_ext='tmp'``, and a dedicated upload command MUST be
-        enqueued for each ancestor, all sharing the leaf's OID.
+        ``thumbnail_ext='tmp'``, and the only upload command MUST list
+        every ancestor, they get renditions of the leaf after conversion.
         """
         alice = await make_user_model()
         root, mid, leaf = await _make_chain(
@@ -795,20 +830,12 @@ class TestUploadItemUseCaseChain:
         # until the converter fills it in.
         assert _read_item_flags(engine, leaf.id) == (False, None)
 
-        # 3 commands, one per item (leaf + mid + root).
+        # One command for the whole chain, image is converted once.
         commands = _read_upload_commands(engine)
-        assert len(commands) == 3
-
-        # Every command references the same OID (thumbnail sharing).
-        oids = {cmd['oid'] for cmd in commands}
-        assert len(oids) == 1
-
-        # Ancestor commands are ``skip_content`` — they only need the
-        # thumbnail rendered, not the original bytes.
-        by_item = {cmd['item_id']: cmd for cmd in commands}
-        assert by_item[leaf.id].get('skip_content') is not True
-        assert by_item[mid.id]['skip_content'] is True
-        assert by_item[root.id]['skip_content'] is True
+        assert len(commands) == 1
+        assert commands[0]['item_id'] == leaf.id
+        assert commands[0].get('skip_content') is not True
+        assert commands[0]['ancestors'] == [mid.id, root.id]
 
         # A note is written on every ancestor linking back to the leaf.
         assert _read_notes(engine, mid.id)['copied_image_from'] == str(leaf.uuid)
@@ -850,20 +877,332 @@ class TestUploadItemUseCaseChain:
         # Root got its update — this is exactly what the bug prevented.
         assert _read_item_flags(engine, root.id) == (True, 'tmp')
 
-        # Mid stays untouched: it already looks correct, no
-        # skip_content command needed for it, no note written.
+        # Mid stays untouched: it already looks correct, it does
+        # not get the thumbnail, no note written.
         assert _read_item_flags(engine, mid.id) == (True, 'jpg')
 
         commands = _read_upload_commands(engine)
-        command_item_ids = {cmd['item_id'] for cmd in commands}
-        # Two commands: leaf (payload) + root (thumbnail share). Mid
+        # Only the leaf command, root gets its thumbnail. Mid
         # skipped because it already had a thumbnail.
-        assert command_item_ids == {leaf.id, root.id}
-
-        # Same OID shared across leaf and root.
-        oids = {cmd['oid'] for cmd in commands}
-        assert len(oids) == 1
+        assert len(commands) == 1
+        assert commands[0]['item_id'] == leaf.id
+        assert commands[0]['ancestors'] == [root.id]
 
         # Only root got the note — mid wasn't touched at all.
         assert _read_notes(engine, root.id)['copied_image_from'] == str(leaf.uuid)
         assert 'copied_image_from' not in _read_notes(engine, mid.id)
+
+
+# --- UploadItemUseCase duplicates ----------------------------------------
+#
+# Content the owner already has is not converted again: files of the
+# existing item are copied, the large object is kept as a fallback.
+
+
+def _read_commands(engine) -> list[tuple[str, dict]]:
+    """Return ``(name, extras)`` of every parallel command."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            sa.select(
+                db_models.ParallelCommand.name,
+                db_models.ParallelCommand.extras,
+            ).order_by(db_models.ParallelCommand.id)
+        ).all()
+    return [(row.name, row.extras) for row in rows]
+
+
+async def _make_uploaded(make_item_model, async_database, signatures_repo, owner, payload):
+    """Create available item that already has given content."""
+    item = await make_item_model(
+        owner_id=owner.id,
+        owner_uuid=owner.uuid,
+        status=models.Status.AVAILABLE,
+        content_ext='jpg',
+        preview_ext='jpg',
+        thumbnail_ext='jpg',
+    )
+    async with async_database.transaction() as conn:
+        await signatures_repo.save_md5_signature(conn, item, hashlib.md5(payload).hexdigest())
+    return item
+
+
+class TestUploadItemUseCaseDuplicates:
+    """Same content is copied from the existing item."""
+
+    async def test_duplicate_is_copied(
+        self,
+        upload_item_use_case,
+        make_user_model,
+        make_item_model,
+        async_database,
+        signatures_repo,
+        engine,
+    ):
+        """Upload of known content enqueues copy instead of conversion."""
+        alice = await make_user_model()
+        payload = b'x' * 128
+        existing = await _make_uploaded(
+            make_item_model, async_database, signatures_repo, alice, payload
+        )
+        target = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+
+        result = await upload_item_use_case.execute(
+            user=alice,
+            item_uuid=target.uuid,
+            file=_upload_file(),
+            chunks=_chunks_of(payload),
+        )
+
+        assert result.duplicate is not None
+        assert result.duplicate.id == existing.id
+
+        commands = _read_commands(engine)
+        assert [name for name, _ in commands] == [models.Command.COPY_IMAGE]
+        assert commands[0][1]['source_item_id'] == existing.id
+        assert commands[0][1]['target_item_id'] == target.id
+        assert commands[0][1]['including_content'] is True
+        assert commands[0][1]['fallback']['ext'] == 'jpg'
+        storage = upload_item_use_case.object_storage
+        chunks = [chunk async for chunk in storage.read(commands[0][1]['oid'])]
+        assert b''.join(chunks) == payload
+
+        async with async_database.transaction() as conn:
+            signature = await signatures_repo.get_md5_signature(conn, target)
+        assert signature == hashlib.md5(payload).hexdigest()
+
+    async def test_duplicate_gives_exif_and_signatures(
+        self,
+        upload_item_use_case,
+        make_user_model,
+        make_item_model,
+        async_database,
+        signatures_repo,
+        exif_repo,
+    ):
+        """Target gets everything conversion calculated for the source."""
+        alice = await make_user_model()
+        payload = b'y' * 128
+        existing = await _make_uploaded(
+            make_item_model, async_database, signatures_repo, alice, payload
+        )
+        exif = models.Exif(exif={'Model': 'Camera'})
+        async with async_database.transaction() as conn:
+            await signatures_repo.save_cr32_signature(conn, existing, 12345)
+            await signatures_repo.save_perceptual_signature(conn, existing, 2**63 + 7)
+            await exif_repo.create(conn, existing, exif)
+        target = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+
+        await upload_item_use_case.execute(
+            user=alice,
+            item_uuid=target.uuid,
+            file=_upload_file(),
+            chunks=_chunks_of(payload),
+        )
+
+        async with async_database.transaction() as conn:
+            crc32 = await signatures_repo.get_cr32_signature(conn, target)
+            perceptual = await signatures_repo.get_perceptual_signature(conn, target)
+            target_exif = await exif_repo.get_by_item(conn, target)
+
+        assert crc32 == 12345
+        assert perceptual == 2**63 + 7
+        assert target_exif == exif
+
+    async def test_duplicate_is_rejected(
+        self,
+        upload_item_use_case,
+        make_user_model,
+        make_item_model,
+        async_database,
+        signatures_repo,
+        engine,
+    ):
+        """Client could ask to get an error instead of a copy."""
+        alice = await make_user_model()
+        payload = b'y' * 128
+        existing = await _make_uploaded(
+            make_item_model, async_database, signatures_repo, alice, payload
+        )
+        target = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+        file = _upload_file()
+        file.features.content_md5 = hashlib.md5(payload).hexdigest()
+        file.features.reject_duplicates = True
+
+        with pytest.raises(exceptions.AlreadyExistsError, match=str(existing.uuid)):
+            await upload_item_use_case.execute(
+                user=alice,
+                item_uuid=target.uuid,
+                file=file,
+                chunks=_chunks_of(payload),
+            )
+
+        assert _read_commands(engine) == []
+
+    async def test_declared_hash_must_match(
+        self,
+        upload_item_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Content that differs from declared hash is not accepted."""
+        alice = await make_user_model()
+        target = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+        file = _upload_file()
+        file.features.content_md5 = hashlib.md5(b'other').hexdigest()
+
+        with pytest.raises(exceptions.InvalidInputError):
+            await upload_item_use_case.execute(
+                user=alice,
+                item_uuid=target.uuid,
+                file=file,
+                chunks=_chunks_of(b'z' * 128),
+            )
+
+        assert _read_commands(engine) == []
+
+
+# --- UploadManyItemsUseCase ----------------------------------------------
+#
+
+
+async def _parts_of(*entries):
+    """Async iterator of batch parts, one chunk per file."""
+    for item, payload in entries:
+        yield item.uuid, _upload_file(), _chunks_of(payload)
+
+
+def _count_large_objects(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(sa.text('SELECT count(*) FROM pg_largeobject_metadata')).scalar()
+
+
+class TestUploadManyItemsUseCase:
+    """Several files are enqueued in one go."""
+
+    async def test_batch_is_enqueued(
+        self,
+        upload_many_items_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Every file gets its command, ancestors are walked once."""
+        alice = await make_user_model()
+        root, album = await _make_chain(
+            make_item_model, alice, states=[(False, None), (False, None)]
+        )
+        first, second = [
+            await make_item_model(
+                owner_id=alice.id,
+                owner_uuid=alice.uuid,
+                parent_id=album.id,
+                parent_uuid=album.uuid,
+            )
+            for _ in range(2)
+        ]
+
+        results = await upload_many_items_use_case.execute(
+            user=alice,
+            item_uuids=[first.uuid, second.uuid],
+            parts=_parts_of((first, b'1' * 128), (second, b'2' * 128)),
+        )
+
+        assert [item.id for item, _ in results] == [first.id, second.id]
+        assert all(result.duplicate is None for _, result in results)
+
+        commands = [extras for _, extras in _read_commands(engine)]
+        assert [command['item_id'] for command in commands] == [first.id, second.id]
+        assert commands[0]['ancestors'] == [album.id, root.id]
+        assert commands[1]['ancestors'] == []
+        assert _read_item_flags(engine, album.id) == (True, 'tmp')
+
+        for item in (first, second):
+            assert _read_notes(engine, item.id)['original_filename'] == 'cat.jpg'
+            with engine.connect() as conn:
+                status = conn.execute(
+                    sa.select(db_models.Item.status).where(db_models.Item.id == item.id)
+                ).scalar()
+            assert status == models.Status.PROCESSING
+
+    async def test_missing_file_rolls_back_batch(
+        self,
+        upload_many_items_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Nothing is enqueued and stored content is deleted."""
+        alice = await make_user_model()
+        first = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+        second = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+
+        with pytest.raises(exceptions.InvalidInputError, match=str(second.uuid)):
+            await upload_many_items_use_case.execute(
+                user=alice,
+                item_uuids=[first.uuid, second.uuid],
+                parts=_parts_of((first, b'1' * 128)),
+            )
+
+        assert _read_commands(engine) == []
+        assert _count_large_objects(engine) == 0
+
+    async def test_identical_files_share_content(
+        self,
+        upload_many_items_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Same file sent twice in one batch is stored once."""
+        alice = await make_user_model()
+        first = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+        second = await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid)
+
+        results = await upload_many_items_use_case.execute(
+            user=alice,
+            item_uuids=[first.uuid, second.uuid],
+            parts=_parts_of((first, b'1' * 128), (second, b'1' * 128)),
+        )
+
+        assert all(result.duplicate is None for _, result in results)
+
+        commands = [extras for _, extras in _read_commands(engine)]
+        assert [command['item_id'] for command in commands] == [first.id, second.id]
+        assert commands[0]['oid'] == commands[1]['oid']
+        assert _count_large_objects(engine) == 1
+
+    async def test_failed_duplicate_does_not_leak_content(
+        self,
+        upload_many_items_use_case,
+        make_user_model,
+        make_item_model,
+        async_database,
+        signatures_repo,
+        engine,
+        monkeypatch,
+    ):
+        """Content of duplicates that were not handled is deleted."""
+        alice = await make_user_model()
+        payload = b'x' * 128
+        await _make_uploaded(make_item_model, async_database, signatures_repo, alice, payload)
+        first, second, fresh = [
+            await make_item_model(owner_id=alice.id, owner_uuid=alice.uuid) for _ in range(3)
+        ]
+
+        async def _fail(*args, **kwargs):
+            msg = 'copy failed'
+            raise RuntimeError(msg)
+
+        monkeypatch.setattr(upload_many_items_use_case, '_use_duplicate', _fail)
+
+        with pytest.raises(RuntimeError, match='copy failed'):
+            await upload_many_items_use_case.execute(
+                user=alice,
+                item_uuids=[first.uuid, second.uuid, fresh.uuid],
+                parts=_parts_of((first, payload), (second, payload), (fresh, b'1' * 128)),
+            )
+
+        commands = [extras for _, extras in _read_commands(engine)]
+        assert [command['item_id'] for command in commands] == [fresh.id]
+        assert _count_large_objects(engine) == 1
@@ -0,0 +1,265 @@
+"""Integration tests for omoide.omoide_api.uploads.upload_use_cases."""
+
+import asyncio
+import base64
+from collections.abc import AsyncIterator
+import hashlib
+
+import pytest
+import sqlalchemy as sa
+
+from omoide import exceptions
+from omoide import models
+from omoide.database import db_models
+from omoide.object_storage.implementations.pgl_object_storage import PgLargeObjectStorage
+from omoide.omoide_api.uploads import upload_use_cases
+
+
+@pytest.fixture
+def object_storage(async_database):
+    """Real ``PgLargeObjectStorage`` backed by the test DB."""
+    return PgLargeObjectStorage(async_database)
+
+
+@pytest.fixture
+def create_upload_use_case(  # noqa: PLR0913
+    async_database,
+    items_repo,
+    meta_repo,
+    misc_repo,
+    commands_repo,
+    object_storage,
+    signatures_repo,
+    exif_repo,
+    upload_sessions_repo,
+):
+    """Build ``CreateUploadUseCase`` wired with real repos + storage."""
+    return upload_use_cases.CreateUploadUseCase(
+        async_database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+        upload_sessions_repo,
+    )
+
+
+@pytest.fixture
+def finish_upload_use_case(  # noqa: PLR0913
+    async_database,
+    items_repo,
+    meta_repo,
+    misc_repo,
+    commands_repo,
+    object_storage,
+    signatures_repo,
+    exif_repo,
+    upload_sessions_repo,
+):
+    """Build ``FinishUploadUseCase`` wired with real repos + storage."""
+    return upload_use_cases.FinishUploadUseCase(
+        async_database,
+        items_repo,
+        meta_repo,
+        misc_repo,
+        commands_repo,
+        object_storage,
+        signatures_repo,
+        exif_repo,
+        upload_sessions_repo,
+    )
+
+
+@pytest.fixture
+def append_upload_use_case(async_database, upload_sessions_repo, object_storage):
+    """Build ``AppendUploadUseCase`` wired with real repos + storage."""
+    return upload_use_cases.AppendUploadUseCase(
+        async_database, upload_sessions_repo, object_storage
+    )
+
+
+async def _chunks_of(payload: bytes) -> AsyncIterator[bytes]:
+    """Async iterator with a single chunk."""
+    yield payload
+
+
+def _upload_file() -> models.NewFile:
+    return models.NewFile(
+        content_type='image/jpeg',
+        filename='cat.jpg',
+        ext='jpg',
+        features=models.Features(extract_exif=False),
+    )
+
+
+def _checksum(payload: bytes) -> str:
+    return 'sha256 ' + base64.b64encode(hashlib.sha256(payload).digest()).decode()
+
+
+async def _start(create_upload_use_case, make_user_model, make_item_model, size):
+    user = await make_user_model()
+    item = await make_item_model(owner_id=user.id, owner_uuid=user.uuid)
+    result = await create_upload_use_case.execute(
+        user=user, item_uuid=item.uuid, file=_upload_file(), size=size
+    )
+    assert result.session is not None
+    return user, item, result.session
+
+
+class TestResumableUpload:
+    """Content sent in parts is processed as one upload."""
+
+    async def test_parts_are_joined(  # noqa: PLR0913
+        self,
+        create_upload_use_case,
+        append_upload_use_case,
+        finish_upload_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Two parts with checksums end up as a single upload command."""
+        payload = b'a' * 100 + b'b' * 50
+        user, item, session = await _start(
+            create_upload_use_case, make_user_model, make_item_model, len(payload)
+        )
+
+        for start, end in ((0, 100), (100, 150)):
+            part = payload[start:end]
+            session = await append_upload_use_case.execute(
+                user=user,
+                session_uuid=session.uuid,
+                offset=start,
+                chunks=_chunks_of(part),
+                checksum=_checksum(part),
+            )
+            assert session.offset == end
+
+        _, result = await finish_upload_use_case.execute(user, session.uuid)
+
+        assert result.duplicate is None
+        with engine.connect() as conn:
+            command = conn.execute(sa.select(db_models.ParallelCommand)).one()
+            sessions = conn.execute(sa.select(db_models.UploadSession)).all()
+        assert command.name == models.Command.UPLOAD
+        assert command.extras['item_id'] == item.id
+        assert command.extras['oid'] == session.oid
+        assert sessions == []
+
+        chunks = [chunk async for chunk in finish_upload_use_case.object_storage.read(session.oid)]
+        assert b''.join(chunks) == payload
+
+    async def test_wrong_offset_is_rejected(
+        self,
+        create_upload_use_case,
+        append_upload_use_case,
+        make_user_model,
+        make_item_model,
+    ):
+        """Part must continue exactly where the previous one stopped."""
+        user, _, session = await _start(
+            create_upload_use_case, make_user_model, make_item_model, 10
+        )
+
+        with pytest.raises(exceptions.InvalidInputError, match='offset'):
+            await append_upload_use_case.execute(
+                user=user,
+                session_uuid=session.uuid,
+                offset=5,
+                chunks=_chunks_of(b'12345'),
+                checksum=None,
+            )
+
+    async def test_concurrent_parts_are_not_mixed(
+        self,
+        create_upload_use_case,
+        append_upload_use_case,
+        make_user_model,
+        make_item_model,
+    ):
+        """Only one of two parts sent at the same offset is written."""
+        user, _, session = await _start(
+            create_upload_use_case, make_user_model, make_item_model, 10
+        )
+        parts = [b'a' * 10, b'b' * 10]
+
+        results = await asyncio.gather(
+            *(
+                append_upload_use_case.execute(
+                    user=user,
+                    session_uuid=session.uuid,
+                    offset=0,
+                    chunks=_chunks_of(part),
+                    checksum=None,
+                )
+                for part in parts
+            ),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        assert len(errors) == 1
+        assert isinstance(errors[0], exceptions.InvalidInputError)
+
+        winner = next(
+            part
+            for part, result in zip(parts, results, strict=True)
+            if not isinstance(result, Exception)
+        )
+        storage = append_upload_use_case.object_storage
+        chunks = [chunk async for chunk in storage.read(session.oid)]
+        assert b''.join(chunks) == winner
+
+    async def test_bad_checksum_drops_part(
+        self,
+        create_upload_use_case,
+        append_upload_use_case,
+        make_user_model,
+        make_item_model,
+        engine,
+    ):
+        """Part with wrong checksum is not counted and could be resent."""
+        user, _, session = await _start(
+            create_upload_use_case, make_user_model, make_item_model, 10
+        )
+
+        with pytest.raises(exceptions.InvalidInputError, match='Checksum'):
+            await append_upload_use_case.execute(
+                user=user,
+                session_uuid=session.uuid,
+                offset=0,
+                chunks=_chunks_of(b'0123456789'),
+                checksum=_checksum(b'something else'),
+            )
+
+        with engine.connect() as conn:
+            row = conn.execute(sa.select(db_models.UploadSession)).one()
+        assert row.offset == 0
+        assert row.writer is None
+
+        session = await append_upload_use_case.execute(
+            user=user,
+            session_uuid=session.uuid,
+            offset=0,
+            chunks=_chunks_of(b'0123456789'),
+            checksum=_checksum(b'0123456789'),
+        )
+        assert session.offset == 10
+
+    async def test_unfinished_upload_is_not_processed(
+        self,
+        create_upload_use_case,
+        finish_upload_use_case,
+        make_user_model,
+        make_item_model,
+    ):
+        """Finishing before all bytes arrived is an error."""
+        user, _, session = await _start(
+            create_upload_use_case, make_user_model, make_item_model, 10
+        )
+
+        with pytest.raises(exceptions.InvalidInputError, match='0 bytes of 10'):
+            await finish_upload_use_case.execute(user, session.uuid)
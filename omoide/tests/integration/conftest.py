@@ -44,14 +44,18 @@ from omoide.database.implementations import impl_sqlalchemy
 from omoide.infra.interfaces.abs_metrics_collector import Metric
 
 _TRUNCATE_TABLES = (
+    'upload_sessions',
     'item_notes',
+    'item_text_search',
     'item_metainfo',
     'exif',
     'signatures_md5',
     'signatures_crc32',
+    'signatures_perceptual',
     'computed_tags',
     'known_tags',
     'known_tags_anon',
+    'user_usage',
     'serial_operations',
     'serial_lock',
     'command_queue_parallel',
@@ -395,6 +399,12 @@ def meta_repo() -> impl_sqlalchemy.MetaRepo:
     return impl_sqlalchemy.MetaRepo()
 
 
+@pytest.fixture
+def usage_repo() -> impl_sqlalchemy.UsageRepo:
+    """Provide a ``UsageRepo`` for use-case tests."""
+    return impl_sqlalchemy.UsageRepo()
+
+
 @pytest.fixture
 def misc_repo() -> impl_sqlalchemy.MiscRepo:
     """Provide a ``MiscRepo`` for use-case tests."""
@@ -413,12 +423,42 @@ def signatures_repo() -> impl_sqlalchemy.SignaturesRepo:
     return impl_sqlalchemy.SignaturesRepo()
 
 
+@pytest.fixture
+def contact_sheets_repo() -> impl_sqlalchemy.ContactSheetsRepo:
+    """Provide a ``ContactSheetsRepo`` for use-case tests."""
+    return impl_sqlalchemy.ContactSheetsRepo()
+
+
+@pytest.fixture
+def duplicates_repo() -> impl_sqlalchemy.DuplicatesRepo:
+    """Provide a ``DuplicatesRepo`` for use-case tests."""
+    return impl_sqlalchemy.DuplicatesRepo()
+
+
+@pytest.fixture
+def search_repo() -> impl_sqlalchemy.SearchRepo:
+    """Provide a ``SearchRepo`` for use-case tests."""
+    return impl_sqlalchemy.SearchRepo()
+
+
+@pytest.fixture
+def exif_repo() -> impl_sqlalchemy.EXIFRepo:
+    """Provide a ``EXIFRepo`` for use-case tests."""
+    return impl_sqlalchemy.EXIFRepo()
+
+
 @pytest.fixture
 def commands_repo() -> impl_sqlalchemy.CommandsRepo:
     """Provide a ``CommandsRepo`` for use-case tests."""
     return impl_sqlalchemy.CommandsRepo()
 
 
+@pytest.fixture
+def upload_sessions_repo() -> impl_sqlalchemy.UploadSessionsRepo:
+    """Provide a ``UploadSessionsRepo`` for use-case tests."""
+    return impl_sqlalchemy.UploadSessionsRepo()
+
+
 @pytest.fixture
 def make_user_model(
     make_user,
@@ -0,0 +1,89 @@
+"""Tests for contact sheets repository."""
+
+from datetime import timedelta
+
+import python_utilz as pu
+import sqlalchemy as sa
+
+from omoide import const
+from omoide import models
+from omoide.database import db_models
+
+
+async def test_source_skips_children_with_narrower_permissions(
+    async_database,
+    contact_sheets_repo,
+    make_user,
+    make_item,
+    make_item_model,
+    make_metainfo,
+):
+    owner_id, owner_uuid = make_user()
+    friend_id, _ = make_user()
+    stranger_id, _ = make_user()
+    parent = await make_item_model(
+        owner_id=owner_id,
+        owner_uuid=owner_uuid,
+        is_collection=True,
+        status=0,
+        permissions=[friend_id],
+    )
+
+    shown = []
+    for number, permissions in enumerate(
+        [[friend_id], [friend_id, stranger_id], [], [stranger_id]], start=1
+    ):
+        child_id, child_uuid, _ = make_item(
+            owner_id=owner_id,
+            owner_uuid=owner_uuid,
+            parent_id=parent.id,
+            parent_uuid=parent.uuid,
+            number=number,
+            status=0,
+            thumbnail_ext='jpg',
+            permissions=permissions,
+        )
+        make_metainfo(child_id)
+        if friend_id in permissions:
+            shown.append(child_uuid)
+
+    async with async_database.transaction() as conn:
+        source = await contact_sheets_repo.get_source(conn, parent, limit=10)
+
+    assert [child.uuid for child, _ in source] == shown
+
+
+async def test_failed_build_is_retried_after_delay(
+    async_database,
+    commands_repo,
+    make_user_model,
+    make_item_model,
+    engine,
+):
+    owner = await make_user_model()
+    parent = await make_item_model(owner_id=owner.id, owner_uuid=owner.uuid, is_collection=True)
+
+    async def _request() -> int:
+        async with async_database.transaction() as conn:
+            return await commands_repo.build_contact_sheet(conn, owner, parent)
+
+    def _finish(status: models.CommandStatus, seconds_ago: int) -> None:
+        with engine.begin() as conn:
+            conn.execute(
+                sa.update(db_models.ParallelCommand).values(
+                    status=status, ended_at=pu.now() - timedelta(seconds=seconds_ago)
+                )
+            )
+
+    assert await _request() > 0
+    assert await _request() == -1
+
+    _finish(models.CommandStatus.FAILED, seconds_ago=0)
+    assert await _request() == -1
+
+    _finish(models.CommandStatus.FAILED, seconds_ago=const.CONTACT_SHEET_RETRY_DELAY + 1)
+    assert await _request() > 0
+
+    # two failures in a row, delay is twice as long now
+    _finish(models.CommandStatus.FAILED, seconds_ago=const.CONTACT_SHEET_RETRY_DELAY + 1)
+    assert await _request() == -1
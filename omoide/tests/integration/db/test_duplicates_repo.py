@@ -0,0 +1,132 @@
+"""Tests for duplicates search."""
+
+from uuid import uuid4
+
+import python_utilz as pu
+
+from omoide import models
+
+
+def _item(
+    user: models.User,
+    parent: models.Item | None = None,
+    *,
+    is_collection: bool = False,
+) -> models.Item:
+    """Return new item model."""
+    return models.Item(
+        id=-1,
+        uuid=uuid4(),
+        parent_id=parent.id if parent else None,
+        parent_uuid=parent.uuid if parent else None,
+        owner_id=user.id,
+        owner_uuid=user.uuid,
+        name='test',
+        status=models.Status.AVAILABLE,
+        number=-1,
+        is_collection=is_collection,
+        content_ext=None,
+        preview_ext=None,
+        thumbnail_ext=None,
+        tags=set(),
+        permissions=set(),
+        extras={},
+    )
+
+
+async def _create(conn, items_repo, meta_repo, item: models.Item) -> models.Item:
+    """Save item and its metainfo."""
+    item.id = await items_repo.create(conn, item)
+    item.reset_changes()
+    await meta_repo.create(
+        conn,
+        models.Metainfo(
+            item_id=item.id,
+            created_at=pu.now(),
+            updated_at=pu.now(),
+            deleted_at=None,
+            user_time=None,
+            content_type=None,
+            content_size=None,
+            preview_size=None,
+            thumbnail_size=None,
+            content_width=None,
+            content_height=None,
+            preview_width=None,
+            preview_height=None,
+            thumbnail_width=None,
+            thumbnail_height=None,
+        ),
+    )
+    return item
+
+
+async def test_duplicates_are_resolved_with_parents(
+    async_database,
+    items_repo,
+    meta_repo,
+    signatures_repo,
+    duplicates_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        root = await _create(conn, items_repo, meta_repo, _item(user, is_collection=True))
+        folder = await _create(conn, items_repo, meta_repo, _item(user, root, is_collection=True))
+        first = await _create(conn, items_repo, meta_repo, _item(user, folder))
+        second = await _create(conn, items_repo, meta_repo, _item(user, root))
+        third = await _create(conn, items_repo, meta_repo, _item(user, root))
+
+        await signatures_repo.save_md5_signature(conn, first, 'a' * 32)
+        await signatures_repo.save_md5_signature(conn, second, 'a' * 32)
+        await signatures_repo.save_md5_signature(conn, third, 'b' * 32)
+
+        await signatures_repo.save_perceptual_signature(conn, first, 2**64 - 1)
+        await signatures_repo.save_perceptual_signature(conn, third, 2**64 - 2)
+
+    async with async_database.transaction() as conn:
+        groups = await duplicates_repo.get_md5_groups(conn, user, None, offset=0, limit=10)
+        assert groups == [('a' * 32, [first.id, second.id])]
+
+        in_folder = await duplicates_repo.get_md5_groups(conn, user, folder, offset=0, limit=10)
+        assert in_folder == []
+
+        signatures = await duplicates_repo.get_perceptual_signatures(conn, user, None, 1)
+        assert signatures == {first.id: 2**64 - 1, third.id: 2**64 - 2}
+        assert await signatures_repo.get_perceptual_signature(conn, first) == 2**64 - 1
+
+        duplicates = await duplicates_repo.resolve_groups(conn, groups)
+
+    assert len(duplicates) == 1
+    first_example, second_example = duplicates[0].examples
+    assert first_example.item.id == first.id
+    assert [parent.id for parent in first_example.parents] == [root.id, folder.id]
+    assert [parent.id for parent in second_example.parents] == [root.id]
+
+
+async def test_lonely_perceptual_signatures_are_not_loaded(
+    async_database,
+    items_repo,
+    meta_repo,
+    signatures_repo,
+    duplicates_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        first = await _create(conn, items_repo, meta_repo, _item(user))
+        second = await _create(conn, items_repo, meta_repo, _item(user))
+        lonely = await _create(conn, items_repo, meta_repo, _item(user))
+
+        await signatures_repo.save_perceptual_signature(conn, first, 0xFFFF_0000_FFFF_0000)
+        await signatures_repo.save_perceptual_signature(conn, second, 0xFFFF_0000_FFFF_0001)
+        await signatures_repo.save_perceptual_signature(conn, lonely, 0x0000_FFFF_0000_FFFF)
+
+    async with async_database.transaction() as conn:
+        signatures = await duplicates_repo.get_perceptual_signatures(conn, user, None, 3)
+        exact = await duplicates_repo.get_perceptual_signatures(conn, user, None, 0)
+
+    assert signatures == {first.id: 0xFFFF_0000_FFFF_0000, second.id: 0xFFFF_0000_FFFF_0001}
+    assert exact == {}
@@ -0,0 +1,67 @@
+"""Tests for looking up items by GPS coordinates from EXIF.
+
+Coordinates are parsed when EXIF is saved, lookups respect visibility
+of items and boxes that cross the antimeridian.
+"""
+
+from omoide import models
+
+
+def _exif(latitude: str, longitude: str) -> models.Exif:
+    """Return EXIF like the upload worker produces."""
+    return models.Exif(
+        exif={
+            'GPSInfo': {
+                'GPSLatitudeRef': 'N',
+                'GPSLatitude': latitude,
+                'GPSLongitudeRef': 'E',
+                'GPSLongitude': longitude,
+            },
+        }
+    )
+
+
+async def test_items_are_found_in_bounding_box(  # noqa: PLR0913
+    async_database,
+    exif_repo,
+    make_user_model,
+    make_item_model,
+    make_metainfo,
+):
+    user = await make_user_model()
+    stranger = await make_user_model()
+    coordinates = [
+        ('(55.0, 45.0, 0.0)', '(37.0, 36.0, 0.0)'),
+        ('(55.0, 46.0, 0.0)', '(37.0, 37.0, 0.0)'),
+        ('(64.0, 44.0, 0.0)', '(179.0, 30.0, 0.0)'),
+    ]
+    items = []
+
+    for latitude, longitude in coordinates:
+        item = await make_item_model(owner_id=user.id, owner_uuid=user.uuid)
+        make_metainfo(item.id)
+        items.append(item)
+
+        async with async_database.transaction() as conn:
+            await exif_repo.save(conn, item, _exif(latitude, longitude))
+
+    moscow = models.BoundingBox(south=55.0, west=37.0, north=56.0, east=38.0)
+    chukotka = models.BoundingBox(south=60.0, west=170.0, north=70.0, east=-170.0)
+
+    async with async_database.transaction() as conn:
+        found = await exif_repo.get_in_box(conn, user, moscow, limit=10)
+        assert {item.id for item, _, _ in found} == {items[0].id, items[1].id}
+        assert {round(latitude, 2) for _, latitude, _ in found} == {55.75, 55.77}
+
+        found = await exif_repo.get_in_box(conn, user, chukotka, limit=10)
+        assert [item.id for item, _, _ in found] == [items[2].id]
+
+        assert await exif_repo.get_in_box(conn, stranger, moscow, limit=10) == []
+
+        (cluster,) = await exif_repo.get_clusters(conn, user, moscow, grid=1)
+        assert cluster.total == 2  # noqa: PLR2004
+        assert round(cluster.latitude, 2) == 55.76  # noqa: PLR2004
+
+        (cluster,) = await exif_repo.get_clusters(conn, user, chukotka, grid=4)
+        assert cluster.item_uuid == items[2].uuid
+        assert round(cluster.longitude, 1) == 179.5  # noqa: PLR2004
@@ -0,0 +1,86 @@
+"""Tests for ``children_count`` and ``descendants_count`` of items.
+
+Counters are changed by ``ItemsRepo`` itself when items are created,
+moved or deleted, so reading an item is enough to know its size.
+"""
+
+from uuid import uuid4
+
+from omoide import models
+
+
+def _item(user: models.User, parent: models.Item | None = None) -> models.Item:
+    """Return new item model."""
+    return models.Item(
+        id=-1,
+        uuid=uuid4(),
+        parent_id=parent.id if parent else None,
+        parent_uuid=parent.uuid if parent else None,
+        owner_id=user.id,
+        owner_uuid=user.uuid,
+        name='test',
+        status=models.Status.CREATED,
+        number=-1,
+        is_collection=True,
+        content_ext=None,
+        preview_ext=None,
+        thumbnail_ext=None,
+        tags=set(),
+        permissions=set(),
+        extras={},
+    )
+
+
+async def _create(conn, items_repo, item: models.Item) -> models.Item:
+    """Save item."""
+    item.id = await items_repo.create(conn, item)
+    item.reset_changes()
+    return item
+
+
+async def _counters(conn, items_repo, item: models.Item) -> tuple[int, int]:
+    """Return actual counters of the item."""
+    fresh = await items_repo.get_by_id(conn, item.id, read_deleted=True)
+    return fresh.children_count, fresh.descendants_count
+
+
+async def test_counters_follow_item_lifecycle(
+    async_database,
+    items_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        root = await _create(conn, items_repo, _item(user))
+        left = await _create(conn, items_repo, _item(user, root))
+        right = await _create(conn, items_repo, _item(user, root))
+        leaf_1 = await _create(conn, items_repo, _item(user, left))
+        await _create(conn, items_repo, _item(user, left))
+
+    async with async_database.transaction() as conn:
+        assert await _counters(conn, items_repo, root) == (2, 4)
+        assert await _counters(conn, items_repo, left) == (2, 2)
+        assert await _counters(conn, items_repo, right) == (0, 0)
+
+        # move whole subtree
+        left.parent_id = right.id
+        left.parent_uuid = right.uuid
+        await items_repo.save(conn, left)
+
+    async with async_database.transaction() as conn:
+        assert await _counters(conn, items_repo, root) == (1, 4)
+        assert await _counters(conn, items_repo, right) == (1, 3)
+
+        await items_repo.soft_delete(conn, leaf_1)
+
+    async with async_database.transaction() as conn:
+        assert await _counters(conn, items_repo, root) == (1, 3)
+        assert await _counters(conn, items_repo, right) == (1, 2)
+        assert await _counters(conn, items_repo, left) == (1, 1)
+
+        await items_repo.hard_delete(conn, left)
+
+    async with async_database.transaction() as conn:
+        assert await _counters(conn, items_repo, root) == (1, 1)
+        assert await _counters(conn, items_repo, right) == (0, 0)
@@ -391,3 +391,21 @@ class TestDecrementKnownTagsAnon:
             await tags_repo.decrement_known_tags_anon(conn, {'depleting'})
 
         assert _anon_counter(engine, 'depleting') == 0
+
+
+# --- search generation --------------------------------------------------
+
+
+class TestSearchGeneration:
+    async def test_bump_changes_generation(self, async_database, tags_repo):
+        async with async_database.transaction() as conn:
+            before = await tags_repo.get_generation(conn)
+
+        async with async_database.transaction() as conn:
+            bumped = await tags_repo.bump_generation(conn)
+
+        async with async_database.transaction() as conn:
+            after = await tags_repo.get_generation(conn)
+
+        assert bumped > before
+        assert after == bumped
@@ -0,0 +1,101 @@
+"""Tests for full-text search over names and notes of items.
+
+Search document is rebuilt by repositories on item creation, rename
+and note insertion, results can be narrowed by tags.
+"""
+
+from uuid import uuid4
+
+from omoide import models
+from omoide.domain import search_planner
+
+
+def _item(user: models.User, name: str) -> models.Item:
+    """Return new item model."""
+    return models.Item(
+        id=-1,
+        uuid=uuid4(),
+        parent_id=None,
+        parent_uuid=None,
+        owner_id=user.id,
+        owner_uuid=user.uuid,
+        name=name,
+        status=models.Status.AVAILABLE,
+        number=-1,
+        is_collection=False,
+        content_ext=None,
+        preview_ext=None,
+        thumbnail_ext=None,
+        tags=set(),
+        permissions=set(),
+        extras={},
+    )
+
+
+def _plan(**kwargs) -> models.Plan:
+    values = {
+        'query': '',
+        'tags_include': set(),
+        'tags_exclude': set(),
+        'order': 'desc',
+        'collections': False,
+        'direct': False,
+        'last_seen': None,
+        'limit': 10,
+    }
+    values.update(kwargs)
+    return models.Plan(**values)
+
+
+async def _search(conn, search_repo, user, text, plan, last_seen=None):
+    """Return found items with their ranks."""
+    query_plan = search_planner.make_plan(plan, {'beach': 1}, {}, 10)
+    return await search_repo.search_text(conn, user, plan, query_plan, text, last_seen)
+
+
+async def test_text_search_follows_names_and_notes(  # noqa: PLR0913
+    async_database,
+    items_repo,
+    meta_repo,
+    tags_repo,
+    search_repo,
+    make_user_model,
+    make_metainfo,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        first = _item(user, 'Summer holidays')
+        first.id = await items_repo.create(conn, first)
+        first.reset_changes()
+        second = _item(user, 'Winter')
+        second.id = await items_repo.create(conn, second)
+        second.reset_changes()
+
+        await tags_repo.save_computed_tags(conn, first, {'beach'})
+        await tags_repo.save_computed_tags(conn, second, set())
+        await meta_repo.add_item_note(conn, second, 'original_filename', 'dsc01234.jpg')
+
+    make_metainfo(first.id)
+    make_metainfo(second.id)
+
+    async with async_database.transaction() as conn:
+        found = await _search(conn, search_repo, user, 'summer', _plan())
+        assert [item.id for item, _ in found] == [first.id]
+
+        found = await _search(conn, search_repo, user, 'dsc01234.jpg', _plan())
+        assert [item.id for item, _ in found] == [second.id]
+
+        found = await _search(conn, search_repo, user, 'summer', _plan(tags_include={'beach'}))
+        assert [item.id for item, _ in found] == [first.id]
+
+        second.name = 'Summer again'
+        await items_repo.save(conn, second)
+
+    async with async_database.transaction() as conn:
+        found = await _search(conn, search_repo, user, 'summer', _plan(limit=1))
+        assert len(found) == 1
+
+        (item, rank), *_ = found
+        rest = await _search(conn, search_repo, user, 'summer', _plan(), (rank, item.id))
+        assert {item.id, *(each.id for each, _ in rest)} == {first.id, second.id}
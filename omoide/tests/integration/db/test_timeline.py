@@ -0,0 +1,83 @@
+"""Tests for browsing items by capture date from EXIF.
+
+Typed EXIF columns are filled on save, timeline respects visibility
+of items and pages by capture date.
+"""
+
+from datetime import datetime
+
+from omoide import const
+from omoide import models
+
+
+def _exif(taken_at: str) -> models.Exif:
+    """Return EXIF like the upload worker produces."""
+    return models.Exif(
+        exif={
+            'Make': 'SONY',
+            'Model': 'DSC-S600',
+            'DateTime': '2020:01:01 00:00:00',
+            'Exif': {'DateTimeOriginal': taken_at},
+        }
+    )
+
+
+async def test_timeline_pages_by_capture_date(  # noqa: PLR0913
+    async_database,
+    exif_repo,
+    make_user_model,
+    make_item_model,
+    make_metainfo,
+):
+    user = await make_user_model()
+    stranger = await make_user_model()
+    dates = ['2007:08:10 08:23:29', '2007:09:01 12:00:00', '2008:01:01 10:00:00']
+    items = []
+
+    for taken_at in dates:
+        item = await make_item_model(owner_id=user.id, owner_uuid=user.uuid)
+        make_metainfo(item.id)
+        items.append(item)
+
+        async with async_database.transaction() as conn:
+            await exif_repo.save(conn, item, _exif(taken_at))
+
+    async with async_database.transaction() as conn:
+        found = await exif_repo.get_timeline(conn, user, user, None, None, const.ASC, None, limit=2)
+        assert [item.id for item, _ in found] == [items[0].id, items[1].id]
+        assert found[0][1] == datetime(2007, 8, 10, 8, 23, 29)  # noqa: DTZ001
+
+        last_item, last_taken_at = found[-1]
+        rest = await exif_repo.get_timeline(
+            conn, user, user, None, None, const.ASC, (last_taken_at, last_item.id), limit=2
+        )
+        assert [item.id for item, _ in rest] == [items[2].id]
+
+        found = await exif_repo.get_timeline(
+            conn,
+            user,
+            None,
+            datetime(2007, 9, 1),  # noqa: DTZ001
+            datetime(2008, 1, 1),  # noqa: DTZ001
+            const.DESC,
+            None,
+            limit=10,
+        )
+        assert [item.id for item, _ in found] == [items[1].id]
+
+        assert (
+            await exif_repo.get_timeline(
+                conn, stranger, user, None, None, const.ASC, None, limit=10
+            )
+            == []
+        )
+
+        assert await exif_repo.get_histogram(conn, user, user, None) == [
+            models.TimelineBucket(year=2007, month=None, total=2),
+            models.TimelineBucket(year=2008, month=None, total=1),
+        ]
+        assert await exif_repo.get_histogram(conn, user, user, 2007) == [
+            models.TimelineBucket(year=2007, month=8, total=1),
+            models.TimelineBucket(year=2007, month=9, total=1),
+        ]
+        assert await exif_repo.get_histogram(conn, stranger, None, None) == []
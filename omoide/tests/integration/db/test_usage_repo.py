@@ -0,0 +1,195 @@
+"""Tests for incremental maintenance of ``user_usage``.
+
+``ItemsRepo`` and ``MetaRepo`` change the aggregate in the same
+transaction as the item itself. Only available items are counted.
+Tests below check that after typical operations stored numbers
+are equal to the full recalculation.
+"""
+
+from uuid import uuid4
+
+import python_utilz as pu
+
+from omoide import models
+
+
+def _item(
+    user: models.User,
+    *,
+    is_collection: bool = False,
+    status: models.Status = models.Status.AVAILABLE,
+) -> models.Item:
+    """Return new item model."""
+    return models.Item(
+        id=-1,
+        uuid=uuid4(),
+        parent_id=None,
+        parent_uuid=None,
+        owner_id=user.id,
+        owner_uuid=user.uuid,
+        name='test',
+        status=status,
+        number=-1,
+        is_collection=is_collection,
+        content_ext=None,
+        preview_ext=None,
+        thumbnail_ext=None,
+        tags=set(),
+        permissions=set(),
+        extras={},
+    )
+
+
+def _metainfo(item: models.Item) -> models.Metainfo:
+    """Return empty metainfo model."""
+    return models.Metainfo(
+        item_id=item.id,
+        created_at=pu.now(),
+        updated_at=pu.now(),
+        deleted_at=None,
+        user_time=None,
+        content_type=None,
+        content_size=None,
+        preview_size=None,
+        thumbnail_size=None,
+        content_width=None,
+        content_height=None,
+        preview_width=None,
+        preview_height=None,
+        thumbnail_width=None,
+        thumbnail_height=None,
+    )
+
+
+async def _create(conn, items_repo, meta_repo, item: models.Item) -> models.Metainfo:
+    """Save item and its metainfo."""
+    item.id = await items_repo.create(conn, item)
+    item.reset_changes()
+    metainfo = _metainfo(item)
+    await meta_repo.create(conn, metainfo)
+    metainfo.reset_changes()
+    return metainfo
+
+
+async def test_usage_follows_item_lifecycle(
+    async_database,
+    items_repo,
+    meta_repo,
+    usage_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        collection = _item(user, is_collection=True)
+        await _create(conn, items_repo, meta_repo, collection)
+
+        item = _item(user)
+        metainfo = await _create(conn, items_repo, meta_repo, item)
+        metainfo.content_size = 1000
+        metainfo.preview_size = 100
+        metainfo.thumbnail_size = 10
+        await meta_repo.save(conn, metainfo)
+
+    async with async_database.transaction() as conn:
+        usage = await usage_repo.get_usage(conn, user)
+        assert usage == await usage_repo.calculate_usage(conn, user)
+
+    assert usage.total_items == 2
+    assert usage.total_collections == 1
+    assert usage.disk_usage.total_size == 1110
+
+    async with async_database.transaction() as conn:
+        metainfo.preview_size = 50
+        await meta_repo.save(conn, metainfo)
+        item.is_collection = True
+        await items_repo.save(conn, item)
+
+    async with async_database.transaction() as conn:
+        usage = await usage_repo.get_usage(conn, user)
+        assert usage == await usage_repo.calculate_usage(conn, user)
+
+    assert usage.total_collections == 2
+    assert usage.disk_usage.preview_bytes == 50
+
+    async with async_database.transaction() as conn:
+        await items_repo.soft_delete(conn, item)
+
+    async with async_database.transaction() as conn:
+        usage = await usage_repo.get_usage(conn, user)
+        assert usage == await usage_repo.calculate_usage(conn, user)
+
+    assert usage.total_items == 1
+    assert usage.total_collections == 1
+    assert usage.disk_usage.total_size == 0
+
+    async with async_database.transaction() as conn:
+        await items_repo.hard_delete(conn, collection)
+        usage = await usage_repo.get_usage(conn, user)
+
+    assert usage.total_items == 0
+    assert usage.total_collections == 0
+
+
+async def test_save_usage_overwrites_drift(
+    async_database,
+    items_repo,
+    meta_repo,
+    usage_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        await _create(conn, items_repo, meta_repo, _item(user))
+        actual = await usage_repo.calculate_usage(conn, user)
+        broken = models.ResourceUsage(
+            user=user,
+            total_items=100,
+            total_collections=100,
+            disk_usage=actual.disk_usage,
+        )
+        await usage_repo.save_usage(conn, broken)
+        assert await usage_repo.get_usage(conn, user) == broken
+
+        await usage_repo.save_usage(conn, actual)
+        assert await usage_repo.get_usage(conn, user) == actual
+
+
+async def test_usage_counts_only_available_items(
+    async_database,
+    items_repo,
+    meta_repo,
+    usage_repo,
+    make_user_model,
+):
+    user = await make_user_model()
+
+    async with async_database.transaction() as conn:
+        item = _item(user, status=models.Status.CREATED)
+        metainfo = await _create(conn, items_repo, meta_repo, item)
+        metainfo.content_size = 1000
+        await meta_repo.save(conn, metainfo)
+        await items_repo.set_status(conn, [item], models.Status.PROCESSING)
+        usage = await usage_repo.get_usage(conn, user)
+
+    assert usage.total_items == 0
+    assert usage.disk_usage.total_size == 0
+
+    async with async_database.transaction() as conn:
+        item.status = models.Status.AVAILABLE
+        await items_repo.save(conn, item)
+        usage = await usage_repo.get_usage(conn, user)
+        assert usage == await usage_repo.calculate_usage(conn, user)
+
+    assert usage.total_items == 1
+    assert usage.disk_usage.total_size == 1000
+
+    # uploading again
+    async with async_database.transaction() as conn:
+        await items_repo.set_status(conn, [item], models.Status.PROCESSING)
+        usage = await usage_repo.get_usage(conn, user)
+        assert usage == await usage_repo.calculate_usage(conn, user)
+
+    assert usage.total_items == 0
+    assert usage.disk_usage.total_size == 0
@@ -12,13 +12,21 @@ happy path, failure, batching, lock-stealing) but rewritten for the
 new advisory-lock / TaskGroup architecture.
 """
 
+import sqlalchemy as sa
+
 from omoide import const
+from omoide import models
 from omoide.const import LockableResource
+from omoide.database import db_models
+from omoide.database.implementations import impl_sqlalchemy
+from omoide.infra.blob_store import BlobStore
 from omoide.infra.implementations.pg_advisory_lock import PGAdvisoryLock
+from omoide.infra.pack_store import PackStore
 from omoide.workers.parallel import __main__ as parallel_main
 from omoide.workers.parallel import commands
 from omoide.workers.parallel import metrics
 
+from .conftest import StubConfig
 from .conftest import _large_object_exists
 from .conftest import _read_log
 from .conftest import _read_status
@@ -57,8 +65,12 @@ def _kwargs(  # noqa: PLR0913
         'meta_repo': meta_repo,
         'exif_repo': exif_repo,
         'signatures_repo': signatures_repo,
+        'contact_sheets_repo': impl_sqlalchemy.ContactSheetsRepo(),
+        'commands_repo': impl_sqlalchemy.CommandsRepo(),
         'fs_locator': fs_locator,
         'object_storage': object_storage,
+        'pack_store': PackStore(fs_locator.root / const.PACKS_FOLDER),
+        'blob_store': BlobStore(fs_locator.root / const.BLOBS_FOLDER),
     }
 
 
@@ -714,3 +726,80 @@ class TestInvalidOid:
 
         assert _read_status(engine, command.id) == 'failed'
         assert 'Invalid oid' in _read_log(engine, command.id)
+
+
+# --- copy of a duplicate ----------------------------------------------
+
+
+class TestCopyFallback:
+    async def test_failed_copy_processes_uploaded_content(  # noqa: PLR0913
+        self,
+        parallel_db,
+        lock_provider,
+        metrics_collector,
+        users_repo,
+        items_repo,
+        meta_repo,
+        exif_repo,
+        signatures_repo,
+        fs_locator,
+        object_storage,
+        make_parallel_command,
+        make_user,
+        make_item,
+        engine,
+        tmp_path,
+    ):
+        """Source files are gone, uploaded bytes are used instead."""
+        owner_id, owner_uuid = make_user()
+        source_id, _, _ = make_item(owner_id=owner_id, owner_uuid=owner_uuid, preview_ext='jpg')
+        target_id, _, _ = make_item(owner_id=owner_id, owner_uuid=owner_uuid)
+        oid = await _save_small_large_object(object_storage, b'same content')
+
+        command = make_parallel_command(
+            name=models.Command.COPY_IMAGE,
+            requested_by=owner_id,
+            extras={
+                'item_id': source_id,
+                'source_item_id': source_id,
+                'target_item_id': target_id,
+                'including_content': True,
+                'oid': oid,
+                'fallback': {
+                    'content_type': 'image/jpeg',
+                    'ext': 'jpg',
+                    'extras': {'ancestors': []},
+                },
+            },
+        )
+        config = StubConfig(
+            data_folder=tmp_path,
+            supported_operations=frozenset([models.Command.COPY_IMAGE]),
+        )
+
+        await parallel_main.do_work(
+            **_kwargs(
+                config,
+                parallel_db,
+                lock_provider,
+                metrics_collector,
+                users_repo,
+                items_repo,
+                meta_repo,
+                exif_repo,
+                signatures_repo,
+                fs_locator,
+                object_storage,
+            )
+        )
+
+        assert _read_status(engine, command.id) == 'done'
+        with engine.connect() as conn:
+            upload = conn.execute(
+                sa.select(db_models.ParallelCommand).where(
+                    db_models.ParallelCommand.name == models.Command.UPLOAD
+                )
+            ).one()
+        assert upload.extras['item_id'] == target_id
+        assert upload.extras['oid'] == oid
+        assert _large_object_exists(engine, oid) is True
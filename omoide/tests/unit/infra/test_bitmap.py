@@ -0,0 +1,74 @@
+"""Tests."""
+
+import random
+
+import pytest
+
+from omoide.infra.bitmap import SPARSE_LIMIT
+from omoide.infra.bitmap import Bitmap
+
+
+@pytest.mark.parametrize('size', [10, SPARSE_LIMIT + 100])
+def test_bitmap_operations_match_sets(size):
+    rng = random.Random(size)
+    left_values = set(rng.sample(range(200_000), size))
+    right_values = set(rng.sample(range(200_000), size))
+    left, right = Bitmap(left_values), Bitmap(right_values)
+
+    assert list(left) == sorted(left_values)
+    assert list(reversed(left)) == sorted(left_values, reverse=True)
+    assert list(left & right) == sorted(left_values & right_values)
+    assert list(left | right) == sorted(left_values | right_values)
+    assert list(left - right) == sorted(left_values - right_values)
+    assert len(left | right) == len(left_values | right_values)
+
+
+def test_bitmap_add_and_discard_switch_containers():
+    bitmap = Bitmap()
+    for value in range(SPARSE_LIMIT + 1):
+        bitmap.add(value * 2)
+
+    assert isinstance(bitmap._chunks[0], int)
+    assert 2 in bitmap
+    assert 3 not in bitmap
+
+    for value in range(100):
+        bitmap.discard(value * 2)
+
+    assert len(bitmap) == SPARSE_LIMIT + 1 - 100
+    assert not isinstance(bitmap._chunks[0], int)
+    assert 0 not in bitmap
+
+    bitmap.add(1)
+    bitmap.add(1)
+    assert 1 in bitmap
+    assert len(bitmap) == SPARSE_LIMIT + 1 - 99
+
+
+def test_bitmap_operations_do_not_share_state():
+    left = Bitmap([1, 2, 3])
+    right = Bitmap([100_000])
+
+    union = left | right
+    union.add(4)
+
+    assert list(left) == [1, 2, 3]
+    assert list(Bitmap.intersection([left, Bitmap([2, 3, 4])])) == [2, 3]
+    assert not Bitmap.intersection([])
+
+
+def test_bitmap_rejects_negative_values():
+    with pytest.raises(ValueError, match='non-negative'):
+        Bitmap([-1])
+
+
+def test_bitmap_update_merges_with_existing_values():
+    bitmap = Bitmap([5, 70_000])
+
+    bitmap.update(range(0, 2 * SPARSE_LIMIT, 2))
+    bitmap.update([1, 5, 70_001])
+
+    expected = {1, 70_000, 70_001, *range(0, 2 * SPARSE_LIMIT, 2)} | {5}
+    assert list(bitmap) == sorted(expected)
+    assert isinstance(bitmap._chunks[0], int)
+    assert not isinstance(bitmap._chunks[1], int)
@@ -0,0 +1,70 @@
+"""Tests."""
+
+import pytest
+
+from omoide.infra.blob_store import BlobStore
+from omoide.infra.blob_store import CopyMethod
+from omoide.infra.blob_store import get_digest
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(tmp_path / 'blobs')
+
+
+def test_blob_store_copy_shares_content(tmp_path, store):
+    source = tmp_path / 'content' / 'a.jpg'
+    source.parent.mkdir()
+    source.write_bytes(b'image')
+    target = tmp_path / 'content' / 'other' / 'b.jpg'
+
+    assert store.copy(source, target) == CopyMethod.HARDLINK
+    assert target.read_bytes() == b'image'
+    assert target.samefile(source)
+
+    blob_path = store.get_blob_path(get_digest(source))
+    assert blob_path.samefile(source)
+    assert store.get_references(blob_path) == 2
+    assert list(store.iter_blobs()) == [blob_path]
+
+
+def test_blob_store_adopt_deduplicates(tmp_path, store):
+    first = tmp_path / 'first.jpg'
+    second = tmp_path / 'second.jpg'
+    first.write_bytes(b'same')
+    second.write_bytes(b'same')
+
+    assert store.adopt(first) == store.adopt(second)
+    assert first.samefile(second)
+    assert store.get_references(store.get_blob_path(get_digest(first))) == 2
+
+
+def test_blob_store_replaces_instead_of_rewriting(tmp_path, store):
+    source = tmp_path / 'source.jpg'
+    source.write_bytes(b'first')
+    target = tmp_path / 'target.jpg'
+    target.write_bytes(b'old')
+    store.copy(source, target)
+
+    other = tmp_path / 'other.jpg'
+    other.write_bytes(b'second')
+    store.copy(other, target)
+
+    assert source.read_bytes() == b'first'
+    assert target.read_bytes() == b'second'
+
+
+def test_blob_store_collect(tmp_path, store):
+    source = tmp_path / 'source.jpg'
+    source.write_bytes(b'image')
+    target = tmp_path / 'target.jpg'
+    store.copy(source, target)
+    blob_path = store.get_blob_path(get_digest(source))
+
+    source.unlink()
+    assert not store.collect(blob_path)
+    assert store.verify(blob_path)
+
+    target.unlink()
+    assert store.collect(blob_path)
+    assert list(store.iter_blobs()) == []
@@ -0,0 +1,104 @@
+"""Tests."""
+
+import asyncio
+import os
+
+from omoide.infra.disk_cache import DiskLRUCache
+
+
+def write(size):
+    def _write(path):
+        path.write_bytes(b'x' * size)
+
+    return _write
+
+
+def test_disk_cache_put_and_get(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_size=100)
+    assert cache.get('abc.jpg') is None
+
+    path = cache.put('abc.jpg', write(10))
+    assert path == tmp_path / 'ab' / 'abc.jpg'
+    assert cache.get('abc.jpg') == path
+    assert cache.total_size == 10
+    assert not [each for each in path.parent.iterdir() if each.name.startswith('.')]
+
+
+def test_disk_cache_read(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_size=100)
+    assert cache.read('a.jpg') is None
+
+    cache.put('a.jpg', write(10))
+    assert cache.read('a.jpg') == b'x' * 10
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_size=25)
+    cache.put('a.jpg', write(10))
+    cache.put('b.jpg', write(10))
+    assert cache.get('a.jpg') is not None
+
+    cache.put('c.jpg', write(10))
+    assert cache.get('a.jpg') is not None
+    assert cache.get('b.jpg') is None
+    assert not (tmp_path / 'b.' / 'b.jpg').exists()
+    assert cache.total_size == 20
+
+
+def test_disk_cache_restores_index(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_size=100)
+    old = cache.put('old.jpg', write(10))
+    cache.put('new.jpg', write(20))
+    os.utime(old, (1, 1))
+    broken = tmp_path / 'ne' / '.broken.tmp'
+    broken.write_bytes(b'x')
+    os.utime(broken, (1, 1))
+    writing = tmp_path / 'ne' / '.writing.tmp'
+    writing.write_bytes(b'x')
+
+    restored = DiskLRUCache(tmp_path, max_size=25)
+    assert restored.total_size == 30
+    restored.put('other.jpg', write(1))
+    assert restored.get('old.jpg') is None
+    assert restored.get('new.jpg') is not None
+    assert not broken.exists()
+    assert writing.exists()
+
+
+def test_disk_cache_budget_is_shared(tmp_path):
+    first = DiskLRUCache(tmp_path, max_size=25)
+    second = DiskLRUCache(tmp_path, max_size=25)
+
+    first.put('a.jpg', write(10))
+    second.put('b.jpg', write(10))
+    assert second.get('a.jpg') is not None
+
+    first.put('c.jpg', write(10))
+    assert first.get('b.jpg') is None
+    assert second.get('a.jpg') is not None
+    assert first.total_size == second.total_size == 20
+
+
+async def test_disk_cache_creates_once(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_size=100)
+    calls = []
+
+    def create(path):
+        calls.append(path)
+        path.write_bytes(b'x')
+
+    contents = await asyncio.gather(*(cache.get_or_create('a.jpg', create) for _ in range(5)))
+    assert contents == [b'x'] * 5
+    assert len(calls) == 1
+
+
+async def test_disk_cache_recreates_evicted(tmp_path):
+    first = DiskLRUCache(tmp_path, max_size=25)
+    second = DiskLRUCache(tmp_path, max_size=25)
+
+    assert await first.get_or_create('a.jpg', write(10)) == b'x' * 10
+    second.put('b.jpg', write(10))
+    second.put('c.jpg', write(10))
+    assert first.read('a.jpg') is None
+
+    assert await first.get_or_create('a.jpg', write(10)) == b'x' * 10
@@ -0,0 +1,70 @@
+"""Tests."""
+
+from PIL import ExifTags
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+import pytest
+
+from omoide.domain import exif as exif_domain
+from omoide.infra import exif_reader
+
+
+@pytest.fixture
+def exif():
+    img_exif = Image.Exif()
+    img_exif[ExifTags.Base.Make] = 'SONY'
+    img_exif[ExifTags.Base.Orientation] = 6
+    img_exif.get_ifd(ExifTags.IFD.Exif)[ExifTags.Base.DateTimeOriginal] = '2007:08:10 08:23:29'
+    gps = img_exif.get_ifd(ExifTags.IFD.GPSInfo)
+    gps[ExifTags.GPS.GPSLatitudeRef] = 'N'
+    gps[ExifTags.GPS.GPSLatitude] = (IFDRational(55), IFDRational(45), IFDRational(36))
+    gps[ExifTags.GPS.GPSLongitudeRef] = 'E'
+    gps[ExifTags.GPS.GPSLongitude] = (IFDRational(37), IFDRational(30), IFDRational(0))
+    return img_exif
+
+
+@pytest.mark.parametrize('image_format', ['JPEG', 'PNG', 'WEBP'])
+def test_extract_exif_from_file(tmp_path, exif, image_format):
+    path = tmp_path / f'image.{image_format.lower()}'
+    with Image.new('RGB', (64, 48), 'red') as img:
+        img.save(path, image_format, exif=exif)
+
+    with Image.open(path) as img:
+        expected = exif_reader.exif_to_dict(img.getexif())
+
+    result = exif_reader.extract_exif_from_file(path)
+
+    assert result == expected
+    fields = exif_domain.extract_fields(result)
+    assert fields.camera_make == 'SONY'
+    assert fields.latitude == 55.76  # noqa: PLR2004
+
+
+def test_extract_exif_does_not_touch_pixels(tmp_path, exif):
+    path = tmp_path / 'image.jpg'
+    with Image.new('RGB', (64, 48), 'red') as img:
+        img.save(path, 'JPEG', exif=exif)
+
+    # everything after the start of compressed data is garbage now
+    data = path.read_bytes()
+    start = data.index(b'\xff\xda')
+    path.write_bytes(data[:start] + b'\xff\xda' + b'\x00' * 100)
+
+    result = exif_reader.extract_exif_from_file(path)
+
+    assert result is not None
+    assert result['Make'] == 'SONY'
+
+
+def test_extract_exif_from_file_without_exif(tmp_path):
+    path = tmp_path / 'image.jpg'
+    with Image.new('RGB', (64, 48), 'red') as img:
+        img.save(path, 'JPEG')
+
+    assert exif_reader.extract_exif_from_file(path) is None
+
+    path = tmp_path / 'image.gif'
+    with Image.new('RGB', (64, 48), 'red') as img:
+        img.save(path, 'GIF')
+
+    assert exif_reader.extract_exif_from_file(path) is None
@@ -0,0 +1,35 @@
+"""Tests."""
+
+import pytest
+
+from omoide.infra.locators import WebLocator
+
+CHROME = 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8'
+OLD_SAFARI = 'image/png,image/svg+xml,image/*;q=0.8,video/*;q=0.8,*/*;q=0.5'
+
+
+def test_web_locator_accepted_types():
+    assert WebLocator.get_accepted_types(CHROME) == {
+        'image/avif',
+        'image/webp',
+        'image/apng',
+        'image/svg+xml',
+    }
+    assert WebLocator.get_accepted_types('image/webp;q=0, image/avif') == {'image/avif'}
+    assert WebLocator.get_accepted_types(None) == set()
+
+
+@pytest.mark.parametrize(
+    ('accept', 'renditions', 'reference'),
+    [
+        (CHROME, {'webp': 600, 'avif': 400}, 'avif'),
+        (CHROME, {'webp': 400, 'avif': 600}, 'webp'),
+        (CHROME, {'webp': 1200}, 'jpg'),
+        (CHROME, {}, 'jpg'),
+        (OLD_SAFARI, {'webp': 600, 'avif': 400}, 'jpg'),
+        ('image/webp', {'webp': 600, 'avif': 400}, 'webp'),
+        (None, {'webp': 600}, 'jpg'),
+    ],
+)
+def test_web_locator_pick_format(accept, renditions, reference):
+    assert WebLocator.pick_format(accept, 'jpg', 1000, renditions) == reference
@@ -0,0 +1,70 @@
+"""Tests."""
+
+import pytest
+
+from omoide.infra.multipart_stream import MultipartError
+from omoide.infra.multipart_stream import iter_parts
+
+BOUNDARY = 'xXxBoUnDaRyxXx'
+CONTENT_TYPE = f'multipart/form-data; boundary={BOUNDARY}'
+
+
+def _body(*parts: tuple[str, str, bytes]) -> bytes:
+    body = b''
+    for name, filename, payload in parts:
+        body += (
+            (
+                f'--{BOUNDARY}\r\n'
+                f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                'Content-Type: image/jpeg\r\n\r\n'
+            ).encode()
+            + payload
+            + b'\r\n'
+        )
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+async def _read_all(content_type: str, body: bytes) -> None:
+    async for part in iter_parts(content_type, _stream(body, 10)):
+        async for _ in part.body:
+            pass
+
+
+async def _stream(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+@pytest.mark.parametrize('size', [1, 7, 1_000_000])
+async def test_multipart_stream_parts_are_streamed(size):
+    body = _body(('first', 'a.jpg', b'1' * 500), ('second', 'b.jpg', b'\r\n--2' * 100))
+
+    result = []
+    async for part in iter_parts(CONTENT_TYPE, _stream(body, size)):
+        payload = b''.join([chunk async for chunk in part.body])
+        result.append((part.name, part.filename, part.content_type, payload))
+
+    assert result == [
+        ('first', 'a.jpg', 'image/jpeg', b'1' * 500),
+        ('second', 'b.jpg', 'image/jpeg', b'\r\n--2' * 100),
+    ]
+
+
+async def test_multipart_stream_unread_body_is_skipped():
+    body = _body(('first', 'a.jpg', b'1' * 500), ('second', 'b.jpg', b'2'))
+
+    names = [part.name async for part in iter_parts(CONTENT_TYPE, _stream(body, 10))]
+
+    assert names == ['first', 'second']
+
+
+async def test_multipart_stream_truncated_body():
+    body = _body(('first', 'a.jpg', b'1' * 500))[:-50]
+
+    with pytest.raises(MultipartError):
+        await _read_all(CONTENT_TYPE, body)
+
+
+async def test_multipart_stream_wrong_content_type():
+    with pytest.raises(MultipartError, match='multipart/form-data'):
+        await _read_all('application/json', b'{}')
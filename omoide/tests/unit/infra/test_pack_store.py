@@ -0,0 +1,120 @@
+"""Tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from omoide.infra.pack_store import PackStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PackStore(tmp_path)
+    yield store
+    store.close()
+
+
+def test_pack_store_put_and_read(store):
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'first')
+    store.put('thumbnail', 'owner', 'ab', 'abd.jpg', b'second')
+
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+    assert store.read_relative(Path('thumbnail/owner/ab/abd.jpg')) == b'second'
+    assert store.read('thumbnail', 'owner', 'ab', 'missing.jpg') is None
+    assert store.read('thumbnail', 'other', 'ab', 'abc.jpg') is None
+
+
+def test_pack_store_replace_and_delete(store):
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'first')
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'replaced')
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'replaced'
+
+    assert store.delete('thumbnail', 'owner', 'ab', 'abc.jpg')
+    assert not store.delete('thumbnail', 'owner', 'ab', 'abc.jpg')
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') is None
+
+
+def test_pack_store_compaction(tmp_path, store):
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'x' * 100)
+    store.put('thumbnail', 'owner', 'ab', 'abd.jpg', b'y' * 10)
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'z' * 20)
+    store.delete('thumbnail', 'owner', 'ab', 'abd.jpg')
+
+    # reader remembers old offsets
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'z' * 20
+
+    assert PackStore(tmp_path).compact('thumbnail', 'owner', 'ab') == 110
+    assert (tmp_path / 'thumbnail' / 'owner' / 'ab.pack').stat().st_size == 20
+
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'z' * 20
+    assert store.read('thumbnail', 'owner', 'ab', 'abd.jpg') is None
+    assert list(store.iter_packs('thumbnail')) == [('owner', 'ab')]
+
+
+def test_pack_store_sees_writes_of_other_instances(tmp_path):
+    store = PackStore(tmp_path, index_ttl=0)
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'first')
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+
+    PackStore(tmp_path).put('thumbnail', 'owner', 'ab', 'abc.jpg', b'second')
+
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'second'
+    store.close()
+
+
+def test_pack_store_checks_index_only_after_ttl(tmp_path, monkeypatch):
+    store = PackStore(tmp_path, max_cached_indexes=1, index_ttl=60)
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'first')
+    store.put('thumbnail', 'owner', 'cd', 'cde.jpg', b'second')
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+
+    calls = []
+    original_stat = Path.stat
+
+    def _stat(path: Path, **kwargs):
+        calls.append(path)
+        return original_stat(path, **kwargs)
+
+    monkeypatch.setattr(Path, 'stat', _stat)
+
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+    assert calls == []
+
+    # only one index is kept, other one has to be read again
+    assert store.read('thumbnail', 'owner', 'cd', 'cde.jpg') == b'second'
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+    assert len(calls) == 2
+    assert list(store._indexes) == [tmp_path / 'thumbnail' / 'owner' / 'ab']
+    store.close()
+
+
+def test_pack_store_ignores_incomplete_record(tmp_path, store):
+    store.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'first')
+
+    with open(tmp_path / 'thumbnail' / 'owner' / 'ab.idx', 'ab') as index:
+        index.write(b'garbage')
+
+    assert store.read('thumbnail', 'owner', 'ab', 'abc.jpg') == b'first'
+
+    store.put('thumbnail', 'owner', 'ab', 'abd.jpg', b'second')
+    assert PackStore(tmp_path).read('thumbnail', 'owner', 'ab', 'abd.jpg') == b'second'
+
+
+def test_pack_store_parallel_reads_survive_eviction(tmp_path):
+    store = PackStore(tmp_path, max_open_packs=1)
+    prefixes = ['ab', 'cd', 'ef']
+    for prefix in prefixes:
+        store.put('thumbnail', 'owner', prefix, f'{prefix}.jpg', prefix.encode() * 1000)
+
+    def _read(number: int) -> bytes | None:
+        prefix = prefixes[number % len(prefixes)]
+        return store.read('thumbnail', 'owner', prefix, f'{prefix}.jpg')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_read, range(300)))
+
+    store.close()
+    assert results == [prefixes[i % len(prefixes)].encode() * 1000 for i in range(300)]
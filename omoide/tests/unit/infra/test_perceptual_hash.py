@@ -0,0 +1,68 @@
+"""Tests."""
+
+import random
+
+from PIL import Image
+import pytest
+
+from omoide.infra import perceptual_hash
+
+
+def test_perceptual_hash_signed_round_trip():
+    for value in (0, 1, 2**63 - 1, 2**63, 2**64 - 1):
+        signed = perceptual_hash.to_signed(value)
+        assert -(2**63) <= signed < 2**63
+        assert perceptual_hash.to_unsigned(signed) == value
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 3, 7, 10])
+def test_multi_index_hash_matches_brute_force(max_distance):
+    rng = random.Random(max_distance)
+    base = [rng.getrandbits(64) for _ in range(20)]
+    hashes: dict[int, int] = {}
+
+    for key in range(500):
+        value = rng.choice(base)
+        for _ in range(rng.randint(0, 12)):
+            value ^= 1 << rng.randrange(64)
+        hashes[key] = value
+
+    index: perceptual_hash.MultiIndexHash[int] = perceptual_hash.MultiIndexHash(max_distance)
+    for key, value in hashes.items():
+        index.add(key, value)
+
+    target = hashes[0]
+    expected = {
+        key
+        for key, value in hashes.items()
+        if perceptual_hash.distance(target, value) <= max_distance
+    }
+    found = index.search(target)
+
+    assert {key for key, _ in found} == expected
+    assert [delta for _, delta in found] == sorted(delta for _, delta in found)
+
+
+def test_group_similar():
+    hashes = {
+        1: 0b0000,
+        2: 0b0001,
+        3: 0b0011,  # close to 2, but not to 1
+        4: 2**64 - 1,
+        5: 2**64 - 2,
+        6: 0xF0F0_F0F0_0000_0000,
+    }
+
+    assert perceptual_hash.group_similar(hashes, max_distance=1) == [[1, 2, 3], [4, 5]]
+    assert perceptual_hash.group_similar(hashes, max_distance=0) == []
+
+
+def test_difference_hash_survives_resizing():
+    img = Image.new('L', (256, 64))
+    img.putdata([255 - x for _ in range(64) for x in range(256)])
+
+    signature = perceptual_hash.difference_hash(img)
+
+    assert signature == 2**64 - 1
+    assert perceptual_hash.difference_hash(img.resize((64, 16))) == signature
+    assert perceptual_hash.difference_hash(img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)) == 0
@@ -0,0 +1,32 @@
+"""Tests."""
+
+import base64
+import io
+
+from PIL import Image
+
+from omoide.infra import placeholder
+
+
+def test_placeholder_is_tiny_jpeg():
+    img = Image.new('RGB', (800, 600), (200, 30, 30))
+    img.paste((20, 20, 220), (0, 0, 100, 100))
+
+    result = placeholder.make_placeholder(img)
+
+    data = base64.b64decode(result.image)
+    assert len(data) < 512
+    with Image.open(io.BytesIO(data)) as small:
+        assert small.format == 'JPEG'
+        assert max(small.size) == placeholder.PLACEHOLDER_SIDE
+    assert result.color == '#c81e1e'
+
+
+def test_placeholder_from_file(tmp_path):
+    path = tmp_path / 'thumbnail.jpg'
+    Image.new('RGB', (384, 256), (10, 120, 10)).save(path)
+
+    result = placeholder.make_placeholder_from_file(path)
+
+    assert result.color.startswith('#')
+    assert len(result.color) == 7
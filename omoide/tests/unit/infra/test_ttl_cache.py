@@ -0,0 +1,40 @@
+"""Tests."""
+
+import time
+
+from omoide.infra.ttl_cache import TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    assert cache.get('a') is None
+
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    assert len(cache) == 1
+
+    cache.pop('a')
+    assert cache.get('a') is None
+
+
+def test_ttl_cache_expiration(monkeypatch):
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+    cache.set('a', 1)
+
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
@@ -0,0 +1,104 @@
+"""Tests."""
+
+import io
+import zipfile
+import zlib
+
+from omoide.presentation.infra.zip_stream import ZipEntry
+from omoide.presentation.infra.zip_stream import ZipLayout
+from omoide.presentation.infra.zip_stream import ZipStreamResponse
+
+
+def _entries(tmp_path, *, with_crc: bool) -> list[ZipEntry]:
+    """Create files on disk and describe them."""
+    entries = []
+    for i, payload in enumerate([b'first file', b'', b'x' * 100_000], start=1):
+        path = tmp_path / f'{i}.bin'
+        path.write_bytes(payload)
+        entries.append(
+            ZipEntry(
+                path=path,
+                arcname=f'{i}___файл.bin',
+                size=len(payload),
+                crc32=zlib.crc32(payload) if with_crc else None,
+                mtime=path.stat().st_mtime,
+            )
+        )
+    return entries
+
+
+async def _download(response: ZipStreamResponse, extensions: dict | None = None) -> bytes:
+    """Run response as ASGI app and collect the body."""
+    body = io.BytesIO()
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            body.write(message['body'])
+        elif message['type'] == 'http.response.zerocopysend':
+            file = message['file']
+            file.seek(message['offset'])
+            body.write(file.read(message['count']))
+
+    scope = {'type': 'http', 'method': 'GET', 'extensions': extensions or {}}
+    await response(scope, receive, send)
+    return body.getvalue()
+
+
+def _check(archive: bytes, entries: list[ZipEntry]) -> None:
+    """Ensure archive is valid and contains all files."""
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [entry.arcname for entry in entries]
+        for entry in entries:
+            assert zip_file.read(entry.arcname) == entry.path.read_bytes()
+
+
+async def test_zip_stream_known_crc(tmp_path):
+    entries = _entries(tmp_path, with_crc=True)
+    response = ZipStreamResponse(entries, filename='test.zip', chunk_size=1024)
+    archive = await _download(response)
+
+    assert len(archive) == ZipLayout(entries).total_size
+    assert response.headers['content-length'] == str(len(archive))
+    _check(archive, entries)
+
+
+async def test_zip_stream_unknown_crc(tmp_path):
+    entries = _entries(tmp_path, with_crc=False)
+    archive = await _download(ZipStreamResponse(entries, filename='test.zip'))
+
+    assert len(archive) == ZipLayout(entries).total_size
+    _check(archive, entries)
+
+
+async def test_zip_stream_zerocopy(tmp_path):
+    entries = _entries(tmp_path, with_crc=True)
+    response = ZipStreamResponse(entries, filename='test.zip')
+    archive = await _download(response, extensions={'http.response.zerocopysend': {}})
+    _check(archive, entries)
+
+
+def test_zip_stream_zip64_many_files(tmp_path):
+    entries = [
+        ZipEntry(path=tmp_path, arcname=f'{i}.bin', size=0, crc32=0, mtime=0.0)
+        for i in range(0xFFFF + 1)
+    ]
+    layout = ZipLayout(entries)
+
+    # files are empty, so archive consists of headers only
+    archive = b''.join(layout.local_header(i) for i in range(len(entries)))
+    archive += b''.join(layout.central_directory([0] * len(entries)))
+
+    assert layout.is_zip64
+    assert len(archive) == layout.total_size
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert len(zip_file.infolist()) == len(entries)
+
+
+def test_zip_stream_empty():
+    layout = ZipLayout([])
+    assert not layout.is_zip64
+    assert layout.total_size == 22
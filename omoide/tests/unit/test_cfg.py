@@ -0,0 +1,32 @@
+"""Tests."""
+
+import nano_settings as ns
+import pytest
+
+from omoide import cfg
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    monkeypatch.setenv('OMOIDE_APP__DB_URL', 'postgresql://localhost/omoide')
+    monkeypatch.setenv('OMOIDE_APP__DATA_FOLDER', str(tmp_path))
+    return monkeypatch
+
+
+def _load() -> cfg.Config:
+    def _terminate():
+        msg = 'invalid config'
+        raise ValueError(msg)
+
+    return ns.from_env(
+        cfg.Config, env_prefix='omoide_app', output=lambda _: None, _terminate=_terminate
+    )
+
+
+def test_download_backend_is_validated(env):
+    env.setenv('OMOIDE_APP__DOWNLOAD_BACKEND', 'app')
+    assert _load().download_backend == 'app'
+
+    env.setenv('OMOIDE_APP__DOWNLOAD_BACKEND', 'ngnix')
+    with pytest.raises(ValueError, match='invalid config'):
+        _load()
@@ -0,0 +1,110 @@
+"""Tests."""
+
+from datetime import UTC
+from datetime import datetime
+from uuid import uuid4
+
+from PIL import Image
+
+from omoide import models
+from omoide.domain import contact_sheet
+from omoide.workers.parallel.commands import build_contact_sheet
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _item(number: int) -> models.Item:
+    return models.Item(
+        id=number,
+        uuid=uuid4(),
+        parent_uuid=None,
+        owner_uuid=uuid4(),
+        parent_id=None,
+        owner_id=1,
+        number=number,
+        name='',
+        is_collection=False,
+        content_ext='jpg',
+        preview_ext='jpg',
+        thumbnail_ext='jpg',
+        status=models.Status.AVAILABLE,
+        tags=set(),
+        permissions=set(),
+        extras={},
+    )
+
+
+def test_layout_wraps_into_rows():
+    children = [_item(i) for i in range(5)]
+
+    width, height, tiles = contact_sheet.get_layout(children, tile=10, columns=2)
+
+    assert (width, height) == (20, 30)
+    assert [(tile.x, tile.y) for tile in tiles] == [(0, 0), (10, 0), (0, 10), (10, 10), (0, 20)]
+    assert [tile.item_uuid for tile in tiles] == [child.uuid for child in children]
+
+
+def test_layout_of_empty_collection():
+    assert contact_sheet.get_layout([]) == (0, 0, [])
+
+
+def test_source_key_changes_with_children():
+    first, second = _item(1), _item(2)
+
+    key = contact_sheet.get_source_key([(first, NOW), (second, NOW)])
+
+    assert key == contact_sheet.get_source_key([(first, NOW), (second, NOW)])
+    assert key != contact_sheet.get_source_key([(second, NOW), (first, NOW)])
+    assert key != contact_sheet.get_source_key([(first, NOW)])
+    assert key != contact_sheet.get_source_key([(first, NOW), (second, datetime.now(tz=UTC))])
+
+
+def test_sheet_with_hidden_child_is_not_covered():
+    first, second = _item(1), _item(2)
+    _, _, tiles = contact_sheet.get_layout([first, second])
+    sheet = models.ContactSheet(
+        item_id=0,
+        version=1,
+        source_key='',
+        ext='webp',
+        width=0,
+        height=0,
+        tiles=tiles,
+        updated_at=NOW,
+    )
+
+    assert contact_sheet.is_covered(sheet, [(first, NOW), (second, NOW)])
+    assert not contact_sheet.is_covered(sheet, [(first, NOW)])
+
+
+def test_make_contact_sheet(tmp_path):
+    thumbnail = tmp_path / 'thumbnail.jpg'
+    Image.new('RGB', (384, 256), (10, 120, 10)).save(thumbnail)
+    target = tmp_path / 'sheet.webp'
+
+    size = build_contact_sheet.make_contact_sheet(
+        thumbnails=[(thumbnail, '#000000'), (tmp_path / 'missing.jpg', '#ff0000')],
+        target_path=target,
+        width=20,
+        height=10,
+        positions=[(0, 0), (10, 0)],
+        tile=10,
+    )
+
+    assert size == target.stat().st_size
+    with Image.open(target) as sheet:
+        assert sheet.format == 'WEBP'
+        assert sheet.size == (20, 10)
+        red, green, _ = sheet.convert('RGB').getpixel((15, 5))
+        assert red > 200
+        assert green < 50
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith('.')] == []
+
+
+def test_drop_other_versions(tmp_path):
+    for version in (1, 2, 3):
+        (tmp_path / f'{version}.webp').write_bytes(b'sheet')
+
+    build_contact_sheet.drop_other_versions(tmp_path / '2.webp')
+
+    assert [path.name for path in tmp_path.iterdir()] == ['2.webp']
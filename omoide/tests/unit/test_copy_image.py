@@ -0,0 +1,32 @@
+"""Tests."""
+
+from types import SimpleNamespace
+
+from omoide.infra.blob_store import BlobStore
+from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
+from omoide.workers.parallel.commands.copy_image import CopyImageCommand
+
+
+async def test_copy_unpacks_into_missing_folder(tmp_path):
+    packs = PackStore(tmp_path)
+    packs.put('thumbnail', 'owner', 'ab', 'abc.jpg', b'thumbnail')
+    command = CopyImageCommand(
+        dto=SimpleNamespace(id=1),  # type: ignore [arg-type]
+        database=None,  # type: ignore [arg-type]
+        users=None,  # type: ignore [arg-type]
+        items=None,  # type: ignore [arg-type]
+        meta=None,  # type: ignore [arg-type]
+        commands=None,  # type: ignore [arg-type]
+        locator=FilesystemLocator(tmp_path, prefix_size=2),
+        packs=packs,
+        blobs=BlobStore(tmp_path / 'blobs'),
+    )
+    target = tmp_path / 'thumbnail' / 'other' / 'cd' / 'cde.jpg'
+
+    size = await command._copy(tmp_path / 'thumbnail' / 'owner' / 'ab' / 'abc.jpg', target)
+
+    assert size == len(b'thumbnail')
+    assert target.read_bytes() == b'thumbnail'
+    assert [path.name for path in target.parent.iterdir()] == ['cde.jpg']
+    packs.close()
@@ -0,0 +1,70 @@
+"""Tests."""
+
+from datetime import datetime
+
+import pytest
+
+from omoide import models
+from omoide.domain import exif
+
+
+def test_extract_fields_from_worker_output():
+    raw = {
+        'Make': 'SONY\x00',
+        'Model': 'DSC-S600',
+        'Orientation': '6',
+        'DateTime': '2020:01:01 00:00:00',
+        'Exif': {
+            'DateTimeOriginal': '2007:08:10 08:23:29',
+            'ExifImageWidth': '2816',
+            'ExifImageHeight': '2112',
+        },
+        'GPSInfo': {
+            'GPSLatitudeRef': 'N',
+            'GPSLatitude': '(55.0, 45.0, 36.0)',
+            'GPSLongitudeRef': 'W',
+            'GPSLongitude': '(37.0, 30.0, 0.0)',
+        },
+    }
+
+    assert exif.extract_fields(raw) == models.ExifFields(
+        taken_at=datetime(2007, 8, 10, 8, 23, 29),  # noqa: DTZ001
+        camera_make='SONY',
+        camera_model='DSC-S600',
+        width=2816,
+        height=2112,
+        orientation=6,
+        latitude=55.76,
+        longitude=-37.5,
+    )
+
+
+def test_extract_fields_from_garbage():
+    raw = {
+        'Make': {'nested': 'value'},
+        'Orientation': 42,
+        'DateTimeOriginal': '0000:00:00 00:00:00',
+        'ImageWidth': 'nan',
+        'GPSInfo': {'GPSLatitude': '(95.0, 0.0, 0.0)', 'GPSLongitude': 10},
+    }
+
+    assert exif.extract_fields(raw) == models.ExifFields()
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('2007:08:10 08:23:29', datetime(2007, 8, 10, 8, 23, 29)),  # noqa: DTZ001
+        ('2007-08-10 08:23:29.123', datetime(2007, 8, 10, 8, 23, 29)),  # noqa: DTZ001
+        ('2007:08:10 08:23:29+03:00', datetime(2007, 8, 10, 8, 23, 29)),  # noqa: DTZ001
+        ('    :  :     :  :  ', None),
+        (1186734209, None),
+    ],
+)
+def test_parse_datetime(value, expected):
+    assert exif.parse_datetime(value) == expected
+
+
+def test_parse_numbers_understands_rationals():
+    assert exif.parse_numbers('1/4') == [0.25]
+    assert exif.parse_numbers([1, '2.5', (3,)]) == [1.0, 2.5, 3.0]
@@ -0,0 +1,97 @@
+"""Tests."""
+
+import os
+import time
+
+import pytest
+
+from omoide.object_storage.implementations.fs_object_storage import FilesystemObjectStorage
+from omoide.object_storage.implementations.fs_object_storage import remove_stale_temporary_files
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FilesystemObjectStorage(tmp_path / 'staging')
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _broken(*parts: bytes):
+    for part in parts:
+        yield part
+    msg = 'checksum mismatch'
+    raise ValueError(msg)
+
+
+async def _read(storage, oid) -> bytes:
+    return b''.join([chunk async for chunk in storage.read(oid)])
+
+
+async def test_fs_object_storage_write_and_read(storage):
+    reference = await storage.write(_chunks(b'first', b'second'))
+
+    assert await _read(storage, reference['oid']) == b'firstsecond'
+    assert [path.name for path in storage.folder.iterdir()] == [str(reference['oid'])]
+
+
+async def test_fs_object_storage_failed_write_leaves_nothing(storage):
+    with pytest.raises(ValueError, match='checksum'):
+        await storage.write(_broken(b'data'))
+
+    assert list(storage.folder.iterdir()) == []
+
+
+async def test_fs_object_storage_write_at_is_rolled_back(storage):
+    oid = (await storage.create())['oid']
+
+    assert await storage.write_at(oid, 0, _chunks(b'1234')) == 4
+    with pytest.raises(ValueError, match='checksum'):
+        await storage.write_at(oid, 4, _broken(b'5678'))
+    assert await storage.write_at(oid, 4, _chunks(b'56')) == 2
+
+    assert await _read(storage, oid) == b'123456'
+
+
+async def test_fs_object_storage_hand_off(tmp_path, storage):
+    oid = (await storage.write(_chunks(b'image')))['oid']
+    target = tmp_path / 'content' / 'a.jpg'
+    target.parent.mkdir()
+
+    assert await storage.hand_off(oid, target)
+    assert target.samefile(storage.get_path(oid))
+
+    await storage.delete(oid)
+    await storage.delete(oid)
+
+    assert target.read_bytes() == b'image'
+    assert list(storage.folder.iterdir()) == []
+
+
+async def test_fs_object_storage_follows_umask(storage):
+    umask = os.umask(0o022)
+    try:
+        oid = (await storage.create())['oid']
+    finally:
+        os.umask(umask)
+
+    assert storage.get_path(oid).stat().st_mode & 0o777 == 0o644
+
+
+def test_remove_stale_temporary_files(tmp_path):
+    stale = tmp_path / '.1.tmp'
+    fresh = tmp_path / '.2.tmp'
+    content = tmp_path / '3'
+    for path in (stale, fresh, content):
+        path.write_bytes(b'data')
+    hour_ago = time.time() - 3600
+    os.utime(stale, (hour_ago, hour_ago))
+    os.utime(content, (hour_ago, hour_ago))
+
+    assert remove_stale_temporary_files(tmp_path, 60, dry_run=True) == [stale]
+    assert stale.exists()
+
+    assert remove_stale_temporary_files(tmp_path, 60, dry_run=False) == [stale]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['.2.tmp', '3']
@@ -0,0 +1,98 @@
+"""Tests."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from omoide import const
+from omoide import exceptions
+from omoide import models
+from omoide.infra.ttl_cache import TTLCache
+from omoide.omoide_app.media import media_controllers
+from omoide.omoide_app.media.media_use_cases import MediaAccess
+from omoide.omoide_app.media.media_use_cases import MediaResult
+from omoide.omoide_app.media.media_use_cases import ServeMediaUseCase
+
+
+def _config(tmp_path: Path) -> SimpleNamespace:
+    return SimpleNamespace(
+        data_folder=tmp_path, media_backend='nginx', media_internal_location='/x'
+    )
+
+
+def test_unversioned_media_is_revalidated(tmp_path):
+    path = tmp_path / 'thumbnail' / 'owner' / 'ab' / 'abc.jpg'
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'first')
+    result = MediaResult(
+        relative_path=path.relative_to(tmp_path),
+        etag=None,
+        is_public=True,
+        is_negotiated=False,
+    )
+    config = _config(tmp_path)
+
+    response = media_controllers.make_response(result, config, None)  # type: ignore [arg-type]
+    etag = response.headers['ETag']
+
+    assert 'immutable' not in response.headers['Cache-Control']
+    assert media_controllers.make_response(result, config, etag).status_code == 304  # type: ignore [arg-type]
+
+    path.write_bytes(b'second version')
+    response = media_controllers.make_response(result, config, etag)  # type: ignore [arg-type]
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_versioned_media_is_immutable(tmp_path):
+    result = MediaResult(
+        relative_path=Path('contact_sheet/owner/ab/abc/1.webp'),
+        etag='"abc-sheet-1"',
+        is_public=False,
+        is_negotiated=False,
+        is_versioned=True,
+    )
+
+    response = media_controllers.make_response(result, _config(tmp_path), None)  # type: ignore [arg-type]
+
+    assert response.headers['Cache-Control'].startswith('private, ')
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+@pytest.mark.parametrize('animated_preview_size', [None, 5000])
+async def test_animated_preview_is_served_only_if_created(animated_preview_size):
+    item_uuid = uuid4()
+    owner_uuid = uuid4()
+    cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+    cache.set(
+        item_uuid,
+        MediaAccess(
+            owner_id=1,
+            owner_uuid=owner_uuid,
+            owner_is_public=True,
+            permissions=frozenset(),
+            extensions={const.MediaType.PREVIEW: 'jpg'},
+            sizes={const.MediaType.PREVIEW: 1000},
+            renditions={const.MediaType.PREVIEW: {'webp': 600}},
+            widths={},
+            animated_preview_size=animated_preview_size,
+            crc32=None,
+        ),
+    )
+    use_case = ServeMediaUseCase(None, None, None, None, None, cache)  # type: ignore [arg-type]
+    filename = f'{item_uuid}.{const.ANIMATED_PREVIEW_EXT}'
+    prefix = str(item_uuid)[:2]
+    user = models.User.new_anon()
+
+    if animated_preview_size is None:
+        with pytest.raises(exceptions.DoesNotExistError):
+            await use_case.execute(user, const.MediaType.PREVIEW, owner_uuid, prefix, filename)
+        return
+
+    result = await use_case.execute(
+        user, const.MediaType.PREVIEW, owner_uuid, prefix, filename, accept='image/webp'
+    )
+    assert result.relative_path.name == filename
+    assert not result.is_negotiated
@@ -2,8 +2,10 @@
 
 from collections.abc import Collection
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Any
 from typing import Self
+from uuid import uuid4
 
 from omoide import models
 
@@ -72,3 +74,38 @@ def test_changes_mixin_reset():
     obj.reset_changes()
     assert not obj.what_changed()
     assert not obj.get_changes()
+
+
+def test_item_from_obj_keeps_counters():
+    # arrange
+    obj = SimpleNamespace(
+        id=1,
+        uuid=uuid4(),
+        parent_id=None,
+        parent_uuid=None,
+        owner_id=2,
+        owner_uuid=uuid4(),
+        name='test',
+        number=3,
+        is_collection=True,
+        content_ext=None,
+        preview_ext=None,
+        thumbnail_ext='jpg',
+        status=0,
+        tags=['a'],
+        permissions=[4],
+        children_count=5,
+        descendants_count=7,
+    )
+
+    # act
+    item = models.Item.from_obj(obj)
+    item.children_count = 6
+
+    # assert
+    assert item.uuid == obj.uuid
+    assert item.status is models.Status.AVAILABLE
+    assert item.tags == {'a'}
+    assert item.children_count == 6
+    assert item.descendants_count == 7
+    assert not item.get_changes()
@@ -0,0 +1,131 @@
+"""Tests."""
+
+from omoide import models
+from omoide.domain import search_planner
+from omoide.domain.search_index import IndexEntry
+from omoide.domain.search_index import SearchIndex
+
+
+def _plan(**kwargs) -> models.Plan:
+    values = {
+        'query': '',
+        'tags_include': set(),
+        'tags_exclude': set(),
+        'order': 'asc',
+        'collections': False,
+        'direct': False,
+        'last_seen': None,
+        'limit': 30,
+    }
+    values.update(kwargs)
+    return models.Plan(**values)
+
+
+def _user(user_id: int) -> models.User:
+    user = models.User.new_anon()
+    user.id = user_id
+    user.role = models.Role.USER
+    return user
+
+
+def _entry(
+    item_id: int,
+    number: int,
+    owner_id: int,
+    tags: tuple[str, ...],
+    *,
+    permissions: tuple[int, ...] = (),
+    is_collection: bool = False,
+) -> IndexEntry:
+    return IndexEntry(item_id, number, owner_id, permissions, is_collection, tags)
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.set_public_users({1})
+    index.add(_entry(1, 30, 1, ('cats', 'red'), is_collection=True))
+    index.add(_entry(2, 20, 1, ('cats', 'blue')))
+    index.add(_entry(3, 10, 1, ('dogs', 'red')))
+    index.add(_entry(4, 40, 2, ('cats', 'red'), permissions=(3,)))
+    return index
+
+
+def _search(index: SearchIndex, user: models.User, plan: models.Plan) -> list[int]:
+    visible = index.get_visible(user)
+    expansions = {
+        prefix: index.get_expansions(prefix, visible, 10)
+        for prefix in search_planner.get_prefixes(plan)
+    }
+    counters = index.get_counters(search_planner.get_tags(plan, expansions), visible)
+    query_plan = search_planner.make_plan(plan, counters, expansions, len(visible))
+    return index.paginate(index.match(user, plan, query_plan), plan)
+
+
+def test_search_index_respects_visibility():
+    index = _index()
+    plan = _plan(tags_include={'cats'})
+
+    assert _search(index, models.User.new_anon(), plan) == [2, 1]
+    assert _search(index, _user(2), plan) == [4]
+    assert _search(index, _user(3), plan) == [4]
+    assert _search(index, _user(5), plan) == []
+
+
+def test_search_index_include_exclude_and_any():
+    index = _index()
+    anon = models.User.new_anon()
+
+    assert _search(index, anon, _plan(tags_include={'red'}, tags_exclude={'dogs'})) == [1]
+    assert _search(index, anon, _plan(tags_any=[{'blue', 'dogs'}])) == [3, 2]
+    assert _search(index, anon, _plan(tags_include={'c*'}, order='desc')) == [1, 2]
+    assert _search(index, anon, _plan(tags_include={'cats'}, collections=True)) == [1]
+    assert _search(index, anon, _plan(order='desc', last_seen=30, limit=1)) == [2]
+
+
+def test_search_index_updates_items():
+    index = _index()
+    anon = models.User.new_anon()
+
+    index.add(_entry(3, 10, 1, ('cats',)))
+    index.remove(2)
+
+    assert _search(index, anon, _plan(tags_include={'cats'})) == [3, 1]
+    assert 'blue' not in index.tags
+    assert 'dogs' not in index.tags
+
+    index.set_public_users({2})
+    assert _search(index, anon, _plan(tags_include={'cats'})) == [4]
+
+
+def test_search_index_add_many_matches_add():
+    one_by_one = _index()
+    batched = SearchIndex()
+    batched.set_public_users({1})
+    entries = [
+        _entry(1, 30, 1, ('cats', 'red'), is_collection=True),
+        _entry(2, 20, 1, ('cats', 'blue')),
+        _entry(3, 10, 1, ('dogs', 'red')),
+        _entry(4, 40, 2, ('cats', 'red'), permissions=(3,)),
+    ]
+    batched.add_many(entries)
+    batched.add_many([_entry(2, 20, 1, ('cats', 'blue'))])
+
+    assert len(batched) == len(one_by_one)
+    assert batched.tags == one_by_one.tags
+    assert batched.owners == one_by_one.owners
+    assert batched.shared == one_by_one.shared
+    assert batched.collections == one_by_one.collections
+
+
+def test_search_index_facets():
+    index = _index()
+    index.add(_entry(5, 50, 1, ('cats', 'red', '0b8e2f7a-3c1d-4e5f-9a6b-7c8d9e0f1a2b')))
+    anon = models.User.new_anon()
+    plan = _plan(tags_include={'cats'})
+    query_plan = search_planner.make_plan(plan, {'cats': 3}, {}, 4)
+
+    matches = index.match(anon, plan, query_plan)
+    facets = index.get_facets(matches, limit=10, fraction=None, skip={'cats'})
+
+    assert facets == [('red', 2), ('blue', 1)]
+    assert index.get_facets(matches, limit=1, fraction=None, skip={'cats'}) == [('red', 2)]
@@ -0,0 +1,77 @@
+"""Tests."""
+
+from omoide import models
+from omoide.domain import search_planner
+
+
+def _plan(**kwargs) -> models.Plan:
+    values = {
+        'query': '',
+        'tags_include': set(),
+        'tags_exclude': set(),
+        'order': 'desc',
+        'collections': False,
+        'direct': False,
+        'last_seen': None,
+        'limit': 30,
+    }
+    values.update(kwargs)
+    return models.Plan(**values)
+
+
+def test_planner_orders_predicates_by_selectivity():
+    plan = _plan(tags_include={'cats', 'rare'}, tags_any=[{'red', 'blue'}])
+    counters = {'cats': 900, 'rare': 3, 'red': 10, 'blue': 20}
+
+    query_plan = search_planner.make_plan(plan, counters, {}, total=1000)
+
+    assert query_plan.strategy is search_planner.Strategy.TAGS_INDEX
+    assert [p.tags for p in query_plan.include] == [('rare',), ('blue', 'red'), ('cats',)]
+    assert query_plan.estimate == 3
+
+
+def test_planner_short_circuits_unknown_tags():
+    plan = _plan(tags_include={'cats', 'unknown'})
+
+    query_plan = search_planner.make_plan(plan, {'cats': 10}, {}, total=1000)
+
+    assert query_plan.is_empty
+    assert query_plan.estimate == 0
+
+
+def test_planner_prefers_ordered_scan_for_frequent_tags():
+    plan = _plan(tags_include={'photo'}, tags_exclude={'video'})
+
+    query_plan = search_planner.make_plan(plan, {'photo': 90_000}, {}, total=100_000)
+    assert query_plan.strategy is search_planner.Strategy.ORDERED_SCAN
+
+    random_plan = _plan(tags_include={'photo'}, order='random')
+    query_plan = search_planner.make_plan(random_plan, {'photo': 90_000}, {}, total=100_000)
+    assert query_plan.strategy is search_planner.Strategy.TAGS_INDEX
+
+
+def test_planner_expands_prefixes():
+    plan = _plan(tags_include={'cat*'}, tags_exclude={'dog*'})
+    assert search_planner.get_prefixes(plan) == {'cat', 'dog'}
+
+    expansions = {'cat': ['cat', 'cats'], 'dog': ['dogs']}
+    assert search_planner.get_tags(plan, expansions) == {'cat', 'cats', 'dogs'}
+
+    query_plan = search_planner.make_plan(plan, {'cat': 1, 'cats': 2}, expansions, total=100)
+    assert [(p.kind, p.tags, p.estimate) for p in query_plan.include] == [
+        ('any', ('cat', 'cats'), 3)
+    ]
+    assert query_plan.exclude == ('dogs',)
+
+    query_plan = search_planner.make_plan(plan, {}, {}, total=100)
+    assert query_plan.is_empty
+
+
+def test_normalize_query_ignores_tag_order():
+    left = _plan(tags_include={'a', 'b'}, tags_any=[{'x', 'y'}, {'z'}])
+    right = _plan(tags_include={'b', 'a'}, tags_any=[{'z'}, {'y', 'x'}], order='random')
+
+    assert search_planner.normalize_query(left) == search_planner.normalize_query(right)
+    assert search_planner.normalize_query(left) != search_planner.normalize_query(
+        _plan(tags_include={'a', 'b'}, tags_any=[{'x', 'y'}, {'z'}], collections=True)
+    )
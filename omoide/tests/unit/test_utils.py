@@ -23,3 +23,12 @@ def test_looks_like_uuid():
     """Must separate UUID from random strings."""
     assert utils.looks_like_uuid('fb6a8840-d6a8-4ab4-9555-be67917c8717')
     assert not utils.looks_like_uuid('hello world')
+
+
+def test_parse_tags():
+    """Must split query into include, exclude and alternatives."""
+    include, exclude, groups = utils.parse_tags('Cats + dogs | frogs - mice | rats + new \\- york')
+
+    assert include == {'cats', 'new - york'}
+    assert exclude == {'mice', 'rats'}
+    assert groups == [{'dogs', 'frogs'}]
@@ -0,0 +1,94 @@
+"""Tests."""
+
+import subprocess
+
+import pytest
+
+from omoide.workers.parallel import video
+
+FFMPEG_OUTPUT = """
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'clip.mp4':
+  Metadata:
+    major_brand     : isom
+  Duration: 00:01:05.50, start: 0.000000, bitrate: 1205 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(progressive), 1280x720 [SAR 1:1 DAR 16:9], 1072 kb/s, 29.97 fps, 29.97 tbr, 30k tbn (default)
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, stereo, fltp, 128 kb/s (default)
+At least one output file must be specified
+"""  # noqa: E501
+
+
+def test_parse_info():
+    assert video.parse_info(FFMPEG_OUTPUT) == video.VideoInfo(
+        duration=65.5,
+        codec='h264',
+        fps=29.97,
+        width=1280,
+        height=720,
+    )
+
+
+def test_parse_info_without_video_stream():
+    assert video.parse_info('Duration: N/A, bitrate: N/A') == video.VideoInfo()
+
+
+def test_probe_timeout(monkeypatch, tmp_path):
+    def _run(arguments, timeout):
+        raise subprocess.TimeoutExpired(arguments, timeout)
+
+    monkeypatch.setattr(video, '_run', _run)
+
+    with pytest.raises(video.VideoError, match='Timed out'):
+        video.probe(tmp_path / 'clip.mp4', timeout=0.1)
+
+
+@pytest.fixture
+def clip(tmp_path):
+    """Two seconds of black followed by two seconds of test pattern."""
+    path = tmp_path / 'clip.mp4'
+    try:
+        ffmpeg = video.get_ffmpeg()
+    except Exception:  # noqa: BLE001
+        pytest.skip('ffmpeg is not available')
+
+    subprocess.run(  # noqa: S603
+        [
+            ffmpeg,
+            '-hide_banner',
+            '-loglevel',
+            'error',
+            '-f',
+            'lavfi',
+            '-i',
+            'color=black:size=160x120:rate=10:duration=2',
+            '-f',
+            'lavfi',
+            '-i',
+            'testsrc=size=160x120:rate=10:duration=2',
+            '-filter_complex',
+            '[0:v][1:v]concat=n=2:v=1[v]',
+            '-map',
+            '[v]',
+            '-pix_fmt',
+            'yuv420p',
+            str(path),
+        ],
+        check=True,
+        timeout=60,
+    )
+    return path
+
+
+def test_poster_skips_black_frames(clip, tmp_path):
+    info = video.probe(clip)
+
+    assert info.codec is not None
+    assert info.duration == pytest.approx(4.0, abs=0.2)
+    assert (info.width, info.height) == (160, 120)
+
+    with video.extract_poster(clip, info.duration) as poster:
+        assert video.is_representative(poster)
+        assert poster.size == (160, 120)
+
+    output = tmp_path / 'preview.webp'
+    assert video.make_animated_preview(clip, output, info.duration, width=80)
+    assert output.stat().st_size > 0
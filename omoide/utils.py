@@ -78,35 +78,44 @@ def serialize(payload: dict[str, Any]) -> dict[str, str | None]:
 
 
 TAGS_PATTERN = re.compile(r'(\s+\+\s+|\s+-\s+)')
+OR_PATTERN = re.compile(r'\s+\|\s+')
 
 
-def parse_tags(query: str) -> tuple[set[str], set[str]]:
-    """Split  user query into tags."""
+def parse_tags(query: str) -> tuple[set[str], set[str], list[set[str]]]:
+    """Split  user query into tags.
+
+    Returns tags to include, tags to exclude and groups of tags where
+    at least one must be present. Groups are written as `cats | dogs`.
+    """
     tags_include: set[str] = set()
     tags_exclude: set[str] = set()
+    tags_any: list[set[str]] = []
 
     parts = TAGS_PATTERN.split(query)
     clean_parts = [x.strip() for x in parts if x.strip()]
 
     if not clean_parts:
-        return tags_include, tags_exclude
+        return tags_include, tags_exclude, tags_any
 
     if clean_parts[0] not in ('+', '-'):
         clean_parts.insert(0, '+')
 
     for operator, tag in group_to_size(clean_parts):
-        _tag = str(tag).lower()
-        if operator == '+':
-            tags_include.add(_tag)
+        # Symbol `-` sometimes used in item names
+        # and should not be treated as minus
+        variants = {
+            x.strip().lower().replace(' \\- ', ' - ')
+            for x in OR_PATTERN.split(str(tag))
+            if x.strip()
+        }
+        if operator == '-':
+            tags_exclude.update(variants)
+        elif len(variants) > 1:
+            tags_any.append(variants)
         else:
-            tags_exclude.add(_tag)
-
-    # Symbol `-` sometimes used in item names
-    # and should not be treated as minus
-    return (
-        {x.replace(' \\- ', ' - ') for x in tags_include},
-        {x.replace(' \\- ', ' - ') for x in tags_exclude},
-    )
+            tags_include.update(variants)
+
+    return tags_include, tags_exclude, tags_any
 
 
 def get_content_path(
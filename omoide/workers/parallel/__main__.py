@@ -2,6 +2,7 @@
 
 import asyncio
 from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 import threading
 import time
 from typing import assert_never
@@ -14,7 +15,12 @@ from omoide import custom_logging
 from omoide.database.implementations import impl_sqlalchemy
 from omoide.infra.implementations.pg_advisory_lock import PGAdvisoryLock
 from omoide.const import LockableResource
+from omoide.infra.blob_store import BlobStore
 from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
+from omoide.object_storage.implementations.fs_object_storage import (
+    FilesystemObjectStorage,
+)
 from omoide.object_storage.implementations.pgl_object_storage import (
     PgLargeObjectStorage,
 )
@@ -70,13 +76,25 @@ async def main() -> None:
     meta_repo = impl_sqlalchemy.MetaRepo()
     exif_repo = impl_sqlalchemy.EXIFRepo()
     signatures_repo = impl_sqlalchemy.SignaturesRepo()
+    contact_sheets_repo = impl_sqlalchemy.ContactSheetsRepo()
+    commands_repo = impl_sqlalchemy.CommandsRepo()
 
     fs_locator = FilesystemLocator(
         root=config.data_folder,
         prefix_size=config.prefix_size,
     )
 
-    object_storage = PgLargeObjectStorage(db)
+    object_storage: AbsObjectStorage
+    if config.upload_backend == 'filesystem':
+        object_storage = FilesystemObjectStorage(
+            Path(config.staging_folder)
+            if config.staging_folder
+            else config.data_folder / const.STAGING_FOLDER
+        )
+    else:
+        object_storage = PgLargeObjectStorage(db)
+    pack_store = PackStore(config.data_folder / const.PACKS_FOLDER)
+    blob_store = BlobStore(config.data_folder / const.BLOBS_FOLDER)
 
     with executor, metrics_collector:
         async with db, lock:
@@ -93,8 +111,12 @@ async def main() -> None:
                         meta_repo=meta_repo,
                         exif_repo=exif_repo,
                         signatures_repo=signatures_repo,
+                        contact_sheets_repo=contact_sheets_repo,
+                        commands_repo=commands_repo,
                         fs_locator=fs_locator,
                         object_storage=object_storage,
+                        pack_store=pack_store,
+                        blob_store=blob_store,
                     )
 
                     if not did_something:
@@ -129,8 +151,12 @@ async def do_work(
     meta_repo: db_interfaces.AbsMetaRepo,
     exif_repo: db_interfaces.AbsEXIFRepo,
     signatures_repo: db_interfaces.AbsSignaturesRepo,
+    contact_sheets_repo: db_interfaces.AbsContactSheetsRepo,
+    commands_repo: db_interfaces.AbsCommandsRepo,
     fs_locator: FilesystemLocator,
     object_storage: AbsObjectStorage,
+    pack_store: PackStore,
+    blob_store: BlobStore,
 ) -> bool:
     """Perform workload."""
     candidates = await database.get_parallel_commands(
@@ -155,8 +181,12 @@ async def do_work(
                     meta_repo=meta_repo,
                     exif_repo=exif_repo,
                     signatures_repo=signatures_repo,
+                    contact_sheets_repo=contact_sheets_repo,
+                    commands_repo=commands_repo,
                     fs_locator=fs_locator,
                     object_storage=object_storage,
+                    pack_store=pack_store,
+                    blob_store=blob_store,
                 )
             )
 
@@ -174,8 +204,12 @@ async def process_one(
     meta_repo: db_interfaces.AbsMetaRepo,
     exif_repo: db_interfaces.AbsEXIFRepo,
     signatures_repo: db_interfaces.AbsSignaturesRepo,
+    contact_sheets_repo: db_interfaces.AbsContactSheetsRepo,
+    commands_repo: db_interfaces.AbsCommandsRepo,
     fs_locator: FilesystemLocator,
     object_storage: AbsObjectStorage,
+    pack_store: PackStore,
+    blob_store: BlobStore,
 ) -> None:
     """Process one command."""
     try:
@@ -190,8 +224,12 @@ async def process_one(
             meta_repo=meta_repo,
             exif_repo=exif_repo,
             signatures_repo=signatures_repo,
+            contact_sheets_repo=contact_sheets_repo,
+            commands_repo=commands_repo,
             fs_locator=fs_locator,
             object_storage=object_storage,
+            pack_store=pack_store,
+            blob_store=blob_store,
         )
     except Exception:
         LOG.exception('Command {} failed', command.id)
@@ -213,8 +251,12 @@ async def _process_one(
     meta_repo: db_interfaces.AbsMetaRepo,
     exif_repo: db_interfaces.AbsEXIFRepo,
     signatures_repo: db_interfaces.AbsSignaturesRepo,
+    contact_sheets_repo: db_interfaces.AbsContactSheetsRepo,
+    commands_repo: db_interfaces.AbsCommandsRepo,
     fs_locator: FilesystemLocator,
     object_storage: AbsObjectStorage,
+    pack_store: PackStore,
+    blob_store: BlobStore,
 ) -> None:
     """Process one command."""
     command_implementation: Command
@@ -230,6 +272,7 @@ async def _process_one(
                 users=users_repo,
                 items=items_repo,
                 locator=fs_locator,
+                packs=pack_store,
             )
 
         case models.Command.SOFT_DELETE:
@@ -248,7 +291,10 @@ async def _process_one(
                 users=users_repo,
                 items=items_repo,
                 meta=meta_repo,
+                commands=commands_repo,
                 locator=fs_locator,
+                packs=pack_store,
+                blobs=blob_store,
             )
 
         case models.Command.UPLOAD:
@@ -263,6 +309,20 @@ async def _process_one(
                 locator=fs_locator,
                 executor=executor,
                 object_storage=object_storage,
+                packs=pack_store,
+                blobs=blob_store,
+            )
+
+        case models.Command.BUILD_CONTACT_SHEET:
+            command_implementation = commands.BuildContactSheetCommand(
+                dto=command,
+                database=database,
+                users=users_repo,
+                items=items_repo,
+                contact_sheets=contact_sheets_repo,
+                locator=fs_locator,
+                executor=executor,
+                packs=pack_store,
             )
 
         case _:
@@ -28,4 +28,7 @@ class ParallelWorkerConfig(ns.BaseConfig):
     workers: int = 0
     max_workers: int = 5
     prefix_size: int = 2
+    # same as in application config
+    upload_backend: str = 'database'
+    staging_folder: str = ''
     shutdown_deadline: float = 300.0
@@ -13,3 +13,6 @@ from omoide.workers.parallel.commands.copy_image import (
 from omoide.workers.parallel.commands.upload import (
     UploadCommand,  # noqa: F401
 )
+from omoide.workers.parallel.commands.build_contact_sheet import (
+    BuildContactSheetCommand,  # noqa: F401
+)
@@ -0,0 +1,209 @@
+"""Build single sprite with thumbnails of the collection children."""
+
+import asyncio
+import io
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import aiofiles.os
+import python_utilz as pu
+from PIL import Image
+from PIL import ImageOps
+
+from omoide import const
+from omoide import custom_logging
+from omoide import models
+from omoide.database import interfaces as db_interfaces
+from omoide.domain import contact_sheet
+from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
+from omoide.models import ParallelCommand
+from omoide.workers.parallel.commands.base_command import Command
+from omoide.workers.parallel.database import ParallelPostgreSQLDatabase
+
+LOG = custom_logging.get_logger(__name__)
+
+# shown in place of thumbnails that could not be read
+EMPTY_TILE_COLOR = '#202020'
+
+
+class BuildContactSheetCommand(Command):
+    """Build single sprite with thumbnails of the collection children."""
+
+    def __init__(
+        self,
+        dto: ParallelCommand,
+        database: ParallelPostgreSQLDatabase,
+        users: db_interfaces.AbsUsersRepo,
+        items: db_interfaces.AbsItemsRepo,
+        contact_sheets: db_interfaces.AbsContactSheetsRepo,
+        locator: FilesystemLocator,
+        executor: ProcessPoolExecutor,
+        packs: PackStore,
+    ) -> None:
+        """Initialize instance."""
+        super().__init__(dto)
+        self.database = database
+        self.users = users
+        self.items = items
+        self.contact_sheets = contact_sheets
+        self.locator = locator
+        self.executor = executor
+        self.packs = packs
+
+    def get_required_resources(self) -> list[const.LockableResource]:
+        """Return resources to lock before execution."""
+        return [
+            const.LockableResource(const.LockNamespace.ITEMS, self.dto.item_id)
+        ]
+
+    async def execute(self) -> int:
+        """Start execution of the command."""
+        async with self.database.transaction() as conn:
+            item = await self.items.get_by_id(conn, self.dto.item_id)
+            owner = await self.users.get_by_id(conn, item.owner_id)
+            old_sheet = await self.contact_sheets.get_by_item(conn, item)
+            source = await self.contact_sheets.get_source(
+                conn, item, limit=const.CONTACT_SHEET_SIZE
+            )
+
+        source_key = contact_sheet.get_source_key(source)
+        if old_sheet is not None and old_sheet.source_key == source_key:
+            LOG.debug(
+                '[{}] Contact sheet of {} is up to date',
+                self.dto.id,
+                item.uuid,
+            )
+            return 0
+
+        version = old_sheet.version + 1 if old_sheet else 1
+        children = [child for child, _ in source]
+        width, height, tiles = contact_sheet.get_layout(children)
+        thumbnails = [
+            (
+                await self._get_thumbnail(owner, child),
+                child.extras.get('dominant_color') or EMPTY_TILE_COLOR,
+            )
+            for child in children
+        ]
+
+        path = self.locator.get_contact_sheet_path(owner, item, version)
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+
+        total_size = 0
+        if tiles:
+            loop = asyncio.get_running_loop()
+            total_size = await loop.run_in_executor(
+                self.executor,
+                make_contact_sheet,
+                thumbnails,
+                path,
+                width,
+                height,
+                [(tile.x, tile.y) for tile in tiles],
+            )
+            LOG.debug(
+                '[{}] Saved contact sheet of {} with {} tiles: {}',
+                self.dto.id,
+                item.uuid,
+                len(tiles),
+                path,
+            )
+
+        try:
+            async with self.database.transaction() as conn:
+                await self.contact_sheets.save(
+                    conn,
+                    models.ContactSheet(
+                        item_id=item.id,
+                        version=version,
+                        source_key=source_key,
+                        ext=const.CONTACT_SHEET_EXT,
+                        width=width,
+                        height=height,
+                        tiles=tiles,
+                        updated_at=pu.now(),
+                    ),
+                )
+        except Exception:
+            if tiles:
+                await aiofiles.os.unlink(path)
+            raise
+
+        # previous version is not referenced by the database anymore
+        await asyncio.to_thread(drop_other_versions, path)
+        return total_size
+
+    async def _get_thumbnail(
+        self,
+        owner: models.User,
+        child: models.Item,
+    ) -> Path | bytes | None:
+        """Return path to the thumbnail or its content if it is packed."""
+        path = self.locator.get_path(owner, child, const.MediaType.THUMBNAIL)
+
+        if path is None or await aiofiles.os.path.exists(path):
+            return path
+
+        return await asyncio.to_thread(
+            self.packs.read_relative, path.relative_to(self.locator.root)
+        )
+
+
+def make_contact_sheet(
+    thumbnails: list[tuple[Path | bytes | None, str]],
+    target_path: Path,
+    width: int,
+    height: int,
+    positions: list[tuple[int, int]],
+    tile: int = const.CONTACT_SHEET_TILE,
+    quality: int = const.IMAGE_QUALITY,
+) -> int:
+    """Paste square crops of thumbnails into one image, return its size."""
+    sheet = Image.new('RGB', (width, height), EMPTY_TILE_COLOR)
+
+    for (source, color), position in zip(thumbnails, positions, strict=True):
+        square = _get_square(source, tile) or Image.new(
+            'RGB', (tile, tile), color
+        )
+        sheet.paste(square, position)
+        square.close()
+
+    # readers must never see half-written file
+    tmp_path = target_path.with_name(f'.{uuid.uuid4().hex}.tmp')
+    try:
+        sheet.save(
+            tmp_path, format=target_path.suffix.lstrip('.'), quality=quality
+        )
+        size = tmp_path.stat().st_size
+        tmp_path.replace(target_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        sheet.close()
+
+    return size
+
+
+def drop_other_versions(path: Path) -> None:
+    """Remove every version of the contact sheet except given one."""
+    for other in path.parent.iterdir():
+        if other != path:
+            other.unlink(missing_ok=True)
+
+
+def _get_square(source: Path | bytes | None, tile: int) -> Image.Image | None:
+    """Return centered square crop of the thumbnail."""
+    if source is None:
+        return None
+
+    name = '<packed>' if isinstance(source, bytes) else source
+    try:
+        with Image.open(
+            io.BytesIO(source) if isinstance(source, bytes) else source
+        ) as img:
+            img.draft('RGB', (tile, tile))
+            return ImageOps.fit(img.convert('RGB'), (tile, tile))
+    except OSError:
+        LOG.warning('Failed to read thumbnail for contact sheet: {}', name)
+        return None
@@ -1,15 +1,20 @@
 """Copy image between items."""
 
-import shutil
+import asyncio
+from pathlib import Path
+import uuid
 from typing import assert_never
 
 import aiofiles
+import aiofiles.os
 
 from omoide import const
 from omoide import custom_logging
-from aiofiles.os import wrap
+from omoide import models
 from omoide.database import interfaces as db_interfaces
+from omoide.infra.blob_store import BlobStore
 from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
 from omoide.workers.parallel.commands.base_command import Command
 from omoide.workers.parallel.database import ParallelPostgreSQLDatabase
 from omoide.models import ParallelCommand
@@ -27,7 +32,10 @@ class CopyImageCommand(Command):
         users: db_interfaces.AbsUsersRepo,
         items: db_interfaces.AbsItemsRepo,
         meta: db_interfaces.AbsMetaRepo,
+        commands: db_interfaces.AbsCommandsRepo,
         locator: FilesystemLocator,
+        packs: PackStore,
+        blobs: BlobStore,
     ) -> None:
         """Initialize instance."""
         super().__init__(dto)
@@ -35,7 +43,10 @@ class CopyImageCommand(Command):
         self.users = users
         self.items = items
         self.meta = meta
+        self.commands = commands
         self.locator = locator
+        self.packs = packs
+        self.blobs = blobs
 
     def get_required_resources(self) -> list[const.LockableResource]:
         """Return resources to lock before execution."""
@@ -49,7 +60,46 @@ class CopyImageCommand(Command):
         ]
 
     async def execute(self) -> int:
-        """Start execution of the command."""
+        """Start execution of the command.
+
+        Target could have its own copy of the content, then it is
+        processed as a regular upload if the source is gone.
+        """
+        fallback = self.dto.extras.get('fallback')
+
+        try:
+            return await self._copy_all()
+        except Exception:
+            if fallback is None or self.dto.oid is None:
+                raise
+            LOG.warning(
+                '[{}] Failed to copy item {}, processing upload {} instead',
+                self.dto.id,
+                self.dto.source_item_id,
+                self.dto.oid,
+            )
+
+        async with self.database.transaction() as conn:
+            requested_by = await self.users.get_by_id(
+                conn, self.dto.requested_by
+            )
+            target_item = await self.items.get_by_id(
+                conn, self.dto.target_item_id
+            )
+            await self.commands.upload(
+                conn=conn,
+                requested_by=requested_by,
+                item=target_item,
+                content_type=fallback['content_type'],
+                ext=fallback['ext'],
+                oid=self.dto.oid,
+                extras=fallback['extras'],
+            )
+
+        return 0
+
+    async def _copy_all(self) -> int:
+        """Copy all files of the source item, return their size."""
         source_item_id = self.dto.source_item_id
         target_item_id = self.dto.target_item_id
         including_content = bool(self.dto.extras.get('including_content'))
@@ -66,7 +116,6 @@ class CopyImageCommand(Command):
                 conn, target_item.owner_id
             )
 
-        async_copyfile = wrap(shutil.copyfile)
         media_types = [const.MediaType.PREVIEW, const.MediaType.THUMBNAIL]
 
         if including_content:
@@ -111,22 +160,27 @@ class CopyImageCommand(Command):
                 / new_filename
             )
 
-            await async_copyfile(
-                src=source_path,
-                dst=target_path,
-            )
-            LOG.debug(
-                '[{}] Copied file: {} to {}',
-                self.dto.id,
-                source_path,
-                target_path,
-            )
+            size = await self._copy(source_path, target_path)
+            if size is None:
+                msg = f'File {source_path} does not exist'
+                raise FileNotFoundError(msg)
+
+            total_size += size
 
-            total_size += await aiofiles.os.path.getsize(source_path)
+        extra_paths = zip(
+            self.locator.get_extra_paths(source_owner, source_item),
+            self.locator.get_extra_paths(target_owner, target_item),
+            strict=True,
+        )
+
+        for source_path, target_path in extra_paths:
+            total_size += await self._copy(source_path, target_path) or 0
 
         async with self.database.transaction() as conn:
             if including_content or including_video:
+                # target was waiting for the same content to be uploaded
                 target_item.content_ext = source_item.content_ext
+                target_item.status = models.Status.AVAILABLE
             target_item.preview_ext = source_item.preview_ext
             target_item.thumbnail_ext = source_item.thumbnail_ext
             await self.items.save(conn, target_item)
@@ -134,7 +188,8 @@ class CopyImageCommand(Command):
             source_metainfo = await self.meta.get_by_item(conn, source_item)
             target_metainfo = await self.meta.get_by_item(conn, target_item)
             target_metainfo.copy_from(
-                source_metainfo, including_content=including_content
+                source_metainfo,
+                including_content=including_content or including_video,
             )
 
             await self.meta.save(conn, target_metainfo)
@@ -146,3 +201,49 @@ class CopyImageCommand(Command):
             )
 
         return total_size
+
+    async def _copy(self, source_path: Path, target_path: Path) -> int | None:
+        """Copy single file, return its size or None if there is no source.
+
+        Regular files are shared through the blob store instead of
+        being duplicated. Packed source is written as a regular file.
+        Packed version of the target is dropped, otherwise it would
+        be served instead.
+        """
+        if await aiofiles.os.path.exists(source_path):
+            method = await asyncio.to_thread(
+                self.blobs.copy, source_path, target_path
+            )
+            size = await aiofiles.os.path.getsize(source_path)
+        else:
+            data = await asyncio.to_thread(
+                self.packs.read_relative,
+                source_path.relative_to(self.locator.root),
+            )
+            if data is None:
+                return None
+
+            # target could be shared with other items, never write into it
+            await aiofiles.os.makedirs(target_path.parent, exist_ok=True)
+            tmp_path = target_path.with_name(f'.{uuid.uuid4().hex}.tmp')
+            try:
+                async with aiofiles.open(tmp_path, mode='wb') as file:
+                    await file.write(data)
+                await aiofiles.os.replace(tmp_path, target_path)
+            finally:
+                await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            method = 'unpack'
+            size = len(data)
+
+        await asyncio.to_thread(
+            self.packs.delete_relative,
+            target_path.relative_to(self.locator.root),
+        )
+        LOG.debug(
+            '[{}] Copied file ({}): {} to {}',
+            self.dto.id,
+            method,
+            source_path,
+            target_path,
+        )
+        return size
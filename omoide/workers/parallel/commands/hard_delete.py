@@ -1,11 +1,15 @@
 """Actually delete all files and the item itself."""
 
+import asyncio
+import shutil
+
 from aiofiles import os
 
 from omoide import const
 from omoide import custom_logging
 
 from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
 from omoide.workers.parallel.commands.base_command import Command
 from omoide.workers.parallel.database import ParallelPostgreSQLDatabase
 from omoide.models import ParallelCommand
@@ -24,6 +28,7 @@ class HardDeleteCommand(Command):
         users: db_interfaces.AbsUsersRepo,
         items: db_interfaces.AbsItemsRepo,
         locator: FilesystemLocator,
+        packs: PackStore,
     ) -> None:
         """Initialize instance."""
         super().__init__(dto)
@@ -31,6 +36,7 @@ class HardDeleteCommand(Command):
         self.users = users
         self.items = items
         self.locator = locator
+        self.packs = packs
 
     def get_required_resources(self) -> list[const.LockableResource]:
         """Return resources to lock before execution."""
@@ -69,11 +75,31 @@ class HardDeleteCommand(Command):
             if path is not None
         ]
 
+        for deleted in [True, False]:
+            paths.extend(
+                self.locator.get_extra_paths(owner, item, deleted=deleted)
+            )
+
+        for path in paths:
+            relative_path = path.relative_to(self.locator.root)
+            if await asyncio.to_thread(
+                self.packs.delete_relative, relative_path
+            ):
+                LOG.debug('[{}] Deleted packed file: {}', self.dto.id, path)
+
+        await asyncio.to_thread(
+            shutil.rmtree,
+            self.locator.get_contact_sheet_folder(owner, item),
+            ignore_errors=True,
+        )
+
         if not paths:
             return 0
 
         # NOTE: Any general OSError shows critical misconfiguration
-        # of the host, so it is not added into exception clause
+        # of the host, so it is not added into exception clause.
+        # Files shared with copies are hard links, unlinking one
+        # only drops a reference, the blob is collected later.
         for path in paths:
             try:
                 await os.unlink(path)
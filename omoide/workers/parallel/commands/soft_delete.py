@@ -75,6 +75,22 @@ class SoftDeleteCommand(Command):
             if segments is not None
         ]
 
+        extra_paths = zip(
+            self.locator.get_extra_paths(owner, item),
+            self.locator.get_extra_paths(owner, item, deleted=True),
+            strict=True,
+        )
+
+        for old_path, new_path in extra_paths:
+            try:
+                await os.rename(src=old_path, dst=new_path)
+            except FileNotFoundError:
+                pass
+            else:
+                LOG.debug(
+                    '[{}] Renamed file to deleted: {}', self.dto.id, old_path
+                )
+
         if not all_segments:
             return 0
 
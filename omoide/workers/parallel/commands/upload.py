@@ -8,29 +8,41 @@ import zlib
 from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
 from typing import Any
-from PIL import ExifTags
 import aiofiles
 import aiofiles.os
 import python_utilz as pu
 from PIL import Image
 from PIL import ImageFilter
 from PIL import ImageOps
-from moviepy import VideoFileClip
 
 from omoide import const
 from omoide import custom_logging
+from omoide import exceptions
 from omoide import models
 from omoide.database import interfaces as db_interfaces
+from omoide.infra import exif_reader
+from omoide.infra import perceptual_hash
+from omoide.infra import placeholder
+from omoide.infra.blob_store import BlobStore
 from omoide.infra.locators import FilesystemLocator
+from omoide.infra.pack_store import PackStore
 from omoide.models import ParallelCommand
 from omoide.object_storage.interfaces import AbsObjectStorage
+from omoide.workers.parallel import video
 from omoide.workers.parallel.commands.base_command import Command
 from omoide.workers.parallel.database import ParallelPostgreSQLDatabase
 
 LOG = custom_logging.get_logger(__name__)
 
+# encoder settings for extra formats, quality is the same as for jpeg
+RENDITION_OPTIONS: dict[str, dict[str, Any]] = {
+    'webp': {'format': 'WEBP', 'method': 4},
+    'avif': {'format': 'AVIF', 'speed': 6},
+}
+
 
 @dataclass(frozen=True)
 class ConversionInput:
@@ -45,6 +57,8 @@ class ConversionInput:
     image_quality: int
     extract_exif: bool
     skip_content: bool
+    animated_preview_path: Path | None = None
+    rendition_formats: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -63,6 +77,15 @@ class ConversionOutput:
     exif: dict[str, Any] | None
     signature_crc32: int | None
     signature_md5: str | None
+    signature_perceptual: int | None
+    video_duration: float | None = None
+    video_codec: str | None = None
+    video_fps: float | None = None
+    animated_preview_size: int | None = None
+    preview_renditions: dict[str, int] = field(default_factory=dict)
+    thumbnail_renditions: dict[str, int] = field(default_factory=dict)
+    placeholder: str | None = None
+    dominant_color: str | None = None
 
 
 class UploadCommand(Command):
@@ -80,6 +103,8 @@ class UploadCommand(Command):
         locator: FilesystemLocator,
         executor: ProcessPoolExecutor,
         object_storage: AbsObjectStorage,
+        packs: PackStore,
+        blobs: BlobStore,
     ) -> None:
         """Initialize instance."""
         super().__init__(dto)
@@ -92,11 +117,19 @@ class UploadCommand(Command):
         self.locator = locator
         self.executor = executor
         self.object_storage = object_storage
+        self.packs = packs
+        self.blobs = blobs
+
+    @property
+    def ancestors(self) -> list[int]:
+        """Return ids of ancestors that get the same thumbnail."""
+        return list(self.dto.extras.get('ancestors') or [])
 
     def get_required_resources(self) -> list[const.LockableResource]:
         """Return resources to lock before execution."""
         return [
-            const.LockableResource(const.LockNamespace.ITEMS, self.dto.item_id)
+            const.LockableResource(const.LockNamespace.ITEMS, item_id)
+            for item_id in [self.dto.item_id, *self.ancestors]
         ]
 
     async def execute(self) -> int:
@@ -122,14 +155,36 @@ class UploadCommand(Command):
         preview_existed = await aiofiles.os.path.exists(preview_path)
         thumbnail_existed = await aiofiles.os.path.exists(thumbnail_path)
 
-        chunks = self.object_storage.read(self.dto.oid)
-        async with aiofiles.open(content_path, mode='wb') as f:
-            async for chunk in chunks:
-                await f.write(chunk)
+        # copied files are hard links shared with other items,
+        # writing into them would change those items too
+        for path in [
+            content_path,
+            preview_path,
+            thumbnail_path,
+            *self.locator.get_extra_paths(owner, item),
+        ]:
+            with suppress(FileNotFoundError):
+                await aiofiles.os.unlink(path)
+
+        # staged files are linked, large objects have to be read
+        if not await self.object_storage.hand_off(self.dto.oid, content_path):
+            chunks = self.object_storage.read(self.dto.oid)
+            async with aiofiles.open(content_path, mode='wb') as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
 
         skip_content = bool(self.dto.extras.get('skip_content'))
         extract_exif = bool(self.dto.extras.get('extract_exif'))
 
+        animated_preview_path = None
+        if is_video and self.dto.extras.get('animated_preview'):
+            animated_preview_path = self.locator.get_path(
+                owner,
+                item,
+                const.MediaType.PREVIEW,
+                force_ext=const.ANIMATED_PREVIEW_EXT,
+            )
+
         conversion_input = ConversionInput(
             content_path=content_path,
             preview_path=preview_path,
@@ -140,6 +195,8 @@ class UploadCommand(Command):
             image_quality=const.IMAGE_QUALITY,
             extract_exif=extract_exif,
             skip_content=skip_content,
+            animated_preview_path=animated_preview_path,
+            rendition_formats=get_rendition_formats(),
         )
 
         loop = asyncio.get_running_loop()
@@ -184,6 +241,18 @@ class UploadCommand(Command):
             else:
                 LOG.debug('[{}] Saved {} file: {}', self.dto.id, label, path)
 
+        # packed versions of previous upload would be served instead
+        for path in [
+            preview_path,
+            thumbnail_path,
+            *self.locator.get_extra_paths(owner, item),
+        ]:
+            relative_path = path.relative_to(self.locator.root)
+            if await asyncio.to_thread(
+                self.packs.delete_relative, relative_path
+            ):
+                LOG.debug('[{}] Dropped packed file: {}', self.dto.id, path)
+
         if skip_content:
             with suppress(FileNotFoundError):
                 await aiofiles.os.unlink(content_path)
@@ -216,6 +285,29 @@ class UploadCommand(Command):
             metainfo.thumbnail_height = conversion_output.thumbnail_height
             metainfo.thumbnail_size = conversion_output.thumbnail_size
 
+            for ext in const.RENDITION_FORMATS:
+                setattr(
+                    metainfo,
+                    f'preview_{ext}_size',
+                    conversion_output.preview_renditions.get(ext),
+                )
+                setattr(
+                    metainfo,
+                    f'thumbnail_{ext}_size',
+                    conversion_output.thumbnail_renditions.get(ext),
+                )
+
+            metainfo.placeholder = conversion_output.placeholder
+            metainfo.dominant_color = conversion_output.dominant_color
+
+            if is_video:
+                metainfo.duration = conversion_output.video_duration
+                metainfo.video_codec = conversion_output.video_codec
+                metainfo.fps = conversion_output.video_fps
+
+            metainfo.animated_preview_size = (
+                conversion_output.animated_preview_size
+            )
             metainfo.content_type = content_type
             metainfo.updated_at = pu.now()
             await self.meta_repo.save(conn, metainfo)
@@ -234,12 +326,108 @@ class UploadCommand(Command):
                     conn, item, conversion_output.signature_crc32
                 )
 
+            if conversion_output.signature_perceptual is not None:
+                await self.signatures_repo.save_perceptual_signature(
+                    conn, item, conversion_output.signature_perceptual
+                )
+
+        await self._share_with_ancestors(owner, item, metainfo)
+
         return (
             conversion_output.content_size
             + conversion_output.preview_size
             + conversion_output.thumbnail_size
+            + (conversion_output.animated_preview_size or 0)
+            + sum(conversion_output.preview_renditions.values())
+            + sum(conversion_output.thumbnail_renditions.values())
         )
 
+    async def _share_with_ancestors(
+        self,
+        owner: models.User,
+        item: models.Item,
+        metainfo: models.Metainfo,
+    ) -> None:
+        """Give ancestors previews and thumbnails of the uploaded item.
+
+        Files are shared through the blob store, so this costs
+        a few hard links per ancestor instead of another conversion.
+        """
+        for ancestor_id in self.ancestors:
+            async with self.database.transaction() as conn:
+                try:
+                    ancestor = await self.items_repo.get_by_id(
+                        conn, ancestor_id
+                    )
+                except exceptions.DoesNotExistError:
+                    LOG.warning(
+                        '[{}] Ancestor {} was deleted, skipping',
+                        self.dto.id,
+                        ancestor_id,
+                    )
+                    continue
+                ancestor_owner = await self.users_repo.get_by_id(
+                    conn, ancestor.owner_id
+                )
+
+            paths = zip(
+                self._get_shared_paths(owner, item),
+                self._get_shared_paths(ancestor_owner, ancestor),
+                strict=True,
+            )
+
+            for source_path, target_path in paths:
+                if await aiofiles.os.path.exists(source_path):
+                    await asyncio.to_thread(
+                        self.blobs.copy, source_path, target_path
+                    )
+                else:
+                    # leftover from previous image of the ancestor
+                    with suppress(FileNotFoundError):
+                        await aiofiles.os.unlink(target_path)
+
+                await asyncio.to_thread(
+                    self.packs.delete_relative,
+                    target_path.relative_to(self.locator.root),
+                )
+
+            async with self.database.transaction() as conn:
+                ancestor.preview_ext = 'jpg'
+                ancestor.thumbnail_ext = 'jpg'
+                await self.items_repo.save(conn, ancestor)
+
+                ancestor_metainfo = await self.meta_repo.get_by_item(
+                    conn, ancestor
+                )
+                ancestor_metainfo.copy_from(metainfo)
+                await self.meta_repo.save(conn, ancestor_metainfo)
+
+            LOG.debug(
+                '[{}] Shared thumbnail of {} with {}',
+                self.dto.id,
+                item.uuid,
+                ancestor.uuid,
+            )
+
+    def _get_shared_paths(
+        self,
+        owner: models.User,
+        item: models.Item,
+    ) -> list[Path]:
+        """Return paths of files that ancestors get from the item."""
+        paths = [
+            self.locator.get_path(
+                owner, item, const.MediaType.PREVIEW, force_ext='jpg'
+            ),
+            self.locator.get_path(
+                owner, item, const.MediaType.THUMBNAIL, force_ext='jpg'
+            ),
+        ]
+        return [
+            *(path for path in paths if path is not None),
+            *self.locator.get_extra_paths(owner, item),
+        ]
+
     async def _get_paths_and_create_folders(
         self,
         owner: models.User,
@@ -311,28 +499,44 @@ def perform_all_conversions(
     """Create all sub-images, calculate signatures."""
     exif = None
 
+    video_info = video.VideoInfo()
+    animated_preview_size = None
+
     if conversion_input.is_video:
-        clip = None
-        img = None
-        try:
-            clip = VideoFileClip(conversion_input.content_path)
-            first_frame = clip.get_frame(0)
-            img = Image.fromarray(first_frame)
+        video_info = video.probe(conversion_input.content_path)
+        with video.extract_poster(
+            conversion_input.content_path, video_info.duration
+        ) as img:
             (
                 preview_width,
                 preview_height,
                 thumbnail_width,
                 thumbnail_height,
+                preview_renditions,
+                thumbnail_renditions,
             ) = do_resizes(img, conversion_input)
             content_width, content_height = img.size
+            signature_perceptual = perceptual_hash.difference_hash(img)
             if conversion_input.extract_exif:
                 exif = extract_exif_from_image(img)
-        finally:
-            if clip is not None:
-                clip.close()
-            if img is not None:
-                img.close()
+
+        if conversion_input.animated_preview_path is not None:
+            is_created = video.make_animated_preview(
+                conversion_input.content_path,
+                conversion_input.animated_preview_path,
+                video_info.duration,
+            )
+            if is_created:
+                animated_preview_size = os.path.getsize(
+                    conversion_input.animated_preview_path
+                )
     else:
+        if conversion_input.extract_exif:
+            # reads only metadata segment of the file
+            exif = exif_reader.extract_exif_from_file(
+                conversion_input.content_path
+            )
+
         with Image.open(conversion_input.content_path) as img:
             content_width, content_height = img.size
             (
@@ -340,10 +544,19 @@ def perform_all_conversions(
                 preview_height,
                 thumbnail_width,
                 thumbnail_height,
+                preview_renditions,
+                thumbnail_renditions,
             ) = do_resizes(img, conversion_input)
-            if conversion_input.extract_exif:
+            signature_perceptual = perceptual_hash.difference_hash(img)
+            if conversion_input.extract_exif and exif is None:
+                # format we cannot read directly, let Pillow find it
                 exif = extract_exif_from_image(img)
 
+    # thumbnail is already oriented and small, so it is cheap to read
+    item_placeholder = placeholder.make_placeholder_from_file(
+        conversion_input.thumbnail_path
+    )
+
     signature_crc32 = None
     signature_md5 = None
     if not conversion_input.skip_content:
@@ -372,31 +585,44 @@ def perform_all_conversions(
         exif=exif,
         signature_crc32=signature_crc32,
         signature_md5=signature_md5,
+        signature_perceptual=signature_perceptual,
+        video_duration=video_info.duration,
+        video_codec=video_info.codec,
+        video_fps=video_info.fps,
+        animated_preview_size=animated_preview_size,
+        preview_renditions=preview_renditions,
+        thumbnail_renditions=thumbnail_renditions,
+        placeholder=item_placeholder.image,
+        dominant_color=item_placeholder.color,
     )
 
 
 def do_resizes(
     img: Image.Image,
     conversion_input: ConversionInput,
-) -> tuple[int, int, int, int]:
+) -> tuple[int, int, int, int, dict[str, int], dict[str, int]]:
     """Resize source image."""
-    preview_width, preview_height = resize(
+    preview_width, preview_height, preview_renditions = resize(
         img,
         conversion_input.preview_width,
         conversion_input.preview_path,
         conversion_input.image_quality,
+        conversion_input.rendition_formats,
     )
-    thumbnail_width, thumbnail_height = resize(
+    thumbnail_width, thumbnail_height, thumbnail_renditions = resize(
         img,
         conversion_input.thumbnail_width,
         conversion_input.thumbnail_path,
         conversion_input.image_quality,
+        conversion_input.rendition_formats,
     )
     return (
         preview_width,
         preview_height,
         thumbnail_width,
         thumbnail_height,
+        preview_renditions,
+        thumbnail_renditions,
     )
 
 
@@ -418,10 +644,28 @@ def get_new_image_dimensions(
     return math.ceil(new_width), math.ceil(new_height)
 
 
+def get_rendition_formats() -> tuple[str, ...]:
+    """Return extra formats that this build of Pillow can write."""
+    Image.init()
+    return tuple(
+        ext
+        for ext in const.RENDITION_FORMATS
+        if RENDITION_OPTIONS[ext]['format'] in Image.SAVE
+    )
+
+
 def resize(
-    img: Image.Image, size: int, dst_path: Path, quality: int
-) -> tuple[int, int]:
-    """Resize to given dimensions."""
+    img: Image.Image,
+    size: int,
+    dst_path: Path,
+    quality: int,
+    rendition_formats: tuple[str, ...] = (),
+) -> tuple[int, int, dict[str, int]]:
+    """Resize to given dimensions.
+
+    Besides the JPEG, same image is saved in every given format
+    next to it. Rendition is kept only if it is smaller than the JPEG.
+    """
     img = ImageOps.exif_transpose(img)
     old_width, old_height = img.size
     new_width, new_height = get_new_image_dimensions(
@@ -437,40 +681,26 @@ def resize(
         quality=quality,
         optimize=True,
     )
-    return new_width, new_height
 
+    jpeg_size = os.path.getsize(dst_path)
+    renditions: dict[str, int] = {}
+    for ext in rendition_formats:
+        rendition_path = dst_path.with_suffix(f'.{ext}')
+        new_img.save(
+            rendition_path,
+            quality=quality,
+            **RENDITION_OPTIONS[ext],
+        )
 
-IFD_CODE_LOOKUP = {i.value: i.name for i in ExifTags.IFD}
+        rendition_size = os.path.getsize(rendition_path)
+        if rendition_size < jpeg_size:
+            renditions[ext] = rendition_size
+        else:
+            rendition_path.unlink()
+
+    return new_width, new_height, renditions
 
 
 def extract_exif_from_image(img: Image.Image) -> dict[str, Any]:
     """Extract exif data from content."""
-    exif: dict[str, Any] = {}
-
-    def cast(maybe_string: Any) -> str:
-        """Convert to string. Also strip unicode \u0000."""
-        return str(maybe_string).replace('\u0000', '')
-
-    img_exif = img.getexif()
-
-    for tag_code, value in img_exif.items():
-        if tag_code in IFD_CODE_LOOKUP:
-            ifd_tag_name = cast(IFD_CODE_LOOKUP[tag_code])
-
-            if ifd_tag_name not in exif:
-                exif[ifd_tag_name] = {}
-
-            ifd_data = img_exif.get_ifd(tag_code).items()
-
-            for nested_key, nested_value in ifd_data:
-                nested_tag_name = (
-                    ExifTags.GPSTAGS.get(nested_key, None)
-                    or ExifTags.TAGS.get(nested_key, None)
-                    or nested_key
-                )
-                exif[ifd_tag_name][cast(nested_tag_name)] = cast(nested_value)
-
-        else:
-            exif[cast(ExifTags.TAGS.get(tag_code))] = cast(value)
-
-    return exif
+    return exif_reader.exif_to_dict(img.getexif())
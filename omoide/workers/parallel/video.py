@@ -0,0 +1,262 @@
+"""Video metadata and poster frames via ffmpeg.
+
+ffmpeg is called directly: input seeking (``-ss`` before ``-i``) jumps
+to the nearest keyframe without decoding everything before it, and
+only the single requested frame is decoded. Every call has a hard
+timeout, hung process is killed.
+"""
+
+import io
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+import imageio_ffmpeg
+from PIL import Image
+from PIL import ImageStat
+
+from omoide import const
+from omoide import custom_logging
+
+LOG = custom_logging.get_logger(__name__)
+
+# frames darker or flatter than this are not good as a poster
+MIN_BRIGHTNESS = 16.0
+MIN_CONTRAST = 8.0
+
+# where to look for the poster, as a share of the duration
+POSTER_POSITIONS = (0.1, 0.25, 0.5, 0.75)
+
+_DURATION = re.compile(r'Duration:\s*(\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+_VIDEO_STREAM = re.compile(
+    r'Stream #\S+.*?: Video: (?P<codec>\w+)(?P<rest>.*)'
+)
+_SIZE = re.compile(r'\b(\d{2,5})x(\d{2,5})\b')
+_FPS = re.compile(r'([\d.]+)(k?) fps')
+
+
+class VideoError(ValueError):
+    """Video could not be processed."""
+
+
+@dataclass(frozen=True)
+class VideoInfo:
+    """Basic parameters of the video stream."""
+
+    duration: float | None = None
+    codec: str | None = None
+    fps: float | None = None
+    width: int | None = None
+    height: int | None = None
+
+
+def get_ffmpeg() -> str:
+    """Return path to ffmpeg executable.
+
+    System one is preferred, binary bundled with imageio-ffmpeg
+    (dependency of moviepy) is used as a fallback.
+    """
+    executable = shutil.which('ffmpeg')
+    if executable is not None:
+        return executable
+
+    return str(imageio_ffmpeg.get_ffmpeg_exe())
+
+
+def _run(arguments: list[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run ffmpeg, kill it if it takes too long."""
+    return subprocess.run(
+        [get_ffmpeg(), '-hide_banner', '-nostdin', *arguments],
+        capture_output=True,
+        timeout=timeout,
+        check=False,
+    )
+
+
+def parse_info(output: str) -> VideoInfo:
+    """Extract video parameters from ffmpeg's description of the input."""
+    duration = None
+    if match := _DURATION.search(output):
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    stream = _VIDEO_STREAM.search(output)
+    if stream is None:
+        return VideoInfo(duration=duration)
+
+    rest = stream.group('rest')
+    width = height = None
+    if size := _SIZE.search(rest):
+        width, height = int(size.group(1)), int(size.group(2))
+
+    fps = None
+    if rate := _FPS.search(rest):
+        fps = float(rate.group(1)) * (1000 if rate.group(2) else 1)
+
+    return VideoInfo(
+        duration=duration,
+        codec=stream.group('codec'),
+        fps=fps,
+        width=width,
+        height=height,
+    )
+
+
+def probe(path: Path, timeout: float = const.VIDEO_PROBE_TIMEOUT) -> VideoInfo:
+    """Return parameters of the video without decoding it."""
+    # without output file ffmpeg only describes the input and exits
+    try:
+        result = _run(['-i', str(path)], timeout)
+    except subprocess.TimeoutExpired as exc:
+        msg = f'Timed out reading parameters of {path}'
+        raise VideoError(msg) from exc
+
+    return parse_info(result.stderr.decode('utf-8', errors='replace'))
+
+
+def extract_frame(
+    path: Path,
+    position: float,
+    timeout: float = const.VIDEO_FRAME_TIMEOUT,
+) -> Image.Image | None:
+    """Return single frame near given position (in seconds)."""
+    result = _run(
+        [
+            '-ss',
+            f'{position:.3f}',
+            '-i',
+            str(path),
+            '-an',
+            '-sn',
+            '-frames:v',
+            '1',
+            '-f',
+            'image2pipe',
+            '-c:v',
+            'png',
+            '-',
+        ],
+        timeout,
+    )
+
+    if result.returncode or not result.stdout:
+        return None
+
+    img = Image.open(io.BytesIO(result.stdout))
+    img.load()
+    return img
+
+
+def get_score(img: Image.Image) -> tuple[float, float]:
+    """Return brightness and contrast of the image."""
+    with img.convert('L') as gray:
+        gray.thumbnail((64, 64))
+        stat = ImageStat.Stat(gray)
+    return stat.mean[0], stat.stddev[0]
+
+
+def is_representative(img: Image.Image) -> bool:
+    """Return True if frame is not black and not a solid fill."""
+    brightness, contrast = get_score(img)
+    return brightness >= MIN_BRIGHTNESS and contrast >= MIN_CONTRAST
+
+
+def extract_poster(
+    path: Path,
+    duration: float | None,
+    timeout: float = const.VIDEO_FRAME_TIMEOUT,
+) -> Image.Image:
+    """Return first frame that looks like something.
+
+    If every candidate is dull, the one with the highest contrast is used.
+    """
+    positions = [0.0]
+    if duration:
+        positions = [duration * share for share in POSTER_POSITIONS]
+        positions.append(0.0)
+
+    best: Image.Image | None = None
+    best_contrast = -1.0
+
+    for position in positions:
+        try:
+            frame = extract_frame(path, position, timeout)
+        except subprocess.TimeoutExpired:
+            LOG.warning('Timed out getting frame at {}s of {}', position, path)
+            continue
+
+        if frame is None:
+            continue
+
+        if is_representative(frame):
+            if best is not None:
+                best.close()
+            return frame
+
+        _, contrast = get_score(frame)
+        if contrast > best_contrast:
+            if best is not None:
+                best.close()
+            best, best_contrast = frame, contrast
+        else:
+            frame.close()
+
+    if best is None:
+        msg = f'Failed to extract any frame from {path}'
+        raise VideoError(msg)
+
+    return best
+
+
+def make_animated_preview(
+    path: Path,
+    output_path: Path,
+    duration: float | None,
+    width: int = const.THUMBNAIL_SIZE,
+    seconds: float = const.ANIMATED_PREVIEW_SECONDS,
+    fps: int = const.ANIMATED_PREVIEW_FPS,
+    timeout: float = const.VIDEO_ANIMATION_TIMEOUT,
+) -> bool:
+    """Save short looped animation of the video, return True on success."""
+    start = 0.0
+    if duration and duration > seconds:
+        start = min(duration * POSTER_POSITIONS[0], duration - seconds)
+
+    arguments = [
+        '-ss',
+        f'{start:.3f}',
+        '-t',
+        f'{seconds:.3f}',
+        '-i',
+        str(path),
+        '-an',
+        '-sn',
+        '-vf',
+        f'fps={fps},scale={width}:-2:flags=lanczos',
+        '-loop',
+        '0',
+        '-c:v',
+        'libwebp_anim',
+        '-quality',
+        str(const.IMAGE_QUALITY),
+        '-y',
+        str(output_path),
+    ]
+
+    try:
+        result = _run(arguments, timeout)
+    except subprocess.TimeoutExpired:
+        LOG.warning('Timed out creating animated preview for {}', path)
+        return False
+
+    if result.returncode:
+        LOG.warning(
+            'Failed to create animated preview for {}: {}',
+            path,
+            result.stderr.decode('utf-8', errors='replace')[-500:],
+        )
+        return False
+
+    return True
@@ -32,6 +32,9 @@ class RebuildPermissionsForItemUseCase(BaseSerialWorkerUseCase):
             await self.do_apply_to_children(operation, affected_users)
 
         async with self.mediator.database.transaction() as conn:
+            # NOTE: changes above are already committed
+            await self.mediator.tags.bump_generation(conn)
+
             for user_id in affected_users:
                 user = await self.mediator.users.get_by_id(conn, user_id)
                 await self.mediator.misc.create_serial_operation(
@@ -131,6 +131,9 @@ class RebuildComputedTagsForItemUseCase(BaseSerialWorkerUseCase):
 
         affected_tags = await self.rebuild_tags(item, affected_users)
 
+        async with self.mediator.database.transaction() as conn:
+            await self.mediator.tags.bump_generation(conn)
+
         if affected_users:
             for user_id in affected_users:
                 async with self.mediator.database.transaction() as conn: